@@ -0,0 +1,94 @@
+"""
+CacheManager Throughput Benchmark
+
+Measures cache operations per second and Redis commands per operation for each
+LRU eviction mode against a local Redis. The L1 cache is disabled so every
+operation reaches Redis.
+
+Usage (from the repository root):
+    python -m apps.backend.benchmarks.cache_manager_ops --redis-url redis://localhost:9104/15
+
+Use a scratch database: keys under the benchmark prefix are deleted afterwards.
+"""
+
+import argparse
+import asyncio
+import time
+from uuid import uuid4
+
+from apps.backend.src.utils.cache_manager import EVICTION_MODES, CacheManager
+
+KEY_PREFIX = "bench_cache:"
+
+
+async def total_commands(manager: CacheManager) -> int:
+    """Total commands processed by the Redis server so far"""
+    stats = await manager.redis_client.info("stats")
+    return int(stats["total_commands_processed"])
+
+
+async def cleanup(manager: CacheManager) -> None:
+    """Delete every key written by the benchmark"""
+    async for key in manager.redis_client.scan_iter(match=f"{KEY_PREFIX}*", count=1000):
+        await manager.redis_client.delete(key)
+
+
+async def run_mode(redis_url: str, mode: str, devices: int, operations: int, read_ratio: float) -> dict:
+    """Run a mixed get/set workload in one eviction mode"""
+    manager = CacheManager(
+        redis_url=redis_url,
+        key_prefix=KEY_PREFIX,
+        max_cache_size=devices * 2,
+        l1_max_size=0,
+        eviction_mode=mode,
+    )
+    await manager.connect()
+    try:
+        await cleanup(manager)
+        device_ids = [uuid4() for _ in range(devices)]
+        payload = {"cpu_usage": 12.5, "memory_usage": 48.1, "containers": list(range(20))}
+        for device_id in device_ids:
+            await manager.set("system_metrics", device_id, payload)
+
+        commands_before = await total_commands(manager)
+        started = time.perf_counter()
+        for i in range(operations):
+            device_id = device_ids[i % devices]
+            if i % 100 < read_ratio * 100:
+                await manager.get("system_metrics", device_id)
+            else:
+                await manager.set("system_metrics", device_id, payload)
+        elapsed = time.perf_counter() - started
+        # Deferred LRU and metrics writes count against the run
+        await manager._flush_maintenance()
+        commands = await total_commands(manager) - commands_before
+        # INFO itself is one command
+        commands -= 1
+
+        return {
+            "mode": mode,
+            "ops_per_sec": operations / elapsed,
+            "commands_per_op": commands / operations,
+        }
+    finally:
+        await cleanup(manager)
+        await manager.disconnect()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--redis-url", default="redis://localhost:9104/15")
+    parser.add_argument("--devices", type=int, default=50)
+    parser.add_argument("--operations", type=int, default=10000)
+    parser.add_argument("--read-ratio", type=float, default=0.9, help="Fraction of operations that are gets")
+    parser.add_argument("--modes", nargs="+", default=list(EVICTION_MODES), choices=EVICTION_MODES)
+    args = parser.parse_args()
+
+    print(f"{'mode':<10} {'ops/sec':>12} {'redis cmds/op':>14}")
+    for mode in args.modes:
+        result = await run_mode(args.redis_url, mode, args.devices, args.operations, args.read_ratio)
+        print(f"{result['mode']:<10} {result['ops_per_sec']:>12.0f} {result['commands_per_op']:>14.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
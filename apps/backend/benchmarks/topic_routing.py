@@ -0,0 +1,92 @@
+"""
+WebSocket Topic Routing Benchmark
+
+Measures how long it takes to find the subscribers of one event topic,
+comparing a linear scan over every connection and subscription pattern (the
+previous behaviour) with the TopicIndex trie used by ConnectionManager.
+
+Each simulated client subscribes to the metrics and containers topics of a
+few hosts, plus a wildcard pattern for a quarter of the clients, so the
+number of matches per topic stays small while the subscription count grows.
+
+Usage (from the repository root):
+    python -m apps.backend.benchmarks.topic_routing --hosts 1000 --clients 100 500 2000
+"""
+
+import argparse
+import random
+import time
+
+from apps.backend.src.websocket.topic_index import TopicIndex, topic_matches
+
+KINDS = ("metrics", "containers", "drives", "status")
+
+
+def build_subscriptions(clients: int, hosts: int, per_client: int, seed: int) -> dict[int, set[str]]:
+    """Random per-client subscription patterns over devices.<host>.<kind> topics"""
+    rng = random.Random(seed)
+    subscriptions: dict[int, set[str]] = {}
+    for client in range(clients):
+        patterns = {
+            f"devices.host{rng.randrange(hosts)}.{rng.choice(KINDS)}" for _ in range(per_client)
+        }
+        if client % 4 == 0:
+            patterns.add(f"devices.host{rng.randrange(hosts)}.*")
+        subscriptions[client] = patterns
+    return subscriptions
+
+
+def linear_match(subscriptions: dict[int, set[str]], topic: str) -> list[int]:
+    """Previous routing: test every pattern of every connection"""
+    return [
+        client
+        for client, patterns in subscriptions.items()
+        if any(topic_matches(topic, pattern) for pattern in patterns)
+    ]
+
+
+def time_lookups(lookup, topics: list[str]) -> float:
+    """Average microseconds per lookup"""
+    started = time.perf_counter()
+    for topic in topics:
+        lookup(topic)
+    return (time.perf_counter() - started) * 1_000_000 / len(topics)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hosts", type=int, default=1000)
+    parser.add_argument("--clients", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--per-client", type=int, default=20, help="Exact topics per client")
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    topics = [f"devices.host{rng.randrange(args.hosts)}.{rng.choice(KINDS)}" for _ in range(args.lookups)]
+
+    print(f"{'clients':>8} {'patterns':>9} {'linear us':>10} {'trie us':>9} {'speedup':>8} {'matches':>8}")
+    for clients in args.clients:
+        subscriptions = build_subscriptions(clients, args.hosts, args.per_client, args.seed)
+        index: TopicIndex[int] = TopicIndex()
+        for client, patterns in subscriptions.items():
+            for pattern in patterns:
+                index.add(pattern, client)
+
+        # Both strategies must route identically
+        for topic in topics[:100]:
+            assert set(linear_match(subscriptions, topic)) == index.match(topic)
+
+        linear_us = time_lookups(
+            lambda topic, subscriptions=subscriptions: linear_match(subscriptions, topic), topics
+        )
+        trie_us = time_lookups(index.match, topics)
+        matches = sum(len(index.match(topic)) for topic in topics) / len(topics)
+        print(
+            f"{clients:>8} {len(index):>9} {linear_us:>10.1f} {trie_us:>9.2f} "
+            f"{linear_us / trie_us:>7.0f}x {matches:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
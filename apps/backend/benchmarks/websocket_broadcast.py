@@ -0,0 +1,120 @@
+"""
+WebSocket Broadcast Benchmark
+
+Measures how many metric events per second ConnectionManager can fan out to N
+subscribed clients, comparing serialization and a direct send per subscriber
+(the previous behaviour) with encoding each broadcast once into a shared frame
+that is handed to every client's send queue. Clients are in-memory stand-ins,
+so the numbers are the server-side CPU cost only.
+
+Usage (from the repository root):
+    python -m apps.backend.benchmarks.websocket_broadcast --events 1000 --clients 1 10 50 200
+"""
+
+import argparse
+import asyncio
+import time
+from uuid import uuid4
+
+from apps.backend.src.core.events import MetricCollectedEvent
+from apps.backend.src.websocket.connection_manager import ConnectionManager
+from apps.backend.src.websocket.message_protocol import DataMessage, MessageType
+
+TOPIC = "devices.bench-host.metrics"
+
+
+class NullWebSocket:
+    """WebSocket that accepts every frame and counts the bytes"""
+
+    def __init__(self) -> None:
+        self.bytes_sent = 0
+
+    async def accept(self) -> None:
+        pass
+
+    async def send_text(self, data: str) -> None:
+        self.bytes_sent += len(data)
+
+    async def send_bytes(self, data: bytes) -> None:
+        self.bytes_sent += len(data)
+
+
+def make_event() -> MetricCollectedEvent:
+    return MetricCollectedEvent(
+        device_id=uuid4(),
+        hostname="bench-host",
+        cpu_usage_percent=12.5,
+        memory_usage_percent=48.1,
+        disk_usage_percent=71.0,
+        load_average_1m=0.5,
+        load_average_5m=0.4,
+        load_average_15m=0.3,
+        uptime_seconds=86400,
+    )
+
+
+async def per_subscriber(manager: ConnectionManager, event: MetricCollectedEvent) -> None:
+    """Previous path: validated message, serialized and sent for every subscriber"""
+    message = DataMessage(
+        hostname=event.hostname,
+        metric_type="system_metrics",
+        type=MessageType.DATA,
+        data=event.model_dump(),
+        timestamp=event.timestamp,
+    )
+    connections = manager.get_connections_by_topic(TOPIC)
+    await asyncio.gather(*[conn.send_text(message.model_dump_json()) for conn in connections])
+
+
+async def encode_once(manager: ConnectionManager, event: MetricCollectedEvent) -> None:
+    """Current path: one conversion and one encoded frame queued per event"""
+    await manager.handle_monitoring_event(event)
+
+
+async def run(strategy, clients: int, events: int, binary: bool) -> dict:
+    """Broadcast events to clients subscribers with one strategy"""
+    manager = ConnectionManager()
+    manager.binary_frames = binary
+    sockets = [NullWebSocket() for _ in range(clients)]
+    for websocket in sockets:
+        await manager.connect(websocket)
+        await manager.subscribe_to_topic(websocket, TOPIC)
+    await manager.flush()
+    for websocket in sockets:
+        websocket.bytes_sent = 0
+
+    batch = [make_event() for _ in range(events)]
+    started = time.perf_counter()
+    for event in batch:
+        await strategy(manager, event)
+        # Let writer tasks run, as the event bus would between dispatches
+        await asyncio.sleep(0)
+    await manager.flush()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "events_per_sec": events / elapsed,
+        "us_per_event": elapsed * 1_000_000 / events,
+        "bytes_per_client": sockets[0].bytes_sent / events,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=1000)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 10, 50, 200])
+    parser.add_argument("--binary", action="store_true", help="Send binary frames in the encode-once path")
+    args = parser.parse_args()
+
+    print(f"{'clients':>8} {'strategy':<15} {'events/sec':>12} {'us/event':>10} {'bytes/event':>12}")
+    for clients in args.clients:
+        for name, strategy in (("per_subscriber", per_subscriber), ("encode_once", encode_once)):
+            result = await run(strategy, clients, args.events, args.binary)
+            print(
+                f"{clients:>8} {name:<15} {result['events_per_sec']:>12.0f} "
+                f"{result['us_per_event']:>10.1f} {result['bytes_per_client']:>12.0f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
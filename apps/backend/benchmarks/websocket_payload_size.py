@@ -0,0 +1,182 @@
+"""
+WebSocket Payload Size Harness
+
+Simulates a fleet polled every 30 seconds and measures the bytes per minute one
+client subscribed to everything receives with each negotiable protocol: plain
+JSON, delta frames, deflate compression and msgpack (when installed).
+
+Every poll publishes, per device, one metrics event plus one event per
+container and drive. Metrics drift on every poll, a few containers change CPU
+usage or status, and drives rarely change, which is roughly what a quiet
+homelab fleet looks like.
+
+Usage (from the repository root):
+    python -m apps.backend.benchmarks.websocket_payload_size --devices 200 --minutes 5
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from uuid import uuid4
+
+from apps.backend.src.core.events import (
+    ContainerStatusEvent,
+    DriveHealthEvent,
+    MetricCollectedEvent,
+)
+from apps.backend.src.websocket import message_protocol
+from apps.backend.src.websocket.connection_manager import ConnectionManager
+from apps.backend.src.websocket.message_protocol import ProtocolOptions, SubscriptionTopics
+
+POLL_INTERVAL_SECONDS = 30
+
+PROTOCOLS = {
+    "json": ProtocolOptions(),
+    "json+delta": ProtocolOptions(delta=True),
+    "json+deflate": ProtocolOptions(compression="deflate"),
+    "json+delta+deflate": ProtocolOptions(delta=True, compression="deflate"),
+    "msgpack": ProtocolOptions(encoding="msgpack"),
+    "msgpack+delta": ProtocolOptions(encoding="msgpack", delta=True),
+    "msgpack+delta+deflate": ProtocolOptions(encoding="msgpack", delta=True, compression="deflate"),
+}
+
+
+class CountingWebSocket:
+    """WebSocket that counts frames and bytes"""
+
+    def __init__(self) -> None:
+        self.frames = 0
+        self.bytes_sent = 0
+
+    async def accept(self) -> None:
+        pass
+
+    async def send_text(self, data: str) -> None:
+        self.frames += 1
+        self.bytes_sent += len(data.encode())
+
+    async def send_bytes(self, data: bytes) -> None:
+        self.frames += 1
+        self.bytes_sent += len(data)
+
+
+class Fleet:
+    """Simulated devices with containers and drives"""
+
+    def __init__(self, devices: int, containers: int, drives: int, seed: int) -> None:
+        self.rng = random.Random(seed)
+        self.devices = []
+        for index in range(devices):
+            self.devices.append({
+                "device_id": uuid4(),
+                "hostname": f"node{index:03d}",
+                "cpu": self.rng.uniform(2, 60),
+                "containers": [
+                    {
+                        "container_id": uuid4().hex[:12],
+                        "container_name": f"service-{index}-{number}",
+                        "image": f"registry.local/team/service-{number}:1.{number}.0",
+                        "status": "running",
+                        "cpu_usage_percent": 0.0,
+                        "memory_usage_bytes": self.rng.randrange(50, 900) * 1024 * 1024,
+                        "memory_limit_bytes": 2 * 1024 * 1024 * 1024,
+                    }
+                    for number in range(containers)
+                ],
+                "drives": [f"sd{chr(ord('a') + number)}" for number in range(drives)],
+            })
+
+    def poll(self, uptime: int) -> list:
+        """Events published by one poll of the whole fleet"""
+        rng = self.rng
+        events = []
+        for device in self.devices:
+            device["cpu"] = min(100.0, max(0.0, device["cpu"] + rng.uniform(-3, 3)))
+            events.append(MetricCollectedEvent(
+                device_id=device["device_id"],
+                hostname=device["hostname"],
+                cpu_usage_percent=round(device["cpu"], 1),
+                memory_usage_percent=round(rng.uniform(30, 70), 1),
+                disk_usage_percent=61.5,
+                load_average_1m=round(device["cpu"] / 25, 2),
+                load_average_5m=round(device["cpu"] / 30, 2),
+                load_average_15m=round(device["cpu"] / 35, 2),
+                uptime_seconds=uptime,
+            ))
+            for container in device["containers"]:
+                if rng.random() < 0.2:
+                    container["cpu_usage_percent"] = round(rng.uniform(0, 5), 1)
+                if rng.random() < 0.01:
+                    container["status"] = "restarting" if container["status"] == "running" else "running"
+                events.append(ContainerStatusEvent(
+                    device_id=device["device_id"], hostname=device["hostname"], **container
+                ))
+            for drive in device["drives"]:
+                events.append(DriveHealthEvent(
+                    device_id=device["device_id"],
+                    hostname=device["hostname"],
+                    drive_name=drive,
+                    health_status="PASSED",
+                    temperature_celsius=rng.choice((34, 35)),
+                    model="Samsung SSD 870 EVO 1TB",
+                    serial_number=f"S6P{drive.upper()}0R123456",
+                ))
+        return events
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--devices", type=int, default=200)
+    parser.add_argument("--containers", type=int, default=10, help="Containers per device")
+    parser.add_argument("--drives", type=int, default=2, help="Drives per device")
+    parser.add_argument("--minutes", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    protocols = {
+        name: protocol for name, protocol in PROTOCOLS.items()
+        if protocol.encoding != "msgpack" or message_protocol.msgpack is not None
+    }
+    if len(protocols) < len(PROTOCOLS):
+        print("msgpack is not installed; skipping msgpack protocols")
+
+    manager = ConnectionManager()
+    manager.send_queue_size = 100_000
+    clients = {}
+    for name, protocol in protocols.items():
+        websocket = CountingWebSocket()
+        client_id = await manager.connect(websocket)
+        await manager.subscribe_to_topic(websocket, SubscriptionTopics.ALL)
+        manager.set_protocol(client_id, protocol)
+        clients[name] = websocket
+    await manager.flush()
+    for websocket in clients.values():
+        websocket.frames = websocket.bytes_sent = 0
+
+    fleet = Fleet(args.devices, args.containers, args.drives, args.seed)
+    polls = args.minutes * 60 // POLL_INTERVAL_SECONDS
+    started = time.perf_counter()
+    for poll in range(polls):
+        for event in fleet.poll(uptime=86400 + poll * POLL_INTERVAL_SECONDS):
+            await manager.handle_monitoring_event(event)
+        await manager.flush(timeout=60)
+    elapsed = time.perf_counter() - started
+
+    events = polls * args.devices * (1 + args.containers + args.drives)
+    print(
+        f"{args.devices} devices, {events // polls} events per poll, {polls} polls "
+        f"({args.minutes} simulated minutes, {elapsed:.1f}s wall time)"
+    )
+    baseline = clients["json"].bytes_sent
+    print(f"{'protocol':<22} {'KiB/min':>10} {'bytes/frame':>12} {'vs json':>8}")
+    for name, websocket in clients.items():
+        print(
+            f"{name:<22} {websocket.bytes_sent / args.minutes / 1024:>10.1f} "
+            f"{websocket.bytes_sent / max(websocket.frames, 1):>12.0f} "
+            f"{websocket.bytes_sent / baseline:>7.0%}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -380,7 +380,11 @@ async def list_device_containers(
             device_id=device_id,
             collection_method=collect_container_list,
             force_refresh=live,
-            correlation_id=f"containers_{hostname}"
+            correlation_id=f"containers_{hostname}",
+            status=status,
+            all_containers=all_containers,
+            limit=limit,
+            offset=offset,
         )
 
         return result
@@ -425,7 +429,8 @@ async def get_container_info(
             device_id=device_id,
             collection_method=collect_container_info,
             force_refresh=live,
-            correlation_id=f"container_info_{hostname}_{container_name}"
+            correlation_id=f"container_info_{hostname}_{container_name}",
+            container_name=container_name,
         )
 
         return result
@@ -483,7 +488,11 @@ async def get_container_logs(
             device_id=device_id,
             collection_method=collect_container_logs,
             force_refresh=live,
-            correlation_id=f"container_logs_{hostname}_{container_name}"
+            correlation_id=f"container_logs_{hostname}_{container_name}",
+            container_name=container_name,
+            since=since,
+            tail=tail,
+            timestamps=timestamps,
         )
 
         return result
@@ -680,7 +689,8 @@ async def get_container_stats(
             device_id=device_id,
             collection_method=collect_container_stats,
             force_refresh=live,
-            correlation_id=f"container_stats_{hostname}_{container_name}"
+            correlation_id=f"container_stats_{hostname}_{container_name}",
+            container_name=container_name,
         )
 
         return result
@@ -387,6 +387,8 @@ async def performance_metrics(request: Request) -> PerformanceMetricsResponse:
                 "database_query_time_ms": round(db_query_time, 2),
                 "ssh_cache_efficiency_percent": round(ssh_cache_efficiency, 2),
                 "enhanced_cache_hit_ratio_percent": round(cache_metrics.hit_ratio * 100, 2),
+                "enhanced_cache_l1_hit_ratio_percent": round(cache_metrics.l1_hit_ratio * 100, 2),
+                "enhanced_cache_l2_hit_ratio_percent": round(cache_metrics.l2_hit_ratio * 100, 2),
                 "enhanced_cache_response_time_ms": round(cache_metrics.average_response_time_ms, 2),
                 "measurement_timestamp": datetime.now(UTC).isoformat(),
             },
@@ -399,6 +401,7 @@ async def performance_metrics(request: Request) -> PerformanceMetricsResponse:
             },
             ssh_performance={
                 "command_cache": ssh_cache_stats,
+                "connection_pool": ssh_cmd_manager.ssh_client.get_pool_stats(),
                 "registry_size": len(ssh_cmd_manager.command_registry),
                 "cache_hit_ratio_estimate": round(ssh_cache_efficiency, 2),
             },
@@ -256,7 +256,9 @@ async def _collect_proxy_configs_live(
     result = await unified_service.collect_and_store_data(
         collection_method=collect_proxy_configs,
         device_id=device_id,
-        data_type="proxy_configurations"
+        data_type="proxy_configurations",
+        limit=limit,
+        offset=offset,
     )
 
     result["source"] = "live_collection"
@@ -129,7 +129,8 @@ async def get_vm_specific_logs(
             device_id=device_id,
             collection_method=collect_vm_specific_logs,
             force_refresh=live,
-            correlation_id=f"vm_specific_logs_{hostname}_{vm_name}"
+            correlation_id=f"vm_specific_logs_{hostname}_{vm_name}",
+            vm_name=vm_name,
         )
 
         return result
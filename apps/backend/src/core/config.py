@@ -39,6 +39,12 @@ class DatabaseSettings(BaseSettings):
     db_pool_timeout: int = Field(default=30, validation_alias="DB_POOL_TIMEOUT")
     db_pool_recycle: int = Field(default=3600, validation_alias="DB_POOL_RECYCLE")
 
+    # Write-Behind Ingestion Settings
+    db_ingest_batch_size: int = Field(default=500, validation_alias="DB_INGEST_BATCH_SIZE")
+    db_ingest_flush_interval: float = Field(default=2.0, validation_alias="DB_INGEST_FLUSH_INTERVAL")
+    db_ingest_max_pending_rows: int = Field(default=10000, validation_alias="DB_INGEST_MAX_PENDING_ROWS")
+    db_ingest_max_write_attempts: int = Field(default=3, validation_alias="DB_INGEST_MAX_WRITE_ATTEMPTS")
+
     @property
     def database_url(self) -> str:
         """Generate async PostgreSQL database URL"""
@@ -97,6 +103,49 @@ class WebSocketSettings(BaseSettings):
     """WebSocket server configuration for real-time streaming"""
 
     websocket_max_connections: int = Field(default=50, validation_alias="WEBSOCKET_MAX_CONNECTIONS")
+    # Send broadcasts as binary frames of UTF-8 JSON instead of text frames
+    websocket_binary_frames: bool = Field(default=False, validation_alias="WEBSOCKET_BINARY_FRAMES")
+    # Outbound frames buffered per client before the slow-consumer policy applies
+    websocket_send_queue_size: int = Field(default=100, validation_alias="WEBSOCKET_SEND_QUEUE_SIZE")
+    # What to do when a client cannot keep up: conflate, drop_oldest or disconnect
+    websocket_slow_consumer_policy: str = Field(
+        default="conflate",
+        pattern="^(conflate|drop_oldest|disconnect)$",
+        validation_alias="WEBSOCKET_SLOW_CONSUMER_POLICY",
+    )
+    # Lag after which the disconnect policy drops a client
+    websocket_max_lag_seconds: float = Field(default=30.0, validation_alias="WEBSOCKET_MAX_LAG_SECONDS")
+
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=False, extra="ignore")
+
+
+class EventBusSettings(BaseSettings):
+    """In-process event bus queueing and dispatch settings"""
+
+    event_bus_max_queue_size: int = Field(default=1000, validation_alias="EVENT_BUS_MAX_QUEUE_SIZE")
+    # Events dispatched per wakeup; handlers get one task per batch instead of one per event
+    event_bus_batch_size: int = Field(default=100, validation_alias="EVENT_BUS_BATCH_SIZE")
+    event_bus_max_concurrent_handlers: int = Field(
+        default=32, validation_alias="EVENT_BUS_MAX_CONCURRENT_HANDLERS"
+    )
+    # Comma-separated "latest wins" event types; a newer event replaces a pending
+    # older one for the same device (and container/drive) instead of queueing
+    event_bus_conflate_event_types: str = Field(
+        default="metric_collected,container_status", validation_alias="EVENT_BUS_CONFLATE_EVENT_TYPES"
+    )
+    # Bridge events between processes: "memory" (single process) or "redis_streams"
+    event_bus_transport: str = Field(
+        default="memory", pattern="^(memory|redis_streams)$", validation_alias="EVENT_BUS_TRANSPORT"
+    )
+    event_bus_redis_stream: str = Field(default="infrastructor:events", validation_alias="EVENT_BUS_REDIS_STREAM")
+    event_bus_redis_stream_maxlen: int = Field(default=10000, validation_alias="EVENT_BUS_REDIS_STREAM_MAXLEN")
+    # Empty: no consumer group, every process sees every event.
+    # Set: processes sharing the name split the events between them.
+    event_bus_consumer_group: str = Field(default="", validation_alias="EVENT_BUS_CONSUMER_GROUP")
+    # Comma-separated event types kept in the emitting process, never bridged
+    event_bus_local_event_types: str = Field(
+        default="data_collected", validation_alias="EVENT_BUS_LOCAL_EVENT_TYPES"
+    )
 
     model_config = SettingsConfigDict(env_file=".env", case_sensitive=False, extra="ignore")
 
@@ -112,6 +161,11 @@ class SSHSettings(BaseSettings):
     ssh_max_retries: int = Field(default=3, validation_alias="SSH_MAX_RETRIES")
     ssh_retry_delay: int = Field(default=5, validation_alias="SSH_RETRY_DELAY")
     ssh_max_connections_per_host: int = Field(default=5, validation_alias="SSH_MAX_CONNECTIONS_PER_HOST")
+    ssh_max_channels_per_connection: int = Field(default=10, validation_alias="SSH_MAX_CHANNELS_PER_CONNECTION")
+    ssh_acquire_timeout: float = Field(default=30.0, validation_alias="SSH_ACQUIRE_TIMEOUT")
+    ssh_keepalive_interval: int = Field(default=30, validation_alias="SSH_KEEPALIVE_INTERVAL")
+    ssh_keepalive_count_max: int = Field(default=3, validation_alias="SSH_KEEPALIVE_COUNT_MAX")
+    ssh_liveness_grace_period: int = Field(default=60, validation_alias="SSH_LIVENESS_GRACE_PERIOD")
     ssh_key_path: str | None = Field(default=None, validation_alias="SSH_KEY_PATH")
 
     @property
@@ -130,6 +184,10 @@ class PollingSettings(BaseSettings):
     polling_system_metrics_interval: int = Field(default=300, validation_alias="POLLING_SYSTEM_METRICS_INTERVAL")
     polling_drive_health_interval: int = Field(default=3600, validation_alias="POLLING_DRIVE_HEALTH_INTERVAL")
     polling_max_concurrent_devices: int = Field(default=10, validation_alias="POLLING_MAX_CONCURRENT_DEVICES")
+    polling_jitter_ratio: float = Field(default=0.1, validation_alias="POLLING_JITTER_RATIO")
+
+    # Collect `docker ps` and `docker stats` for all containers in one SSH round-trip
+    polling_container_batch_stats: bool = Field(default=True, validation_alias="POLLING_CONTAINER_BATCH_STATS")
 
     # Startup timing settings to reduce SSH congestion
     polling_startup_delay: int = Field(default=30, validation_alias="POLLING_STARTUP_DELAY")
@@ -224,6 +282,21 @@ class APISettings(BaseSettings):
     cache_enabled: bool = Field(default=True, validation_alias="CACHE_ENABLED")
     cache_ttl: int = Field(default=300, validation_alias="CACHE_TTL")
     cache_max_size: int = Field(default=1000, validation_alias="CACHE_MAX_SIZE")
+    cache_l1_enabled: bool = Field(default=True, validation_alias="CACHE_L1_ENABLED")
+    cache_l1_max_size: int = Field(default=512, validation_alias="CACHE_L1_MAX_SIZE")
+    cache_l1_ttl: float = Field(default=5.0, validation_alias="CACHE_L1_TTL")
+    cache_eviction_mode: str = Field(
+        default="batched", pattern="^(tracked|batched|redis)$", validation_alias="CACHE_EVICTION_MODE"
+    )
+    cache_lru_flush_interval: float = Field(default=1.0, validation_alias="CACHE_LRU_FLUSH_INTERVAL")
+    cache_serializer: str = Field(
+        default="orjson", pattern="^(orjson|msgpack)$", validation_alias="CACHE_SERIALIZER"
+    )
+    cache_compression: str = Field(
+        default="none", pattern="^(none|zstd|lz4)$", validation_alias="CACHE_COMPRESSION"
+    )
+    cache_compression_threshold: int = Field(default=8192, validation_alias="CACHE_COMPRESSION_THRESHOLD")
+    cache_event_sync_enabled: bool = Field(default=True, validation_alias="CACHE_EVENT_SYNC_ENABLED")
 
     rate_limit_enabled: bool = Field(default=True, validation_alias="RATE_LIMIT_ENABLED")
     rate_limit_requests_per_minute: int = Field(default=100, validation_alias="RATE_LIMIT_REQUESTS_PER_MINUTE")
@@ -262,6 +335,9 @@ class GlancesSettings(BaseSettings):
     max_connections_per_device: int = Field(default=5, description="Max concurrent connections")
     retry_attempts: int = Field(default=3, description="Number of retry attempts")
     retry_delay: float = Field(default=1.0, description="Delay between retries in seconds")
+    use_all_endpoint: bool = Field(
+        default=True, description="Fetch all plugins with one /api/4/all request"
+    )
 
     model_config = SettingsConfigDict(env_file=".env", case_sensitive=False, extra="ignore")
 
@@ -288,6 +364,7 @@ class ApplicationSettings(BaseSettings):
     redis: RedisSettings = Field(default_factory=RedisSettings)
     mcp_server: MCPServerSettings = Field(default_factory=MCPServerSettings)
     websocket: WebSocketSettings = Field(default_factory=WebSocketSettings)
+    event_bus: EventBusSettings = Field(default_factory=EventBusSettings)
     ssh: SSHSettings = Field(default_factory=SSHSettings)
     polling: PollingSettings = Field(default_factory=PollingSettings)
     monitoring: MonitoringSettings = Field(default_factory=MonitoringSettings)
@@ -577,6 +577,205 @@ async def setup_compression_policies() -> dict:
     return results
 
 
+# Continuous aggregates (rollups) of system_metrics, keyed by bucket width.
+# Each rollup is built from the raw hypertable and refreshed by a TimescaleDB policy.
+SYSTEM_METRICS_ROLLUPS: dict[str, dict[str, str]] = {
+    "1m": {
+        "view": "system_metrics_1m",
+        "bucket": "1 minute",
+        "start_offset": "2 hours",
+        "end_offset": "1 minute",
+        "schedule_interval": "1 minute",
+    },
+    "5m": {
+        "view": "system_metrics_5m",
+        "bucket": "5 minutes",
+        "start_offset": "1 day",
+        "end_offset": "5 minutes",
+        "schedule_interval": "5 minutes",
+    },
+    "1h": {
+        "view": "system_metrics_1h",
+        "bucket": "1 hour",
+        "start_offset": "7 days",
+        "end_offset": "1 hour",
+        "schedule_interval": "30 minutes",
+    },
+    "1d": {
+        "view": "system_metrics_1d",
+        "bucket": "1 day",
+        "start_offset": "90 days",
+        "end_offset": "1 day",
+        "schedule_interval": "1 hour",
+    },
+}
+
+# Aggregated columns materialized by every system_metrics rollup
+SYSTEM_METRICS_ROLLUP_COLUMNS = """
+    avg(cpu_usage_percent) AS avg_cpu_usage,
+    max(cpu_usage_percent) AS max_cpu_usage,
+    min(cpu_usage_percent) AS min_cpu_usage,
+    avg(memory_usage_percent) AS avg_memory_usage,
+    max(memory_usage_percent) AS max_memory_usage,
+    min(memory_usage_percent) AS min_memory_usage,
+    avg(memory_total_bytes) AS avg_memory_total,
+    avg(memory_available_bytes) AS avg_memory_available,
+    avg(load_average_1m) AS avg_load_1m,
+    max(load_average_1m) AS max_load_1m,
+    avg(load_average_5m) AS avg_load_5m,
+    avg(load_average_15m) AS avg_load_15m,
+    avg(disk_usage_percent) AS avg_disk_usage,
+    max(disk_usage_percent) AS max_disk_usage,
+    avg(disk_total_bytes) AS avg_disk_total,
+    avg(disk_available_bytes) AS avg_disk_available,
+    sum(network_bytes_sent) AS total_network_sent,
+    sum(network_bytes_recv) AS total_network_recv,
+    avg(network_bytes_sent) AS avg_network_sent,
+    avg(network_bytes_recv) AS avg_network_recv,
+    avg(process_count) AS avg_process_count,
+    max(process_count) AS max_process_count,
+    avg(uptime_seconds) AS avg_uptime,
+    count(*) AS sample_count,
+    min(time) AS period_start,
+    max(time) AS period_end
+"""
+
+
+async def setup_continuous_aggregates() -> dict:
+    """
+    Set up continuous aggregates (1m/5m/1h/1d rollups) of system_metrics and
+    their refresh policies, used for downsampled historical queries. Newly
+    created rollups are backfilled with all existing history, which can take a
+    while on a large table, so run this after migrations rather than at startup.
+
+    Requires system_metrics to already be a hypertable (see create_hypertables).
+
+    Returns:
+        dict: Results of continuous aggregate setup
+    """
+    results: dict[str, Any] = {"created": [], "skipped": [], "errors": []}
+
+    try:
+        async with get_async_session() as session:
+            result = await session.execute(
+                text("""
+                    SELECT hypertable_name FROM timescaledb_information.hypertables
+                    WHERE hypertable_name = 'system_metrics'
+                """)
+            )
+            if not result.fetchone():
+                results["errors"].append("system_metrics is not a hypertable")
+                logger.warning("Skipping continuous aggregates: system_metrics is not a hypertable")
+                return results
+
+            for rollup in SYSTEM_METRICS_ROLLUPS.values():
+                view_name = rollup["view"]
+                try:
+                    # Check if continuous aggregate already exists
+                    result = await session.execute(
+                        text("""
+                            SELECT view_name FROM timescaledb_information.continuous_aggregates
+                            WHERE view_name = :view_name
+                        """),
+                        {"view_name": view_name},
+                    )
+
+                    if result.fetchone():
+                        results["skipped"].append(f"{view_name} (already exists)")
+                        continue
+
+                    # Create the rollup empty; history is backfilled below and the
+                    # refresh policy keeps the recent window materialized. Buckets newer
+                    # than end_offset are aggregated from raw rows at query time
+                    # (materialized_only = false, no longer the default in TimescaleDB 2.13+)
+                    await session.execute(
+                        text(f"""
+                            CREATE MATERIALIZED VIEW {view_name}
+                            WITH (
+                                timescaledb.continuous,
+                                timescaledb.materialized_only = false
+                            ) AS
+                            SELECT
+                                time_bucket(INTERVAL '{rollup["bucket"]}', time) AS bucket,
+                                device_id,
+                                {SYSTEM_METRICS_ROLLUP_COLUMNS}
+                            FROM system_metrics
+                            GROUP BY bucket, device_id
+                            WITH NO DATA
+                        """)
+                    )
+
+                    await session.execute(
+                        text(f"""
+                            SELECT add_continuous_aggregate_policy(
+                                '{view_name}',
+                                start_offset => INTERVAL '{rollup["start_offset"]}',
+                                end_offset => INTERVAL '{rollup["end_offset"]}',
+                                schedule_interval => INTERVAL '{rollup["schedule_interval"]}'
+                            )
+                        """)
+                    )
+
+                    await session.commit()
+                    results["created"].append(view_name)
+                    logger.info(f"Created continuous aggregate: {view_name}")
+
+                except Exception as e:
+                    results["errors"].append(f"{view_name}: {str(e)}")
+                    logger.error(f"Failed to create continuous aggregate {view_name}: {e}")
+                    await session.rollback()
+
+    except Exception as e:
+        logger.error(f"Failed to setup continuous aggregates: {e}")
+        results["errors"].append(f"General error: {str(e)}")
+
+    if results["created"]:
+        results["backfilled"] = await _backfill_continuous_aggregates(results["created"], results)
+
+    return results
+
+
+async def _backfill_continuous_aggregates(
+    view_names: list[str], results: dict[str, Any]
+) -> list[str]:
+    """
+    Materialize all existing history into newly created rollups.
+
+    The refresh policies only cover [now - start_offset, now - end_offset], so
+    without this an existing deployment would never see older buckets.
+    refresh_continuous_aggregate cannot run inside a transaction block, hence
+    the autocommit connection.
+    """
+    end_offsets = {
+        rollup["view"]: rollup["end_offset"] for rollup in SYSTEM_METRICS_ROLLUPS.values()
+    }
+    backfilled: list[str] = []
+
+    try:
+        async with get_async_engine().connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            for view_name in view_names:
+                try:
+                    await conn.execute(
+                        text(f"""
+                            CALL refresh_continuous_aggregate(
+                                '{view_name}', NULL, now() - INTERVAL '{end_offsets[view_name]}'
+                            )
+                        """)
+                    )
+                    backfilled.append(view_name)
+                    logger.info(f"Backfilled continuous aggregate: {view_name}")
+                except Exception as e:
+                    results["errors"].append(f"{view_name} backfill: {str(e)}")
+                    logger.error(f"Failed to backfill continuous aggregate {view_name}: {e}")
+
+    except Exception as e:
+        logger.error(f"Failed to backfill continuous aggregates: {e}")
+        results["errors"].append(f"Backfill error: {str(e)}")
+
+    return backfilled
+
+
 async def setup_retention_policies() -> dict:
     """
     Set up data retention policies for hypertables.
@@ -0,0 +1,452 @@
+"""
+Event Bus Transports
+
+Carry serialized events between EventBus instances in different processes,
+e.g. several uvicorn workers or the API and the MCP server, so an event
+emitted by polling in one process reaches WebSocket clients connected to
+another.
+
+Local delivery never goes through the transport: handlers in the emitting
+process receive the original event object. Only events crossing a process
+boundary are serialized.
+
+Transports:
+    - "memory" (default): single process, nothing is bridged
+    - "redis_streams": events are appended to a Redis stream and read back by
+      every other process
+"""
+
+import asyncio
+from collections import deque
+from collections.abc import Callable
+import contextlib
+import logging
+import os
+import socket
+import time
+from typing import Any, cast
+from uuid import uuid4
+
+import redis.asyncio as redis
+from redis.exceptions import ResponseError
+
+logger = logging.getLogger(__name__)
+
+# Receives the serialized event and returns whether it was accepted locally
+DeliverCallback = Callable[[bytes], bool]
+
+# XREAD/XREADGROUP reply: [(stream, [(entry ID, fields), ...]), ...]
+StreamEntries = list[tuple[bytes, dict[bytes, bytes]]]
+StreamReadResponse = list[tuple[bytes, StreamEntries]]
+
+TRANSPORTS = ("memory", "redis_streams")
+
+
+class EventTransport:
+    """
+    Base transport: bridges nothing, so the event bus stays process-local.
+
+    Subclasses publish serialized events to other processes and pass events
+    received from them to the deliver callback given to start().
+    """
+
+    name = "memory"
+
+    async def start(self, deliver: DeliverCallback) -> None:
+        """Start bridging; deliver is called for each event from another process"""
+
+    async def stop(self) -> None:
+        """Stop bridging and release connections"""
+
+    def publish(self, event_type: str, payload: bytes) -> None:
+        """Send a serialized event to other processes without blocking"""
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get transport statistics"""
+        return {"transport": self.name}
+
+
+class InMemoryTransport(EventTransport):
+    """Default transport for single-process deployments"""
+
+
+class RedisStreamTransport(EventTransport):
+    """
+    Bridges events through a Redis stream.
+
+    Every published event is appended (XADD, capped at maxlen) with its origin
+    and send time. Each process reads the stream either:
+
+    - Without consumer_group, with plain XREAD from the last entry it has
+      seen, so every process sees every event (fan-out, what WebSocket
+      workers need). Nothing is kept in Redis per process, so a crashed
+      worker leaves nothing behind.
+    - With consumer_group, through that consumer group: processes sharing
+      the name share the group and each event is delivered to only one of
+      them (work sharing).
+
+    A process skips the events it published itself, since its local
+    handlers already received them.
+    """
+
+    name = "redis_streams"
+
+    def __init__(
+        self,
+        redis_url: str,
+        stream: str = "infrastructor:events",
+        consumer_group: str | None = None,
+        maxlen: int = 10000,
+        read_batch_size: int = 100,
+        block_ms: int = 1000,
+        max_pending_publishes: int = 10000,
+        group_stats_interval: float = 10.0,
+        client: redis.Redis | None = None,
+    ):
+        """
+        Initialize the transport.
+
+        Args:
+            redis_url: Redis connection URL
+            stream: Stream key shared by all processes
+            consumer_group: Shared consumer group name, or None for fan-out to every process
+            maxlen: Approximate maximum stream length
+            read_batch_size: Entries read per XREAD/XREADGROUP call
+            block_ms: How long one read waits for new entries
+            max_pending_publishes: Events buffered for publishing before the oldest are dropped
+            group_stats_interval: Seconds between consumer group lag snapshots
+            client: Redis client to use instead of connecting to redis_url
+        """
+        self.redis_url = redis_url
+        self.stream = stream
+        self.origin = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self.consumer_group = consumer_group or None
+        self.maxlen = maxlen
+        self.read_batch_size = read_batch_size
+        self.block_ms = block_ms
+        self.group_stats_interval = group_stats_interval
+        self.client = client
+        self._owns_client = client is None
+
+        self._outbox: deque[tuple[str, bytes, float]] = deque(maxlen=max(1, max_pending_publishes))
+        self._outbox_ready = asyncio.Event()
+        self._deliver: DeliverCallback | None = None
+        # Fan-out read position: ID of the last entry seen, None until the first read
+        self._last_id: bytes | None = None
+        self._tasks: list[asyncio.Task] = []
+        # consumer group ("fanout" without one) -> [count, total seconds, max seconds]
+        # from publish to delivery
+        self._latency: dict[str, list[float]] = {}
+        # consumer group -> pending / lag / consumers, from the last XINFO GROUPS
+        self._groups: dict[str, dict[str, Any]] = {}
+        # Fan-out read position against the end of the stream, from the last XINFO STREAM
+        self._fanout_lag: dict[str, Any] = {}
+        self._stats = {
+            "published": 0,
+            "publish_failures": 0,
+            "publish_dropped": 0,
+            "received": 0,
+            "delivered": 0,
+            "rejected": 0,
+            "skipped_own": 0,
+            "read_failures": 0,
+        }
+
+    async def start(self, deliver: DeliverCallback) -> None:
+        """Connect, create the consumer group and start the publish/read loops"""
+        if self._tasks:
+            return
+
+        self._deliver = deliver
+        if self.client is None:
+            self.client = redis.from_url(
+                self.redis_url,
+                decode_responses=False,
+                socket_connect_timeout=5,
+                # Reads block for block_ms, so allow for that on top of the usual timeout
+                socket_timeout=5 + self.block_ms / 1000,
+                retry_on_timeout=True,
+                health_check_interval=30,
+            )
+
+        self._tasks = [
+            asyncio.create_task(self._publish_loop()),
+            asyncio.create_task(self._read_loop()),
+        ]
+        mode = f"consumer group {self.consumer_group}" if self.consumer_group else "fan-out"
+        logger.info(f"Event bus bridged through Redis stream {self.stream} ({mode})")
+
+    async def stop(self) -> None:
+        """Flush pending publishes and stop the loops"""
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._tasks = []
+
+        if self.client is None:
+            return
+        try:
+            await self._flush_outbox()
+        except Exception as e:
+            logger.warning(f"Error shutting down Redis event transport: {e}")
+        if self._owns_client:
+            with contextlib.suppress(Exception):
+                await self.client.aclose()
+            self.client = None
+
+    def publish(self, event_type: str, payload: bytes) -> None:
+        """Buffer an event for the publish loop; the oldest is dropped when full"""
+        if len(self._outbox) == self._outbox.maxlen:
+            self._stats["publish_dropped"] += 1
+        self._outbox.append((event_type, payload, time.time()))
+        self._outbox_ready.set()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get publish/delivery counters, delivery latency and consumer group lag"""
+        return {
+            "transport": self.name,
+            "stream": self.stream,
+            "origin": self.origin,
+            "consumer_group": self.consumer_group,
+            **self._stats,
+            "pending_publishes": len(self._outbox),
+            "delivery_latency_ms": {
+                group: {
+                    "count": int(count),
+                    "avg": round(total * 1000 / count, 3),
+                    "max": round(peak * 1000, 3),
+                }
+                for group, (count, total, peak) in self._latency.items()
+            },
+            "consumer_groups": {name: dict(info) for name, info in self._groups.items()},
+            "fanout_lag": dict(self._fanout_lag),
+        }
+
+    async def _publish_loop(self) -> None:
+        """Send buffered events in pipelined batches"""
+        while True:
+            await self._outbox_ready.wait()
+            self._outbox_ready.clear()
+            try:
+                await self._flush_outbox()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Dropped rather than retried: bridged events are live updates
+                logger.warning(f"Failed to publish events to Redis stream {self.stream}: {e}")
+                await asyncio.sleep(1.0)
+
+    async def _flush_outbox(self) -> None:
+        """XADD everything buffered in one pipeline"""
+        if not self._outbox:
+            return
+
+        batch = list(self._outbox)
+        self._outbox.clear()
+        pipeline = self._redis().pipeline(transaction=False)
+        for event_type, payload, sent_at in batch:
+            pipeline.xadd(
+                self.stream,
+                {"origin": self.origin, "type": event_type, "sent_at": repr(sent_at), "payload": payload},
+                maxlen=self.maxlen,
+                approximate=True,
+            )
+        try:
+            await pipeline.execute()
+        except Exception:
+            self._stats["publish_failures"] += len(batch)
+            raise
+        self._stats["published"] += len(batch)
+
+    async def _read_loop(self) -> None:
+        """Read the stream and deliver other processes' events"""
+        group_ready = False
+        next_group_stats = 0.0
+        while True:
+            try:
+                if self.consumer_group is None:
+                    response = await self._read_fanout()
+                else:
+                    if not group_ready:
+                        await self._ensure_group(self.consumer_group)
+                        group_ready = True
+                    response = await self._read_group(self.consumer_group)
+                for _, entries in response or []:
+                    await self._handle_entries(entries)
+
+                if time.monotonic() >= next_group_stats:
+                    await self._refresh_group_stats()
+                    next_group_stats = time.monotonic() + self.group_stats_interval
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # The group may be gone (stream deleted, Redis restarted); recreate it.
+                # Fan-out reads resume from the last entry seen.
+                self._stats["read_failures"] += 1
+                group_ready = False
+                logger.warning(f"Redis event transport read error, retrying: {e}")
+                await asyncio.sleep(1.0)
+
+    async def _read_fanout(self) -> StreamReadResponse:
+        """XREAD the entries after the last one seen, starting at the current end of the stream"""
+        client = self._redis()
+        if self._last_id is None:
+            # Not "$" on every call: entries added between two reads would be missed
+            latest = cast("StreamEntries", await client.xrevrange(self.stream, count=1))
+            self._last_id = latest[0][0] if latest else b"0-0"
+        return cast(
+            "StreamReadResponse",
+            await client.xread(
+                {self.stream: self._last_id}, count=self.read_batch_size, block=self.block_ms
+            ),
+        )
+
+    async def _read_group(self, consumer_group: str) -> StreamReadResponse:
+        """XREADGROUP the entries not yet delivered to the consumer group"""
+        return cast(
+            "StreamReadResponse",
+            await self._redis().xreadgroup(
+                consumer_group,
+                self.origin,
+                {self.stream: ">"},
+                count=self.read_batch_size,
+                block=self.block_ms,
+            ),
+        )
+
+    async def _ensure_group(self, consumer_group: str) -> None:
+        """Create the consumer group at the end of the stream if it does not exist"""
+        try:
+            await self._redis().xgroup_create(self.stream, consumer_group, id="$", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def _handle_entries(self, entries: StreamEntries) -> None:
+        """Deliver a batch of stream entries and acknowledge them in a consumer group"""
+        deliver = self._deliver
+        assert deliver is not None, "entries are only read after start()"
+        now = time.time()
+        for entry_id, fields in entries:
+            self._stats["received"] += 1
+            # A malformed entry is rejected on its own; raising here would keep the
+            # read position before it and re-read the same batch forever
+            try:
+                if fields.get(b"origin", b"").decode() == self.origin:
+                    self._stats["skipped_own"] += 1
+                    continue
+
+                sent_at = float(fields.get(b"sent_at", now))
+                self._record_latency(max(0.0, now - sent_at))
+                delivered = deliver(fields[b"payload"])
+            except Exception as e:
+                logger.warning(f"Rejecting malformed stream entry {_text(entry_id)}: {e}")
+                delivered = False
+
+            if delivered:
+                self._stats["delivered"] += 1
+            else:
+                self._stats["rejected"] += 1
+
+        if not entries:
+            return
+        if self.consumer_group is None:
+            self._last_id = entries[-1][0]
+        else:
+            await self._redis().xack(
+                self.stream, self.consumer_group, *[entry_id for entry_id, _ in entries]
+            )
+
+    def _redis(self) -> redis.Redis:
+        """Client given to the constructor or connected by start()"""
+        assert self.client is not None, "transport is not started"
+        return self.client
+
+    def _record_latency(self, seconds: float) -> None:
+        stats = self._latency.setdefault(self.consumer_group or "fanout", [0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += seconds
+        stats[2] = max(stats[2], seconds)
+
+    async def _refresh_group_stats(self) -> None:
+        """Snapshot pending entries and lag of every consumer group on the stream
+
+        Fan-out readers have no group on the server, so their own lag is
+        snapshotted too.
+        """
+        if self.consumer_group is None:
+            await self._refresh_fanout_lag()
+        try:
+            groups = await self._redis().xinfo_groups(self.stream)
+        except ResponseError:
+            # Fan-out readers do not create the stream; nothing published yet
+            groups = []
+        self._groups = {
+            _text(group["name"]): {
+                "consumers": group.get("consumers", 0),
+                "pending": group.get("pending", 0),
+                # Entries not yet delivered to the group (Redis 7+)
+                "lag": group.get("lag"),
+            }
+            for group in groups
+        }
+
+    async def _refresh_fanout_lag(self) -> None:
+        """Compare the fan-out read position with the newest entry of the stream
+
+        lag_ms is the gap between the millisecond parts of the two entry IDs,
+        i.e. how much older the last entry read is than the newest one.
+        """
+        if self._last_id is None:
+            return
+        try:
+            info = await self._redis().xinfo_stream(self.stream)
+        except ResponseError:
+            # Stream not created yet: nothing published, nothing to read
+            return
+        last_generated = _text(info["last-generated-id"])
+        last_read = _text(self._last_id)
+        self._fanout_lag = {
+            "last_read_id": last_read,
+            "last_generated_id": last_generated,
+            "caught_up": last_read == last_generated,
+            "lag_ms": max(0, _id_millis(last_generated) - _id_millis(last_read)),
+        }
+
+
+def _text(value: bytes | str) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _id_millis(entry_id: str) -> int:
+    """Millisecond timestamp part of a stream entry ID ("<ms>-<seq>")"""
+    return int(entry_id.split("-", 1)[0])
+
+
+def create_event_transport(
+    transport: str,
+    redis_url: str,
+    stream: str = "infrastructor:events",
+    consumer_group: str | None = None,
+    maxlen: int = 10000,
+) -> EventTransport:
+    """
+    Build the transport selected in settings.
+
+    Args:
+        transport: 'memory' or 'redis_streams'
+        redis_url: Redis connection URL for the redis_streams transport
+        stream: Stream key
+        consumer_group: Shared consumer group, or None/empty for fan-out to every process
+        maxlen: Approximate maximum stream length
+
+    Returns:
+        Event transport
+    """
+    if transport == "redis_streams":
+        return RedisStreamTransport(redis_url, stream, consumer_group or None, maxlen)
+    if transport != "memory":
+        raise ValueError(f"Unknown event bus transport {transport!r}, expected one of {TRANSPORTS}")
+    return InMemoryTransport()
@@ -6,14 +6,24 @@ particularly connecting polling service data collection to WebSocket broadcastin
 """
 
 import asyncio
-from collections.abc import Awaitable, Callable
+from collections.abc import Awaitable, Callable, Hashable, Iterable
 import contextlib
+from dataclasses import dataclass
 from datetime import UTC, datetime
 import logging
+import time
 from typing import Any
 from uuid import UUID, uuid4
 
-from pydantic import BaseModel, Field
+import orjson
+from pydantic import BaseModel, Field, ValidationError
+
+from apps.backend.src.core.config import get_settings
+from apps.backend.src.core.event_transport import (
+    EventTransport,
+    InMemoryTransport,
+    create_event_transport,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -90,27 +100,105 @@ class DriveHealthEvent(BaseEvent):
     serial_number: str | None = None
 
 
+class DataCollectedEvent(BaseEvent):
+    """Event emitted when the unified data collection service completes a collection"""
+
+    event_type: str = "data_collected"
+    device_id: UUID
+    data_type: str
+    data: dict[str, Any]
+    correlation_id: str | None = None
+    cache_ttl: int | None = None
+    # Whether the publisher already stored data in the cache itself
+    cached: bool = False
+
+
+# Event classes by event_type, for rebuilding events received from other processes
+EVENT_CLASSES: dict[str, type[BaseEvent]] = {
+    event_class.model_fields["event_type"].default: event_class
+    for event_class in (
+        MetricCollectedEvent,
+        DeviceStatusChangedEvent,
+        ContainerStatusEvent,
+        DriveHealthEvent,
+        DataCollectedEvent,
+    )
+}
+
+# Metadata flag set on events received from another process through the transport
+BRIDGED_METADATA_KEY = "bridged"
+
+# Event types kept in the emitting process by default: data_collected carries the
+# full collected payload and only feeds that process's cache
+LOCAL_EVENT_TYPES = frozenset({"data_collected"})
+
+
+def is_bridged(event: BaseEvent) -> bool:
+    """Whether an event was emitted in another process"""
+    return bool(event.metadata.get(BRIDGED_METADATA_KEY))
+
+
+# Event fields that, with the event type, identify what a conflated event reports on
+CONFLATION_KEY_FIELDS = ("device_id", "container_id", "drive_name")
+
+
+def conflation_key(event: BaseEvent) -> tuple[Hashable, ...]:
+    """Key under which a newer event supersedes a pending older one"""
+    return (event.event_type, *(getattr(event, name, None) for name in CONFLATION_KEY_FIELDS))
+
+
+@dataclass(slots=True)
+class QueuedEvent:
+    """An event waiting in the EventBus queue"""
+
+    event: BaseEvent
+    queued_at: float
+    # Conflation key, set for conflatable events
+    key: tuple[Hashable, ...] | None = None
+    # Set once the processing loop has taken the event off the queue
+    taken: bool = False
+
+
 class EventHandler:
-    """Wrapper for event handler functions with metadata"""
+    """
+    Wrapper for event handler functions with metadata
+
+    Batch handlers take a list of events instead of a single event and are
+    called once per dispatched batch.
+    """
 
     def __init__(
         self,
-        handler: Callable[[BaseEvent], Awaitable[None]],
+        handler: Callable[[Any], Awaitable[None]],
         event_types: list[str],
-        priority: int = 0
+        priority: int = 0,
+        batch: bool = False,
     ):
         self.handler = handler
         self.event_types = set(event_types)
         self.priority = priority
+        self.batch = batch
         self.handler_id = str(uuid4())
 
     async def handle(self, event: BaseEvent) -> None:
         """Execute the handler function"""
         try:
-            await self.handler(event)
+            await self.handler([event] if self.batch else event)
         except Exception as e:
             logger.error(f"Event handler {self.handler_id} failed: {e}", exc_info=True)
 
+    async def handle_batch(self, events: list[BaseEvent]) -> None:
+        """Execute the handler for events in order, in a single call for batch handlers"""
+        if not self.batch:
+            for event in events:
+                await self.handle(event)
+            return
+
+        try:
+            await self.handler(events)
+        except Exception as e:
+            logger.error(f"Event handler {self.handler_id} failed on batch of {len(events)}: {e}", exc_info=True)
+
     def matches_event(self, event: BaseEvent) -> bool:
         """Check if this handler should process the given event"""
         return event.event_type in self.event_types
@@ -125,19 +213,69 @@ class EventBus:
     - Topic-based event routing
     - Priority-based handler execution
     - Bounded queue to prevent memory issues
+    - Drain-batch dispatch: up to batch_size queued events are taken per
+      wakeup and each handler gets one task per batch, not one per event
+    - Bounded handler concurrency
+    - Queue-wait latency per event type
+    - Optional latest-value conflation: for conflate_event_types, a newer
+      event replaces a pending older one with the same conflation_key()
+      instead of taking another queue slot
+    - Pluggable transport bridging events to event buses in other processes;
+      local handlers always get the original object, only the bridged copy
+      is serialized. local_event_types are never bridged
     - Graceful error handling
     """
 
-    def __init__(self, max_queue_size: int = 1000):
+    def __init__(
+        self,
+        max_queue_size: int = 1000,
+        batch_size: int = 100,
+        max_concurrent_handlers: int = 32,
+        conflate_event_types: Iterable[str] | None = None,
+        transport: EventTransport | None = None,
+        local_event_types: Iterable[str] | None = None,
+    ):
+        """
+        Initialize the event bus.
+
+        Args:
+            max_queue_size: Maximum number of queued events before emission fails
+            batch_size: Maximum number of events dispatched per wakeup
+            max_concurrent_handlers: Maximum number of handler tasks running at once
+            conflate_event_types: "Latest wins" event types whose pending events
+                are replaced by newer ones (none by default)
+            transport: Bridge to other processes (process-local by default)
+            local_event_types: Event types the transport does not carry
+                (LOCAL_EVENT_TYPES by default)
+        """
         self._handlers: dict[str, list[EventHandler]] = {}
-        self._event_queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self._event_queue: asyncio.Queue[QueuedEvent] = asyncio.Queue(maxsize=max_queue_size)
+        self.conflate_event_types = frozenset(conflate_event_types or ())
+        self.transport = transport or InMemoryTransport()
+        self._bridged = not isinstance(self.transport, InMemoryTransport)
+        self.local_event_types = frozenset(
+            LOCAL_EVENT_TYPES if local_event_types is None else local_event_types
+        )
+        # Pending conflatable events by conflation key; replaced in place while queued
+        self._pending: dict[tuple[Hashable, ...], QueuedEvent] = {}
         self._processor_task: asyncio.Task | None = None
+        # Batch the processing loop has taken and is dispatching, if any
+        self._current_batch: list[QueuedEvent] | None = None
         self._running = False
         self._handler_tasks: set[asyncio.Task] = set()
+        self.batch_size = max(1, batch_size)
+        self.max_concurrent_handlers = max(1, max_concurrent_handlers)
+        self._handler_slots = asyncio.Semaphore(self.max_concurrent_handlers)
+        # event_type -> [count, total seconds, max seconds] spent queued
+        self._queue_wait: dict[str, list[float]] = {}
         self._stats = {
             "events_processed": 0,
             "events_failed": 0,
             "events_dropped": 0,
+            "events_conflated": 0,
+            "events_bridged_in": 0,
+            "events_bridged_failed": 0,
+            "batches_processed": 0,
             "handlers_count": 0,
             "active_handler_tasks": 0
         }
@@ -150,6 +288,7 @@ class EventBus:
 
         self._running = True
         self._processor_task = asyncio.create_task(self._process_events())
+        await self.transport.start(self._receive_bridged)
         logger.info("Event bus started")
 
     async def stop(self) -> None:
@@ -159,26 +298,56 @@ class EventBus:
 
         self._running = False
 
+        # Stop receiving from other processes before draining
+        try:
+            await self.transport.stop()
+        except Exception as e:
+            logger.error(f"Error stopping event transport: {e}")
+
         if self._processor_task:
-            self._processor_task.cancel()
-            with contextlib.suppress(asyncio.CancelledError):
-                await self._processor_task
+            await self._stop_processor()
 
         # Process remaining events
         while not self._event_queue.empty():
             try:
-                event = self._event_queue.get_nowait()
-                await self._process_single_event(event)
-            except asyncio.QueueEmpty:
-                break
+                await self._dispatch_batch(self._take_batch())
             except Exception as e:
-                logger.error(f"Error processing remaining event: {e}")
+                logger.error(f"Error processing remaining events: {e}")
+
+        # Give handlers of the drained events a moment to finish
+        if self._handler_tasks:
+            await asyncio.wait(set(self._handler_tasks), timeout=1.0)
 
         # Cancel and cleanup remaining handler tasks
         await self._cleanup_handler_tasks()
 
         logger.info("Event bus stopped")
 
+    async def _stop_processor(self, timeout: float = 5.0) -> None:
+        """
+        Stop the processing loop without losing the batch it has taken
+
+        An idle loop is only waiting on the queue and is cancelled. A loop in
+        the middle of a batch (e.g. waiting for a handler slot) finishes it and
+        exits; if that takes longer than timeout, the rest of the batch is
+        counted as dropped.
+        """
+        task = self._processor_task
+        self._processor_task = None
+        if task is None:
+            return
+        if self._current_batch is not None:
+            done, _ = await asyncio.wait({task}, timeout=timeout)
+            if done:
+                return
+            batch = self._current_batch or []
+            self._stats["events_dropped"] += len(batch)
+            logger.warning(f"Dropping {len(batch)} events still being dispatched at shutdown")
+
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
     def subscribe(
         self,
         event_types: str | list[str],
@@ -196,10 +365,35 @@ class EventBus:
         Returns:
             Handler ID for unsubscribing
         """
-        if isinstance(event_types, str):
-            event_types = [event_types]
+        return self._add_handler(EventHandler(handler, _event_type_list(event_types), priority))
 
-        event_handler = EventHandler(handler, event_types, priority)
+    def subscribe_batch(
+        self,
+        event_types: str | list[str],
+        handler: Callable[[list[BaseEvent]], Awaitable[None]],
+        priority: int = 0
+    ) -> str:
+        """
+        Subscribe a handler that receives events in batches
+
+        The handler is called once per dispatched batch with the matching
+        events in the order they were emitted.
+
+        Args:
+            event_types: Event type(s) to listen for
+            handler: Async function taking a list of events
+            priority: Handler priority (higher = executed first)
+
+        Returns:
+            Handler ID for unsubscribing
+        """
+        return self._add_handler(
+            EventHandler(handler, _event_type_list(event_types), priority, batch=True)
+        )
+
+    def _add_handler(self, event_handler: EventHandler) -> str:
+        """Register a handler for each of its event types"""
+        event_types = sorted(event_handler.event_types)
 
         for event_type in event_types:
             if event_type not in self._handlers:
@@ -255,10 +449,20 @@ class EventBus:
             event: Event to emit
             
         Returns:
-            True if event was queued, False if queue is full
+            True if event was queued (or replaced a pending one), False if queue is full
         """
+        self._publish(event)
+        return self._enqueue_nowait(event)
+
+    def _enqueue_nowait(self, event: BaseEvent) -> bool:
+        """Queue an event for local handlers only"""
+        if self._conflate(event):
+            return True
+
+        queued = self._queued(event)
         try:
-            self._event_queue.put_nowait(event)
+            self._event_queue.put_nowait(queued)
+            self._track_pending(queued)
             logger.debug(f"Event {event.event_type} queued: {event.event_id}")
             return True
         except asyncio.QueueFull:
@@ -275,13 +479,16 @@ class EventBus:
             timeout: Maximum time to wait for queue space
             
         Returns:
-            True if event was queued
+            True if event was queued (or replaced a pending one)
         """
+        self._publish(event)
+        if self._conflate(event):
+            return True
+
         try:
-            await asyncio.wait_for(
-                self._event_queue.put(event),
-                timeout=timeout
-            )
+            queued = self._queued(event)
+            await asyncio.wait_for(self._event_queue.put(queued), timeout=timeout)
+            self._track_pending(queued)
             logger.debug(f"Event {event.event_type} queued: {event.event_id}")
             return True
         except TimeoutError:
@@ -289,6 +496,62 @@ class EventBus:
             logger.warning(f"Event queue timeout, dropping event: {event.event_type}")
             return False
 
+    def _publish(self, event: BaseEvent) -> None:
+        """Hand a locally emitted event to the transport, serialized once"""
+        if not self._bridged or is_bridged(event) or event.event_type in self.local_event_types:
+            return
+        try:
+            payload = orjson.dumps(event.model_dump(), default=str, option=orjson.OPT_NON_STR_KEYS)
+        except Exception as e:
+            logger.error(f"Failed to serialize {event.event_type} event for the transport: {e}")
+            return
+        self.transport.publish(event.event_type, payload)
+
+    def _receive_bridged(self, payload: bytes) -> bool:
+        """Queue an event received from another process for local handlers"""
+        try:
+            data = orjson.loads(payload)
+            event_class = EVENT_CLASSES[data["event_type"]]
+            event = event_class.model_validate(data)
+        except (orjson.JSONDecodeError, KeyError, TypeError, ValidationError) as e:
+            self._stats["events_bridged_failed"] += 1
+            logger.warning(f"Dropping undecodable bridged event: {e}")
+            return False
+
+        event.metadata[BRIDGED_METADATA_KEY] = True
+        self._stats["events_bridged_in"] += 1
+        return self._enqueue_nowait(event)
+
+    def _conflate(self, event: BaseEvent) -> bool:
+        """Replace a pending event with the same conflation key, True if one was replaced"""
+        if event.event_type not in self.conflate_event_types:
+            return False
+
+        key = conflation_key(event)
+        pending = self._pending.get(key)
+        if pending is None:
+            return False
+        if pending.taken:
+            # Tracked after the processing loop already took it (emit() with a full queue)
+            del self._pending[key]
+            return False
+
+        pending.event = event
+        pending.queued_at = time.monotonic()
+        self._stats["events_conflated"] += 1
+        logger.debug(f"Event {event.event_type} conflated into pending event: {event.event_id}")
+        return True
+
+    def _queued(self, event: BaseEvent) -> QueuedEvent:
+        """Wrap an event for the queue, keyed if it is conflatable"""
+        key = conflation_key(event) if event.event_type in self.conflate_event_types else None
+        return QueuedEvent(event, time.monotonic(), key)
+
+    def _track_pending(self, queued: QueuedEvent) -> None:
+        """Make a queued conflatable event replaceable until it is taken"""
+        if queued.key is not None:
+            self._pending[queued.key] = queued
+
     async def _process_events(self) -> None:
         """Main event processing loop"""
         logger.info("Event processing loop started")
@@ -296,16 +559,14 @@ class EventBus:
         try:
             while self._running:
                 try:
-                    # Wait for events with timeout to allow graceful shutdown
-                    event = await asyncio.wait_for(
-                        self._event_queue.get(),
-                        timeout=1.0
-                    )
-                    await self._process_single_event(event)
-
-                except TimeoutError:
-                    # Normal timeout for shutdown checking
-                    continue
+                    # Block for one event, then take whatever else is already queued
+                    first = await self._event_queue.get()
+                    self._current_batch = self._take_batch(first)
+                    try:
+                        await self._dispatch_batch(self._current_batch)
+                    finally:
+                        self._current_batch = None
+
                 except Exception as e:
                     logger.error(f"Error in event processing loop: {e}", exc_info=True)
                     await asyncio.sleep(0.1)  # Brief pause on error
@@ -316,38 +577,83 @@ class EventBus:
         finally:
             logger.info("Event processing loop stopped")
 
-    async def _process_single_event(self, event: BaseEvent) -> None:
-        """Process a single event by calling all matching handlers"""
-        handlers = self._handlers.get(event.event_type, [])
+    def _take_batch(self, first: QueuedEvent | None = None) -> list[QueuedEvent]:
+        """Take up to batch_size queued events without waiting"""
+        batch = [first] if first is not None else []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._event_queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
 
-        if not handlers:
-            logger.debug(f"No handlers for event type: {event.event_type}")
-            return
+        # Taken events can no longer be replaced; newer ones queue again
+        for queued in batch:
+            queued.taken = True
+            if queued.key is not None and self._pending.get(queued.key) is queued:
+                del self._pending[queued.key]
+        return batch
 
-        logger.debug(f"Processing event {event.event_type} with {len(handlers)} handlers")
+    async def _dispatch_batch(self, batch: list[QueuedEvent]) -> None:
+        """
+        Deliver a batch of queued events to their handlers
 
-        # Execute handlers concurrently but don't wait for completion
-        handler_tasks = []
-        for handler in handlers:
-            task = asyncio.create_task(handler.handle(event))
-            # Add cleanup callback to remove task from tracking when done
-            task.add_done_callback(self._remove_handler_task)
-            handler_tasks.append(task)
+        Each handler gets one task for all of its events in the batch. Tasks are
+        started in priority order, waiting for a free slot when
+        max_concurrent_handlers are already running; they are not awaited.
+        """
+        now = time.monotonic()
+        handler_events: dict[str, tuple[EventHandler, list[BaseEvent]]] = {}
+        handled = 0
 
-        # Track handler tasks for lifecycle management
-        self._handler_tasks.update(handler_tasks)
-        self._stats["active_handler_tasks"] = len(self._handler_tasks)
+        for queued in batch:
+            event = queued.event
+            self._record_queue_wait(event.event_type, now - queued.queued_at)
+
+            handlers = self._handlers.get(event.event_type, [])
+            if not handlers:
+                logger.debug(f"No handlers for event type: {event.event_type}")
+                continue
+
+            handled += 1
+            for handler in handlers:
+                handler_events.setdefault(handler.handler_id, (handler, []))[1].append(event)
+
+        if not handler_events:
+            return
+
+        logger.debug(f"Dispatching {handled} events to {len(handler_events)} handlers")
 
-        # Fire and forget - don't wait for completion to avoid blocking
-        # Log any immediate failures but don't propagate them
         try:
-            # Give handlers a brief moment to start
-            await asyncio.sleep(0)
-            self._stats["events_processed"] += 1
+            for handler, events in sorted(
+                handler_events.values(), key=lambda item: item[0].priority, reverse=True
+            ):
+                await self._handler_slots.acquire()
+                task = asyncio.create_task(self._run_handler(handler, events))
+                # Add cleanup callback to remove task from tracking when done
+                task.add_done_callback(self._remove_handler_task)
+                self._handler_tasks.add(task)
+
+            self._stats["active_handler_tasks"] = len(self._handler_tasks)
+            self._stats["events_processed"] += handled
+            self._stats["batches_processed"] += 1
         except Exception as e:
-            self._stats["events_failed"] += 1
+            self._stats["events_failed"] += handled
             logger.error(f"Error starting event handlers: {e}")
 
+    async def _run_handler(self, handler: EventHandler, events: list[BaseEvent]) -> None:
+        """Run a handler on its events, holding a concurrency slot"""
+        try:
+            await handler.handle_batch(events)
+        finally:
+            self._handler_slots.release()
+
+    def _record_queue_wait(self, event_type: str, seconds: float) -> None:
+        """Record how long an event waited in the queue"""
+        wait = self._queue_wait.setdefault(event_type, [0, 0.0, 0.0])
+        wait[0] += 1
+        wait[1] += seconds
+        wait[2] = max(wait[2], seconds)
+
     def _remove_handler_task(self, task: asyncio.Task) -> None:
         """Remove completed handler task from tracking set"""
         self._handler_tasks.discard(task)
@@ -385,7 +691,20 @@ class EventBus:
             "queue_size": self._event_queue.qsize(),
             "max_queue_size": self._event_queue.maxsize,
             "is_running": self._running,
-            "event_types": list(self._handlers.keys())
+            "event_types": list(self._handlers.keys()),
+            "batch_size": self.batch_size,
+            "max_concurrent_handlers": self.max_concurrent_handlers,
+            "conflate_event_types": sorted(self.conflate_event_types),
+            "pending_conflatable": len(self._pending),
+            "transport": self.transport.get_stats(),
+            "queue_wait_ms": {
+                event_type: {
+                    "count": int(count),
+                    "avg": round(total * 1000 / count, 3),
+                    "max": round(peak * 1000, 3),
+                }
+                for event_type, (count, total, peak) in self._queue_wait.items()
+            },
         }
 
     def is_running(self) -> bool:
@@ -393,6 +712,11 @@ class EventBus:
         return self._running
 
 
+def _event_type_list(event_types: str | list[str]) -> list[str]:
+    """Normalize a single event type or a list of them to a list"""
+    return [event_types] if isinstance(event_types, str) else list(event_types)
+
+
 # Global event bus instance
 _event_bus: EventBus | None = None
 
@@ -401,7 +725,29 @@ def get_event_bus() -> EventBus:
     """Get the global event bus instance"""
     global _event_bus
     if _event_bus is None:
-        _event_bus = EventBus()
+        settings = get_settings().event_bus
+        _event_bus = EventBus(
+            max_queue_size=settings.event_bus_max_queue_size,
+            batch_size=settings.event_bus_batch_size,
+            max_concurrent_handlers=settings.event_bus_max_concurrent_handlers,
+            conflate_event_types=[
+                event_type.strip()
+                for event_type in settings.event_bus_conflate_event_types.split(",")
+                if event_type.strip()
+            ],
+            transport=create_event_transport(
+                settings.event_bus_transport,
+                get_settings().redis.redis_url,
+                stream=settings.event_bus_redis_stream,
+                consumer_group=settings.event_bus_consumer_group,
+                maxlen=settings.event_bus_redis_stream_maxlen,
+            ),
+            local_event_types=[
+                event_type.strip()
+                for event_type in settings.event_bus_local_event_types.split(",")
+                if event_type.strip()
+            ],
+        )
     return _event_bus
 
 
@@ -0,0 +1,387 @@
+"""
+Infrastructure Management MCP Server - Write-Behind Ingestion Buffer
+
+Time-series rows produced by polling (system metrics, container snapshots, drive
+health and data collection audit records) are buffered in memory and written to
+TimescaleDB in multi-row INSERTs, instead of one session and commit per
+collection. Flushes are triggered by buffer size or elapsed time, and producers
+are made to wait when the buffer is full so a slow database throttles polling
+rather than growing memory without bound.
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.sql.expression import TableClause
+
+from .config import get_settings
+from .database import get_async_session_factory
+
+logger = logging.getLogger(__name__)
+
+# PostgreSQL accepts at most 32767 bind parameters per statement
+MAX_BIND_PARAMETERS = 32767
+
+# Upper bound for the delay between retries of a failed write
+MAX_RETRY_BACKOFF = 30.0
+
+
+def model_to_row(instance: Any) -> dict[str, Any]:
+    """
+    Convert an ORM instance into a column -> value mapping for a bulk INSERT.
+
+    Unset columns that have a default are omitted so the column default applies.
+    """
+    row: dict[str, Any] = {}
+    for column in instance.__table__.columns:
+        value = getattr(instance, column.key, None)
+        if value is None and (column.default is not None or column.server_default is not None):
+            continue
+        row[column.name] = value
+    return row
+
+
+class IngestionBuffer:
+    """
+    Bounded write-behind buffer flushed to the database in batches.
+
+    Rows are grouped per table and written with one multi-row INSERT per chunk,
+    in one transaction per table per flush. A chunk that violates a constraint
+    is split until the offending rows are isolated, so only those are dropped.
+    Any other failure (database restart, lost connection, pool timeout) puts
+    the rows back at the head of the buffer; they are retried with backoff and
+    only dropped after `max_write_attempts` failed writes.
+    A flush runs when `batch_size` rows
+    are pending or `flush_interval` seconds have passed. Rows count against
+    `max_pending_rows` until they have been written, so `add()` blocks while the
+    database is behind.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+        batch_size: int = 500,
+        flush_interval: float = 2.0,
+        max_pending_rows: int = 10000,
+        max_write_attempts: int = 3,
+        retry_backoff: float = 1.0,
+    ):
+        """
+        Initialize the ingestion buffer.
+
+        Args:
+            session_factory: Session factory used for writes (defaults to the global one)
+            batch_size: Pending row count that triggers an immediate flush
+            flush_interval: Maximum seconds a row waits before being flushed
+            max_pending_rows: Buffered plus in-flight rows at which producers must wait
+            max_write_attempts: Failed writes of a table's rows before they are dropped
+            retry_backoff: Seconds before the first retry, doubled for each further one
+        """
+        self._session_factory = session_factory
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_pending_rows = max(self.batch_size, max_pending_rows)
+        self.max_write_attempts = max(1, max_write_attempts)
+        self.retry_backoff = retry_backoff
+
+        # table name -> (table, rows)
+        self._pending: dict[str, tuple[TableClause, list[dict[str, Any]]]] = {}
+        self._pending_rows = 0
+        self._in_flight_rows = 0
+        # table name -> consecutive failed writes of its buffered rows
+        self._write_attempts: dict[str, int] = {}
+
+        self._flush_requested = asyncio.Event()
+        self._space_available = asyncio.Event()
+        self._space_available.set()
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: asyncio.Task | None = None
+        self._closed = False
+
+        self._stats: dict[str, Any] = {
+            "rows_buffered": 0,
+            "rows_written": 0,
+            "rows_failed": 0,
+            "rows_rejected": 0,
+            "statements": 0,
+            "flushes": 0,
+            "flush_failures": 0,
+            "write_retries": 0,
+            "last_flush_seconds": 0.0,
+            "total_flush_seconds": 0.0,
+            "backpressure_waits": 0,
+            "backpressure_wait_seconds": 0.0,
+        }
+        self._rows_written_by_table: dict[str, int] = {}
+
+    @property
+    def occupancy(self) -> int:
+        """Rows buffered or currently being written"""
+        return self._pending_rows + self._in_flight_rows
+
+    def is_running(self) -> bool:
+        """Check if the background flush task is running"""
+        return self._flush_task is not None and not self._flush_task.done()
+
+    async def start(self) -> None:
+        """Start the background flush task"""
+        if self.is_running():
+            return
+        self._closed = False
+        self._flush_task = asyncio.create_task(self._flush_loop())
+        logger.info("Ingestion buffer started")
+
+    async def _flush_loop(self) -> None:
+        """Flush on size trigger or after flush_interval"""
+        while not self._closed:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=self.flush_interval)
+            self._flush_requested.clear()
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in ingestion flush loop: {e}")
+            # Back off while a failed write waits to be retried
+            await asyncio.sleep(self._retry_delay())
+
+    async def add(self, table: TableClause, rows: list[dict[str, Any]]) -> None:
+        """
+        Queue rows for a table, waiting while the buffer is full.
+
+        Args:
+            table: Target table (ORM `__table__` or lightweight `table()` clause)
+            rows: Column -> value mappings
+        """
+        if not rows:
+            return
+        if self._closed:
+            raise RuntimeError("Ingestion buffer is stopped")
+
+        if not self.is_running():
+            await self.start()
+
+        if self.occupancy >= self.max_pending_rows:
+            # Backpressure: hold the producer until a flush has made room
+            self._stats["backpressure_waits"] += 1
+            wait_started = time.monotonic()
+            self._flush_requested.set()
+            while self.occupancy >= self.max_pending_rows:
+                self._space_available.clear()
+                await self._space_available.wait()
+            self._stats["backpressure_wait_seconds"] += time.monotonic() - wait_started
+
+        _, table_rows = self._pending.setdefault(table.name, (table, []))
+        table_rows.extend(rows)
+        self._pending_rows += len(rows)
+        self._stats["rows_buffered"] += len(rows)
+
+        if self._pending_rows >= self.batch_size:
+            self._flush_requested.set()
+
+    async def add_models(self, instances: list[Any]) -> None:
+        """Queue ORM instances for insertion"""
+        by_table: dict[str, tuple[TableClause, list[dict[str, Any]]]] = {}
+        for instance in instances:
+            table = instance.__table__
+            by_table.setdefault(table.name, (table, []))[1].append(model_to_row(instance))
+        for table, rows in by_table.values():
+            await self.add(table, rows)
+
+    async def flush(self) -> int:
+        """
+        Write all buffered rows to the database.
+
+        Returns:
+            int: Number of rows written
+        """
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+
+            session_factory = self._session_factory or get_async_session_factory()
+            pending, self._pending = self._pending, {}
+            self._in_flight_rows, self._pending_rows = self._pending_rows, 0
+
+            started = time.monotonic()
+            written = 0
+            tables = list(pending.values())
+            try:
+                for index, (table, rows) in enumerate(tables):
+                    try:
+                        written += await self._write_table(session_factory, table, rows)
+                    except asyncio.CancelledError:
+                        # The open transaction is rolled back; keep its rows and the unwritten ones
+                        self._requeue(tables[index:])
+                        raise
+            finally:
+                self._in_flight_rows = 0
+                self._space_available.set()
+
+            elapsed = time.monotonic() - started
+            self._stats["flushes"] += 1
+            self._stats["last_flush_seconds"] = round(elapsed, 4)
+            self._stats["total_flush_seconds"] += elapsed
+            return written
+
+    def _retry_delay(self) -> float:
+        """Seconds to wait before retrying failed writes, 0 if none are pending"""
+        attempts = max(self._write_attempts.values(), default=0)
+        if not attempts:
+            return 0.0
+        return float(min(self.retry_backoff * 2 ** (attempts - 1), MAX_RETRY_BACKOFF))
+
+    def _requeue(self, tables: list[tuple[TableClause, list[dict[str, Any]]]]) -> None:
+        """Put rows taken by an interrupted flush back in front of the buffer"""
+        for table, rows in tables:
+            _, table_rows = self._pending.setdefault(table.name, (table, []))
+            table_rows[:0] = rows
+            self._pending_rows += len(rows)
+
+    async def _write_table(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        table: TableClause,
+        rows: list[dict[str, Any]],
+    ) -> int:
+        """Insert rows for one table in a single transaction"""
+        # A multi-row VALUES statement needs the same columns in every row
+        groups: dict[tuple[str, ...], list[dict[str, Any]]] = {}
+        for row in rows:
+            groups.setdefault(tuple(row), []).append(row)
+
+        try:
+            async with session_factory() as session:
+                written = 0
+                for columns, group in groups.items():
+                    chunk_size = max(1, MAX_BIND_PARAMETERS // max(1, len(columns)))
+                    for start in range(0, len(group), chunk_size):
+                        written += await self._insert_rows(session, table, group[start:start + chunk_size])
+                await session.commit()
+        except Exception as e:
+            self._write_failed(table, rows, e)
+            return 0
+
+        self._write_attempts.pop(table.name, None)
+        self._stats["rows_written"] += written
+        self._rows_written_by_table[table.name] = self._rows_written_by_table.get(table.name, 0) + written
+        return written
+
+    def _write_failed(self, table: TableClause, rows: list[dict[str, Any]], error: Exception) -> None:
+        """Requeue rows after a failed write, or drop them once out of attempts"""
+        self._stats["flush_failures"] += 1
+        attempts = self._write_attempts.get(table.name, 0) + 1
+        if attempts < self.max_write_attempts:
+            self._write_attempts[table.name] = attempts
+            self._stats["write_retries"] += 1
+            self._requeue([(table, rows)])
+            logger.warning(
+                f"Failed to write {len(rows)} buffered rows to {table.name} "
+                f"(attempt {attempts}/{self.max_write_attempts}), retrying: {error}"
+            )
+            return
+
+        self._write_attempts.pop(table.name, None)
+        self._stats["rows_failed"] += len(rows)
+        logger.error(
+            f"Dropping {len(rows)} buffered rows for {table.name} after "
+            f"{attempts} failed writes: {error}"
+        )
+
+    async def _insert_rows(self, session: AsyncSession, table: TableClause, rows: list[dict[str, Any]]) -> int:
+        """
+        Insert rows in a savepoint, bisecting around rows that violate a constraint.
+
+        A duplicate key or a reference to a deleted device only costs the rows
+        involved instead of the whole table's batch.
+
+        Returns:
+            int: Number of rows inserted
+        """
+        try:
+            async with session.begin_nested():
+                await session.execute(insert(table).values(rows))
+            return len(rows)
+        except IntegrityError as e:
+            if len(rows) == 1:
+                self._stats["rows_failed"] += 1
+                self._stats["rows_rejected"] += 1
+                logger.warning(f"Dropping buffered row rejected by {table.name}: {e.orig}")
+                return 0
+            middle = len(rows) // 2
+            return (
+                await self._insert_rows(session, table, rows[:middle])
+                + await self._insert_rows(session, table, rows[middle:])
+            )
+        finally:
+            self._stats["statements"] += 1
+
+    async def stop(self) -> None:
+        """Stop the flush task and write out any remaining rows"""
+        self._closed = True
+        if self._flush_task and not self._flush_task.done():
+            # Let a flush in progress finish instead of cancelling it mid-write
+            self._flush_requested.set()
+            await self._flush_task
+        self._flush_task = None
+        await self.flush()
+        # Rows requeued by a failed write get their remaining attempts
+        while self._pending:
+            await asyncio.sleep(self._retry_delay())
+            await self.flush()
+        logger.info("Ingestion buffer stopped")
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get ingestion buffer statistics"""
+        flushes = self._stats["flushes"]
+        return {
+            **self._stats,
+            "pending_rows": self._pending_rows,
+            "in_flight_rows": self._in_flight_rows,
+            "max_pending_rows": self.max_pending_rows,
+            "batch_size": self.batch_size,
+            "flush_interval": self.flush_interval,
+            "avg_flush_seconds": round(self._stats["total_flush_seconds"] / flushes, 4) if flushes else 0.0,
+            "rows_written_by_table": dict(self._rows_written_by_table),
+        }
+
+
+# Global ingestion buffer instance
+_ingestion_buffer: IngestionBuffer | None = None
+
+
+def get_ingestion_buffer() -> IngestionBuffer:
+    """Get the global ingestion buffer instance"""
+    global _ingestion_buffer
+    if _ingestion_buffer is None:
+        settings = get_settings()
+        _ingestion_buffer = IngestionBuffer(
+            batch_size=settings.database.db_ingest_batch_size,
+            flush_interval=settings.database.db_ingest_flush_interval,
+            max_pending_rows=settings.database.db_ingest_max_pending_rows,
+            max_write_attempts=settings.database.db_ingest_max_write_attempts,
+        )
+    return _ingestion_buffer
+
+
+async def initialize_ingestion_buffer() -> IngestionBuffer:
+    """Initialize and start the global ingestion buffer"""
+    ingestion_buffer = get_ingestion_buffer()
+    if not ingestion_buffer.is_running():
+        await ingestion_buffer.start()
+    return ingestion_buffer
+
+
+async def shutdown_ingestion_buffer() -> None:
+    """Flush remaining rows and stop the global ingestion buffer"""
+    global _ingestion_buffer
+    if _ingestion_buffer is not None:
+        await _ingestion_buffer.stop()
+        _ingestion_buffer = None
@@ -41,6 +41,7 @@ from apps.backend.src.core.database import (
     init_database,
 )
 from apps.backend.src.core.events import initialize_event_bus, shutdown_event_bus
+from apps.backend.src.core.ingestion import initialize_ingestion_buffer, shutdown_ingestion_buffer
 from apps.backend.src.core.exceptions import (
     InfrastructureException,
     ServiceUnavailableError,
@@ -48,9 +49,17 @@ from apps.backend.src.core.exceptions import (
 from apps.backend.src.models.device import Device
 from apps.backend.src.utils.database_utils import get_database_helper
 from apps.backend.src.schemas.common import HealthCheckResponse
+from apps.backend.src.services.cache_invalidation import (
+    initialize_cache_event_subscriber,
+    shutdown_cache_event_subscriber,
+)
 from apps.backend.src.services.configuration_monitoring import get_configuration_monitoring_service
 from apps.backend.src.services.polling_service import PollingService
-from apps.backend.src.services.unified_data_collection import get_unified_data_collection_service
+from apps.backend.src.services.unified_data_collection import (
+    get_unified_data_collection_service,
+    shutdown_unified_data_collection_services,
+)
+from apps.backend.src.utils.glances_client import close_glances_clients
 from apps.backend.src.utils.ssh_client import cleanup_ssh_client, get_ssh_client
 from apps.backend.src.websocket import websocket_router
 from apps.backend.src.core.logging import setup_logging, set_request_id, get_request_id
@@ -98,6 +107,10 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         await initialize_event_bus()
         logger.info("Event bus initialized successfully")
 
+        # Start write-behind buffer for batched time-series inserts
+        await initialize_ingestion_buffer()
+        logger.info("Ingestion buffer initialized successfully")
+
         # Initialize and start polling service if enabled
         if settings.polling.polling_enabled:
             polling_service = PollingService()
@@ -108,6 +121,14 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
             app.state.polling_service = None
             logger.info("Polling service disabled via configuration")
 
+        # Keep the cache in step with collections and monitoring events
+        if settings.api.cache_enabled and settings.api.cache_event_sync_enabled:
+            try:
+                await initialize_cache_event_subscriber()
+                logger.info("Cache event subscriber started successfully")
+            except Exception as e:
+                logger.warning(f"Cache event subscriber not started, cache relies on TTLs: {e}")
+
         # Initialize configuration monitoring in background (non-blocking)
         logger.info("Starting configuration monitoring setup in background...")
         app.state.config_monitoring_service = None  # Initialize to None
@@ -193,6 +214,17 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         else:
             logger.info("Configuration monitoring service was not running")
 
+        # Stop stale-while-revalidate refreshes before their writes lose the buffer and database
+        await shutdown_unified_data_collection_services()
+        logger.info("Background data refreshes stopped")
+
+        # Flush buffered time-series rows before the database is closed
+        await shutdown_ingestion_buffer()
+        logger.info("Ingestion buffer flushed and stopped")
+
+        # Stop cache write-through/invalidation before the event bus goes away
+        await shutdown_cache_event_subscriber()
+
         # Shutdown event bus
         await shutdown_event_bus()
         logger.info("Event bus shutdown complete")
@@ -201,6 +233,10 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         await cleanup_ssh_client()
         logger.info("SSH connections cleaned up")
 
+        # Close pooled Glances HTTP clients
+        await close_glances_clients()
+        logger.info("Glances clients closed")
+
         # Close database connections
         await close_database()
         logger.info("Database connections closed")
@@ -48,6 +48,14 @@ class PaginationParams(BaseModel):
 
     page: int = Field(default=1, ge=1, description="Page number (starts from 1)")
     page_size: int = Field(default=50, ge=1, le=1000, description="Number of items per page")
+    cursor: str | None = Field(
+        default=None,
+        description="Cursor from a previous page's next_cursor; when set, page is ignored",
+    )
+    include_total: bool = Field(
+        default=True,
+        description="Count total_count exactly; when false it is estimated from table statistics",
+    )
 
     @property
     def offset(self) -> int:
@@ -96,6 +104,12 @@ class PaginatedResponse(BaseModel, Generic[T]):
     total_pages: int = Field(description="Total number of pages")
     has_next: bool = Field(description="Whether there are more pages")
     has_previous: bool = Field(description="Whether there are previous pages")
+    next_cursor: str | None = Field(
+        default=None, description="Cursor for the next page, if there is one"
+    )
+    total_is_estimate: bool = Field(
+        default=False, description="Whether total_count and total_pages are estimates"
+    )
 
     class Config:
         arbitrary_types_allowed = True
@@ -9,7 +9,12 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field, field_validator
 
-from apps.backend.src.schemas.common import AggregationParams, PaginatedResponse, TimeRangeParams
+from apps.backend.src.schemas.common import (
+    AggregationParams,
+    PaginatedResponse,
+    TimeRangeParams,
+    TimeSeriesInterval,
+)
 
 
 class SystemMetricBase(BaseModel):
@@ -193,6 +198,8 @@ class SystemMetricsAggregatedList(BaseModel):
     metrics: list[SystemMetricsAggregated] = Field(description="Aggregated metrics data")
     total_count: int = Field(description="Total number of aggregated records")
     query_params: SystemMetricsQuery = Field(description="Query parameters used")
+    resolution: TimeSeriesInterval | None = Field(None, description="Bucket width of the returned points")
+    source: str | None = Field(None, description="Table or continuous aggregate the points were read from")
     generated_at: datetime = Field(
         default_factory=lambda: datetime.now(UTC), description="Response generation timestamp"
     )
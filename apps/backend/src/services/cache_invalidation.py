@@ -0,0 +1,193 @@
+"""
+Event-Driven Cache Invalidation
+
+Keeps the Redis cache in step with the event bus. Completed collections are
+written through to the cache, and monitoring events invalidate the cache
+entries derived from the state they report, so cached values are replaced
+as soon as newer data exists rather than when their TTL runs out.
+"""
+
+from datetime import datetime
+import logging
+from typing import Any, cast
+from uuid import UUID
+
+from apps.backend.src.core.events import (
+    BaseEvent,
+    DataCollectedEvent,
+    DeviceStatusChangedEvent,
+    EventBus,
+    get_event_bus,
+    is_bridged,
+)
+from apps.backend.src.utils.cache_manager import CacheManager, get_cache_manager
+
+logger = logging.getLogger(__name__)
+
+# Cached data types that depend on the state reported by each event type.
+# Entries cached before the event was created are invalidated.
+DEPENDENT_DATA_TYPES: dict[str, tuple[str, ...]] = {
+    "metric_collected": ("system_metrics",),
+    "container_status": ("containers", "service_dependencies", "proxy_configurations"),
+    "drive_health": ("drive_health",),
+}
+
+
+class CacheEventSubscriber:
+    """
+    Event bus subscriber that writes through to and invalidates the cache.
+
+    - data_collected: the collected data is written to the cache, unless the
+      publisher already cached it
+    - metric_collected, container_status, drive_health: dependent entries of
+      the device that are older than the event are deleted
+    - device_status_changed: every cached entry of the device is deleted
+
+    Events arrive in event bus batches; invalidations within a batch are
+    coalesced, so a poll reporting 100 containers of a device costs one
+    check per dependent data type rather than one per container.
+
+    Events bridged from another process are skipped: the cache is shared,
+    the emitting process already applied them, and its deletes reach this
+    process's L1 through the cache invalidation channel.
+    """
+
+    def __init__(self, cache_manager: CacheManager, event_bus: EventBus | None = None):
+        """
+        Initialize the subscriber.
+
+        Args:
+            cache_manager: Cache to keep in sync
+            event_bus: Event bus to subscribe to (defaults to the global one)
+        """
+        self.cache_manager = cache_manager
+        self.event_bus = event_bus or get_event_bus()
+        self._handler_id: str | None = None
+        self._stats = {
+            "events_handled": 0,
+            "write_throughs": 0,
+            "invalidations": 0,
+            "device_clears": 0,
+            "bridged_skipped": 0,
+            "failures": 0,
+        }
+
+    def start(self) -> None:
+        """Subscribe to the event bus"""
+        if self._handler_id is not None:
+            return
+
+        self._handler_id = self.event_bus.subscribe_batch(
+            ["data_collected", "device_status_changed", *DEPENDENT_DATA_TYPES],
+            self.handle_events,
+            # Ahead of WebSocket broadcasting, so clients reading back see new data
+            priority=20,
+        )
+        logger.info("Cache event subscriber started")
+
+    def stop(self) -> None:
+        """Unsubscribe from the event bus"""
+        if self._handler_id is None:
+            return
+
+        self.event_bus.unsubscribe(self._handler_id)
+        self._handler_id = None
+        logger.info("Cache event subscriber stopped")
+
+    def is_running(self) -> bool:
+        """Check if the subscriber is subscribed to the event bus"""
+        return self._handler_id is not None
+
+    async def handle_event(self, event: BaseEvent) -> None:
+        """Apply one event to the cache"""
+        await self.handle_events([event])
+
+    async def handle_events(self, events: list[BaseEvent]) -> None:
+        """Apply a batch of events to the cache, in order"""
+        # (data_type, device_id) -> newest timestamp of an event invalidating it
+        invalidations: dict[tuple[str, UUID], datetime] = {}
+
+        for event in events:
+            self._stats["events_handled"] += 1
+            if is_bridged(event):
+                self._stats["bridged_skipped"] += 1
+                continue
+            try:
+                if event.event_type == "data_collected":
+                    await self._write_through(cast("DataCollectedEvent", event))
+                elif event.event_type == "device_status_changed":
+                    device_id = cast("DeviceStatusChangedEvent", event).device_id
+                    self._stats["invalidations"] += await self.cache_manager.clear_device_cache(device_id)
+                    self._stats["device_clears"] += 1
+                else:
+                    self._collect_invalidations(event, invalidations)
+            except Exception as e:
+                self._stats["failures"] += 1
+                logger.warning(f"Cache update for {event.event_type} event {event.event_id} failed: {e}")
+
+        if not invalidations:
+            return
+
+        try:
+            for (data_type, device_id), older_than in invalidations.items():
+                if await self.cache_manager.delete_if_older(data_type, device_id, older_than):
+                    self._stats["invalidations"] += 1
+        except Exception as e:
+            self._stats["failures"] += 1
+            logger.warning(f"Cache invalidation of {len(invalidations)} entries failed: {e}")
+
+    async def _write_through(self, event: DataCollectedEvent) -> None:
+        """Store collected data in the cache if the publisher did not"""
+        if event.cached:
+            return
+
+        if await self.cache_manager.set(
+            event.data_type, event.device_id, event.data, ttl=event.cache_ttl
+        ):
+            self._stats["write_throughs"] += 1
+        else:
+            self._stats["failures"] += 1
+
+    def _collect_invalidations(
+        self, event: BaseEvent, invalidations: dict[tuple[str, UUID], datetime]
+    ) -> None:
+        """Add the dependent cache entries of the event's device to invalidations"""
+        device_id = getattr(event, "device_id", None)
+        if device_id is None:
+            return
+
+        for data_type in DEPENDENT_DATA_TYPES.get(event.event_type, ()):
+            key = (data_type, device_id)
+            invalidations[key] = max(invalidations.get(key, event.timestamp), event.timestamp)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get write-through and invalidation statistics"""
+        return {**self._stats, "is_running": self.is_running()}
+
+
+# Global subscriber instance
+_cache_event_subscriber: CacheEventSubscriber | None = None
+
+
+async def initialize_cache_event_subscriber(
+    cache_manager: CacheManager | None = None,
+) -> CacheEventSubscriber:
+    """Create the global cache event subscriber and subscribe it to the event bus"""
+    global _cache_event_subscriber
+    if _cache_event_subscriber is None:
+        _cache_event_subscriber = CacheEventSubscriber(cache_manager or await get_cache_manager())
+    _cache_event_subscriber.start()
+    return _cache_event_subscriber
+
+
+def get_cache_event_subscriber() -> CacheEventSubscriber | None:
+    """Get the global cache event subscriber, None if it was not initialized"""
+    return _cache_event_subscriber
+
+
+async def shutdown_cache_event_subscriber() -> None:
+    """Unsubscribe the global cache event subscriber"""
+    global _cache_event_subscriber
+    if _cache_event_subscriber:
+        _cache_event_subscriber.stop()
+        _cache_event_subscriber = None
@@ -5,11 +5,9 @@ Service layer for container-related business logic.
 from datetime import UTC, datetime
 import json
 import logging
-
-Optional
 from uuid import UUID
 
-from sqlalchemy import and_, desc, func, or_, select
+from sqlalchemy import and_, desc, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from apps.backend.src.core.exceptions import (
@@ -27,6 +25,7 @@ from apps.backend.src.schemas.container import (
     ContainerSnapshotResponse,
     ContainerSummary,
 )
+from apps.backend.src.utils.pagination import count_rows, fetch_keyset_page
 from apps.backend.src.utils.ssh_client import SSHConnectionInfo, execute_ssh_command, get_ssh_client
 
 logger = logging.getLogger(__name__)
@@ -62,10 +61,15 @@ class ContainerService:
         since: str | None = None,
         search: str | None = None,
     ) -> ContainerSnapshotList:
-        """List container snapshots with filtering and pagination"""
+        """
+        List container snapshots with filtering and pagination.
+
+        Snapshots are returned newest first and paged by (time, device_id, container_id):
+        pass the previous page's next_cursor to continue without OFFSET. Set
+        pagination.include_total to False to estimate total_count instead of counting.
+        """
 
         query = select(ContainerSnapshot)
-        count_query = select(func.count(ContainerSnapshot.container_id))
 
         filters = []
 
@@ -105,25 +109,18 @@ class ContainerService:
 
         if filters:
             query = query.where(and_(*filters))
-            count_query = count_query.where(and_(*filters))
 
-        # Get total count
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar()
-
-        # Apply pagination and ordering
-        query = (
-            query.order_by(desc(ContainerSnapshot.time))
-            .offset((pagination.page - 1) * pagination.page_size)
-            .limit(pagination.page_size)
+        page = await fetch_keyset_page(
+            self.db,
+            query,
+            pagination,
+            [ContainerSnapshot.time, ContainerSnapshot.device_id, ContainerSnapshot.container_id],
         )
-
-        result = await self.db.execute(query)
-        containers = result.scalars().all()
+        total = await count_rows(self.db, query, pagination)
 
         # Convert to response models
         container_responses = [
-            ContainerSnapshotResponse.model_validate(container) for container in containers
+            ContainerSnapshotResponse.model_validate(container) for container in page.items
         ]
         total_pages = (total + pagination.page_size - 1) // pagination.page_size
 
@@ -133,8 +130,10 @@ class ContainerService:
             page=pagination.page,
             page_size=pagination.page_size,
             total_pages=total_pages,
-            has_next=pagination.page < total_pages,
-            has_previous=pagination.page > 1,
+            has_next=page.has_next,
+            has_previous=pagination.page > 1 or pagination.cursor is not None,
+            next_cursor=page.next_cursor,
+            total_is_estimate=not pagination.include_total,
         )
 
     async def list_device_containers(
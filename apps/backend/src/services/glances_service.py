@@ -24,11 +24,20 @@ from apps.backend.src.schemas.glances import (
     GlancesGPUResponse,
     GlancesSensorResponse,
 )
+from apps.backend.src.core.config import get_settings
 from apps.backend.src.utils.glances_client import get_glances_client
 from apps.backend.src.core.exceptions import DataCollectionError, DeviceNotFoundError, SSHConnectionError
 
 logger = logging.getLogger(__name__)
 
+# Plugins required to build GlancesSystemMetricsResponse
+SYSTEM_METRIC_ENDPOINTS = ['cpu', 'mem', 'load', 'uptime', 'processcount']
+
+# Plugins used by get_all_system_data when /api/4/all is not available
+ALL_SYSTEM_DATA_ENDPOINTS = SYSTEM_METRIC_ENDPOINTS + [
+    'network', 'processlist', 'fs', 'diskio', 'gpu', 'sensors'
+]
+
 
 class GlancesService:
     """Service layer for Glances API integration"""
@@ -36,283 +45,318 @@ class GlancesService:
     def __init__(self, device: Device):
         self.device = device
         self.base_url = device.glances_endpoint
+        # Shared keep-alive client for this endpoint; not closed per collection
         self.client = get_glances_client(self.base_url)
+        self.use_all_endpoint = get_settings().glances.use_all_endpoint
     
     async def get_system_metrics(self) -> GlancesSystemMetricsResponse:
         """Get comprehensive system metrics (CPU, memory, load, uptime)"""
         try:
             # Get all required metrics in parallel
-            endpoints = ['cpu', 'mem', 'load', 'uptime', 'processcount']
-            data = await self.client.get_multiple_endpoints(endpoints)
-            
+            data = await self.client.get_multiple_endpoints(SYSTEM_METRIC_ENDPOINTS)
+
             # Validate we got all required data
             missing_endpoints = [ep for ep, result in data.items() if result is None]
             if missing_endpoints:
                 raise DataCollectionError(
                     f"Failed to get data from endpoints: {missing_endpoints}"
                 )
-            
-            # Parse CPU data
-            cpu_data = data['cpu']
-            if isinstance(cpu_data, list) and len(cpu_data) > 0:
-                cpu_data = cpu_data[0]  # Take first CPU entry for overall stats
-            
-            cpu = GlancesCPUResponse(
-                total=cpu_data.get('total', 0.0),
-                user=cpu_data.get('user', 0.0),
-                system=cpu_data.get('system', 0.0),
-                idle=cpu_data.get('idle', 0.0),
-                iowait=cpu_data.get('iowait'),
-                steal=cpu_data.get('steal')
-            )
-            
-            # Parse memory data
-            mem_data = data['mem']
-            memory = GlancesMemoryResponse(
-                total=mem_data.get('total', 0),
-                available=mem_data.get('available', 0),
-                percent=mem_data.get('percent', 0.0),
-                used=mem_data.get('used', 0),
-                free=mem_data.get('free', 0),
-                active=mem_data.get('active'),
-                inactive=mem_data.get('inactive'),
-                buffers=mem_data.get('buffers'),
-                cached=mem_data.get('cached')
-            )
-            
-            # Parse load data
-            load_data = data['load']
-            load = GlancesLoadResponse(
-                min1=load_data.get('min1', 0.0),
-                min5=load_data.get('min5', 0.0),
-                min15=load_data.get('min15', 0.0),
-                cpucore=load_data.get('cpucore', 1)
-            )
-            
-            # Parse uptime data
-            uptime_data = data['uptime']
-            uptime = GlancesUptimeResponse(
-                uptime=uptime_data if isinstance(uptime_data, str) else str(uptime_data)
-            )
-            
-            # Parse process count
-            process_count = data['processcount']
-            if isinstance(process_count, dict):
-                process_count = process_count.get('total', 0)
-            elif isinstance(process_count, list):
-                process_count = len(process_count)
-            
-            return GlancesSystemMetricsResponse(
-                device_hostname=self.device.hostname,
-                timestamp=datetime.now(UTC),
-                cpu=cpu,
-                memory=memory,
-                load=load,
-                uptime=uptime,
-                process_count=process_count
-            )
-            
+
+            return self._parse_system_metrics(data)
+
         except Exception as e:
             logger.error(f"Failed to get system metrics for {self.device.hostname}: {str(e)}")
             raise DataCollectionError(f"Failed to collect system metrics: {str(e)}")
-    
+
+    def _parse_system_metrics(self, data: dict[str, Any]) -> GlancesSystemMetricsResponse:
+        """Build system metrics from cpu, mem, load, uptime and processcount plugin data"""
+        # Parse CPU data
+        cpu_data = data['cpu']
+        if isinstance(cpu_data, list) and len(cpu_data) > 0:
+            cpu_data = cpu_data[0]  # Take first CPU entry for overall stats
+
+        cpu = GlancesCPUResponse(
+            total=cpu_data.get('total', 0.0),
+            user=cpu_data.get('user', 0.0),
+            system=cpu_data.get('system', 0.0),
+            idle=cpu_data.get('idle', 0.0),
+            iowait=cpu_data.get('iowait'),
+            steal=cpu_data.get('steal')
+        )
+
+        # Parse memory data
+        mem_data = data['mem']
+        memory = GlancesMemoryResponse(
+            total=mem_data.get('total', 0),
+            available=mem_data.get('available', 0),
+            percent=mem_data.get('percent', 0.0),
+            used=mem_data.get('used', 0),
+            free=mem_data.get('free', 0),
+            active=mem_data.get('active'),
+            inactive=mem_data.get('inactive'),
+            buffers=mem_data.get('buffers'),
+            cached=mem_data.get('cached')
+        )
+
+        # Parse load data
+        load_data = data['load']
+        load = GlancesLoadResponse(
+            min1=load_data.get('min1', 0.0),
+            min5=load_data.get('min5', 0.0),
+            min15=load_data.get('min15', 0.0),
+            cpucore=load_data.get('cpucore', 1)
+        )
+
+        # Parse uptime data
+        uptime_data = data['uptime']
+        uptime = GlancesUptimeResponse(
+            uptime=uptime_data if isinstance(uptime_data, str) else str(uptime_data)
+        )
+
+        # Parse process count
+        process_count = data['processcount']
+        if isinstance(process_count, dict):
+            process_count = process_count.get('total', 0)
+        elif isinstance(process_count, list):
+            process_count = len(process_count)
+
+        return GlancesSystemMetricsResponse(
+            device_hostname=self.device.hostname,
+            timestamp=datetime.now(UTC),
+            cpu=cpu,
+            memory=memory,
+            load=load,
+            uptime=uptime,
+            process_count=process_count
+        )
+
     async def get_network_stats(self) -> list[GlancesNetworkResponse]:
         """Get network interface statistics"""
         try:
             data = await self.client.get_endpoint('network')
-            
-            if not isinstance(data, list):
-                logger.warning(f"Expected list for network data, got {type(data)}")
-                return []
-            
-            interfaces = []
-            for interface in data:
-                if not isinstance(interface, dict):
-                    continue
-                    
-                interfaces.append(GlancesNetworkResponse(
-                    interface_name=interface.get('interface_name', 'unknown'),
-                    rx=interface.get('rx', 0),
-                    tx=interface.get('tx', 0),
-                    rx_per_sec=interface.get('rx_per_sec'),
-                    tx_per_sec=interface.get('tx_per_sec'),
-                    cumulative_rx=interface.get('cumulative_rx', interface.get('rx', 0)),
-                    cumulative_tx=interface.get('cumulative_tx', interface.get('tx', 0)),
-                    speed=interface.get('speed'),
-                    is_up=interface.get('is_up', True)
-                ))
-            
-            return interfaces
-            
+            return self._parse_network_stats(data)
+
         except Exception as e:
             logger.error(f"Failed to get network stats for {self.device.hostname}: {str(e)}")
             raise DataCollectionError(f"Failed to collect network statistics: {str(e)}")
-    
+
+    def _parse_network_stats(self, data: Any) -> list[GlancesNetworkResponse]:
+        """Build network interface statistics from network plugin data"""
+        if not isinstance(data, list):
+            logger.warning(f"Expected list for network data, got {type(data)}")
+            return []
+
+        interfaces = []
+        for interface in data:
+            if not isinstance(interface, dict):
+                continue
+
+            interfaces.append(GlancesNetworkResponse(
+                interface_name=interface.get('interface_name', 'unknown'),
+                rx=interface.get('rx', 0),
+                tx=interface.get('tx', 0),
+                rx_per_sec=interface.get('rx_per_sec'),
+                tx_per_sec=interface.get('tx_per_sec'),
+                cumulative_rx=interface.get('cumulative_rx', interface.get('rx', 0)),
+                cumulative_tx=interface.get('cumulative_tx', interface.get('tx', 0)),
+                speed=interface.get('speed'),
+                is_up=interface.get('is_up', True)
+            ))
+
+        return interfaces
+
     async def get_process_list(self, sort_by: str = "cpu_percent") -> list[GlancesProcessResponse]:
         """Get running processes with optional sorting"""
         try:
             data = await self.client.get_endpoint('processlist')
-            
-            if not isinstance(data, list):
-                logger.warning(f"Expected list for process data, got {type(data)}")
-                return []
-            
-            processes = []
-            for process in data:
-                if not isinstance(process, dict):
-                    continue
-                    
-                processes.append(GlancesProcessResponse(
-                    pid=process.get('pid', 0),
-                    name=process.get('name', 'unknown'),
-                    username=process.get('username', 'unknown'),
-                    cpu_percent=process.get('cpu_percent', 0.0),
-                    memory_percent=process.get('memory_percent', 0.0),
-                    memory_info=process.get('memory_info'),
-                    status=process.get('status', 'unknown'),
-                    cmdline=process.get('cmdline', [])
-                ))
-            
-            # Sort processes by specified field
-            if sort_by in ['cpu_percent', 'memory_percent']:
-                processes.sort(key=lambda p: getattr(p, sort_by), reverse=True)
-            
-            return processes
-            
+            return self._parse_process_list(data, sort_by)
+
         except Exception as e:
             logger.error(f"Failed to get process list for {self.device.hostname}: {str(e)}")
             raise DataCollectionError(f"Failed to collect process list: {str(e)}")
-    
+
+    def _parse_process_list(self, data: Any, sort_by: str = "cpu_percent") -> list[GlancesProcessResponse]:
+        """Build the sorted process list from processlist plugin data"""
+        if not isinstance(data, list):
+            logger.warning(f"Expected list for process data, got {type(data)}")
+            return []
+
+        processes = []
+        for process in data:
+            if not isinstance(process, dict):
+                continue
+
+            processes.append(GlancesProcessResponse(
+                pid=process.get('pid', 0),
+                name=process.get('name', 'unknown'),
+                username=process.get('username', 'unknown'),
+                cpu_percent=process.get('cpu_percent', 0.0),
+                memory_percent=process.get('memory_percent', 0.0),
+                memory_info=process.get('memory_info'),
+                status=process.get('status', 'unknown'),
+                cmdline=process.get('cmdline', [])
+            ))
+
+        # Sort processes by specified field
+        if sort_by in ['cpu_percent', 'memory_percent']:
+            processes.sort(key=lambda p: getattr(p, sort_by), reverse=True)
+
+        return processes
+
     async def get_file_system_usage(self) -> list[GlancesFileSystemResponse]:
         """Get file system usage for all mount points"""
         try:
             data = await self.client.get_endpoint('fs')
-            
-            if not isinstance(data, list):
-                logger.warning(f"Expected list for filesystem data, got {type(data)}")
-                return []
-            
-            filesystems = []
-            for fs in data:
-                if not isinstance(fs, dict):
-                    continue
-                    
-                filesystems.append(GlancesFileSystemResponse(
-                    device_name=fs.get('device_name', 'unknown'),
-                    mnt_point=fs.get('mnt_point', '/'),
-                    fs_type=fs.get('fs_type', 'unknown'),
-                    size=fs.get('size', 0),
-                    used=fs.get('used', 0),
-                    free=fs.get('free', 0),
-                    percent=fs.get('percent', 0.0)
-                ))
-            
-            return filesystems
-            
+            return self._parse_file_system_usage(data)
+
         except Exception as e:
             logger.error(f"Failed to get filesystem usage for {self.device.hostname}: {str(e)}")
             raise DataCollectionError(f"Failed to collect filesystem usage: {str(e)}")
-    
+
+    def _parse_file_system_usage(self, data: Any) -> list[GlancesFileSystemResponse]:
+        """Build file system usage from fs plugin data"""
+        if not isinstance(data, list):
+            logger.warning(f"Expected list for filesystem data, got {type(data)}")
+            return []
+
+        filesystems = []
+        for fs in data:
+            if not isinstance(fs, dict):
+                continue
+
+            filesystems.append(GlancesFileSystemResponse(
+                device_name=fs.get('device_name', 'unknown'),
+                mnt_point=fs.get('mnt_point', '/'),
+                fs_type=fs.get('fs_type', 'unknown'),
+                size=fs.get('size', 0),
+                used=fs.get('used', 0),
+                free=fs.get('free', 0),
+                percent=fs.get('percent', 0.0)
+            ))
+
+        return filesystems
+
     async def get_disk_io_stats(self) -> list[GlancesDiskIOResponse]:
         """Get disk I/O statistics"""
         try:
             data = await self.client.get_endpoint('diskio')
-            
-            if not isinstance(data, list):
-                logger.warning(f"Expected list for diskio data, got {type(data)}")
-                return []
-            
-            disks = []
-            for disk in data:
-                if not isinstance(disk, dict):
-                    continue
-                    
-                disks.append(GlancesDiskIOResponse(
-                    disk_name=disk.get('disk_name', 'unknown'),
-                    read_count=disk.get('read_count', 0),
-                    write_count=disk.get('write_count', 0),
-                    read_bytes=disk.get('read_bytes', 0),
-                    write_bytes=disk.get('write_bytes', 0),
-                    time_since_update=disk.get('time_since_update', 0.0)
-                ))
-            
-            return disks
-            
+            return self._parse_disk_io_stats(data)
+
         except Exception as e:
             logger.error(f"Failed to get disk I/O stats for {self.device.hostname}: {str(e)}")
             raise DataCollectionError(f"Failed to collect disk I/O statistics: {str(e)}")
-    
+
+    def _parse_disk_io_stats(self, data: Any) -> list[GlancesDiskIOResponse]:
+        """Build disk I/O statistics from diskio plugin data"""
+        if not isinstance(data, list):
+            logger.warning(f"Expected list for diskio data, got {type(data)}")
+            return []
+
+        disks = []
+        for disk in data:
+            if not isinstance(disk, dict):
+                continue
+
+            disks.append(GlancesDiskIOResponse(
+                disk_name=disk.get('disk_name', 'unknown'),
+                read_count=disk.get('read_count', 0),
+                write_count=disk.get('write_count', 0),
+                read_bytes=disk.get('read_bytes', 0),
+                write_bytes=disk.get('write_bytes', 0),
+                time_since_update=disk.get('time_since_update', 0.0)
+            ))
+
+        return disks
+
     async def get_gpu_stats(self) -> list[GlancesGPUResponse]:
         """Get GPU statistics (if available)"""
         try:
             data = await self.client.get_endpoint('gpu')
-            
-            if not isinstance(data, list):
-                # GPU data might not be available on all systems
-                return []
-            
-            gpus = []
-            for gpu in data:
-                if not isinstance(gpu, dict):
-                    continue
-                    
-                gpus.append(GlancesGPUResponse(
-                    gpu_id=gpu.get('gpu_id', 0),
-                    name=gpu.get('name', 'Unknown GPU'),
-                    mem=gpu.get('mem'),
-                    proc=gpu.get('proc'),
-                    temperature=gpu.get('temperature'),
-                    fan_speed=gpu.get('fan_speed')
-                ))
-            
-            return gpus
-            
+            return self._parse_gpu_stats(data)
+
         except Exception as e:
             logger.debug(f"GPU stats not available for {self.device.hostname}: {str(e)}")
             return []  # GPU stats are optional
-    
+
+    def _parse_gpu_stats(self, data: Any) -> list[GlancesGPUResponse]:
+        """Build GPU statistics from gpu plugin data"""
+        if not isinstance(data, list):
+            # GPU data might not be available on all systems
+            return []
+
+        gpus = []
+        for gpu in data:
+            if not isinstance(gpu, dict):
+                continue
+
+            gpus.append(GlancesGPUResponse(
+                gpu_id=gpu.get('gpu_id', 0),
+                name=gpu.get('name', 'Unknown GPU'),
+                mem=gpu.get('mem'),
+                proc=gpu.get('proc'),
+                temperature=gpu.get('temperature'),
+                fan_speed=gpu.get('fan_speed')
+            ))
+
+        return gpus
+
     async def get_sensor_data(self) -> list[GlancesSensorResponse]:
         """Get sensor data (temperature, fans, power)"""
         try:
             data = await self.client.get_endpoint('sensors')
-            
-            if not isinstance(data, list):
-                # Sensor data might not be available on all systems
-                return []
-            
-            sensors = []
-            for sensor in data:
-                if not isinstance(sensor, dict):
-                    continue
-                    
-                sensors.append(GlancesSensorResponse(
-                    label=sensor.get('label', 'Unknown'),
-                    value=sensor.get('value', 0.0),
-                    warning=sensor.get('warning'),
-                    critical=sensor.get('critical'),
-                    unit=sensor.get('unit', ''),
-                    type=sensor.get('type', 'unknown')
-                ))
-            
-            return sensors
-            
+            return self._parse_sensor_data(data)
+
         except Exception as e:
             logger.debug(f"Sensor data not available for {self.device.hostname}: {str(e)}")
             return []  # Sensor data is optional
-    
+
+    def _parse_sensor_data(self, data: Any) -> list[GlancesSensorResponse]:
+        """Build sensor readings from sensors plugin data"""
+        if not isinstance(data, list):
+            # Sensor data might not be available on all systems
+            return []
+
+        sensors = []
+        for sensor in data:
+            if not isinstance(sensor, dict):
+                continue
+
+            sensors.append(GlancesSensorResponse(
+                label=sensor.get('label', 'Unknown'),
+                value=sensor.get('value', 0.0),
+                warning=sensor.get('warning'),
+                critical=sensor.get('critical'),
+                unit=sensor.get('unit', ''),
+                type=sensor.get('type', 'unknown')
+            ))
+
+        return sensors
+
+    async def _get_all_plugin_data(self) -> dict[str, Any]:
+        """
+        Get raw data for every plugin used by get_all_system_data.
+
+        Uses the aggregate `/api/4/all` endpoint (one request) unless disabled or
+        unsupported by the server, in which case the plugins are fetched individually.
+        The pooled client remembers an unsupported endpoint, so it is only tried once.
+        """
+        if self.use_all_endpoint:
+            all_data = await self.client.get_all()
+            if all_data is not None:
+                return all_data
+
+        data = await self.client.get_multiple_endpoints(ALL_SYSTEM_DATA_ENDPOINTS)
+        if all(result is None for result in data.values()):
+            raise DataCollectionError(f"Glances API not accessible on {self.device.hostname}")
+        return data
+
     async def get_all_system_data(self) -> dict[str, Any]:
         """Get all system data in a single optimized call"""
         try:
-            # Get all available endpoints in parallel
-            endpoints = [
-                'cpu', 'mem', 'load', 'uptime', 'processcount',
-                'network', 'processlist', 'fs', 'diskio', 'gpu', 'sensors'
-            ]
-            
-            data = await self.client.get_multiple_endpoints(endpoints)
-            
+            data = await self._get_all_plugin_data()
+
             # Process and structure the data
-            result = {
+            result: dict[str, Any] = {
                 'system_metrics': None,
                 'network_stats': [],
                 'process_list': [],
@@ -321,90 +365,31 @@ class GlancesService:
                 'gpu_stats': [],
                 'sensor_data': []
             }
-            
+
             # Build system metrics if we have the required data
-            required_for_system = ['cpu', 'mem', 'load', 'uptime', 'processcount']
-            if all(data.get(ep) is not None for ep in required_for_system):
-                # Parse CPU data
-                cpu_data = data['cpu']
-                if isinstance(cpu_data, list) and len(cpu_data) > 0:
-                    cpu_data = cpu_data[0]  # Take first CPU entry for overall stats
-                
-                cpu = GlancesCPUResponse(
-                    total=cpu_data.get('total', 0.0),
-                    user=cpu_data.get('user', 0.0),
-                    system=cpu_data.get('system', 0.0),
-                    idle=cpu_data.get('idle', 0.0),
-                    iowait=cpu_data.get('iowait'),
-                    steal=cpu_data.get('steal')
-                )
-                
-                # Parse memory data
-                mem_data = data['mem']
-                memory = GlancesMemoryResponse(
-                    total=mem_data.get('total', 0),
-                    available=mem_data.get('available', 0),
-                    percent=mem_data.get('percent', 0.0),
-                    used=mem_data.get('used', 0),
-                    free=mem_data.get('free', 0),
-                    active=mem_data.get('active'),
-                    inactive=mem_data.get('inactive'),
-                    buffers=mem_data.get('buffers'),
-                    cached=mem_data.get('cached')
-                )
-                
-                # Parse load data
-                load_data = data['load']
-                load = GlancesLoadResponse(
-                    min1=load_data.get('min1', 0.0),
-                    min5=load_data.get('min5', 0.0),
-                    min15=load_data.get('min15', 0.0),
-                    cpucore=load_data.get('cpucore', 1)
-                )
-                
-                # Parse uptime data
-                uptime_data = data['uptime']
-                uptime = GlancesUptimeResponse(
-                    uptime=uptime_data if isinstance(uptime_data, str) else str(uptime_data)
-                )
-                
-                # Parse process count
-                process_count = data['processcount']
-                if isinstance(process_count, dict):
-                    process_count = process_count.get('total', 0)
-                elif isinstance(process_count, list):
-                    process_count = len(process_count)
-                
-                result['system_metrics'] = GlancesSystemMetricsResponse(
-                    device_hostname=self.device.hostname,
-                    timestamp=datetime.now(UTC),
-                    cpu=cpu,
-                    memory=memory,
-                    load=load,
-                    uptime=uptime,
-                    process_count=process_count
-                )
-            
-            # Process optional data
+            if all(data.get(ep) is not None for ep in SYSTEM_METRIC_ENDPOINTS):
+                result['system_metrics'] = self._parse_system_metrics(data)
+
+            # Process optional data from the same response
             if data.get('network'):
-                result['network_stats'] = await self.get_network_stats()
+                result['network_stats'] = self._parse_network_stats(data['network'])
             if data.get('processlist'):
-                result['process_list'] = await self.get_process_list()
+                result['process_list'] = self._parse_process_list(data['processlist'])
             if data.get('fs'):
-                result['filesystem_usage'] = await self.get_file_system_usage()
+                result['filesystem_usage'] = self._parse_file_system_usage(data['fs'])
             if data.get('diskio'):
-                result['disk_io_stats'] = await self.get_disk_io_stats()
+                result['disk_io_stats'] = self._parse_disk_io_stats(data['diskio'])
             if data.get('gpu'):
-                result['gpu_stats'] = await self.get_gpu_stats()
+                result['gpu_stats'] = self._parse_gpu_stats(data['gpu'])
             if data.get('sensors'):
-                result['sensor_data'] = await self.get_sensor_data()
-            
+                result['sensor_data'] = self._parse_sensor_data(data['sensors'])
+
             return result
-            
+
         except Exception as e:
             logger.error(f"Failed to get all system data for {self.device.hostname}: {str(e)}")
             raise DataCollectionError(f"Failed to collect system data: {str(e)}")
-    
+
     async def test_connectivity(self) -> bool:
         """Test if Glances API is accessible"""
         try:
@@ -412,7 +397,12 @@ class GlancesService:
         except Exception as e:
             logger.error(f"Connectivity test failed for {self.device.hostname}: {str(e)}")
             return False
-    
+
     async def close(self) -> None:
-        """Close client connections"""
-        await self.client.close()
\ No newline at end of file
+        """
+        Release the service.
+
+        The HTTP client is shared per Glances endpoint and kept alive between
+        collections; pooled clients are closed by close_glances_clients() on shutdown.
+        """
+        return None
@@ -9,32 +9,66 @@ from typing import Any
 
 from uuid import UUID
 
-from sqlalchemy import desc, select
+from sqlalchemy import Select, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
 
+from apps.backend.src.core.database import SYSTEM_METRICS_ROLLUP_COLUMNS, SYSTEM_METRICS_ROLLUPS
 from apps.backend.src.core.exceptions import (
     DeviceNotFoundError,
     SSHCommandError,
+    ValidationError,
 )
 from apps.backend.src.models.device import Device
 from apps.backend.src.models.metrics import DriveHealth, SystemMetric
 from apps.backend.src.schemas.backup import BackupStatusResponse
-from apps.backend.src.schemas.common import PaginationParams
+from apps.backend.src.schemas.common import AggregationParams, PaginationParams, TimeSeriesInterval
 from apps.backend.src.schemas.drive_health import (
     DriveHealthList,
     DriveHealthResponse,
     DriveInventory,
 )
 from apps.backend.src.schemas.network import NetworkInterfaceResponse
-from apps.backend.src.schemas.system_metrics import SystemMetricResponse, SystemMetricsList
+from apps.backend.src.schemas.system_metrics import (
+    SystemMetricResponse,
+    SystemMetricsAggregated,
+    SystemMetricsAggregatedList,
+    SystemMetricsList,
+    SystemMetricsQuery,
+)
 from apps.backend.src.schemas.updates import UpdateSummary
 from apps.backend.src.services.unified_data_collection import UnifiedDataCollectionService
+from apps.backend.src.utils.pagination import count_rows, fetch_keyset_page
 from apps.backend.src.schemas.vm import VMStatusList, VMStatusResponse
 from apps.backend.src.schemas.zfs import ZFSSnapshotList, ZFSSnapshotResponse, ZFSStatusResponse
 from apps.backend.src.utils.ssh_client import SSHConnectionInfo, get_ssh_client
 
 logger = logging.getLogger(__name__)
 
+# Default number of points per chart when choosing a resolution automatically
+DEFAULT_CHART_POINTS = 500
+
+# Bucket widths for every supported resolution
+RESOLUTION_WIDTHS: dict[TimeSeriesInterval, timedelta] = {
+    TimeSeriesInterval.MINUTE: timedelta(minutes=1),
+    TimeSeriesInterval.FIVE_MINUTES: timedelta(minutes=5),
+    TimeSeriesInterval.FIFTEEN_MINUTES: timedelta(minutes=15),
+    TimeSeriesInterval.HOUR: timedelta(hours=1),
+    TimeSeriesInterval.SIX_HOURS: timedelta(hours=6),
+    TimeSeriesInterval.DAY: timedelta(days=1),
+    TimeSeriesInterval.WEEK: timedelta(weeks=1),
+}
+
+# Rollup columns combined when re-bucketing a rollup into wider buckets
+_ROLLUP_AVG_COLUMNS = [
+    "avg_cpu_usage", "avg_memory_usage", "avg_memory_total", "avg_memory_available",
+    "avg_load_1m", "avg_load_5m", "avg_load_15m", "avg_disk_usage", "avg_disk_total",
+    "avg_disk_available", "avg_network_sent", "avg_network_recv", "avg_process_count", "avg_uptime",
+]
+_ROLLUP_MAX_COLUMNS = ["max_cpu_usage", "max_memory_usage", "max_load_1m", "max_disk_usage", "max_process_count"]
+_ROLLUP_MIN_COLUMNS = ["min_cpu_usage", "min_memory_usage"]
+_ROLLUP_SUM_COLUMNS = ["total_network_sent", "total_network_recv", "sample_count"]
+
 
 class MetricsService:
     def __init__(self, db_session: AsyncSession, unified_data_service: UnifiedDataCollectionService | None = None):
@@ -63,8 +97,24 @@ class MetricsService:
         live: bool = False,
         time_range: str | None = None,
         pagination: PaginationParams | None = None,
-    ) -> SystemMetricResponse | SystemMetricsList:
-        """Get system metrics for a device using unified data collection service with Glances"""
+        resolution: TimeSeriesInterval | str | None = None,
+        points: int | None = None,
+    ) -> SystemMetricResponse | SystemMetricsList | SystemMetricsAggregatedList:
+        """
+        Get system metrics for a device using unified data collection service with Glances.
+
+        Historical queries return raw rows unless a resolution or target point count is
+        given, in which case metrics are downsampled server-side from the continuous
+        aggregates.
+
+        Args:
+            device_id: Device identifier
+            live: Collect current metrics instead of reading history
+            time_range: History window such as "24h" or "30d"
+            pagination: Pagination for raw history
+            resolution: Bucket width ("1m", "5m", "15m", "1h", "6h", "1d", "1w") or "auto"
+            points: Target points per chart used to choose the resolution automatically
+        """
         device = await self.get_device_by_id(device_id)
 
         if live:
@@ -104,9 +154,6 @@ class MetricsService:
                 glances_service = GlancesService(device)
                 
                 try:
-                    if not await glances_service.test_connectivity():
-                        raise DeviceNotFoundError(f"Glances API not accessible on {device.hostname}")
-                    
                     metrics = await glances_service.get_system_metrics()
                     
                     return SystemMetricResponse(
@@ -124,10 +171,16 @@ class MetricsService:
                 except Exception as e:
                     logger.error(f"Error getting Glances metrics for device {device_id}: {e}")
                     raise SSHCommandError("glances", f"Failed to get Glances metrics: {str(e)}")
-                finally:
-                    await glances_service.close()
 
         else:
+            # Downsample from the continuous aggregates when a resolution is requested
+            span = self._parse_time_range(time_range) if time_range else timedelta(hours=1)
+            interval = self._select_resolution(resolution, points, span)
+            if interval is not None:
+                return await self._get_downsampled_metrics(
+                    device_id, interval, datetime.now(UTC) - span
+                )
+
             # Get historical metrics from database
             query = select(SystemMetric).where(SystemMetric.device_id == device_id)
 
@@ -136,23 +189,13 @@ class MetricsService:
                 since = datetime.now(UTC) - time_delta
                 query = query.where(SystemMetric.time >= since)
 
-            query = query.order_by(desc(SystemMetric.time))
-
-            if pagination:
-                query = query.offset((pagination.page - 1) * pagination.page_size).limit(
-                    pagination.page_size
-                )
-
-            result = await self.db.execute(query)
-            metrics = result.scalars().all()
+            metrics, page_fields = await self._fetch_history(
+                query, pagination, [SystemMetric.time, SystemMetric.device_id]
+            )
 
             return SystemMetricsList(
                 items=[SystemMetricResponse.model_validate(metric) for metric in metrics],
-                page=pagination.page if pagination else 1,
-                page_size=pagination.page_size if pagination else len(metrics),
-                total_pages=1,
-                has_next=False,
-                has_previous=False,
+                **page_fields,
             )
 
     async def get_device_drives(
@@ -216,25 +259,67 @@ class MetricsService:
             query = select(DriveHealth).where(DriveHealth.device_id == device_id)
 
             if drive_name:
-                query = query.where(DriveHealth.device.ilike(f"%{drive_name}%"))
+                query = query.where(DriveHealth.drive_name.ilike(f"%{drive_name}%"))
 
-            if pagination:
-                query = query.offset((pagination.page - 1) * pagination.page_size).limit(
-                    pagination.page_size
-                )
-
-            result = await self.db.execute(query)
-            drives_list = list(result.scalars().all())
+            drives_list, page_fields = await self._fetch_history(
+                query,
+                pagination,
+                [DriveHealth.time, DriveHealth.device_id, DriveHealth.drive_name],
+            )
 
             return DriveHealthList(
                 items=[DriveHealthResponse.model_validate(drive) for drive in drives_list],
-                page=pagination.page if pagination else 1,
-                page_size=pagination.page_size if pagination else len(drives_list),
-                total_pages=1,
-                has_next=False,
-                has_previous=False,
+                **page_fields,
             )
 
+    async def _fetch_history(
+        self,
+        query: Select,
+        pagination: PaginationParams | None,
+        key_columns: list[InstrumentedAttribute],
+    ) -> tuple[list[Any], dict[str, Any]]:
+        """
+        Fetch history rows, newest first, and the pagination fields of the response.
+
+        Without pagination the whole filtered range is returned in one list. Paged
+        totals are estimated from planner statistics unless the caller explicitly
+        asks for an exact count, so paging a hypertable never adds a count(*).
+        """
+        if pagination is None:
+            ordered = query.order_by(*(column.desc() for column in key_columns))
+            result = await self.db.execute(ordered)
+            rows = list(result.scalars().all())
+            return rows, {
+                "total_count": len(rows),
+                "page": 1,
+                "page_size": len(rows),
+                "total_pages": 1,
+                "has_next": False,
+                "has_previous": False,
+            }
+
+        if "include_total" not in pagination.model_fields_set:
+            pagination = pagination.model_copy(update={"include_total": False})
+        page = await fetch_keyset_page(self.db, query, pagination, key_columns)
+        total = await count_rows(self.db, query, pagination)
+        return page.items, self._page_fields(pagination, total, page.has_next, page.next_cursor)
+
+    @staticmethod
+    def _page_fields(
+        pagination: PaginationParams, total: int, has_next: bool, next_cursor: str | None
+    ) -> dict[str, Any]:
+        """Pagination fields for a keyset-paged history response"""
+        return {
+            "total_count": total,
+            "page": pagination.page,
+            "page_size": pagination.page_size,
+            "total_pages": (total + pagination.page_size - 1) // pagination.page_size,
+            "has_next": has_next,
+            "has_previous": pagination.page > 1 or pagination.cursor is not None,
+            "next_cursor": next_cursor,
+            "total_is_estimate": not pagination.include_total,
+        }
+
     async def get_device_network(
         self,
         device_id: UUID,
@@ -287,9 +372,6 @@ class MetricsService:
             glances_service = GlancesService(device)
 
             try:
-                if not await glances_service.test_connectivity():
-                    raise DeviceNotFoundError(f"Glances API not accessible on {device.hostname}")
-                
                 network_stats = await glances_service.get_network_stats()
                 
                 # Filter by interface name if specified
@@ -319,8 +401,6 @@ class MetricsService:
             except Exception as e:
                 logger.error(f"Error getting Glances network stats for device {device_id}: {e}")
                 raise SSHCommandError("glances", f"Failed to get network statistics: {str(e)}")
-            finally:
-                await glances_service.close()
 
     async def get_device_zfs_status(
         self,
@@ -562,6 +642,122 @@ class MetricsService:
             logger.error(f"Error checking updates for device {device_id}: {e}")
             raise SSHCommandError("ssh", f"Failed to check updates: {str(e)}")
 
+    def _select_resolution(
+        self,
+        resolution: TimeSeriesInterval | str | None,
+        points: int | None,
+        span: timedelta,
+    ) -> TimeSeriesInterval | None:
+        """
+        Choose the bucket width for a historical query.
+
+        With "auto" (or only a point count), picks the coarsest rollup that still
+        yields at least `points` buckets over the span. Returns None for raw rows,
+        either because no downsampling was requested or because even the finest
+        rollup is too coarse for the requested detail.
+        """
+        if resolution is None and points is None:
+            return None
+
+        if resolution is not None and resolution != "auto":
+            try:
+                return TimeSeriesInterval(resolution)
+            except ValueError as e:
+                valid = ", ".join(["auto", *(interval.value for interval in TimeSeriesInterval)])
+                raise ValidationError(
+                    f"Invalid resolution: {resolution}. Valid resolutions: {valid}",
+                    field="resolution",
+                    value=resolution,
+                ) from e
+
+        target_points = points or DEFAULT_CHART_POINTS
+        rollups = sorted(
+            (TimeSeriesInterval(key) for key in SYSTEM_METRICS_ROLLUPS),
+            key=lambda interval: RESOLUTION_WIDTHS[interval],
+            reverse=True,
+        )
+        for interval in rollups:
+            if span / RESOLUTION_WIDTHS[interval] >= target_points:
+                return interval
+        return None
+
+    def _rollup_for(self, interval: TimeSeriesInterval) -> dict[str, str]:
+        """Get the coarsest rollup whose buckets evenly divide the requested interval"""
+        width = RESOLUTION_WIDTHS[interval]
+        candidates = [
+            (RESOLUTION_WIDTHS[TimeSeriesInterval(key)], rollup)
+            for key, rollup in SYSTEM_METRICS_ROLLUPS.items()
+            if width % RESOLUTION_WIDTHS[TimeSeriesInterval(key)] == timedelta(0)
+        ]
+        return max(candidates, key=lambda candidate: candidate[0])[1]
+
+    async def _get_downsampled_metrics(
+        self, device_id: UUID, interval: TimeSeriesInterval, since: datetime
+    ) -> SystemMetricsAggregatedList:
+        """Get bucketed metrics for a device from the matching continuous aggregate"""
+        rollup = self._rollup_for(interval)
+        source = rollup["view"]
+        params = {
+            "device_id": device_id,
+            "since": since,
+            "bucket_width": RESOLUTION_WIDTHS[interval],
+        }
+
+        # Re-bucket the rollup; averages are weighted by the sample count of the
+        # buckets where the column has a value
+        combined = [
+            *(
+                f"sum({col} * sample_count) / nullif(sum(sample_count) FILTER (WHERE {col} IS NOT NULL), 0) AS {col}"
+                for col in _ROLLUP_AVG_COLUMNS
+            ),
+            *(f"max({col}) AS {col}" for col in _ROLLUP_MAX_COLUMNS),
+            *(f"min({col}) AS {col}" for col in _ROLLUP_MIN_COLUMNS),
+            *(f"sum({col}) AS {col}" for col in _ROLLUP_SUM_COLUMNS),
+            "min(period_start) AS period_start",
+            "max(period_end) AS period_end",
+        ]
+        rollup_query = text(f"""
+            SELECT time_bucket(:bucket_width, bucket) AS time_bucket, device_id, {", ".join(combined)}
+            FROM {source}
+            WHERE device_id = :device_id AND bucket >= :since
+            GROUP BY 1, 2
+            ORDER BY 1
+        """)
+
+        try:
+            # Savepoint, so a missing aggregate does not abort the caller's transaction
+            async with self.db.begin_nested():
+                result = await self.db.execute(rollup_query, params)
+        except Exception as e:
+            # Rollups not set up yet (see setup_continuous_aggregates); bucket the raw table
+            logger.warning(f"Continuous aggregate {source} unavailable, downsampling raw metrics: {e}")
+            source = "system_metrics"
+            result = await self.db.execute(
+                text(f"""
+                    SELECT time_bucket(:bucket_width, time) AS time_bucket, device_id,
+                        {SYSTEM_METRICS_ROLLUP_COLUMNS}
+                    FROM system_metrics
+                    WHERE device_id = :device_id AND time >= :since
+                    GROUP BY 1, 2
+                    ORDER BY 1
+                """),
+                params,
+            )
+
+        metrics = [SystemMetricsAggregated.model_validate(dict(row._mapping)) for row in result.fetchall()]
+
+        return SystemMetricsAggregatedList(
+            metrics=metrics,
+            total_count=len(metrics),
+            query_params=SystemMetricsQuery(
+                start_time=since,
+                device_ids=[device_id],
+                aggregation=AggregationParams(interval=interval),
+            ),
+            resolution=interval,
+            source=source,
+        )
+
     def _parse_time_range(self, time_range: str) -> timedelta:
         """Parse time range string to timedelta"""
         if time_range.endswith("h"):
@@ -0,0 +1,276 @@
+"""
+Polling Scheduler
+
+Central deadline scheduler for background device polling. Every (device, data_type)
+pair is a job in a single deadline-ordered priority queue that is drained by a
+fixed-size worker pool, so the number of collections in flight stays bounded no
+matter how many devices are monitored.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import contextlib
+from dataclasses import dataclass, field
+import heapq
+import itertools
+import logging
+import random
+from typing import Any
+from uuid import UUID
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(order=True)
+class PollingJob:
+    """A recurring collection of one data type from one device"""
+
+    due_at: float
+    sequence: int
+    device_id: UUID = field(compare=False)
+    data_type: str = field(compare=False)
+    interval: float = field(compare=False)
+    # Nominal deadline on the job's fixed-rate grid; due_at adds jitter on top
+    deadline: float = field(compare=False)
+    consecutive_failures: int = field(default=0, compare=False)
+    cancelled: bool = field(default=False, compare=False)
+
+
+# Called for each due job; returns seconds until the next run to override the
+# regular schedule (e.g. failure backoff) or None to stay on schedule
+JobRunner = Callable[[PollingJob], Awaitable[float | None]]
+
+
+class PollingScheduler:
+    """
+    Deadline-ordered job queue drained by a bounded pool of workers.
+
+    Jobs run on a fixed-rate grid (deadline + interval) with random jitter added
+    to each run so devices with equal intervals do not fire in lockstep. When a
+    job falls more than a full interval behind, the missed runs are skipped and
+    the job runs once immediately, then resumes on its grid.
+    """
+
+    def __init__(
+        self,
+        run_job: JobRunner,
+        max_workers: int = 10,
+        jitter_ratio: float = 0.1,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            run_job: Coroutine function executing a single job
+            max_workers: Maximum number of jobs running concurrently
+            jitter_ratio: Fraction of the interval added as random delay to each run
+        """
+        self.run_job = run_job
+        self.max_workers = max(1, max_workers)
+        self.jitter_ratio = max(0.0, jitter_ratio)
+
+        self._queue: list[PollingJob] = []
+        self._jobs: dict[UUID, dict[str, PollingJob]] = {}
+        self._sequence = itertools.count()
+        # Set whenever the queue changes so idle workers re-check the earliest deadline
+        self._queue_changed = asyncio.Event()
+        self._workers: list[asyncio.Task] = []
+        self._running_jobs = 0
+
+        self._stats: dict[str, int] = {
+            "jobs_completed": 0,
+            "jobs_failed": 0,
+            "missed_deadlines": 0,
+        }
+        # Scheduling lag per data type: how late jobs start relative to their due time
+        self._lag: dict[str, dict[str, float]] = {}
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the worker pool is running"""
+        return any(not worker.done() for worker in self._workers)
+
+    def _now(self) -> float:
+        return asyncio.get_running_loop().time()
+
+    def _jitter(self, interval: float) -> float:
+        return random.uniform(0, interval * self.jitter_ratio) if self.jitter_ratio else 0.0
+
+    def start(self) -> None:
+        """Start the worker pool"""
+        if self.is_running:
+            return
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"polling-worker-{index}")
+            for index in range(self.max_workers)
+        ]
+        logger.info("polling.scheduler.start", extra={"workers": self.max_workers})
+
+    async def stop(self) -> None:
+        """Stop the worker pool and drop all scheduled jobs"""
+        for worker in self._workers:
+            worker.cancel()
+        for worker in self._workers:
+            with contextlib.suppress(asyncio.CancelledError):
+                await worker
+        self._workers = []
+
+        for device_jobs in self._jobs.values():
+            for job in device_jobs.values():
+                job.cancelled = True
+        self._jobs.clear()
+        self._queue.clear()
+
+    def schedule(
+        self, device_id: UUID, data_type: str, interval: float, first_run_delay: float = 0.0
+    ) -> PollingJob:
+        """
+        Add a recurring job, replacing any existing job for the same device and data type.
+
+        Args:
+            device_id: Device to collect from
+            data_type: Type of data to collect
+            interval: Seconds between runs
+            first_run_delay: Seconds before the first run
+
+        Returns:
+            PollingJob: The scheduled job
+        """
+        existing = self._jobs.get(device_id, {}).get(data_type)
+        if existing is not None:
+            existing.cancelled = True
+
+        deadline = self._now() + first_run_delay
+        job = PollingJob(
+            due_at=deadline,
+            sequence=next(self._sequence),
+            device_id=device_id,
+            data_type=data_type,
+            interval=interval,
+            deadline=deadline,
+        )
+        self._jobs.setdefault(device_id, {})[data_type] = job
+        self._push(job)
+        return job
+
+    def unschedule_device(self, device_id: UUID) -> int:
+        """
+        Remove all jobs for a device. A job that is currently running finishes
+        but is not rescheduled.
+
+        Returns:
+            int: Number of jobs removed
+        """
+        device_jobs = self._jobs.pop(device_id, {})
+        for job in device_jobs.values():
+            job.cancelled = True
+        return len(device_jobs)
+
+    def scheduled_devices(self) -> list[UUID]:
+        """Get the IDs of devices with scheduled jobs"""
+        return list(self._jobs.keys())
+
+    def _push(self, job: PollingJob) -> None:
+        heapq.heappush(self._queue, job)
+        self._queue_changed.set()
+
+    async def _next_job(self) -> PollingJob:
+        """Wait until the earliest job is due and take it off the queue"""
+        while True:
+            while self._queue and self._queue[0].cancelled:
+                heapq.heappop(self._queue)
+
+            timeout = None
+            if self._queue:
+                timeout = self._queue[0].due_at - self._now()
+                if timeout <= 0:
+                    return heapq.heappop(self._queue)
+
+            # Sleep until the earliest deadline or until a job is added
+            self._queue_changed.clear()
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._queue_changed.wait(), timeout=timeout)
+
+    async def _worker(self) -> None:
+        """Run due jobs until cancelled"""
+        while True:
+            job = await self._next_job()
+            self._record_lag(job.data_type, self._now() - job.due_at)
+
+            self._running_jobs += 1
+            delay_override: float | None = None
+            try:
+                delay_override = await self.run_job(job)
+                self._stats["jobs_completed"] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._stats["jobs_failed"] += 1
+                logger.error(
+                    "polling.scheduler.job_error",
+                    extra={"device_id": str(job.device_id), "data_type": job.data_type, "error": str(e)},
+                )
+            finally:
+                self._running_jobs -= 1
+
+            if not job.cancelled:
+                self._reschedule(job, delay_override)
+
+    def _reschedule(self, job: PollingJob, delay_override: float | None) -> None:
+        """Put a finished job back on the queue at its next deadline"""
+        now = self._now()
+
+        if delay_override is not None:
+            # Off-grid run (backoff); the grid restarts from there
+            job.deadline = now + delay_override
+            job.due_at = job.deadline
+        else:
+            deadline = job.deadline + job.interval
+            if deadline <= now:
+                # Fell behind: skip the runs we can no longer make and run once now
+                missed = int((now - deadline) // job.interval)
+                self._stats["missed_deadlines"] += missed + 1
+                deadline += missed * job.interval
+            job.deadline = deadline
+            job.due_at = deadline + self._jitter(job.interval)
+
+        job.sequence = next(self._sequence)
+        self._push(job)
+
+    def _record_lag(self, data_type: str, lag: float) -> None:
+        lag = max(0.0, lag)
+        lag_stats = self._lag.setdefault(data_type, {
+            "runs": 0,
+            "total_lag_seconds": 0.0,
+            "last_lag_seconds": 0.0,
+            "max_lag_seconds": 0.0,
+        })
+        lag_stats["runs"] += 1
+        lag_stats["total_lag_seconds"] += lag
+        lag_stats["last_lag_seconds"] = lag
+        lag_stats["max_lag_seconds"] = max(lag_stats["max_lag_seconds"], lag)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get scheduler statistics, including scheduling lag per data type"""
+        overdue = [job for job in self._queue if not job.cancelled and job.due_at <= self._now()]
+        current_lag = max((self._now() - job.due_at for job in overdue), default=0.0)
+
+        return {
+            "is_running": self.is_running,
+            "workers": self.max_workers,
+            "running_jobs": self._running_jobs,
+            "scheduled_jobs": sum(len(jobs) for jobs in self._jobs.values()),
+            "overdue_jobs": len(overdue),
+            "current_lag_seconds": round(current_lag, 3),
+            "jitter_ratio": self.jitter_ratio,
+            **self._stats,
+            "lag": {
+                data_type: {
+                    "runs": int(stats["runs"]),
+                    "last_lag_seconds": round(stats["last_lag_seconds"], 3),
+                    "avg_lag_seconds": round(stats["total_lag_seconds"] / stats["runs"], 3),
+                    "max_lag_seconds": round(stats["max_lag_seconds"], 3),
+                }
+                for data_type, stats in self._lag.items()
+            },
+        }
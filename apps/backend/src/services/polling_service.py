@@ -3,11 +3,15 @@ Service layer for background device polling and metrics collection.
 """
 
 import asyncio
+from collections.abc import Callable
 import contextlib
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
 import json
 import logging
-from typing import Any, Callable, cast
+import random
+import time
+from typing import Any, cast
 from uuid import UUID
 
 from sqlalchemy import and_, select
@@ -24,9 +28,11 @@ from apps.backend.src.core.exceptions import (
     DeviceNotFoundError,
     SSHConnectionError,
 )
+from apps.backend.src.core.ingestion import get_ingestion_buffer
 from apps.backend.src.models.container import ContainerSnapshot
 from apps.backend.src.models.device import Device
 from apps.backend.src.models.metrics import DriveHealth, SystemMetric
+from apps.backend.src.services.polling_scheduler import PollingJob, PollingScheduler
 from apps.backend.src.services.unified_data_collection import (
     UnifiedDataCollectionService,
     get_unified_data_collection_service,
@@ -38,15 +44,26 @@ from apps.backend.src.utils.ssh_command_manager import get_ssh_command_manager
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class ContainerInventory:
+    """Container listing for a device joined with per-container `docker stats` output"""
+
+    mode: str
+    entries: list[tuple[dict[str, Any], dict[str, Any]]] = field(default_factory=list)
+    status: str = "success"
+    message: str | None = None
+    ssh_round_trips: int = 0
+
+
 class PollingService:
     def __init__(self) -> None:
         self.ssh_client = get_ssh_client()
         self.ssh_command_manager = get_ssh_command_manager()
         self.settings = get_settings()
         self.event_bus = get_event_bus()
-        self.polling_tasks: dict[
-            UUID, dict[str, asyncio.Task]
-        ] = {}  # device_id -> {task_type: task}
+        # Time-series rows are written in batches by the shared write-behind buffer
+        self.ingestion_buffer = get_ingestion_buffer()
+        self.polled_devices: dict[UUID, Device] = {}  # device_id -> latest device record
         self.is_running = False
         self.unified_data_service: UnifiedDataCollectionService | None = None  # Will be initialized in start_polling
 
@@ -55,6 +72,17 @@ class PollingService:
         self.metrics_interval = self.settings.polling.polling_system_metrics_interval
         self.drive_health_interval = self.settings.polling.polling_drive_health_interval
         self.max_concurrent_devices = self.settings.polling.polling_max_concurrent_devices
+        self.container_batch_stats = self.settings.polling.polling_container_batch_stats
+
+        # All (device, data_type) collections share one bounded worker pool
+        self.scheduler = PollingScheduler(
+            self._run_polling_job,
+            max_workers=self.max_concurrent_devices,
+            jitter_ratio=self.settings.polling.polling_jitter_ratio,
+        )
+
+        # Latest collection latency per device: device_id -> {data_type: stats}
+        self.collection_latency: dict[UUID, dict[str, dict[str, Any]]] = {}
 
     async def start_polling(self) -> None:
         """Start the background polling service"""
@@ -78,6 +106,7 @@ class PollingService:
         )
 
         # Start polling loop - it will manage its own database sessions
+        self.scheduler.start()
         asyncio.create_task(self._polling_loop())
 
     async def stop_polling(self) -> None:
@@ -88,15 +117,9 @@ class PollingService:
         logger.info("Stopping device polling service")
         self.is_running = False
 
-        # Cancel all polling tasks for all devices
-        for _device_id, tasks in self.polling_tasks.items():
-            for _task_type, task in tasks.items():
-                if not task.done():
-                    task.cancel()
-                    with contextlib.suppress(asyncio.CancelledError):
-                        await task
-
-        self.polling_tasks.clear()
+        # Stop the worker pool and drop all scheduled jobs
+        await self.scheduler.stop()
+        self.polled_devices.clear()
 
     async def _polling_loop(self) -> None:
         """Main polling loop that manages device polling tasks"""
@@ -113,8 +136,8 @@ class PollingService:
                 # Get all devices that should be polled
                 devices = await self._get_devices_to_poll()
 
-                # Start/stop polling tasks as needed
-                await self._manage_polling_tasks(devices)
+                # Schedule/unschedule polling jobs as needed
+                await self._manage_polling_jobs(devices)
 
                 # Wait before next iteration
                 await asyncio.sleep(60)  # Check every minute for device changes
@@ -136,130 +159,98 @@ class PollingService:
             result = await db.execute(query)
             return list(result.scalars().all())
 
-    async def _manage_polling_tasks(self, devices: list[Device]) -> None:
-        """Start/stop polling tasks based on current devices"""
-        from typing import cast
-        current_device_ids = {cast(UUID, device.id) for device in devices}
-        running_device_ids = set(self.polling_tasks.keys())
+    def _polling_schedule(self) -> dict[str, tuple[int, Callable[[Device], Any]]]:
+        """Polling interval and collection method for each data type"""
+        return {
+            "containers": (self.container_interval, self._collect_container_data_unified),
+            "system_metrics": (self.metrics_interval, self._collect_system_metrics_unified),
+            "drive_health": (self.drive_health_interval, self._collect_drive_health_unified),
+        }
+
+    async def _manage_polling_jobs(self, devices: list[Device]) -> None:
+        """Add/remove scheduler jobs based on current devices"""
+        current_devices = {cast(UUID, device.id): device for device in devices}
 
         # Stop polling for devices no longer in the list
-        to_stop = running_device_ids - current_device_ids
-        for device_id in to_stop:
-            tasks = self.polling_tasks.pop(device_id)
-            for _task_type, task in tasks.items():
-                if not task.done():
-                    task.cancel()
-                    with contextlib.suppress(asyncio.CancelledError):
-                        await task
+        for device_id in set(self.polled_devices) - set(current_devices):
+            del self.polled_devices[device_id]
+            self.scheduler.unschedule_device(device_id)
+            self.collection_latency.pop(device_id, None)
             logger.info(f"Stopped polling for device {device_id}")
 
-        # Start polling for new devices with staggered startup
-        to_start = current_device_ids - running_device_ids
-        device_delay = 0
         task_stagger = self.settings.polling.polling_task_stagger_delay
         device_stagger = self.settings.polling.polling_device_stagger_delay
 
-        for device in devices:
-            if device.id in to_start:
-                # Create separate tasks for each data type with different intervals
-                device_tasks = {
-                    "containers": asyncio.create_task(self._poll_containers(device, device_delay)),
-                    "metrics": asyncio.create_task(self._poll_system_metrics(device, device_delay + task_stagger)),
-                    "drive_health": asyncio.create_task(self._poll_drive_health(device, device_delay + (task_stagger * 2))),
-                }
-                self.polling_tasks[cast(UUID, device.id)] = device_tasks
-                logger.info(
-                    f"Started staggered polling for device {device.id} ({device.hostname}) with {device_delay}s delay"
-                )
-                # Stagger device startups to avoid SSH congestion
-                device_delay += device_stagger
-
-    async def _poll_data_type(
-        self,
-        device: Device,
-        collection_method: Callable,
-        interval: int,
-        data_type: str,
-        startup_delay: int = 0
-    ) -> None:
-        """Generic method to continuously poll data for a device using unified service"""
-        from typing import cast
-        device_id = cast(UUID, device.id)
-        consecutive_failures = 0
-        max_consecutive_failures = 3
+        for device_id, device in current_devices.items():
+            is_new = device_id not in self.polled_devices
+            # Jobs always collect with the most recently loaded device record
+            self.polled_devices[device_id] = device
+            if not is_new:
+                continue
 
-        # Initial startup delay to stagger device polling
-        if startup_delay > 0:
-            logger.debug(f"{data_type} polling for {device.hostname} waiting {startup_delay}s before starting")
-            await asyncio.sleep(startup_delay)
+            # Spread first runs randomly over the stagger window instead of
+            # offsetting each new device by a fixed step, so startup load stays
+            # flat regardless of the number of devices
+            device_delay = random.uniform(0, device_stagger)
+            for index, (data_type, (interval, _)) in enumerate(self._polling_schedule().items()):
+                self.scheduler.schedule(
+                    device_id,
+                    data_type,
+                    interval,
+                    first_run_delay=device_delay + task_stagger * index,
+                )
+            logger.info(
+                f"Scheduled polling for device {device_id} ({device.hostname}) with {device_delay:.1f}s delay"
+            )
 
-        while self.is_running and device_id in self.polling_tasks:
-            try:
-                # Use unified data collection service with force_refresh=True for polling
-                if self.unified_data_service:
-                    await self.unified_data_service.collect_and_store_data(
-                        data_type=data_type,
-                        device_id=device_id,
-                        collection_method=collection_method,
-                        force_refresh=True,  # Polling always gets fresh data
-                        correlation_id=f"polling_{data_type}_{device_id}"
-                    )
-                else:
-                    logger.error(f"Unified data service not initialized for {data_type} polling")
-                    await asyncio.sleep(interval)
-                    continue
+    async def _run_polling_job(self, job: PollingJob) -> float | None:
+        """
+        Collect one data type from one device for the scheduler.
 
-                consecutive_failures = 0
-                await asyncio.sleep(interval)
+        Returns:
+            Seconds until the next attempt when backing off after a failure, or
+            None to keep the job on its regular schedule
+        """
+        device = self.polled_devices.get(job.device_id)
+        if device is None:
+            return None
 
-            except SSHConnectionError:
-                consecutive_failures += 1
-                backoff_delay = min(30 * (2 ** (consecutive_failures - 1)), 300)  # Exponential backoff, max 5 minutes
-                logger.warning(
-                    f"SSH connection failed for {data_type} polling on {device.hostname} "
-                    f"(attempt {consecutive_failures}/{max_consecutive_failures}) - waiting {backoff_delay}s"
-                )
-                if consecutive_failures >= max_consecutive_failures:
-                    await self._update_device_status(device, "offline")
-                    await asyncio.sleep(interval * 2)
-                else:
-                    await asyncio.sleep(backoff_delay)
+        max_consecutive_failures = 3
+        _, collect = self._polling_schedule()[job.data_type]
 
-            except Exception as e:
-                consecutive_failures += 1
-                backoff_delay = min(60 * consecutive_failures, 300)  # Linear backoff for other errors
-                logger.error(f"Error polling {data_type} for {device.hostname}: {e} - waiting {backoff_delay}s")
-                await asyncio.sleep(backoff_delay)
-
-    async def _poll_containers(self, device: Device, startup_delay: int = 0) -> None:
-        """Continuously poll container data for a device"""
-        return await self._poll_data_type(
-            device,
-            lambda: self._collect_container_data_unified(device),
-            self.container_interval,
-            "containers",
-            startup_delay
-        )
+        if not self.unified_data_service:
+            logger.error(f"Unified data service not initialized for {job.data_type} polling")
+            return None
 
-    async def _poll_system_metrics(self, device: Device, startup_delay: int = 0) -> None:
-        """Continuously poll system metrics for a device"""
-        return await self._poll_data_type(
-            device,
-            lambda: self._collect_system_metrics_unified(device),
-            self.metrics_interval,
-            "system_metrics",
-            startup_delay
-        )
+        try:
+            # Use unified data collection service with force_refresh=True for polling
+            await self.unified_data_service.collect_and_store_data(
+                data_type=job.data_type,
+                device_id=job.device_id,
+                collection_method=lambda: collect(device),
+                force_refresh=True,  # Polling always gets fresh data
+                correlation_id=f"polling_{job.data_type}_{job.device_id}"
+            )
+            job.consecutive_failures = 0
+            return None
+
+        except SSHConnectionError:
+            job.consecutive_failures += 1
+            backoff_delay: float = min(30 * (2 ** (job.consecutive_failures - 1)), 300)  # Exponential backoff, max 5 minutes
+            logger.warning(
+                f"SSH connection failed for {job.data_type} polling on {device.hostname} "
+                f"(attempt {job.consecutive_failures}/{max_consecutive_failures}) - waiting {backoff_delay}s"
+            )
+            if job.consecutive_failures >= max_consecutive_failures:
+                await self._update_device_status(device, "offline")
+                return job.interval * 2
+            return backoff_delay
 
-    async def _poll_drive_health(self, device: Device, startup_delay: int = 0) -> None:
-        """Continuously poll drive health for a device"""
-        return await self._poll_data_type(
-            device,
-            lambda: self._collect_drive_health_unified(device),
-            self.drive_health_interval,
-            "drive_health",
-            startup_delay
-        )
+        except Exception as e:
+            job.consecutive_failures += 1
+            backoff_delay = min(60 * job.consecutive_failures, 300)  # Linear backoff for other errors
+            logger.error(f"Error polling {job.data_type} for {device.hostname}: {e} - waiting {backoff_delay}s")
+            return backoff_delay
 
     async def _update_device_status(self, device: Device, status: str) -> None:
         """Update device status and last seen timestamp"""
@@ -327,9 +318,7 @@ class PollingService:
             network_bytes_recv=0,
         )
 
-        async with self.session_factory() as db:
-            db.add(metric)
-            await db.commit()
+        await self.ingestion_buffer.add_models([metric])
 
         # Emit metric collected event for real-time updates
         event = MetricCollectedEvent(
@@ -475,11 +464,8 @@ class PollingService:
                 "smart_status": "PASSED" if health_status == "healthy" else "UNKNOWN"
             })
 
-        # Add all drive records to database
-        async with self.session_factory() as db:
-            for drive in drives:
-                db.add(drive)
-            await db.commit()
+        # Queue all drive records for the next batched insert
+        await self.ingestion_buffer.add_models(drives)
 
         # Emit drive health events for real-time updates
         for drive in drives:
@@ -509,16 +495,71 @@ class PollingService:
             host=cast(str, device.hostname), port=cast(int, device.ssh_port) or 22, username=cast(str, device.ssh_username) or "root"
         )
 
+        start_time = time.perf_counter()
+        if self.container_batch_stats:
+            inventory = await self._fetch_container_inventory_batched(device, ssh_info)
+        else:
+            inventory = await self._fetch_container_inventory_per_container(device, ssh_info)
+
+        result = await self._store_container_inventory(device, inventory)
+
+        latency = time.perf_counter() - start_time
+        self._record_collection_latency(device, "containers", latency, inventory.ssh_round_trips)
+        result["collection_mode"] = inventory.mode
+        result["ssh_round_trips"] = inventory.ssh_round_trips
+        result["collection_latency_seconds"] = round(latency, 3)
+        return result
+
+    async def _fetch_container_inventory_batched(
+        self, device: Device, ssh_info: SSHConnectionInfo
+    ) -> ContainerInventory:
+        """Fetch `docker ps` and `docker stats` for all containers in one SSH round-trip"""
+        inventory = ContainerInventory(mode="batched", ssh_round_trips=1)
+
+        try:
+            inventory_data = await self.ssh_command_manager.execute_command(
+                "container_inventory",
+                ssh_info
+            )
+        except Exception as e:
+            logger.warning(f"Failed to get container inventory for {device.hostname}: {e}")
+            inventory.status = "error"
+            inventory.message = f"Failed to get container list: {str(e)}"
+            return inventory
+
+        if not isinstance(inventory_data, dict):
+            inventory.status = "error"
+            inventory.message = "Failed to parse container inventory output"
+            return inventory
+
+        if not inventory_data.get("docker_available", True):
+            inventory.status = "docker_not_available"
+            inventory.message = "Docker not available on device"
+            return inventory
+
+        stats_by_key: dict[str, dict[str, Any]] = inventory_data.get("stats", {})
+        for container_data in inventory_data.get("containers", []):
+            container_id = container_data.get("ID", "")
+            container_name = container_data.get("Names", "").lstrip("/")
+            # Stopped containers have no `docker stats` entry and report zero usage
+            stats_data = stats_by_key.get(container_id[:12]) or stats_by_key.get(container_name) or {}
+            inventory.entries.append((container_data, stats_data))
+
+        return inventory
+
+    async def _fetch_container_inventory_per_container(
+        self, device: Device, ssh_info: SSHConnectionInfo
+    ) -> ContainerInventory:
+        """Fetch the container list, then `docker stats` separately for each container"""
+        inventory = ContainerInventory(mode="per_container")
+
         # Check if Docker is available
         docker_check = await self.ssh_client.execute_command(ssh_info, "docker --version")
+        inventory.ssh_round_trips += 1
         if not docker_check.stdout:
-            return {
-                "device_id": str(device.id),
-                "hostname": device.hostname,
-                "containers": [],
-                "status": "docker_not_available",
-                "message": "Docker not available on device"
-            }
+            inventory.status = "docker_not_available"
+            inventory.message = "Docker not available on device"
+            return inventory
 
         # Use SSH Command Manager for robust container listing
         try:
@@ -527,17 +568,62 @@ class PollingService:
                 ssh_info,
                 parameters={"all": True}
             )
+            inventory.ssh_round_trips += 1
         except Exception as e:
             logger.warning(f"Failed to get container list for {device.hostname}: {e}")
+            inventory.status = "error"
+            inventory.message = f"Failed to get container list: {str(e)}"
+            return inventory
+
+        for container_data in container_list or []:
+            container_id = container_data.get("ID", "")
+            if not container_id or not container_id.strip():
+                continue
+
+            # Get detailed stats for this container using SSH Command Manager
+            try:
+                stats_result = await self.ssh_command_manager.execute_raw_command(
+                    f"docker stats --no-stream --format '{{{{json .}}}}' {container_id}",
+                    ssh_info,
+                    timeout=15
+                )
+                inventory.ssh_round_trips += 1
+            except Exception as e:
+                logger.warning(f"Failed to process container {container_id}: {e}")
+                continue
+
+            stats_data = {}
+            if stats_result.stdout:
+                # Check if the output contains an error message instead of JSON
+                if "Error response from daemon" in stats_result.stdout or "No such container" in stats_result.stdout:
+                    logger.debug(f"Container {container_id} no longer exists, skipping stats collection")
+                    continue
+
+                try:
+                    stats_data = json.loads(stats_result.stdout.strip())
+                except json.JSONDecodeError as e:
+                    logger.warning(f"Failed to parse stats for container {container_id}: {e}")
+                    logger.debug(f"Raw stats output for {container_id}: {repr(stats_result.stdout)}")
+                    # Continue with empty stats_data instead of failing
+
+            inventory.entries.append((container_data, stats_data))
+
+        return inventory
+
+    async def _store_container_inventory(
+        self, device: Device, inventory: ContainerInventory
+    ) -> dict[str, Any]:
+        """Persist container snapshots, emit status events and return structured data"""
+        if inventory.status != "success":
             return {
                 "device_id": str(device.id),
                 "hostname": device.hostname,
                 "containers": [],
-                "status": "error",
-                "message": f"Failed to get container list: {str(e)}"
+                "status": inventory.status,
+                "message": inventory.message,
             }
 
-        if not container_list:
+        if not inventory.entries:
             return {
                 "device_id": str(device.id),
                 "hostname": device.hostname,
@@ -549,7 +635,7 @@ class PollingService:
         containers = []
         container_data_list = []
 
-        for container_data in container_list:
+        for container_data, stats_data in inventory.entries:
             container_id = container_data.get("ID", "")
             container_name = container_data.get("Names", "").lstrip("/")
 
@@ -557,28 +643,7 @@ class PollingService:
                 logger.debug(f"Skipping container with empty ID: {container_data}")
                 continue
 
-            # Get detailed stats for this container using SSH Command Manager
             try:
-                stats_result = await self.ssh_command_manager.execute_raw_command(
-                    f"docker stats --no-stream --format '{{{{json .}}}}' {container_id}",
-                    ssh_info,
-                    timeout=15
-                )
-
-                stats_data = {}
-                if stats_result.stdout:
-                    # Check if the output contains an error message instead of JSON
-                    if "Error response from daemon" in stats_result.stdout or "No such container" in stats_result.stdout:
-                        logger.debug(f"Container {container_id} no longer exists, skipping stats collection")
-                        continue
-
-                    try:
-                        stats_data = json.loads(stats_result.stdout.strip())
-                    except json.JSONDecodeError as e:
-                        logger.warning(f"Failed to parse stats for container {container_id}: {e}")
-                        logger.debug(f"Raw stats output for {container_id}: {repr(stats_result.stdout)}")
-                        # Continue with empty stats_data instead of failing
-
                 # Parse resource usage
                 cpu_usage = 0.0
                 memory_usage_bytes = 0
@@ -643,11 +708,8 @@ class PollingService:
                 logger.warning(f"Failed to process container {container_id}: {e}")
                 continue
 
-        # Add all container snapshots to database
-        async with self.session_factory() as db:
-            for container in containers:
-                db.add(container)
-            await db.commit()
+        # Queue all container snapshots for the next batched insert
+        await self.ingestion_buffer.add_models(containers)
 
         # Emit container status events for real-time updates
         for container in containers:
@@ -676,6 +738,28 @@ class PollingService:
             "container_count": len(containers)
         }
 
+    def _record_collection_latency(
+        self, device: Device, data_type: str, latency_seconds: float, ssh_round_trips: int
+    ) -> None:
+        """Record the latest collection latency for a device and data type"""
+        device_latency = self.collection_latency.setdefault(cast(UUID, device.id), {})
+        device_latency[data_type] = {
+            "hostname": cast(str, device.hostname),
+            "latency_seconds": round(latency_seconds, 3),
+            "ssh_round_trips": ssh_round_trips,
+            "collected_at": datetime.now(UTC).isoformat(),
+        }
+        logger.debug(
+            "polling.collection.latency",
+            extra={
+                "device_id": str(device.id),
+                "hostname": device.hostname,
+                "data_type": data_type,
+                "latency_seconds": round(latency_seconds, 3),
+                "ssh_round_trips": ssh_round_trips,
+            },
+        )
+
     async def _collect_system_logs_unified(self, device: Device, service: str | None = None, since: str | None = None, lines: int = 100) -> dict[str, Any]:
         """Collect system logs for a device using SSH command manager"""
         ssh_info = SSHConnectionInfo(
@@ -982,6 +1066,13 @@ class PollingService:
             "metrics_interval_seconds": self.metrics_interval,
             "container_interval_seconds": self.container_interval,
             "drive_health_interval_seconds": self.drive_health_interval,
-            "active_devices": len(self.polling_tasks),
-            "device_ids": [str(device_id) for device_id in self.polling_tasks.keys()],
+            "active_devices": len(self.polled_devices),
+            "device_ids": [str(device_id) for device_id in self.polled_devices.keys()],
+            "max_concurrent_devices": self.max_concurrent_devices,
+            "scheduler": self.scheduler.get_stats(),
+            "ingestion": self.ingestion_buffer.get_stats(),
+            "container_collection_mode": "batched" if self.container_batch_stats else "per_container",
+            "collection_latency": {
+                str(device_id): latency for device_id, latency in self.collection_latency.items()
+            },
         }
@@ -5,23 +5,31 @@ Central orchestrator for all infrastructure data collection, implementing intell
 data freshness management and coordinated polling across different data sources.
 """
 
+import asyncio
 from datetime import UTC, datetime, timedelta
 import logging
+import weakref
 
 from typing import Any, Dict, List, Optional
 from collections.abc import Awaitable, Callable
 from uuid import UUID
 
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
-from sqlalchemy import text
+from sqlalchemy import Boolean, DateTime, Integer, Numeric, String, column, table, text
 
+from apps.backend.src.core.events import DataCollectedEvent, get_event_bus
 from apps.backend.src.core.exceptions import (
     CacheOperationError,
     DatabaseOperationError,
     DataCollectionError,
 )
+from apps.backend.src.core.ingestion import IngestionBuffer, get_ingestion_buffer
 from apps.backend.src.utils.cache_manager import CacheManager, get_cache_manager
 from apps.backend.src.utils.command_registry import get_unified_command_registry
+from apps.backend.src.utils.glances_client import get_glances_client_stats
+from apps.backend.src.utils.single_flight import SingleFlight, get_collection_single_flight
 from apps.backend.src.utils.ssh_client import SSHClient
 from apps.backend.src.services.glances_service import GlancesService
 from apps.backend.src.models.device import Device
@@ -29,6 +37,23 @@ from sqlalchemy import select
 
 logger = logging.getLogger(__name__)
 
+# Columns of data_collection_audit written per collection (see init-scripts/01-schema.sql)
+DATA_COLLECTION_AUDIT_TABLE = table(
+    "data_collection_audit",
+    column("data_type", String),
+    column("device_id", PostgresUUID(as_uuid=True)),
+    column("correlation_id", String),
+    column("collected_at", DateTime(timezone=True)),
+    column("collection_duration_seconds", Numeric),
+    column("data_size", Integer),
+    column("cache_hit", Boolean),
+    column("force_refresh", Boolean),
+    column("metadata_info", JSONB),
+)
+
+# Live services, so application shutdown can stop their background refreshes
+_services: "weakref.WeakSet[UnifiedDataCollectionService]" = weakref.WeakSet()
+
 
 class UnifiedDataCollectionService:
     """
@@ -45,6 +70,9 @@ class UnifiedDataCollectionService:
         ssh_client: SSHClient,
         ssh_command_manager: Callable | None = None,
         cache_manager: CacheManager | None = None,
+        single_flight: SingleFlight | None = None,
+        ingestion_buffer: IngestionBuffer | None = None,
+        bulk_concurrency: int = 10,
     ):
         """
         Initialize the UnifiedDataCollectionService.
@@ -54,11 +82,20 @@ class UnifiedDataCollectionService:
             ssh_client: SSH client for device communication
             ssh_command_manager: Optional command manager for SSH operations
             cache_manager: Optional cache manager for data caching
+            single_flight: Optional in-flight collection registry (defaults to the
+                process-wide one, so concurrent collections are shared across instances)
+            ingestion_buffer: Optional write-behind buffer for audit records (defaults
+                to the process-wide one)
+            bulk_concurrency: Maximum concurrent collections in get_fresh_data_bulk
         """
         self.db_session_factory = db_session_factory
         self.ssh_client = ssh_client
         self.ssh_command_manager = ssh_command_manager
         self.cache_manager = cache_manager
+        self.single_flight = single_flight or get_collection_single_flight()
+        self.event_bus = get_event_bus()
+        self.ingestion_buffer = ingestion_buffer or get_ingestion_buffer()
+        self.bulk_concurrency = max(1, bulk_concurrency)
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
 
         # Initialize unified command registry
@@ -98,6 +135,13 @@ class UnifiedDataCollectionService:
             "system_logs": 300,  # 5 minutes
         }
 
+        # Seconds past the freshness threshold that cached data may still be
+        # served while a background refresh runs; defaults to the threshold itself
+        self.max_stale: dict[str, int] = {}
+        self._background_refreshes: dict[tuple[Any, ...], asyncio.Task] = {}
+        self._refresh_stats = {"stale_served": 0, "started": 0, "deduplicated": 0, "failed": 0}
+        _services.add(self)
+
         self.logger.info(
             "UnifiedDataCollectionService initialized with freshness thresholds: %s",
             self.freshness_thresholds
@@ -141,13 +185,9 @@ class UnifiedDataCollectionService:
                         "Returning cached data for %s on device %s",
                         data_type, device_id
                     )
-                    return cached_data
+                    return self._strip_cache_metadata(cached_data)
 
-            # Collect fresh data
-            fresh_data = await self._collect_fresh_data(data_type, device_id, **kwargs)
-
-            # Cache the fresh data
-            await self._cache_data(data_type, device_id, fresh_data)
+            fresh_data = await self._collect_shared(data_type, device_id, kwargs)
 
             self.logger.info(
                 "Successfully collected fresh data: type=%s, device_id=%s",
@@ -165,6 +205,104 @@ class UnifiedDataCollectionService:
                 f"Failed to collect {data_type} data for device {device_id}"
             ) from e
 
+    async def _collect_shared(
+        self,
+        data_type: str,
+        device_id: UUID,
+        kwargs: dict[str, Any],
+        cache_result: bool = True,
+    ) -> dict[str, Any]:
+        """
+        Collect fresh data, sharing an in-flight collection with concurrent
+        callers asking for the same data.
+
+        Args:
+            data_type: Type of data to collect
+            device_id: UUID of the target device
+            kwargs: Additional parameters for data collection
+            cache_result: Cache the result (callers caching in bulk pass False)
+        """
+        async def collect() -> dict[str, Any]:
+            fresh_data = await self._collect_fresh_data(data_type, device_id, **kwargs)
+            if cache_result:
+                await self._cache_data(data_type, device_id, fresh_data)
+            return fresh_data
+
+        return dict(await self._single_flight(
+            self._collection_key("get_fresh_data", data_type, device_id, kwargs),
+            data_type,
+            collect,
+        ))
+
+    async def get_fresh_data_bulk(
+        self,
+        data_type: str,
+        device_ids: list[UUID],
+        force_refresh: bool = False,
+        max_concurrency: int | None = None,
+        **kwargs: Any
+    ) -> dict[UUID, dict[str, Any]]:
+        """
+        Get fresh data of one type for many devices.
+
+        Cached entries for all devices are read in one batch; only devices with
+        a missing or stale entry are collected, at most max_concurrency at a
+        time, and their results are cached in one batch.
+
+        Args:
+            data_type: Type of data to collect (e.g., 'containers', 'system_metrics')
+            device_ids: UUIDs of the target devices
+            force_refresh: Collect every device even if cached data is fresh
+            max_concurrency: Maximum concurrent collections (defaults to bulk_concurrency)
+            **kwargs: Additional parameters for data collection
+
+        Returns:
+            Data per device. Devices whose collection failed are omitted and logged.
+        """
+        device_ids = list(dict.fromkeys(device_ids))
+        results: dict[UUID, dict[str, Any]] = {}
+
+        if not force_refresh and self.cache_manager:
+            try:
+                cached = await self.cache_manager.get_many(data_type, device_ids)
+            except CacheOperationError as e:
+                self.logger.warning("Bulk cache lookup failed for %s: %s", data_type, str(e))
+                cached = {}
+            for device_id, cached_data in cached.items():
+                if self._is_data_fresh(cached_data, data_type):
+                    results[device_id] = self._strip_cache_metadata(cached_data)
+
+        misses = [device_id for device_id in device_ids if device_id not in results]
+        semaphore = asyncio.Semaphore(max(1, max_concurrency or self.bulk_concurrency))
+
+        async def collect(device_id: UUID) -> dict[str, Any]:
+            async with semaphore:
+                return await self._collect_shared(data_type, device_id, kwargs, cache_result=False)
+
+        collected = await asyncio.gather(
+            *(collect(device_id) for device_id in misses), return_exceptions=True
+        )
+
+        fresh: dict[UUID, dict[str, Any]] = {}
+        for device_id, result in zip(misses, collected, strict=True):
+            if isinstance(result, BaseException):
+                self.logger.warning(
+                    "Bulk collection of %s failed for device %s: %s",
+                    data_type, device_id, str(result)
+                )
+                continue
+            fresh[device_id] = result
+
+        await self._cache_data_many(data_type, fresh)
+        results.update(fresh)
+
+        self.logger.info(
+            "Bulk collection of %s: %d devices, %d from cache, %d collected, %d failed",
+            data_type, len(device_ids), len(device_ids) - len(misses), len(fresh),
+            len(misses) - len(fresh)
+        )
+        return results
+
     async def collect_and_store_data(
         self,
         data_type: str,
@@ -175,7 +313,8 @@ class UnifiedDataCollectionService:
     ) -> dict[str, Any]:
         """
         Universal data collection method implementing the complete lifecycle:
-        1. Check cache
+        1. Check cache (stale data within max_stale is returned immediately,
+           tagged stale, while a deduplicated background refresh runs)
         2. If cache miss, execute collection method
         3. Store result in database for audit
         4. Populate cache
@@ -231,6 +370,38 @@ class UnifiedDataCollectionService:
                             },
                         )
                         return self._strip_cache_metadata(cached_data)
+
+                    stale_key = self._collection_key("collect_and_store_data", data_type, device_id, kwargs)
+                    if (
+                        cached_data
+                        and stale_key is not None
+                        and self._is_data_servable_stale(cached_data, data_type)
+                    ):
+                        # Stale-while-revalidate: answer now, refresh behind the caller
+                        refresh_started = self._start_background_refresh(
+                            stale_key,
+                            lambda: self._single_flight(
+                                stale_key,
+                                data_type,
+                                lambda: self._collect_and_store_fresh(
+                                    data_type, device_id, collection_method, False,
+                                    correlation_id, datetime.now(UTC)
+                                ),
+                            ),
+                        )
+                        self._refresh_stats["stale_served"] += 1
+                        self.logger.info(
+                            "collect.success",
+                            extra={
+                                "data_type": data_type,
+                                "device_id": str(device_id),
+                                "duration_ms": int((datetime.now(UTC) - start_time).total_seconds() * 1000),
+                                "source": "stale_cache",
+                                "refresh_started": refresh_started,
+                                "correlation_id": correlation_id,
+                            },
+                        )
+                        return self._mark_stale(self._strip_cache_metadata(cached_data), cached_data)
                 except CacheOperationError as e:
                     self.logger.warning(
                         "cache.get.failed",
@@ -242,114 +413,189 @@ class UnifiedDataCollectionService:
                         },
                     )
 
-            # Step 2: Collect fresh data via the provided collection method
-            fresh_data = await collection_method()
-            collection_duration = (datetime.now(UTC) - start_time).total_seconds()
+            # Steps 2-5: Collect, audit, cache and emit. Concurrent callers asking
+            # for the same data share one in-flight collection
+            enriched_data = await self._single_flight(
+                self._collection_key("collect_and_store_data", data_type, device_id, kwargs),
+                data_type,
+                lambda: self._collect_and_store_fresh(
+                    data_type, device_id, collection_method, force_refresh, correlation_id, start_time
+                ),
+            )
 
-            # Enrich data with collection metadata
-            enriched_data = {
-                **fresh_data,
-                "collection_metadata": {
+            # Return data without cache metadata for public consumption
+            return self._strip_cache_metadata(enriched_data)
+
+        except Exception as e:
+            self.logger.error(
+                "collect.error",
+                exc_info=True,
+                extra={
                     "data_type": data_type,
                     "device_id": str(device_id),
-                    "collected_at": start_time.isoformat(),
-                    "collection_duration_seconds": collection_duration,
                     "correlation_id": correlation_id,
-                    "force_refresh": force_refresh,
-                    "cache_hit": False,
-                }
+                    "error": str(e),
+                },
+            )
+            raise DataCollectionError(
+                f"Failed to collect and store {data_type} data for device {device_id}"
+            ) from e
+
+    async def _collect_and_store_fresh(
+        self,
+        data_type: str,
+        device_id: UUID,
+        collection_method: Callable[[], Awaitable[dict[str, Any]]],
+        force_refresh: bool,
+        correlation_id: str,
+        start_time: datetime,
+    ) -> dict[str, Any]:
+        """
+        Run a collection method and store its result (audit record, cache, event).
+
+        Returns:
+            Collected data enriched with collection metadata
+        """
+        # Step 2: Collect fresh data via the provided collection method
+        fresh_data = await collection_method()
+        collection_duration = (datetime.now(UTC) - start_time).total_seconds()
+
+        # Enrich data with collection metadata
+        enriched_data = {
+            **fresh_data,
+            "collection_metadata": {
+                "data_type": data_type,
+                "device_id": str(device_id),
+                "collected_at": start_time.isoformat(),
+                "collection_duration_seconds": collection_duration,
+                "correlation_id": correlation_id,
+                "force_refresh": force_refresh,
+                "cache_hit": False,
             }
+        }
 
-            # Exit log for fresh collection
-            self.logger.info(
-                "collect.success",
+        # Exit log for fresh collection
+        self.logger.info(
+            "collect.success",
+            extra={
+                "data_type": data_type,
+                "device_id": str(device_id),
+                "duration_ms": int(collection_duration * 1000),
+                "source": "fresh",
+                "correlation_id": correlation_id,
+            },
+        )
+
+        # Step 3: Store result in database for audit (async, non-blocking)
+        try:
+            await self._store_audit_record(data_type, device_id, enriched_data, correlation_id)
+        except DatabaseOperationError as e:
+            # Log error but don't fail the entire operation
+            self.logger.error(
+                "audit.store.failed",
                 extra={
                     "data_type": data_type,
                     "device_id": str(device_id),
-                    "duration_ms": int(collection_duration * 1000),
-                    "source": "fresh",
+                    "error": str(e),
                     "correlation_id": correlation_id,
                 },
             )
 
-            # Step 3: Store result in database for audit (async, non-blocking)
+        # Step 4: Populate cache with collected data
+        cached = False
+        if self.cache_manager:
             try:
-                await self._store_audit_record(data_type, device_id, enriched_data, correlation_id)
-            except DatabaseOperationError as e:
-                # Log error but don't fail the entire operation
-                self.logger.error(
-                    "audit.store.failed",
-                    extra={
-                        "data_type": data_type,
-                        "device_id": str(device_id),
-                        "error": str(e),
-                        "correlation_id": correlation_id,
-                    },
+                # Keep the entry past its freshness threshold so it can be served stale
+                cache_ttl = self._cache_ttl(data_type)
+                success = await self.cache_manager.set(
+                    data_type, device_id, enriched_data, ttl=cache_ttl
                 )
-
-            # Step 4: Populate cache with collected data
-            if self.cache_manager:
-                try:
-                    cache_ttl = self.freshness_thresholds.get(data_type, 600)
-                    success = await self.cache_manager.set(
-                        data_type, device_id, enriched_data, ttl=cache_ttl
+                cached = bool(success)
+                if success:
+                    self.logger.debug(
+                        "cache.set.success",
+                        extra={
+                            "data_type": data_type,
+                            "device_id": str(device_id),
+                            "ttl_seconds": cache_ttl,
+                            "correlation_id": correlation_id,
+                        },
                     )
-                    if success:
-                        self.logger.debug(
-                            "cache.set.success",
-                            extra={
-                                "data_type": data_type,
-                                "device_id": str(device_id),
-                                "ttl_seconds": cache_ttl,
-                                "correlation_id": correlation_id,
-                            },
-                        )
-                    else:
-                        self.logger.warning(
-                            "cache.set.failed",
-                            extra={
-                                "data_type": data_type,
-                                "device_id": str(device_id),
-                                "correlation_id": correlation_id,
-                            },
-                        )
-                except CacheOperationError as e:
+                else:
                     self.logger.warning(
-                        "cache.set.exception",
+                        "cache.set.failed",
                         extra={
                             "data_type": data_type,
                             "device_id": str(device_id),
-                            "error": str(e),
                             "correlation_id": correlation_id,
                         },
                     )
+            except CacheOperationError as e:
+                self.logger.warning(
+                    "cache.set.exception",
+                    extra={
+                        "data_type": data_type,
+                        "device_id": str(device_id),
+                        "error": str(e),
+                        "correlation_id": correlation_id,
+                    },
+                )
 
-            # Step 5: Emit event (placeholder for future implementation)
-            self._emit_data_collection_event(data_type, device_id, enriched_data, correlation_id)
+        # Step 5: Emit event so subscribers (cache write-through, etc.) see the new data
+        self._emit_data_collection_event(data_type, device_id, enriched_data, correlation_id, cached=cached)
 
-            # Return data without cache metadata for public consumption
-            return self._strip_cache_metadata(enriched_data)
+        return enriched_data
 
-        except Exception as e:
-            self.logger.error(
-                "collect.error",
-                exc_info=True,
-                extra={
-                    "data_type": data_type,
-                    "device_id": str(device_id),
-                    "correlation_id": correlation_id,
-                    "error": str(e),
-                },
-            )
-            raise DataCollectionError(
-                f"Failed to collect and store {data_type} data for device {device_id}"
-            ) from e
+    def _collection_key(
+        self, operation: str, data_type: str, device_id: UUID | None, params: dict[str, Any]
+    ) -> tuple[Any, ...] | None:
+        """
+        Build the single-flight key for a collection.
+
+        Collections are only coalesced when they target a known device. The
+        correlation ID differs per caller and does not change what is collected,
+        so it is not part of the key.
+
+        Returns:
+            Hashable key, or None if the collection must not be coalesced
+        """
+        if device_id is None:
+            return None
+        frozen_params = tuple(sorted(
+            ((name, value) for name, value in params.items() if name != "correlation_id"),
+            key=lambda item: item[0],
+        ))
+        try:
+            hash(frozen_params)
+        except TypeError:
+            return None
+        return (operation, data_type, str(device_id), frozen_params)
+
+    async def _single_flight(
+        self,
+        key: tuple[Any, ...] | None,
+        data_type: str,
+        collect: Callable[[], Awaitable[dict[str, Any]]],
+    ) -> dict[str, Any]:
+        """Run a collection, joining an identical one already in flight"""
+        if key is None:
+            return await collect()
+        return await self.single_flight.do(key, collect, label=data_type)
+
+    def get_single_flight_stats(self) -> dict[str, Any]:
+        """
+        Get statistics on coalesced collections.
+
+        Returns:
+            Dictionary with execution and coalesced request counts per data type
+        """
+        return self.single_flight.get_stats()
 
     async def _get_cached_data(
         self, data_type: str, device_id: UUID
     ) -> dict[str, Any] | None:
         """
-        Retrieve cached data from the database.
+        Retrieve cached data from the cache manager.
         
         Args:
             data_type: Type of data to retrieve
@@ -358,9 +604,13 @@ class UnifiedDataCollectionService:
         Returns:
             Cached data if available, None otherwise
         """
-        # This will be implemented in subsequent tasks
-        # For now, return None to always trigger fresh collection
-        return None
+        if not self.cache_manager:
+            return None
+        try:
+            return await self.cache_manager.get(data_type, device_id)
+        except CacheOperationError as e:
+            self.logger.warning("Cache lookup failed for %s on %s: %s", data_type, device_id, str(e))
+            return None
 
     async def _collect_fresh_data(
         self, data_type: str, device_id: UUID, **kwargs: Any
@@ -419,10 +669,6 @@ class UnifiedDataCollectionService:
         glances_service = GlancesService(device)
         
         try:
-            # Test connectivity first
-            if not await glances_service.test_connectivity():
-                raise DataCollectionError(f"Glances API not accessible on {device.hostname}")
-            
             # Get system metrics from Glances
             metrics = await glances_service.get_system_metrics()
             
@@ -464,17 +710,12 @@ class UnifiedDataCollectionService:
         except Exception as e:
             self.logger.error(f"Failed to collect system metrics via Glances for {device.hostname}: {e}")
             raise DataCollectionError(f"Glances system metrics collection failed: {str(e)}")
-        finally:
-            await glances_service.close()
 
     async def _collect_network_stats_glances(self, device: Device, **kwargs: Any) -> dict[str, Any]:
         """Collect network statistics using Glances API"""
         glances_service = GlancesService(device)
         
         try:
-            if not await glances_service.test_connectivity():
-                raise DataCollectionError(f"Glances API not accessible on {device.hostname}")
-            
             network_stats = await glances_service.get_network_stats()
             
             return {
@@ -501,17 +742,12 @@ class UnifiedDataCollectionService:
         except Exception as e:
             self.logger.error(f"Failed to collect network stats via Glances for {device.hostname}: {e}")
             raise DataCollectionError(f"Glances network stats collection failed: {str(e)}")
-        finally:
-            await glances_service.close()
 
     async def _collect_process_list_glances(self, device: Device, **kwargs: Any) -> dict[str, Any]:
         """Collect process list using Glances API"""
         glances_service = GlancesService(device)
         
         try:
-            if not await glances_service.test_connectivity():
-                raise DataCollectionError(f"Glances API not accessible on {device.hostname}")
-            
             sort_by = kwargs.get("sort_by", "cpu_percent")
             limit = kwargs.get("limit", 50)  # Default to top 50 processes
             
@@ -542,17 +778,12 @@ class UnifiedDataCollectionService:
         except Exception as e:
             self.logger.error(f"Failed to collect process list via Glances for {device.hostname}: {e}")
             raise DataCollectionError(f"Glances process list collection failed: {str(e)}")
-        finally:
-            await glances_service.close()
 
     async def _collect_filesystem_usage_glances(self, device: Device, **kwargs: Any) -> dict[str, Any]:
         """Collect filesystem usage using Glances API"""
         glances_service = GlancesService(device)
         
         try:
-            if not await glances_service.test_connectivity():
-                raise DataCollectionError(f"Glances API not accessible on {device.hostname}")
-            
             filesystems = await glances_service.get_file_system_usage()
             
             return {
@@ -577,17 +808,12 @@ class UnifiedDataCollectionService:
         except Exception as e:
             self.logger.error(f"Failed to collect filesystem usage via Glances for {device.hostname}: {e}")
             raise DataCollectionError(f"Glances filesystem usage collection failed: {str(e)}")
-        finally:
-            await glances_service.close()
 
     async def _collect_disk_io_stats_glances(self, device: Device, **kwargs: Any) -> dict[str, Any]:
         """Collect disk I/O statistics using Glances API"""
         glances_service = GlancesService(device)
         
         try:
-            if not await glances_service.test_connectivity():
-                raise DataCollectionError(f"Glances API not accessible on {device.hostname}")
-            
             disk_stats = await glances_service.get_disk_io_stats()
             
             return {
@@ -611,17 +837,12 @@ class UnifiedDataCollectionService:
         except Exception as e:
             self.logger.error(f"Failed to collect disk I/O stats via Glances for {device.hostname}: {e}")
             raise DataCollectionError(f"Glances disk I/O stats collection failed: {str(e)}")
-        finally:
-            await glances_service.close()
 
     async def _collect_gpu_stats_glances(self, device: Device, **kwargs: Any) -> dict[str, Any]:
         """Collect GPU statistics using Glances API"""
         glances_service = GlancesService(device)
         
         try:
-            if not await glances_service.test_connectivity():
-                raise DataCollectionError(f"Glances API not accessible on {device.hostname}")
-            
             gpu_stats = await glances_service.get_gpu_stats()
             
             return {
@@ -645,17 +866,12 @@ class UnifiedDataCollectionService:
         except Exception as e:
             self.logger.error(f"Failed to collect GPU stats via Glances for {device.hostname}: {e}")
             raise DataCollectionError(f"Glances GPU stats collection failed: {str(e)}")
-        finally:
-            await glances_service.close()
 
     async def _collect_sensor_data_glances(self, device: Device, **kwargs: Any) -> dict[str, Any]:
         """Collect sensor data using Glances API"""
         glances_service = GlancesService(device)
         
         try:
-            if not await glances_service.test_connectivity():
-                raise DataCollectionError(f"Glances API not accessible on {device.hostname}")
-            
             sensors = await glances_service.get_sensor_data()
             
             return {
@@ -679,17 +895,12 @@ class UnifiedDataCollectionService:
         except Exception as e:
             self.logger.error(f"Failed to collect sensor data via Glances for {device.hostname}: {e}")
             raise DataCollectionError(f"Glances sensor data collection failed: {str(e)}")
-        finally:
-            await glances_service.close()
 
     async def _collect_all_system_data_glances(self, device: Device, **kwargs: Any) -> dict[str, Any]:
         """Collect all available system data using Glances API in a single optimized call"""
         glances_service = GlancesService(device)
         
         try:
-            if not await glances_service.test_connectivity():
-                raise DataCollectionError(f"Glances API not accessible on {device.hostname}")
-            
             # Get all system data in one optimized call
             all_data = await glances_service.get_all_system_data()
             
@@ -821,36 +1032,48 @@ class UnifiedDataCollectionService:
         except Exception as e:
             self.logger.error(f"Failed to collect all system data via Glances for {device.hostname}: {e}")
             raise DataCollectionError(f"Glances all system data collection failed: {str(e)}")
-        finally:
-            await glances_service.close()
 
     async def _cache_data(
         self, data_type: str, device_id: UUID, data: dict[str, Any]
     ) -> None:
         """
-        Cache the collected data in the database.
+        Cache the collected data for the data type's freshness threshold.
         
         Args:
             data_type: Type of data being cached
             device_id: UUID of the target device
             data: Data to cache
         """
-        # This will be implemented in subsequent tasks
-        pass
+        if not self.cache_manager:
+            return
+        try:
+            await self.cache_manager.set(data_type, device_id, data, ttl=self._cache_ttl(data_type))
+        except CacheOperationError as e:
+            self.logger.warning("Failed to cache %s for %s: %s", data_type, device_id, str(e))
 
-    def _is_data_fresh(self, cached_data: dict[str, Any], data_type: str) -> bool:
+    async def _cache_data_many(
+        self, data_type: str, items: dict[UUID, dict[str, Any]]
+    ) -> None:
+        """Cache collected data for many devices in one batch"""
+        if not self.cache_manager or not items:
+            return
+        try:
+            await self.cache_manager.set_many(data_type, items, ttl=self._cache_ttl(data_type))
+        except CacheOperationError as e:
+            self.logger.warning("Failed to cache %s for %d devices: %s", data_type, len(items), str(e))
+
+    def _get_data_age(self, cached_data: dict[str, Any]) -> timedelta | None:
         """
-        Check if cached data is still fresh based on the freshness threshold.
-        
+        Get how long ago cached data was collected.
+
         Args:
             cached_data: The cached data to check
-            data_type: Type of data to check freshness for
-            
+
         Returns:
-            True if data is fresh, False otherwise
+            Age of the data, None if it has no valid collection timestamp
         """
         if not cached_data:
-            return False
+            return None
 
         # Try to get collected_at from collection_metadata first, then fallback to root level
         collected_at_str = None
@@ -858,36 +1081,66 @@ class UnifiedDataCollectionService:
             collected_at_str = cached_data["collection_metadata"]["collected_at"]
         elif "collected_at" in cached_data:
             collected_at_str = cached_data["collected_at"]
+        elif "cached_at" in cached_data.get("_cache_metadata", {}):
+            # Cached straight after collection, so the cache time is the collection time
+            collected_at_str = cached_data["_cache_metadata"]["cached_at"]
 
         if not collected_at_str:
             self.logger.debug("No collected_at timestamp found in cached data")
-            return False
+            return None
 
         try:
             collected_at = datetime.fromisoformat(collected_at_str.replace("Z", "+00:00"))
             if collected_at.tzinfo is None:
                 collected_at = collected_at.replace(tzinfo=UTC)
+            return datetime.now(UTC) - collected_at
 
-            threshold_seconds = self.freshness_thresholds.get(data_type, 600)  # Default 10 minutes
-            threshold = timedelta(seconds=threshold_seconds)
-
-            age = datetime.now(UTC) - collected_at
-            is_fresh = age < threshold
-
-            self.logger.debug(
-                "Data freshness check: type=%s, age=%s, threshold=%s, fresh=%s",
-                data_type, age, threshold, is_fresh
-            )
-
-            return is_fresh
-
-        except (ValueError, TypeError) as e:
+        except (ValueError, TypeError, AttributeError) as e:
             self.logger.warning(
                 "Failed to parse collected_at timestamp: %s, error=%s",
                 collected_at_str, str(e)
             )
+            return None
+
+    def _is_data_fresh(self, cached_data: dict[str, Any], data_type: str) -> bool:
+        """
+        Check if cached data is still fresh based on the freshness threshold.
+        
+        Args:
+            cached_data: The cached data to check
+            data_type: Type of data to check freshness for
+            
+        Returns:
+            True if data is fresh, False otherwise
+        """
+        age = self._get_data_age(cached_data)
+        if age is None:
             return False
 
+        threshold_seconds = self.freshness_thresholds.get(data_type, 600)  # Default 10 minutes
+        threshold = timedelta(seconds=threshold_seconds)
+        is_fresh = age < threshold
+
+        self.logger.debug(
+            "Data freshness check: type=%s, age=%s, threshold=%s, fresh=%s",
+            data_type, age, threshold, is_fresh
+        )
+
+        return is_fresh
+
+    def _is_data_servable_stale(self, cached_data: dict[str, Any], data_type: str) -> bool:
+        """
+        Check if stale cached data is still within the data type's max_stale window.
+
+        Returns:
+            True if the data is past its freshness threshold by at most max_stale seconds
+        """
+        age = self._get_data_age(cached_data)
+        if age is None:
+            return False
+        limit = self.get_freshness_threshold(data_type) + self.get_max_stale(data_type)
+        return age < timedelta(seconds=limit)
+
     def get_freshness_threshold(self, data_type: str) -> int:
         """
         Get the freshness threshold for a specific data type.
@@ -919,11 +1172,94 @@ class UnifiedDataCollectionService:
             data_type, old_threshold, threshold_seconds
         )
 
+    def get_max_stale(self, data_type: str) -> int:
+        """
+        Get how long past its freshness threshold data may be served while it is refreshed.
+
+        Args:
+            data_type: Type of data to get the window for
+
+        Returns:
+            Stale window in seconds (0 disables stale-while-revalidate)
+        """
+        return self.max_stale.get(data_type, self.get_freshness_threshold(data_type))
+
+    def set_max_stale(self, data_type: str, max_stale_seconds: int) -> None:
+        """
+        Set the stale-while-revalidate window for a specific data type.
+
+        Args:
+            data_type: Type of data to set the window for
+            max_stale_seconds: Window in seconds (0 disables stale-while-revalidate)
+        """
+        if max_stale_seconds < 0:
+            raise ValueError("Max stale must not be negative")
+
+        old_max_stale = self.max_stale.get(data_type)
+        self.max_stale[data_type] = max_stale_seconds
+
+        self.logger.info(
+            "Updated max stale: type=%s, old=%s, new=%s",
+            data_type, old_max_stale, max_stale_seconds
+        )
+
+    def _cache_ttl(self, data_type: str) -> int:
+        """Cache TTL for a data type: fresh for the threshold, then servable for max_stale"""
+        return self.get_freshness_threshold(data_type) + self.get_max_stale(data_type)
+
+    def _start_background_refresh(
+        self, key: tuple[Any, ...], refresh: Callable[[], Awaitable[dict[str, Any]]]
+    ) -> bool:
+        """
+        Start a background refresh unless one is already running for the key.
+
+        Returns:
+            True if a refresh was started
+        """
+        if key in self._background_refreshes:
+            self._refresh_stats["deduplicated"] += 1
+            return False
+
+        async def run() -> None:
+            try:
+                await refresh()
+            except Exception as e:
+                self._refresh_stats["failed"] += 1
+                self.logger.warning("Background refresh failed for %s: %s", key[1:3], str(e))
+
+        task = asyncio.create_task(run())
+        self._background_refreshes[key] = task
+        task.add_done_callback(lambda _: self._background_refreshes.pop(key, None))
+        self._refresh_stats["started"] += 1
+        return True
+
+    async def shutdown(self) -> None:
+        """Cancel background refreshes and wait for them to finish"""
+        tasks = list(self._background_refreshes.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.logger.info("Cancelled %d background refreshes", len(tasks))
+        self._background_refreshes.clear()
+
+    def get_stale_serving_stats(self) -> dict[str, Any]:
+        """
+        Get stale-while-revalidate statistics.
+
+        Returns:
+            Dictionary with stale responses served and background refresh counts
+        """
+        return {
+            **self._refresh_stats,
+            "in_progress": len(self._background_refreshes),
+        }
+
     async def _store_audit_record(
         self, data_type: str, device_id: UUID, data: dict[str, Any], correlation_id: str
     ) -> None:
         """
-        Store audit record of data collection in the database.
+        Queue an audit record of data collection for batched storage in the database.
         
         Args:
             data_type: Type of data collected
@@ -932,43 +1268,27 @@ class UnifiedDataCollectionService:
             correlation_id: Correlation ID for tracking
         """
         try:
-            async with self.db_session_factory() as session:
-                # Store audit record in data_collection_audit table
-                from datetime import datetime
-
-                from sqlalchemy import text
+            metadata = data.get("collection_metadata", {})
+            collected_at_str = metadata.get("collected_at")
+            collected_at = datetime.fromisoformat(collected_at_str.replace('Z', '+00:00')) if collected_at_str else datetime.now(UTC)
 
-                collected_at_str = data.get("collection_metadata", {}).get("collected_at")
-                collected_at = datetime.fromisoformat(collected_at_str.replace('Z', '+00:00')) if collected_at_str else datetime.utcnow()
-
-                insert_query = text("""
-                    INSERT INTO data_collection_audit 
-                    (data_type, device_id, correlation_id, collected_at, collection_duration_seconds, 
-                     data_size, cache_hit, force_refresh, metadata_info)
-                    VALUES (:data_type, :device_id, :correlation_id, :collected_at, :collection_duration_seconds,
-                            :data_size, :cache_hit, :force_refresh, :metadata_info)
-                """)
-
-                import json
+            # Written by the write-behind buffer in the next batched insert
+            await self.ingestion_buffer.add(DATA_COLLECTION_AUDIT_TABLE, [{
+                "data_type": data_type,
+                "device_id": device_id,
+                "correlation_id": correlation_id,
+                "collected_at": collected_at,
+                "collection_duration_seconds": metadata.get("collection_duration_seconds"),
+                "data_size": len(str(data)),
+                "cache_hit": metadata.get("cache_hit", False),
+                "force_refresh": metadata.get("force_refresh", False),
+                "metadata_info": metadata,
+            }])
 
-                await session.execute(insert_query, {
-                    "data_type": data_type,
-                    "device_id": device_id,
-                    "correlation_id": correlation_id,
-                    "collected_at": collected_at,
-                    "collection_duration_seconds": data.get("collection_metadata", {}).get("collection_duration_seconds"),
-                    "data_size": len(str(data)),
-                    "cache_hit": data.get("collection_metadata", {}).get("cache_hit", False),
-                    "force_refresh": data.get("collection_metadata", {}).get("force_refresh", False),
-                    "metadata_info": json.dumps(data.get("collection_metadata", {}))
-                })
-
-                await session.commit()
-
-                self.logger.debug(
-                    "Audit record stored in database: type=%s, device_id=%s, correlation_id=%s",
-                    data_type, device_id, correlation_id
-                )
+            self.logger.debug(
+                "Audit record queued for storage: type=%s, device_id=%s, correlation_id=%s",
+                data_type, device_id, correlation_id
+            )
 
         except Exception as e:
             self.logger.error(
@@ -981,24 +1301,41 @@ class UnifiedDataCollectionService:
             ) from e
 
     def _emit_data_collection_event(
-        self, data_type: str, device_id: UUID, data: dict[str, Any], correlation_id: str
+        self,
+        data_type: str,
+        device_id: UUID,
+        data: dict[str, Any],
+        correlation_id: str,
+        cached: bool = False,
     ) -> None:
         """
-        Emit event for data collection completion.
-        
-        This is a placeholder for future event system integration.
+        Emit a DataCollectedEvent for data collection completion.
+
+        Emission never blocks the collection; the event is dropped if the
+        event bus is not running (e.g. in the MCP server) or its queue is full.
         
         Args:
             data_type: Type of data collected
             device_id: UUID of the target device
             data: Collected data with metadata
             correlation_id: Correlation ID for tracking
+            cached: Whether the data was already written to the cache
         """
-        # Placeholder for event emission
-        # Future implementation might integrate with EventBus, WebSocket notifications, etc.
+        if not self.event_bus.is_running():
+            return
+
+        event = DataCollectedEvent(
+            device_id=device_id,
+            data_type=data_type,
+            data=data,
+            correlation_id=correlation_id,
+            cache_ttl=self._cache_ttl(data_type),
+            cached=cached,
+        )
+        emitted = self.event_bus.emit_nowait(event)
         self.logger.debug(
-            "Data collection event emitted: type=%s, device_id=%s, correlation_id=%s",
-            data_type, device_id, correlation_id
+            "Data collection event emitted: type=%s, device_id=%s, correlation_id=%s, queued=%s",
+            data_type, device_id, correlation_id, emitted
         )
 
     def _strip_cache_metadata(self, data: dict[str, Any]) -> dict[str, Any]:
@@ -1017,14 +1354,26 @@ class UnifiedDataCollectionService:
 
         # Update collection metadata to indicate cache hit if applicable
         if "_cache_metadata" in data and "collection_metadata" in cleaned_data:
-            cleaned_data["collection_metadata"]["cache_hit"] = True
+            # Copy rather than mutate: cached values can be shared through the L1 cache
+            collection_metadata = {**cleaned_data["collection_metadata"], "cache_hit": True}
             # Use original collection time from cache metadata
             cache_meta = data["_cache_metadata"]
             if "cached_at" in cache_meta:
-                cleaned_data["collection_metadata"]["served_from_cache_at"] = cache_meta["cached_at"]
+                collection_metadata["served_from_cache_at"] = cache_meta["cached_at"]
+            cleaned_data["collection_metadata"] = collection_metadata
 
         return cleaned_data
 
+    def _mark_stale(self, data: dict[str, Any], cached_data: dict[str, Any]) -> dict[str, Any]:
+        """Tag data served past its freshness threshold as stale in collection_metadata"""
+        age = self._get_data_age(cached_data)
+        data["collection_metadata"] = {
+            **data.get("collection_metadata", {}),
+            "stale": True,
+            "age_seconds": round(age.total_seconds(), 3) if age is not None else None,
+        }
+        return data
+
     async def health_check(self) -> dict[str, Any]:
         """
         Perform a health check of the service and its dependencies.
@@ -1054,6 +1403,36 @@ class UnifiedDataCollectionService:
             }
             health_status["status"] = "degraded"
 
+        # In-flight collection sharing
+        health_status["components"]["single_flight"] = {
+            "status": "healthy",
+            **self.get_single_flight_stats(),
+        }
+
+        # Stale-while-revalidate
+        health_status["components"]["stale_while_revalidate"] = {
+            "status": "healthy",
+            **self.get_stale_serving_stats(),
+        }
+
+        # Pooled Glances clients; reachability is learned from real requests.
+        # An unreachable device does not degrade the service itself.
+        glances_endpoints = get_glances_client_stats()
+        unreachable = [
+            base_url for base_url, stats in glances_endpoints.items() if stats["reachable"] is False
+        ]
+        if not unreachable:
+            glances_status = "healthy"
+        elif len(unreachable) == len(glances_endpoints):
+            glances_status = "unhealthy"
+        else:
+            glances_status = "degraded"
+        health_status["components"]["glances_clients"] = {
+            "status": glances_status,
+            "unreachable": unreachable,
+            "endpoints": glances_endpoints,
+        }
+
         # Check SSH client
         if self.ssh_client:
             health_status["components"]["ssh_client"] = {
@@ -1103,3 +1482,9 @@ async def get_unified_data_collection_service(
         ssh_command_manager=ssh_command_manager,
         cache_manager=cache_manager,
     )
+
+
+async def shutdown_unified_data_collection_services() -> None:
+    """Stop background refreshes of every live data collection service"""
+    for service in list(_services):
+        await service.shutdown()
@@ -0,0 +1,229 @@
+"""
+Cache Value Codecs
+
+Serializes cached payloads to compact bytes with an optional compression step
+for large values. Every encoded value starts with a three byte header
+(format version, serializer id, compression id), so entries written with a
+different codec configuration, and plain JSON strings written before the
+header existed, remain readable.
+
+orjson is always available; msgpack, zstandard and lz4 are optional and the
+codec falls back to orjson / no compression when they are not installed.
+"""
+
+import json
+import logging
+import time
+from typing import Any
+
+import orjson
+
+# Optional modules are typed Any so the None fallbacks type-check
+try:
+    import msgpack as _msgpack
+
+    msgpack: Any = _msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import zstandard as _zstandard
+
+    zstandard: Any = _zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+try:
+    import lz4.frame as _lz4_frame
+
+    lz4_frame: Any = _lz4_frame
+except ImportError:  # pragma: no cover - optional dependency
+    lz4_frame = None
+
+logger = logging.getLogger(__name__)
+
+CODEC_FORMAT_VERSION = 1
+
+SERIALIZERS = {"orjson": 1, "msgpack": 2}
+COMPRESSIONS = {"none": 0, "zstd": 1, "lz4": 2}
+
+
+def _available(serializer: str | None = None, compression: str | None = None) -> bool:
+    """Whether the library behind a serializer or compression is installed"""
+    if serializer == "msgpack":
+        return msgpack is not None
+    if compression == "zstd":
+        return zstandard is not None
+    if compression == "lz4":
+        return lz4_frame is not None
+    return True
+
+
+class CacheCodec:
+    """
+    Encodes and decodes cache values, tracking sizes and timings.
+
+    Values are serialized with the configured serializer and compressed when
+    the serialized size reaches compression_threshold bytes.
+    """
+
+    def __init__(
+        self,
+        serializer: str = "orjson",
+        compression: str = "none",
+        compression_threshold: int = 8192,
+        compression_level: int | None = None,
+    ):
+        """
+        Initialize the codec.
+
+        Args:
+            serializer: 'orjson' or 'msgpack'
+            compression: 'none', 'zstd' or 'lz4'
+            compression_threshold: Serialized size in bytes from which values are compressed
+            compression_level: Compression level (library default if None)
+        """
+        if serializer not in SERIALIZERS:
+            raise ValueError(f"Unknown cache serializer: {serializer}")
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown cache compression: {compression}")
+
+        if not _available(serializer=serializer):
+            logger.warning("Cache serializer %s is not installed, using orjson", serializer)
+            serializer = "orjson"
+        if not _available(compression=compression):
+            logger.warning("Cache compression %s is not installed, storing values uncompressed", compression)
+            compression = "none"
+
+        self.serializer = serializer
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+        self.compression_level = compression_level
+
+        self._stats = {
+            "encoded": 0,
+            "decoded": 0,
+            "compressed": 0,
+            "legacy_decoded": 0,
+            "serialized_bytes": 0,
+            "stored_bytes": 0,
+            "encode_seconds": 0.0,
+            "decode_seconds": 0.0,
+        }
+
+    def encode(self, value: Any) -> bytes:
+        """Encode a value into header-prefixed bytes"""
+        started = time.perf_counter()
+
+        payload = self._serialize(value)
+        serialized_size = len(payload)
+
+        compression = "none"
+        if self.compression != "none" and serialized_size >= self.compression_threshold:
+            compressed = self._compress(payload)
+            # Only keep the compressed form if it actually is smaller
+            if len(compressed) < serialized_size:
+                payload = compressed
+                compression = self.compression
+
+        encoded = bytes((CODEC_FORMAT_VERSION, SERIALIZERS[self.serializer], COMPRESSIONS[compression])) + payload
+
+        self._stats["encoded"] += 1
+        self._stats["compressed"] += compression != "none"
+        self._stats["serialized_bytes"] += serialized_size
+        self._stats["stored_bytes"] += len(payload)
+        self._stats["encode_seconds"] += time.perf_counter() - started
+        return encoded
+
+    def decode(self, data: bytes | str) -> Any:
+        """
+        Decode a value produced by encode(), or a legacy JSON string.
+
+        Raises:
+            ValueError: If the value is corrupt or needs a codec that is not installed
+        """
+        started = time.perf_counter()
+        try:
+            if isinstance(data, str):
+                self._stats["legacy_decoded"] += 1
+                return json.loads(data)
+            if not data or data[0] != CODEC_FORMAT_VERSION:
+                # Written as plain JSON before values carried a header
+                self._stats["legacy_decoded"] += 1
+                return orjson.loads(data)
+            if len(data) < 3:
+                raise ValueError("Truncated cache value header")
+
+            serializer_id, compression_id = data[1], data[2]
+            payload = self._decompress(compression_id, data[3:])
+            return self._deserialize(serializer_id, payload)
+        finally:
+            self._stats["decoded"] += 1
+            self._stats["decode_seconds"] += time.perf_counter() - started
+
+    def _serialize(self, value: Any) -> bytes:
+        if self.serializer == "msgpack":
+            packed: bytes = msgpack.packb(value, default=str, use_bin_type=True)
+            return packed
+        return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+    def _deserialize(self, serializer_id: int, payload: bytes) -> Any:
+        if serializer_id == SERIALIZERS["orjson"]:
+            return orjson.loads(payload)
+        if serializer_id == SERIALIZERS["msgpack"]:
+            if msgpack is None:
+                raise ValueError("Cache value is msgpack-encoded but msgpack is not installed")
+            return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+        raise ValueError(f"Unknown cache serializer id {serializer_id}")
+
+    def _compress(self, payload: bytes) -> bytes:
+        compressed: bytes
+        if self.compression == "zstd":
+            level = self.compression_level if self.compression_level is not None else 3
+            compressed = zstandard.ZstdCompressor(level=level).compress(payload)
+        elif self.compression_level is not None:
+            compressed = lz4_frame.compress(payload, compression_level=self.compression_level)
+        else:
+            compressed = lz4_frame.compress(payload)
+        return compressed
+
+    def _decompress(self, compression_id: int, payload: bytes) -> bytes:
+        decompressed: bytes
+        if compression_id == COMPRESSIONS["none"]:
+            return payload
+        if compression_id == COMPRESSIONS["zstd"]:
+            if zstandard is None:
+                raise ValueError("Cache value is zstd-compressed but zstandard is not installed")
+            try:
+                decompressed = zstandard.ZstdDecompressor().decompress(payload)
+                return decompressed
+            except zstandard.ZstdError as e:
+                raise ValueError(f"Corrupt zstd cache value: {e}") from e
+        if compression_id == COMPRESSIONS["lz4"]:
+            if lz4_frame is None:
+                raise ValueError("Cache value is lz4-compressed but lz4 is not installed")
+            try:
+                decompressed = lz4_frame.decompress(payload)
+                return decompressed
+            except RuntimeError as e:
+                raise ValueError(f"Corrupt lz4 cache value: {e}") from e
+        raise ValueError(f"Unknown cache compression id {compression_id}")
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get codec statistics.
+
+        bytes_saved is the difference between serialized and stored sizes, i.e.
+        what compression saved.
+        """
+        encoded = self._stats["encoded"]
+        decoded = self._stats["decoded"]
+        return {
+            **self._stats,
+            "serializer": self.serializer,
+            "compression": self.compression,
+            "compression_threshold": self.compression_threshold,
+            "bytes_saved": self._stats["serialized_bytes"] - self._stats["stored_bytes"],
+            "avg_encode_ms": (self._stats["encode_seconds"] * 1000 / encoded) if encoded else 0.0,
+            "avg_decode_ms": (self._stats["decode_seconds"] * 1000 / decoded) if decoded else 0.0,
+        }
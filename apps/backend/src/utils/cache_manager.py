@@ -4,22 +4,52 @@ Cache Manager for Infrastructure Data
 Provides Redis-based caching functionality for infrastructure data collection,
 implementing intelligent cache management with LRU eviction, performance metrics,
 and memory-aware cache operations.
+
+LRU bookkeeping in Redis is selected by the eviction mode: "tracked" updates the
+LRU sorted set on every operation, "batched" buffers access times and writes them
+in one ZADD per flush interval, and "redis" keeps no sorted set at all and leaves
+eviction to the server's maxmemory-policy.
+
+Every cache key is also recorded in a per-device and a per-data-type index set
+so bulk invalidation touches only the affected keys instead of scanning the
+keyspace.
+
+Values are stored as compact bytes by a pluggable codec (see cache_codec), so a
+separate Redis client without response decoding is used for cached values.
+
+Reads are served from a small in-process LRU (L1) in front of Redis (L2) when
+possible. Writes and deletes publish the affected keys on a Redis pub/sub
+channel so other processes drop their L1 copies.
 """
 
+import asyncio
+from collections import OrderedDict
+import contextlib
 from datetime import UTC, datetime
+from fnmatch import fnmatchcase
 import json
 import logging
 import time
-from typing import Any, Dict, List, Optional, NamedTuple
-from uuid import UUID
+from typing import Any, Dict, List, Optional, NamedTuple, cast
+from uuid import UUID, uuid4
 
 import redis.asyncio as redis
 from redis.exceptions import RedisError
 
+from apps.backend.src.core.config import get_settings
 from apps.backend.src.core.exceptions import CacheOperationError
+from apps.backend.src.utils.cache_codec import CacheCodec
 
 logger = logging.getLogger(__name__)
 
+EVICTION_MODES = ("tracked", "batched", "redis")
+
+# Keys deleted per DEL/SREM command during bulk invalidation
+INVALIDATION_BATCH_SIZE = 500
+
+# maxmemory-policy values under which Redis evicts cache keys by itself
+REDIS_EVICTING_POLICIES = ("allkeys-lru", "volatile-lru", "allkeys-lfu", "volatile-lfu")
+
 
 class CacheMetrics(NamedTuple):
     """Cache performance metrics"""
@@ -31,6 +61,81 @@ class CacheMetrics(NamedTuple):
     hit_ratio: float
     cache_size: int
     memory_usage_mb: float
+    l1_hits: int = 0
+    l2_hits: int = 0
+    l1_hit_ratio: float = 0.0
+    l2_hit_ratio: float = 0.0
+    l1_size: int = 0
+    bytes_saved: int = 0
+    average_encode_time_ms: float = 0.0
+    average_decode_time_ms: float = 0.0
+
+
+class LocalCache:
+    """
+    Bounded in-process LRU cache with per-entry expiry.
+
+    Values are stored as-is and shared between readers, so callers must not
+    mutate nested structures of values they get back.
+    """
+
+    def __init__(self, max_size: int = 512, max_ttl: float = 5.0):
+        """
+        Initialize the local cache.
+
+        Args:
+            max_size: Maximum number of entries before the least recently used is dropped
+            max_ttl: Upper bound in seconds on how long an entry is served locally
+        """
+        self.max_size = max_size
+        self.max_ttl = max_ttl
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the local cache stores anything"""
+        return self.max_size > 0 and self.max_ttl > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Any | None:
+        """Get a value if present and not expired, marking it most recently used"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store a value for at most ttl seconds (capped by max_ttl)"""
+        ttl = min(ttl, self.max_ttl)
+        if not self.enabled or ttl <= 0:
+            self._entries.pop(key, None)
+            return
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """Drop a single entry"""
+        self._entries.pop(key, None)
+
+    def delete_matching(self, pattern: str) -> int:
+        """Drop entries whose key matches a Redis-style glob pattern"""
+        matching = [key for key in self._entries if fnmatchcase(key, pattern)]
+        for key in matching:
+            del self._entries[key]
+        return len(matching)
+
+    def clear(self) -> None:
+        """Drop all entries"""
+        self._entries.clear()
 
 
 class CacheManager:
@@ -49,6 +154,11 @@ class CacheManager:
         max_cache_size: int = 1000,
         max_memory_mb: int = 100,
         eviction_batch_size: int = 50,
+        l1_max_size: int = 512,
+        l1_ttl: float = 5.0,
+        eviction_mode: str = "tracked",
+        lru_flush_interval: float = 1.0,
+        codec: CacheCodec | None = None,
     ):
         """
         Initialize the enhanced CacheManager.
@@ -60,20 +170,48 @@ class CacheManager:
             max_cache_size: Maximum number of items in cache before eviction
             max_memory_mb: Maximum memory usage in MB before eviction
             eviction_batch_size: Number of items to evict at once when limits exceeded
+            l1_max_size: Maximum number of items in the in-process L1 cache (0 disables it)
+            l1_ttl: Maximum seconds an item is served from L1 without asking Redis
+            eviction_mode: How LRU order is tracked ('tracked', 'batched' or 'redis')
+            lru_flush_interval: Seconds between LRU/metrics flushes in 'batched' and 'redis' modes
+            codec: Codec for cached values (orjson without compression if None)
         """
+        if eviction_mode not in EVICTION_MODES:
+            raise ValueError(f"Unknown cache eviction mode: {eviction_mode}")
+
         self.redis_url = redis_url
         self.default_ttl = default_ttl
         self.key_prefix = key_prefix
         self.max_cache_size = max_cache_size
         self.max_memory_mb = max_memory_mb
         self.eviction_batch_size = eviction_batch_size
+        self.eviction_mode = eviction_mode
+        self.lru_flush_interval = lru_flush_interval
+        self.codec = codec or CacheCodec()
         self.redis_client: redis.Redis | None = None
+        # Client returning raw bytes, for encoded cache values
+        self.binary_client: redis.Redis | None = None
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
 
         # LRU tracking key names
         self.lru_zset_key = f"{key_prefix}lru_tracker"
         self.metrics_key = f"{key_prefix}metrics"
 
+        # Secondary index set key prefixes (device id / data type -> cache keys)
+        self.device_index_prefix = f"{key_prefix}index:device:"
+        self.type_index_prefix = f"{key_prefix}index:type:"
+
+        # In-process L1 cache, kept coherent across processes over pub/sub
+        self.l1 = LocalCache(max_size=l1_max_size, max_ttl=l1_ttl)
+        self.invalidation_channel = f"{key_prefix}invalidations"
+        self._instance_id = uuid4().hex
+        self._invalidation_task: asyncio.Task | None = None
+
+        # LRU access times waiting to be written ('batched' mode)
+        self._pending_touches: dict[str, float] = {}
+        self._maintenance_task: asyncio.Task | None = None
+        self._persisted_operations = 0
+
         # Performance metrics
         self._metrics = {
             "hits": 0,
@@ -81,6 +219,8 @@ class CacheManager:
             "evictions": 0,
             "total_operations": 0,
             "total_response_time_ms": 0.0,
+            "l1_hits": 0,
+            "l2_hits": 0,
         }
 
     async def connect(self) -> None:
@@ -95,16 +235,52 @@ class CacheManager:
                 retry_on_timeout=True,
                 health_check_interval=30,
             )
+            self.binary_client = redis.from_url(
+                self.redis_url,
+                decode_responses=False,
+                socket_connect_timeout=5,
+                socket_timeout=5,
+                retry_on_timeout=True,
+                health_check_interval=30,
+            )
             # Test connection
             await self.redis_client.ping()
             self.logger.info("Successfully connected to Redis at %s", self.redis_url)
         except RedisError as e:
             self.logger.error("Failed to connect to Redis: %s", str(e))
             self.redis_client = None
+            self.binary_client = None
             raise CacheOperationError(f"Redis connection failed: {str(e)}") from e
 
+        if self.l1.enabled:
+            self._invalidation_task = asyncio.create_task(self._listen_for_invalidations())
+
+        if self.eviction_mode == "redis":
+            await self._check_eviction_policy()
+        if self.eviction_mode != "tracked":
+            self._maintenance_task = asyncio.create_task(self._maintenance_loop())
+
     async def disconnect(self) -> None:
         """Close Redis connection"""
+        if self._maintenance_task:
+            self._maintenance_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._maintenance_task
+            self._maintenance_task = None
+            await self._flush_maintenance()
+
+        if self._invalidation_task:
+            self._invalidation_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._invalidation_task
+            self._invalidation_task = None
+        self.l1.clear()
+
+        if self.binary_client:
+            with contextlib.suppress(Exception):
+                await self.binary_client.aclose()
+            self.binary_client = None
+
         if self.redis_client:
             try:
                 await self.redis_client.aclose()
@@ -114,6 +290,11 @@ class CacheManager:
             finally:
                 self.redis_client = None
 
+    @property
+    def value_client(self) -> redis.Redis | None:
+        """Redis client used to read and write encoded cache values"""
+        return self.binary_client or self.redis_client
+
     def _build_cache_key(self, data_type: str, device_id: UUID, additional_key: str = "") -> str:
         """
         Build a standardized cache key.
@@ -131,6 +312,41 @@ class CacheManager:
             key_parts.append(additional_key)
         return ":".join(key_parts)
 
+    def _index_keys(self, data_type: str, device_id: UUID | str) -> tuple[str, str]:
+        """Get the device and data type index set keys for a cache entry"""
+        return f"{self.device_index_prefix}{device_id}", f"{self.type_index_prefix}{data_type}"
+
+    def _index_keys_for_cache_key(self, cache_key: str) -> tuple[str, str] | None:
+        """Get the index set keys for a built cache key, None if it is not one"""
+        entry_prefix = f"{self.key_prefix}:"
+        if not cache_key.startswith(entry_prefix):
+            return None
+        parts = cache_key[len(entry_prefix):].split(":", 2)
+        if len(parts) < 2:
+            return None
+        return self._index_keys(parts[0], parts[1])
+
+    async def _add_to_indexes(self, pipe: Any, cache_key: str, data_type: str, device_id: UUID, ttl: int) -> None:
+        """
+        Queue index set updates for a stored cache entry on a pipeline.
+
+        Index sets expire with the longest-lived entry they reference, so sets
+        for devices or types that stop being written clean themselves up.
+        """
+        for index_key in self._index_keys(data_type, device_id):
+            await pipe.sadd(index_key, cache_key)
+            await pipe.expire(index_key, ttl, nx=True)
+            await pipe.expire(index_key, ttl, gt=True)
+
+    async def _remove_from_indexes(self, pipe: Any, cache_keys: list[str]) -> None:
+        """Queue removal of cache keys from their index sets on a pipeline"""
+        by_index: dict[str, list[str]] = {}
+        for cache_key in cache_keys:
+            for index_key in self._index_keys_for_cache_key(cache_key) or ():
+                by_index.setdefault(index_key, []).append(cache_key)
+        for index_key, members in by_index.items():
+            await pipe.srem(index_key, *members)
+
     async def get(
         self,
         data_type: str,
@@ -139,6 +355,10 @@ class CacheManager:
     ) -> dict[str, Any] | None:
         """
         Retrieve data from cache with LRU tracking.
+
+        The in-process L1 cache is checked first; Redis is only asked on an L1
+        miss, and the result is then kept in L1 for the rest of its TTL (capped
+        by l1_ttl).
         
         Args:
             data_type: Type of data to retrieve
@@ -150,16 +370,23 @@ class CacheManager:
         """
         start_time = time.time()
 
-        if not self.redis_client:
+        value_client = self.value_client
+        if not value_client:
             self.logger.warning("Redis client not connected, skipping cache get")
             return None
 
         cache_key = self._build_cache_key(data_type, device_id, additional_key)
 
+        local_data = self.l1.get(cache_key)
+        if local_data is not None:
+            await self._update_metrics("l1_hit", time.time() - start_time)
+            return dict(local_data)
+
         try:
-            cached_data = await self.redis_client.get(cache_key)
+            cached_data = await value_client.get(cache_key)
             if cached_data:
-                data = json.loads(cached_data)
+                data = self.codec.decode(cached_data)
+                self.l1.set(cache_key, data, self._remaining_ttl(data))
 
                 # Update LRU tracker with current timestamp
                 await self._update_lru_access(cache_key)
@@ -180,7 +407,7 @@ class CacheManager:
                 self.logger.debug("Cache miss for key %s", cache_key)
                 return None
 
-        except (RedisError, json.JSONDecodeError) as e:
+        except (RedisError, ValueError) as e:
             self.logger.warning(
                 "Failed to retrieve from cache (key: %s): %s",
                 cache_key, str(e)
@@ -209,7 +436,8 @@ class CacheManager:
         Returns:
             True if successful, False otherwise
         """
-        if not self.redis_client:
+        value_client = self.value_client
+        if not value_client:
             self.logger.warning("Redis client not connected, skipping cache set")
             return False
 
@@ -217,46 +445,214 @@ class CacheManager:
         cache_ttl = ttl if ttl is not None else self.default_ttl
 
         try:
-            # Check if we need to evict before adding new data
-            await self._enforce_cache_limits()
-
-            # Add cache metadata to the data
-            cached_data = {
-                **data,
-                "_cache_metadata": {
-                    "cached_at": datetime.now(UTC).isoformat(),
-                    "data_type": data_type,
-                    "device_id": str(device_id),
-                    "ttl": cache_ttl,
-                }
-            }
+            # Check if we need to evict before adding new data ('batched' checks on flush)
+            if self.eviction_mode == "tracked":
+                await self._enforce_cache_limits()
 
-            serialized_data = json.dumps(cached_data, default=str)
+            serialized_data = self.codec.encode(
+                self._with_cache_metadata(data, data_type, device_id, cache_ttl)
+            )
 
             # Use pipeline for atomic operations
-            async with self.redis_client.pipeline() as pipe:
+            async with value_client.pipeline() as pipe:
                 # Store the data
                 await pipe.setex(cache_key, cache_ttl, serialized_data)
 
+                # Record the key for bulk invalidation
+                await self._add_to_indexes(pipe, cache_key, data_type, device_id, cache_ttl)
+
                 # Update LRU tracker
-                await pipe.zadd(self.lru_zset_key, {cache_key: time.time()})
+                if self.eviction_mode == "tracked":
+                    await pipe.zadd(self.lru_zset_key, {cache_key: time.time()})
+
+                # Drop stale L1 copies in other processes
+                await self._publish_invalidation(pipe, keys=[cache_key])
 
                 # Execute pipeline
                 await pipe.execute()
 
+            if self.eviction_mode == "batched":
+                self._pending_touches[cache_key] = time.time()
+
+            # Keep the stored form locally (round-tripped so values match an L2 read)
+            self.l1.set(cache_key, self.codec.decode(serialized_data), cache_ttl)
+
             self.logger.debug(
                 "Cached data for key %s with TTL %ds",
                 cache_key, cache_ttl
             )
             return True
 
-        except (RedisError, json.JSONDecodeError) as e:
+        except (RedisError, ValueError, TypeError) as e:
             self.logger.error(
                 "Failed to cache data (key: %s): %s",
                 cache_key, str(e)
             )
             return False
 
+    def _with_cache_metadata(
+        self, data: dict[str, Any], data_type: str, device_id: UUID, ttl: int
+    ) -> dict[str, Any]:
+        """Add cache metadata to data before it is stored"""
+        return {
+            **data,
+            "_cache_metadata": {
+                "cached_at": datetime.now(UTC).isoformat(),
+                "data_type": data_type,
+                "device_id": str(device_id),
+                "ttl": ttl,
+            }
+        }
+
+    async def get_many(
+        self,
+        data_type: str,
+        device_ids: list[UUID],
+        additional_key: str = "",
+    ) -> dict[UUID, dict[str, Any]]:
+        """
+        Retrieve data for many devices with a single MGET.
+
+        L1 is checked first; the remaining keys are fetched in one round-trip
+        and their LRU access times are recorded in one batch.
+
+        Args:
+            data_type: Type of data to retrieve
+            device_ids: UUIDs of the target devices
+            additional_key: Optional additional key component
+
+        Returns:
+            Cached data per device, for devices with a cache entry only
+        """
+        start_time = time.time()
+
+        value_client = self.value_client
+        if not value_client or not device_ids:
+            return {}
+
+        results: dict[UUID, dict[str, Any]] = {}
+        remote: dict[str, UUID] = {}
+        for device_id in dict.fromkeys(device_ids):
+            cache_key = self._build_cache_key(data_type, device_id, additional_key)
+            local_data = self.l1.get(cache_key)
+            if local_data is not None:
+                results[device_id] = dict(local_data)
+            else:
+                remote[cache_key] = device_id
+        l1_hits = len(results)
+
+        misses = len(remote)
+        if remote:
+            try:
+                values = await value_client.mget(list(remote))
+            except RedisError as e:
+                self.logger.warning("Failed to retrieve %d keys from cache: %s", len(remote), str(e))
+                values = [None] * len(remote)
+
+            hit_keys = []
+            for cache_key, cached_data in zip(remote, values, strict=True):
+                if not cached_data:
+                    continue
+                try:
+                    data = self.codec.decode(cached_data)
+                except ValueError as e:
+                    self.logger.warning("Failed to decode cached value (key: %s): %s", cache_key, str(e))
+                    continue
+                self.l1.set(cache_key, data, self._remaining_ttl(data))
+                results[remote[cache_key]] = dict(data)
+                hit_keys.append(cache_key)
+            misses -= len(hit_keys)
+            await self._update_lru_access_many(hit_keys)
+
+        elapsed = time.time() - start_time
+        if l1_hits:
+            await self._update_metrics("l1_hit", 0, count=l1_hits)
+        if len(results) > l1_hits:
+            await self._update_metrics("hit", 0, count=len(results) - l1_hits)
+        if misses:
+            await self._update_metrics("miss", 0, count=misses)
+        self._metrics["total_response_time_ms"] += elapsed * 1000
+
+        self.logger.debug(
+            "Batch cache get for %s: %d requested, %d hits",
+            data_type, len(device_ids), len(results)
+        )
+        return results
+
+    async def set_many(
+        self,
+        data_type: str,
+        items: dict[UUID, dict[str, Any]],
+        ttl: int | None = None,
+        additional_key: str = "",
+    ) -> int:
+        """
+        Store data for many devices in a single pipeline.
+
+        Args:
+            data_type: Type of data being cached
+            items: Data to cache per device
+            ttl: Time-to-live in seconds (uses default_ttl if None)
+            additional_key: Optional additional key component
+
+        Returns:
+            Number of entries stored
+        """
+        value_client = self.value_client
+        if not value_client:
+            self.logger.warning("Redis client not connected, skipping cache set_many")
+            return 0
+        if not items:
+            return 0
+
+        cache_ttl = ttl if ttl is not None else self.default_ttl
+
+        try:
+            if self.eviction_mode == "tracked":
+                await self._enforce_cache_limits()
+
+            # cache key -> (device id, encoded value)
+            encoded: dict[str, tuple[UUID, bytes]] = {}
+            for device_id, data in items.items():
+                cache_key = self._build_cache_key(data_type, device_id, additional_key)
+                try:
+                    encoded[cache_key] = (device_id, self.codec.encode(
+                        self._with_cache_metadata(data, data_type, device_id, cache_ttl)
+                    ))
+                except (ValueError, TypeError) as e:
+                    self.logger.error("Failed to encode cache data (key: %s): %s", cache_key, str(e))
+                    continue
+            if not encoded:
+                return 0
+
+            now = time.time()
+            async with value_client.pipeline() as pipe:
+                for cache_key, (device_id, value) in encoded.items():
+                    await pipe.setex(cache_key, cache_ttl, value)
+                    await self._add_to_indexes(pipe, cache_key, data_type, device_id, cache_ttl)
+                if self.eviction_mode == "tracked":
+                    await pipe.zadd(self.lru_zset_key, dict.fromkeys(encoded, now))
+                await self._publish_invalidation(pipe, keys=list(encoded))
+                await pipe.execute()
+
+            for cache_key, (_, value) in encoded.items():
+                if self.eviction_mode == "batched":
+                    self._pending_touches[cache_key] = now
+                self.l1.set(cache_key, self.codec.decode(value), cache_ttl)
+
+            self.logger.debug(
+                "Cached %d entries for %s with TTL %ds",
+                len(encoded), data_type, cache_ttl
+            )
+            return len(encoded)
+
+        except RedisError as e:
+            self.logger.error(
+                "Failed to cache %d entries for %s: %s",
+                len(items), data_type, str(e)
+            )
+            return 0
+
     async def delete(
         self,
         data_type: str,
@@ -279,6 +675,8 @@ class CacheManager:
             return False
 
         cache_key = self._build_cache_key(data_type, device_id, additional_key)
+        self.l1.delete(cache_key)
+        self._pending_touches.pop(cache_key, None)
 
         try:
             # Use pipeline for atomic operations
@@ -287,7 +685,12 @@ class CacheManager:
                 await pipe.delete(cache_key)
 
                 # Remove from LRU tracker
-                await pipe.zrem(self.lru_zset_key, cache_key)
+                if self.eviction_mode != "redis":
+                    await pipe.zrem(self.lru_zset_key, cache_key)
+
+                await self._remove_from_indexes(pipe, [cache_key])
+
+                await self._publish_invalidation(pipe, keys=[cache_key])
 
                 # Execute pipeline
                 results = await pipe.execute()
@@ -306,6 +709,53 @@ class CacheManager:
             )
             return False
 
+    async def delete_if_older(
+        self,
+        data_type: str,
+        device_id: UUID,
+        older_than: datetime,
+        additional_key: str = "",
+    ) -> bool:
+        """
+        Delete a cache entry only if it was cached before a point in time.
+
+        Used to invalidate on change events without discarding a value that was
+        written after the change was observed. Entries without a cached_at
+        timestamp are treated as old.
+
+        Args:
+            data_type: Type of data to invalidate
+            device_id: UUID of the target device
+            older_than: Entries cached before this time are deleted
+            additional_key: Optional additional key component
+
+        Returns:
+            True if an entry was deleted
+        """
+        value_client = self.value_client
+        if not value_client:
+            return False
+
+        cache_key = self._build_cache_key(data_type, device_id, additional_key)
+        try:
+            cached_data = await value_client.get(cache_key)
+            if not cached_data:
+                return False
+            cached_at_str = self.codec.decode(cached_data).get("_cache_metadata", {}).get("cached_at")
+            if cached_at_str:
+                cached_at = datetime.fromisoformat(cached_at_str.replace("Z", "+00:00"))
+                if cached_at.tzinfo is None:
+                    cached_at = cached_at.replace(tzinfo=UTC)
+                if cached_at >= older_than:
+                    return False
+        except (RedisError, ValueError, AttributeError) as e:
+            self.logger.warning(
+                "Failed to check cache entry age (key: %s): %s",
+                cache_key, str(e)
+            )
+
+        return await self.delete(data_type, device_id, additional_key)
+
     async def exists(
         self,
         data_type: str,
@@ -370,12 +820,17 @@ class CacheManager:
             )
             return None
 
-    async def clear_device_cache(self, device_id: UUID) -> int:
+    async def clear_device_cache(self, device_id: UUID, scan_legacy: bool = False) -> int:
         """
         Clear all cached data for a specific device.
+
+        Keys are read from the device's index set. Redis is only scanned when
+        there is no index (entries written before indexing existed) or when
+        scan_legacy is set.
         
         Args:
             device_id: UUID of the device to clear cache for
+            scan_legacy: Also SCAN for matching keys that are not indexed
             
         Returns:
             Number of keys deleted
@@ -383,18 +838,19 @@ class CacheManager:
         if not self.redis_client:
             return 0
 
-        pattern = self._build_cache_key("*", device_id)
+        # Match keys with and without an additional key component
+        pattern = self._build_cache_key("*", device_id) + "*"
+        await self._invalidate_l1_pattern(pattern)
 
         try:
-            keys = await self.redis_client.keys(pattern)
-            if keys:
-                deleted_count = await self.redis_client.delete(*keys)
+            device_index, _ = self._index_keys("*", device_id)
+            deleted_count = await self._clear_indexed(device_index, pattern, scan_legacy)
+            if deleted_count:
                 self.logger.info(
                     "Cleared %d cache entries for device %s",
-                    int(deleted_count), device_id
+                    deleted_count, device_id
                 )
-                return int(deleted_count)
-            return 0
+            return deleted_count
         except RedisError as e:
             self.logger.error(
                 "Failed to clear device cache for %s: %s",
@@ -402,12 +858,17 @@ class CacheManager:
             )
             return 0
 
-    async def clear_data_type_cache(self, data_type: str) -> int:
+    async def clear_data_type_cache(self, data_type: str, scan_legacy: bool = False) -> int:
         """
         Clear all cached data for a specific data type.
+
+        Keys are read from the data type's index set. Redis is only scanned when
+        there is no index (entries written before indexing existed) or when
+        scan_legacy is set.
         
         Args:
             data_type: Type of data to clear
+            scan_legacy: Also SCAN for matching keys that are not indexed
             
         Returns:
             Number of keys deleted
@@ -415,18 +876,18 @@ class CacheManager:
         if not self.redis_client:
             return 0
 
-        pattern = f"{self.key_prefix}{data_type}:*"
+        pattern = ":".join([self.key_prefix, data_type, "*"])
+        await self._invalidate_l1_pattern(pattern)
 
         try:
-            keys = await self.redis_client.keys(pattern)
-            if keys:
-                deleted_count = await self.redis_client.delete(*keys)
+            _, type_index = self._index_keys(data_type, "*")
+            deleted_count = await self._clear_indexed(type_index, pattern, scan_legacy)
+            if deleted_count:
                 self.logger.info(
                     "Cleared %d cache entries for data type %s",
-                    int(deleted_count), data_type
+                    deleted_count, data_type
                 )
-                return int(deleted_count)
-            return 0
+            return deleted_count
         except RedisError as e:
             self.logger.error(
                 "Failed to clear cache for data type %s: %s",
@@ -434,19 +895,216 @@ class CacheManager:
             )
             return 0
 
+    async def _clear_indexed(self, index_key: str, pattern: str, scan_legacy: bool) -> int:
+        """
+        Delete the cache keys listed in an index set, and the set itself.
+
+        Args:
+            index_key: Device or data type index set
+            pattern: Glob matching the same keys, used for the SCAN fallback
+            scan_legacy: SCAN even if the index set exists
+
+        Returns:
+            Number of cache keys deleted
+        """
+        if not self.redis_client:
+            return 0
+        keys = cast("set[str]", await self.redis_client.smembers(index_key))
+        if scan_legacy or not keys:
+            # SCAN walks the keyspace incrementally instead of blocking Redis like KEYS
+            async for key in self.redis_client.scan_iter(match=pattern, count=INVALIDATION_BATCH_SIZE):
+                keys.add(key)
+        if not keys:
+            return 0
+
+        ordered_keys = list(keys)
+        deleted_count = 0
+        for start in range(0, len(ordered_keys), INVALIDATION_BATCH_SIZE):
+            batch = ordered_keys[start:start + INVALIDATION_BATCH_SIZE]
+            async with self.redis_client.pipeline() as pipe:
+                await pipe.delete(*batch)
+                if self.eviction_mode != "redis":
+                    await pipe.zrem(self.lru_zset_key, *batch)
+                # Also drop the keys from the other index they are listed in
+                await self._remove_from_indexes(pipe, batch)
+                results = await pipe.execute()
+            deleted_count += int(results[0])
+            for key in batch:
+                self._pending_touches.pop(key, None)
+
+        await self.redis_client.delete(index_key)
+        return deleted_count
+
     async def _update_lru_access(self, cache_key: str) -> None:
         """
         Update LRU access time for a cache key.
         
+        In 'batched' mode the access is only recorded in memory and written on the
+        next flush; in 'redis' mode nothing is tracked.
+
         Args:
             cache_key: The cache key that was accessed
         """
+        if self.eviction_mode == "batched":
+            self._pending_touches[cache_key] = time.time()
+            return
+        if self.eviction_mode == "redis":
+            return
+
         try:
             if self.redis_client:
                 await self.redis_client.zadd(self.lru_zset_key, {cache_key: time.time()})
         except RedisError as e:
             self.logger.warning("Failed to update LRU access for key %s: %s", cache_key, str(e))
 
+    async def _update_lru_access_many(self, cache_keys: list[str]) -> None:
+        """Update LRU access time for several cache keys with one ZADD"""
+        if not cache_keys:
+            return
+        now = time.time()
+        if self.eviction_mode == "batched":
+            self._pending_touches.update(dict.fromkeys(cache_keys, now))
+            return
+        if self.eviction_mode == "redis":
+            return
+
+        try:
+            if self.redis_client:
+                await self.redis_client.zadd(self.lru_zset_key, dict.fromkeys(cache_keys, now))
+        except RedisError as e:
+            self.logger.warning("Failed to update LRU access for %d keys: %s", len(cache_keys), str(e))
+
+    async def _flush_lru_touches(self) -> None:
+        """Write buffered LRU access times in one ZADD and enforce cache limits"""
+        if not self.redis_client:
+            return
+        if self._pending_touches:
+            touches, self._pending_touches = self._pending_touches, {}
+            try:
+                await self.redis_client.zadd(self.lru_zset_key, touches)
+            except RedisError as e:
+                self.logger.warning("Failed to flush %d LRU touches: %s", len(touches), str(e))
+                return
+        await self._enforce_cache_limits()
+
+    async def _flush_maintenance(self) -> None:
+        """Flush LRU touches ('batched' mode) and changed metrics"""
+        if self.eviction_mode == "batched":
+            await self._flush_lru_touches()
+        if self._metrics["total_operations"] != self._persisted_operations:
+            self._persisted_operations = int(self._metrics["total_operations"])
+            await self._persist_metrics()
+
+    async def _maintenance_loop(self) -> None:
+        """Periodically flush deferred LRU and metrics writes"""
+        while True:
+            await asyncio.sleep(self.lru_flush_interval)
+            try:
+                await self._flush_maintenance()
+            except Exception as e:
+                self.logger.warning("Cache maintenance flush failed: %s", str(e))
+
+    async def _check_eviction_policy(self) -> None:
+        """Warn if Redis will not evict cache keys by itself in 'redis' mode"""
+        if not self.redis_client:
+            return
+        try:
+            config = await self.redis_client.config_get("maxmemory*")
+        except RedisError as e:
+            # CONFIG is often disabled on managed Redis
+            self.logger.info("Could not read Redis eviction policy: %s", str(e))
+            return
+        policy = config.get("maxmemory-policy")
+        if policy not in REDIS_EVICTING_POLICIES or str(config.get("maxmemory", "0")) == "0":
+            self.logger.warning(
+                "Cache eviction mode is 'redis' but Redis has maxmemory=%s, maxmemory-policy=%s; "
+                "set maxmemory and an LRU/LFU policy or the cache will grow unbounded",
+                config.get("maxmemory"), policy,
+            )
+
+    def _remaining_ttl(self, data: dict[str, Any]) -> float:
+        """
+        Seconds until a cached value expires in Redis, from its cache metadata.
+
+        Used to keep an L1 copy no longer than the Redis copy would live.
+        """
+        try:
+            cache_metadata = data.get("_cache_metadata", {})
+            cached_at = datetime.fromisoformat(cache_metadata["cached_at"].replace("Z", "+00:00"))
+            if cached_at.tzinfo is None:
+                cached_at = cached_at.replace(tzinfo=UTC)
+            age = (datetime.now(UTC) - cached_at).total_seconds()
+            return float(cache_metadata.get("ttl", self.default_ttl)) - age
+        except (AttributeError, KeyError, TypeError, ValueError):
+            return 0.0
+
+    async def _publish_invalidation(
+        self,
+        pipe: Any,
+        keys: list[str] | None = None,
+        pattern: str | None = None,
+    ) -> None:
+        """
+        Queue an invalidation message on a pipeline for other processes' L1 caches.
+
+        Args:
+            pipe: Redis pipeline the publish is added to
+            keys: Exact cache keys that changed
+            pattern: Glob pattern of cache keys that changed
+        """
+        if not self.l1.enabled:
+            return
+        message = {"origin": self._instance_id, "keys": keys or [], "pattern": pattern}
+        await pipe.publish(self.invalidation_channel, json.dumps(message))
+
+    async def _invalidate_l1_pattern(self, pattern: str) -> None:
+        """Drop L1 entries matching a pattern here and in other processes"""
+        self.l1.delete_matching(pattern)
+        if not self.redis_client or not self.l1.enabled:
+            return
+        try:
+            message = {"origin": self._instance_id, "keys": [], "pattern": pattern}
+            await self.redis_client.publish(self.invalidation_channel, json.dumps(message))
+        except RedisError as e:
+            self.logger.warning("Failed to publish cache invalidation for %s: %s", pattern, str(e))
+
+    def _apply_invalidation(self, raw_message: str) -> None:
+        """Apply an invalidation message published by another process"""
+        try:
+            message = json.loads(raw_message)
+        except (TypeError, json.JSONDecodeError):
+            self.logger.debug("Ignoring malformed cache invalidation: %r", raw_message)
+            return
+        if message.get("origin") == self._instance_id:
+            return
+        for key in message.get("keys") or []:
+            self.l1.delete(key)
+        if message.get("pattern"):
+            self.l1.delete_matching(message["pattern"])
+
+    async def _listen_for_invalidations(self) -> None:
+        """Subscribe to the invalidation channel and drop changed keys from L1"""
+        while self.redis_client:
+            pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.invalidation_channel)
+                # Anything may have changed while we were not subscribed
+                self.l1.clear()
+                while True:
+                    message = await pubsub.get_message(timeout=1.0)
+                    if message and message.get("type") == "message":
+                        self._apply_invalidation(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Without invalidations L1 could serve stale data; fall back to Redis until resubscribed
+                self.logger.warning("Cache invalidation listener error, retrying: %s", str(e))
+                self.l1.clear()
+                await asyncio.sleep(1.0)
+            finally:
+                with contextlib.suppress(Exception):
+                    await pubsub.aclose()
+
     async def _enforce_cache_limits(self) -> None:
         """
         Enforce cache size and memory limits by evicting LRU items if necessary.
@@ -483,7 +1141,9 @@ class CacheManager:
             
         try:
             # Get the oldest items from the sorted set
-            oldest_keys = await self.redis_client.zrange(self.lru_zset_key, 0, count - 1)
+            oldest_keys = cast(
+                "list[str]", await self.redis_client.zrange(self.lru_zset_key, 0, count - 1)
+            )
 
             if not oldest_keys:
                 return 0
@@ -497,8 +1157,15 @@ class CacheManager:
                 # Remove from LRU tracker
                 await pipe.zrem(self.lru_zset_key, *oldest_keys)
 
+                await self._remove_from_indexes(pipe, list(oldest_keys))
+
+                await self._publish_invalidation(pipe, keys=list(oldest_keys))
+
                 await pipe.execute()
 
+            for key in oldest_keys:
+                self.l1.delete(key)
+
             # Update metrics
             await self._update_metrics("eviction", 0, len(oldest_keys))
 
@@ -513,29 +1180,39 @@ class CacheManager:
         self,
         operation_type: str,
         response_time: float,
-        eviction_count: int = 0
+        eviction_count: int = 0,
+        count: int = 1,
     ) -> None:
         """
         Update cache performance metrics.
         
         Args:
-            operation_type: Type of operation ('hit', 'miss', 'eviction')
+            operation_type: Type of operation ('l1_hit', 'hit', 'miss', 'eviction')
             response_time: Operation response time in seconds
             eviction_count: Number of items evicted (for eviction operations)
+            count: Number of operations of this type (for batch operations)
         """
         try:
-            if operation_type == "hit":
-                self._metrics["hits"] += 1
+            if operation_type == "l1_hit":
+                self._metrics["hits"] += count
+                self._metrics["l1_hits"] += count
+            elif operation_type == "hit":
+                self._metrics["hits"] += count
+                self._metrics["l2_hits"] += count
             elif operation_type == "miss":
-                self._metrics["misses"] += 1
+                self._metrics["misses"] += count
             elif operation_type == "eviction":
                 self._metrics["evictions"] += eviction_count
 
-            self._metrics["total_operations"] += 1
+            operations_before = self._metrics["total_operations"]
+            self._metrics["total_operations"] += count
             self._metrics["total_response_time_ms"] += response_time * 1000
 
-            # Periodically persist metrics to Redis (every 10 operations)
-            if self._metrics["total_operations"] % 10 == 0:
+            # Periodically persist metrics to Redis (every 10 operations, or on flush)
+            if (
+                self.eviction_mode == "tracked"
+                and operations_before // 10 != self._metrics["total_operations"] // 10
+            ):
                 await self._persist_metrics()
 
         except Exception as e:
@@ -572,13 +1249,26 @@ class CacheManager:
             total_ops = self._metrics["total_operations"]
             hits = self._metrics["hits"]
             hit_ratio = (hits / total_ops) if total_ops > 0 else 0.0
+
+            # L1 ratio is over all lookups, L2 ratio over the lookups that reached Redis
+            l1_hits = self._metrics.get("l1_hits", 0)
+            l2_hits = self._metrics.get("l2_hits", 0)
+            lookups = hits + self._metrics["misses"]
+            l2_lookups = lookups - l1_hits
+            l1_hit_ratio = (l1_hits / lookups) if lookups > 0 else 0.0
+            l2_hit_ratio = (l2_hits / l2_lookups) if l2_lookups > 0 else 0.0
+            codec_stats = self.codec.get_stats()
             avg_response = (self._metrics["total_response_time_ms"] / total_ops) if total_ops > 0 else 0.0
 
             # Get current cache size
             cache_size = 0
             memory_usage = 0.0
             if self.redis_client:
-                cache_size = await self.redis_client.zcard(self.lru_zset_key)
+                if self.eviction_mode == "redis":
+                    # No sorted set to count; the database holds little besides the cache
+                    cache_size = await self.redis_client.dbsize()
+                else:
+                    cache_size = await self.redis_client.zcard(self.lru_zset_key)
                 # Estimate memory usage (rough approximation)
                 memory_usage = cache_size * 2.0  # Assume ~2KB per cache entry on average
 
@@ -591,6 +1281,14 @@ class CacheManager:
                 hit_ratio=hit_ratio,
                 cache_size=int(cache_size),
                 memory_usage_mb=memory_usage / 1024,
+                l1_hits=int(l1_hits),
+                l2_hits=int(l2_hits),
+                l1_hit_ratio=l1_hit_ratio,
+                l2_hit_ratio=l2_hit_ratio,
+                l1_size=len(self.l1),
+                bytes_saved=int(codec_stats["bytes_saved"]),
+                average_encode_time_ms=codec_stats["avg_encode_ms"],
+                average_decode_time_ms=codec_stats["avg_decode_ms"],
             )
 
         except Exception as e:
@@ -615,7 +1313,22 @@ class CacheManager:
                 "max_cache_size": self.max_cache_size,
                 "max_memory_mb": self.max_memory_mb,
                 "eviction_batch_size": self.eviction_batch_size,
-            }
+                "eviction_mode": self.eviction_mode,
+                "pending_lru_touches": len(self._pending_touches),
+            },
+            "codec": {
+                "serializer": self.codec.serializer,
+                "compression": self.codec.compression,
+                "compression_threshold": self.codec.compression_threshold,
+            },
+            "l1_config": {
+                "enabled": self.l1.enabled,
+                "max_size": self.l1.max_size,
+                "max_ttl": self.l1.max_ttl,
+                "invalidation_listener": bool(
+                    self._invalidation_task and not self._invalidation_task.done()
+                ),
+            },
         }
 
         if not self.redis_client:
@@ -642,6 +1355,14 @@ class CacheManager:
                 "hits": cache_metrics.hits,
                 "misses": cache_metrics.misses,
                 "hit_ratio": f"{cache_metrics.hit_ratio:.2%}",
+                "l1_hits": cache_metrics.l1_hits,
+                "l2_hits": cache_metrics.l2_hits,
+                "l1_hit_ratio": f"{cache_metrics.l1_hit_ratio:.2%}",
+                "l2_hit_ratio": f"{cache_metrics.l2_hit_ratio:.2%}",
+                "l1_size": cache_metrics.l1_size,
+                "bytes_saved": cache_metrics.bytes_saved,
+                "avg_encode_time_ms": f"{cache_metrics.average_encode_time_ms:.3f}",
+                "avg_decode_time_ms": f"{cache_metrics.average_decode_time_ms:.3f}",
                 "evictions": cache_metrics.evictions,
                 "cache_size": cache_metrics.cache_size,
                 "estimated_memory_mb": f"{cache_metrics.memory_usage_mb:.2f}",
@@ -701,6 +1422,9 @@ async def get_cache_manager(
     max_cache_size: int = 1000,
     max_memory_mb: int = 100,
     eviction_batch_size: int = 50,
+    l1_max_size: int | None = None,
+    l1_ttl: float | None = None,
+    eviction_mode: str | None = None,
 ) -> CacheManager:
     """
     Get or create the global enhanced cache manager instance.
@@ -711,18 +1435,37 @@ async def get_cache_manager(
         max_cache_size: Maximum number of items in cache
         max_memory_mb: Maximum memory usage in MB
         eviction_batch_size: Number of items to evict at once
+        l1_max_size: Maximum items in the in-process L1 cache (defaults to settings)
+        l1_ttl: Maximum seconds an item is served from L1 (defaults to settings)
+        eviction_mode: LRU tracking mode (defaults to settings)
         
     Returns:
         Configured enhanced CacheManager instance
     """
     global _cache_manager
     if _cache_manager is None:
+        api_settings = get_settings().api
+        if l1_max_size is None:
+            l1_max_size = api_settings.cache_l1_max_size if api_settings.cache_l1_enabled else 0
+        if l1_ttl is None:
+            l1_ttl = api_settings.cache_l1_ttl
+        if eviction_mode is None:
+            eviction_mode = api_settings.cache_eviction_mode
         _cache_manager = CacheManager(
             redis_url=redis_url,
             default_ttl=default_ttl,
             max_cache_size=max_cache_size,
             max_memory_mb=max_memory_mb,
             eviction_batch_size=eviction_batch_size,
+            l1_max_size=l1_max_size,
+            l1_ttl=l1_ttl,
+            eviction_mode=eviction_mode,
+            lru_flush_interval=api_settings.cache_lru_flush_interval,
+            codec=CacheCodec(
+                serializer=api_settings.cache_serializer,
+                compression=api_settings.cache_compression,
+                compression_threshold=api_settings.cache_compression_threshold,
+            ),
         )
         await _cache_manager.connect()
     return _cache_manager
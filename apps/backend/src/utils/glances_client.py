@@ -2,11 +2,13 @@
 Glances HTTP Client
 
 Low-level HTTP client for Glances API communication with connection pooling,
-error handling, and authentication support.
+error handling, and authentication support. Clients are long-lived and shared
+per Glances endpoint, so keep-alive connections are reused across collections.
 """
 
 import asyncio
 from contextlib import asynccontextmanager
+from datetime import UTC, datetime
 import logging
 from typing import Any, AsyncGenerator
 
@@ -18,37 +20,110 @@ logger = logging.getLogger(__name__)
 
 class GlancesClient:
     """HTTP client for Glances API with connection pooling and error handling"""
-    
-    def __init__(self, base_url: str, timeout: int = 30):
+
+    def __init__(self, base_url: str, timeout: int = 30, max_connections: int = 5):
         self.base_url = base_url.rstrip('/')
         self.client = httpx.AsyncClient(
             base_url=self.base_url,
             timeout=httpx.Timeout(timeout),
-            headers={"Accept": "application/json"}
+            headers={"Accept": "application/json"},
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
         )
-    
-    async def get_endpoint(self, endpoint: str) -> dict[str, Any]:
-        """Get data from a single Glances API endpoint"""
+        # Reachability is learned from real requests instead of a pre-flight probe
+        self._stats: dict[str, Any] = {
+            "requests": 0,
+            "failures": 0,
+            "consecutive_failures": 0,
+            "last_success_at": None,
+            "last_error": None,
+        }
+        # Whether the server provides /api/4/all (None until it has been tried)
+        self.supports_all: bool | None = None
+
+    @property
+    def is_closed(self) -> bool:
+        """Whether the underlying HTTP client has been closed"""
+        return self.client.is_closed
+
+    @property
+    def is_reachable(self) -> bool | None:
+        """Whether the last request succeeded (None until a request has been made)"""
+        if self._stats["requests"] == 0:
+            return None
+        return bool(self._stats["consecutive_failures"] == 0)
+
+    def _record_result(self, error: Exception | None) -> None:
+        self._stats["requests"] += 1
+        if error is None:
+            self._stats["consecutive_failures"] = 0
+            self._stats["last_success_at"] = datetime.now(UTC).isoformat()
+        else:
+            self._stats["failures"] += 1
+            self._stats["consecutive_failures"] += 1
+            self._stats["last_error"] = str(error)
+
+    async def get_endpoint(self, endpoint: str, optional: bool = False) -> Any:
+        """
+        Get data from a single Glances API endpoint.
+
+        With optional=True a 404 (endpoint not provided by this server) is raised
+        as usual but not counted as a failed request, since the server answered.
+        """
+        endpoint = endpoint.lstrip('/')
+        url = f"/api/4/{endpoint}"
         try:
-            endpoint = endpoint.lstrip('/')
-            url = f"/api/4/{endpoint}"
-            
             logger.debug(f"Making request to {self.base_url}{url}")
             response = await self.client.get(url)
             response.raise_for_status()
-            
-            return response.json()
-            
+            data = response.json()
+
         except httpx.HTTPStatusError as e:
+            if optional and e.response.status_code == 404:
+                self._record_result(None)
+                logger.debug(f"Endpoint {url} not provided by {self.base_url}")
+                raise
+            self._record_result(e)
             logger.error(f"HTTP error {e.response.status_code} for {url}: {e.response.text}")
             raise
         except httpx.RequestError as e:
+            self._record_result(e)
             logger.error(f"Request error for {url}: {str(e)}")
             raise
         except Exception as e:
+            self._record_result(e)
             logger.error(f"Unexpected error for {url}: {str(e)}")
             raise
-    
+
+        self._record_result(None)
+        return data
+
+    async def get_all(self) -> dict[str, Any] | None:
+        """
+        Get data for every Glances plugin in a single request (`/api/4/all`).
+
+        Returns None if the server does not provide the endpoint. That is
+        remembered, so later calls return None without another request.
+        """
+        if self.supports_all is False:
+            return None
+        try:
+            data = await self.get_endpoint('all', optional=True)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code != 404:
+                raise
+            self.supports_all = False
+            logger.info(
+                f"Glances on {self.base_url} has no /api/4/all endpoint, using per-plugin requests"
+            )
+            return None
+        self.supports_all = True
+        if not isinstance(data, dict):
+            raise ValueError(f"Expected object from /api/4/all, got {type(data).__name__}")
+        return data
+
     async def get_multiple_endpoints(self, endpoints: list[str]) -> dict[str, dict[str, Any]]:
         """Get data from multiple endpoints in parallel"""
         tasks = []
@@ -58,7 +133,7 @@ class GlancesClient:
                 name=f"glances_{endpoint}"
             )
             tasks.append((endpoint, task))
-        
+
         results = {}
         for endpoint, task in tasks:
             try:
@@ -66,9 +141,9 @@ class GlancesClient:
             except Exception as e:
                 logger.error(f"Failed to get data from {endpoint}: {str(e)}")
                 results[endpoint] = None
-        
+
         return results
-    
+
     async def test_connectivity(self) -> bool:
         """Test if Glances server is accessible"""
         try:
@@ -77,11 +152,20 @@ class GlancesClient:
         except Exception as e:
             logger.warning(f"Glances connectivity test failed: {str(e)}")
             return False
-    
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get request and reachability statistics for this endpoint"""
+        return {
+            "base_url": self.base_url,
+            "reachable": self.is_reachable,
+            "supports_all": self.supports_all,
+            **self._stats,
+        }
+
     async def close(self) -> None:
         """Close HTTP client connections"""
         await self.client.aclose()
-    
+
     @asynccontextmanager
     async def request_context(self) -> AsyncGenerator[httpx.AsyncClient, None]:
         """Context manager for HTTP requests with automatic cleanup"""
@@ -92,8 +176,36 @@ class GlancesClient:
             pass
 
 
+# Shared clients keyed by Glances endpoint URL
+_glances_clients: dict[str, GlancesClient] = {}
+
+
 def get_glances_client(device_url: str) -> GlancesClient:
-    """Get Glances client instance for device"""
-    settings = get_settings()
-    timeout = getattr(settings.glances, 'connection_timeout', 30)
-    return GlancesClient(device_url, timeout=timeout)
\ No newline at end of file
+    """Get the shared Glances client for a device endpoint, creating it on first use"""
+    base_url = device_url.rstrip('/')
+    client = _glances_clients.get(base_url)
+    if client is None or client.is_closed:
+        settings = get_settings()
+        client = GlancesClient(
+            base_url,
+            timeout=getattr(settings.glances, 'connection_timeout', 30),
+            max_connections=getattr(settings.glances, 'max_connections_per_device', 5),
+        )
+        _glances_clients[base_url] = client
+    return client
+
+
+def get_glances_client_stats() -> dict[str, dict[str, Any]]:
+    """Get statistics for every pooled Glances client"""
+    return {base_url: client.get_stats() for base_url, client in _glances_clients.items()}
+
+
+async def close_glances_clients() -> None:
+    """Close all pooled Glances clients"""
+    clients = list(_glances_clients.values())
+    _glances_clients.clear()
+    for client in clients:
+        try:
+            await client.close()
+        except Exception as e:
+            logger.warning(f"Error closing Glances client for {client.base_url}: {e}")
@@ -0,0 +1,167 @@
+"""
+Keyset (Cursor) Pagination
+
+Helpers for paging through time-series hypertables without OFFSET. Rows are
+ordered by a unique key such as (time, device_id, container_id), newest first,
+and each page continues strictly after the last key of the previous page, so
+deep pages cost the same as the first. Totals can be estimated from planner
+statistics instead of counted exactly.
+"""
+
+import base64
+from dataclasses import dataclass
+from datetime import datetime
+import json
+import logging
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import Select, Table, func, select, text, tuple_
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from apps.backend.src.core.exceptions import ValidationError
+from apps.backend.src.schemas.common import PaginationParams
+
+logger = logging.getLogger(__name__)
+
+
+def encode_cursor(values: list[Any]) -> str:
+    """Encode key values of the last row of a page as an opaque cursor"""
+    encoded = [
+        {"t": "datetime", "v": value.isoformat()} if isinstance(value, datetime)
+        else {"t": "uuid", "v": str(value)} if isinstance(value, UUID)
+        else {"t": "value", "v": value}
+        for value in values
+    ]
+    payload = json.dumps(encoded, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, key_count: int) -> list[Any]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        ValidationError: If the cursor is malformed or has the wrong number of keys
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        encoded = json.loads(payload)
+        values = [
+            datetime.fromisoformat(item["v"]) if item["t"] == "datetime"
+            else UUID(item["v"]) if item["t"] == "uuid"
+            else item["v"]
+            for item in encoded
+        ]
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValidationError("Invalid pagination cursor", field="cursor", value=cursor) from e
+
+    if len(values) != key_count:
+        raise ValidationError("Invalid pagination cursor", field="cursor", value=cursor)
+    return values
+
+
+@dataclass
+class KeysetPage:
+    """One page of rows fetched in key order"""
+
+    items: list[Any]
+    has_next: bool
+    next_cursor: str | None
+
+
+async def fetch_keyset_page(
+    db: AsyncSession,
+    query: Select,
+    pagination: PaginationParams,
+    key_columns: list[InstrumentedAttribute],
+) -> KeysetPage:
+    """
+    Fetch a page of ORM rows ordered by key_columns, newest first.
+
+    With a cursor the page starts strictly after the cursor's key. Without one,
+    page-number pagination is still honoured (via OFFSET) for existing clients.
+
+    Args:
+        db: Database session
+        query: Filtered select of a single ORM entity
+        pagination: Page size plus either a cursor or a page number
+        key_columns: Columns forming a unique sort key, leading with time
+
+    Returns:
+        KeysetPage: Rows of the page and the cursor for the next one
+    """
+    query = query.order_by(*(column.desc() for column in key_columns))
+
+    if pagination.cursor:
+        values = decode_cursor(pagination.cursor, len(key_columns))
+        query = query.where(tuple_(*key_columns) < tuple_(*values))
+    elif pagination.page > 1:
+        query = query.offset(pagination.offset)
+
+    # One extra row tells whether another page exists without counting
+    result = await db.execute(query.limit(pagination.page_size + 1))
+    rows = list(result.scalars().all())
+
+    has_next = len(rows) > pagination.page_size
+    rows = rows[:pagination.page_size]
+    next_cursor = None
+    if has_next and rows:
+        next_cursor = encode_cursor([getattr(rows[-1], column.key) for column in key_columns])
+
+    return KeysetPage(items=rows, has_next=has_next, next_cursor=next_cursor)
+
+
+async def estimate_count(db: AsyncSession, query: Select) -> int:
+    """
+    Estimate the number of rows a query returns from planner statistics.
+
+    Unfiltered queries of a single table use TimescaleDB's
+    approximate_row_count(); anything else (filters, joins, subqueries) uses
+    the row estimate of the query plan. Neither scans the table.
+    """
+    try:
+        # Savepoint, so a failed estimate (e.g. no TimescaleDB) leaves the caller's
+        # transaction and the rows it has already loaded intact
+        async with db.begin_nested():
+            return await _estimate_count(db, query)
+    except Exception as e:
+        logger.warning(f"Row count estimate failed, counting exactly: {e}")
+        return await exact_count(db, query)
+
+
+async def _estimate_count(db: AsyncSession, query: Select) -> int:
+    froms = query.get_final_froms()
+    if query.whereclause is None and len(froms) == 1 and isinstance(froms[0], Table):
+        table = froms[0]
+        result = await db.execute(
+            text("SELECT approximate_row_count(CAST(:table_name AS regclass))"),
+            {"table_name": table.name},
+        )
+        return int(result.scalar() or 0)
+
+    compiled = query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    # Escape colons in rendered literals (e.g. timestamps) so they are not read as binds
+    explain_sql = str(compiled).replace(":", "\\:")
+    result = await db.execute(text(f"EXPLAIN (FORMAT JSON) {explain_sql}"))
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    if not isinstance(plan, list) or not plan:
+        raise ValueError(f"Unexpected EXPLAIN output: {plan!r}")
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def exact_count(db: AsyncSession, query: Select) -> int:
+    """Count the rows a query returns"""
+    result = await db.execute(select(func.count()).select_from(query.order_by(None).subquery()))
+    return int(result.scalar() or 0)
+
+
+async def count_rows(db: AsyncSession, query: Select, pagination: PaginationParams) -> int:
+    """Count exactly or estimate, as requested by pagination.include_total"""
+    if pagination.include_total:
+        return await exact_count(db, query)
+    return await estimate_count(db, query)
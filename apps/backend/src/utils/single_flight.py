@@ -0,0 +1,96 @@
+"""
+Single-Flight Request Coalescing
+
+Concurrent callers asking for the same key share a single in-flight execution
+instead of each starting their own. Used to stop the poller, REST endpoints and
+MCP tools from collecting the same data from the same device at the same time.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+import logging
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into one execution.
+
+    The first caller for a key starts the work in its own task; callers that
+    arrive while it is running await the same task and receive its result or
+    exception. Because the work runs in a separate task, a caller that is
+    cancelled (e.g. a dropped HTTP request) does not cancel the collection
+    other callers are waiting on. Nothing is cached once the task finishes.
+    """
+
+    def __init__(self) -> None:
+        self._in_flight: dict[Hashable, asyncio.Task[Any]] = {}
+        self._stats: dict[str, dict[str, int]] = {}
+
+    def _record(self, label: str, stat: str) -> None:
+        label_stats = self._stats.setdefault(label, {"executions": 0, "coalesced": 0, "failures": 0})
+        label_stats[stat] += 1
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]], label: str = "default") -> T:
+        """
+        Run `fn` unless a call with the same key is already in flight.
+
+        Args:
+            key: Hashable key identifying equivalent calls
+            fn: Zero-argument coroutine function performing the work
+            label: Name under which execution and coalescing counts are recorded
+
+        Returns:
+            The result of the shared execution
+        """
+        task = self._in_flight.get(key)
+        if task is not None:
+            self._record(label, "coalesced")
+            logger.debug("single_flight.coalesced", extra={"key": str(key), "label": label})
+        else:
+            self._record(label, "executions")
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t: self._finish(key, label, t))
+
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, label: str, task: asyncio.Task[Any]) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark the exception as retrieved; callers that are still waiting re-raise it
+        if not task.cancelled() and task.exception() is not None:
+            self._record(label, "failures")
+
+    def in_flight(self) -> int:
+        """Number of executions currently running"""
+        return len(self._in_flight)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get execution and coalescing counts, overall and per label"""
+        executions = sum(s["executions"] for s in self._stats.values())
+        coalesced = sum(s["coalesced"] for s in self._stats.values())
+        requests = executions + coalesced
+        return {
+            "in_flight": len(self._in_flight),
+            "executions": executions,
+            "coalesced": coalesced,
+            "coalesced_ratio": round(coalesced / requests, 4) if requests else 0.0,
+            "by_label": {label: dict(stats) for label, stats in self._stats.items()},
+        }
+
+
+# Global single-flight registry for data collection
+_collection_single_flight: SingleFlight | None = None
+
+
+def get_collection_single_flight() -> SingleFlight:
+    """Get the process-wide single-flight registry shared by all data collection"""
+    global _collection_single_flight
+    if _collection_single_flight is None:
+        _collection_single_flight = SingleFlight()
+    return _collection_single_flight
@@ -6,18 +6,19 @@ including connection pooling, secure authentication, command execution, and erro
 """
 
 import asyncio
+from collections import deque
+from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
 import logging
 import time
-
 from typing import Any, Dict, List, Optional, cast
-from collections.abc import AsyncGenerator
 
 import asyncssh
 from asyncssh import SSHClientConnection
 
 from apps.backend.src.core.config import get_settings
+from apps.backend.src.core.exceptions import SSHConnectionError
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -34,6 +35,15 @@ def _to_text(data: str | bytes | None) -> str:
             return str(data)
     return data
 
+# Errors indicating the underlying SSH transport is gone rather than the command failing.
+# asyncssh.ChannelOpenError is not one of them: the server refused one more channel
+# (e.g. MaxSessions) on a connection that is still serving other channels.
+SSH_TRANSPORT_ERRORS: tuple[type[BaseException], ...] = (
+    asyncssh.DisconnectError,
+    ConnectionError,
+)
+
+
 @dataclass(frozen=True)
 class SSHConnectionInfo:
     """SSH connection configuration for a device"""
@@ -73,26 +83,69 @@ class SSHConnectionPool:
     """
     Async SSH connection pool with automatic cleanup and connection management.
 
-    Manages connections to multiple devices with configurable limits and timeouts.
+    Each host is served by a small number of shared, authenticated connections.
+    Callers do not hold a connection exclusively; instead they reserve one of the
+    session channel slots on a shared connection, so concurrent commands to the
+    same host are multiplexed over a single transport. Additional connections are
+    only opened when every existing connection is at its channel cap.
+
+    When a host is at both its connection and channel limits, callers wait in a
+    per-host FIFO queue and are handed capacity in arrival order as channels are
+    released, rather than polling for a free slot.
     """
 
-    def __init__(self, max_connections_per_host: int = 3, connection_timeout: int = 30):
+    def __init__(
+        self,
+        max_connections_per_host: int = 3,
+        connection_timeout: int = 30,
+        keepalive_interval: int = 30,
+        keepalive_count_max: int = 3,
+        liveness_grace_period: int = 60,
+        max_channels_per_connection: int = 10,
+        acquire_timeout: float = 30.0,
+    ):
         """
         Initialize SSH connection pool.
 
         Args:
             max_connections_per_host: Maximum concurrent connections per host
             connection_timeout: Connection timeout in seconds
+            keepalive_interval: Seconds between SSH keepalive requests (0 disables)
+            keepalive_count_max: Unanswered keepalives before a connection is closed
+            liveness_grace_period: Seconds after a successful use during which a
+                pooled connection is reused without probing (used when keepalive is disabled)
+            max_channels_per_connection: Maximum concurrent session channels on one
+                connection (should not exceed the server's MaxSessions, 10 by default)
+            acquire_timeout: Seconds a caller waits in the host queue for a free
+                channel before giving up (0 waits indefinitely)
         """
         self.max_connections_per_host = max_connections_per_host
         self.connection_timeout = connection_timeout
+        self.keepalive_interval = keepalive_interval
+        self.keepalive_count_max = keepalive_count_max
+        self.liveness_grace_period = liveness_grace_period
+        self.max_channels_per_connection = max(1, max_channels_per_connection)
+        self.acquire_timeout = acquire_timeout
 
-        # Connection pool storage
+        # Connection pool storage: every open connection per host, shared by callers
         self._pools: dict[str, list[SSHClientConnection]] = {}
         self._pool_locks: dict[str, asyncio.Lock] = {}
         self._connection_counts: dict[str, int] = {}
         self._last_used: dict[str, float] = {}
 
+        # Session channels currently open on each connection
+        self._active_channels: dict[SSHClientConnection, int] = {}
+        # Lower channel limits learned from connections that refused a channel
+        self._channel_limits: dict[SSHClientConnection, int] = {}
+
+        # Connection health tracking: monotonic time of the last successful use
+        self._last_ok: dict[SSHClientConnection, float] = {}
+        self._health_stats: dict[str, dict[str, int]] = {}
+
+        # Callers waiting for capacity, in arrival order, and their wait statistics
+        self._waiters: dict[str, deque[asyncio.Future[None]]] = {}
+        self._wait_stats: dict[str, dict[str, float]] = {}
+
         # Connection cleanup tracking
         self._cleanup_task: asyncio.Task | None = None
         self._shutdown = False
@@ -122,21 +175,11 @@ class SSHConnectionPool:
                         idle_time = current_time - self._last_used[host]
 
                         if idle_time > cleanup_threshold and connections:
-                            # Close idle connections
+                            # Close connections with no open channels
                             async with self._pool_locks.get(host, asyncio.Lock()):
-                                if connections:
-                                    connection = connections.pop()
-                                    try:
-                                        connection.close()
-                                        await connection.wait_closed()
-                                    except Exception as e:
-                                        logger.debug(
-                                            f"Error closing idle connection to {host}: {e}"
-                                        )
-
-                                    self._connection_counts[host] = max(
-                                        0, self._connection_counts.get(host, 0) - 1
-                                    )
+                                for connection in list(connections):
+                                    if not self._active_channels.get(connection):
+                                        await self._discard_connection(host, connection)
 
                 await asyncio.sleep(60)  # Check every minute
 
@@ -150,6 +193,85 @@ class SSHConnectionPool:
         """Generate unique key for host connection pool"""
         return connection_info.host
 
+    def _record(self, host_key: str, stat: str) -> None:
+        """Increment a per-host connection health counter"""
+        host_stats = self._health_stats.setdefault(host_key, {
+            "connections_opened": 0,
+            "channels_opened": 0,
+            "probes_avoided": 0,
+            "probes_performed": 0,
+            "probe_failures": 0,
+            "stale_discarded": 0,
+            "reconnects": 0,
+            "channel_refusals": 0,
+        })
+        host_stats[stat] += 1
+
+    def _host_wait_stats(self, host_key: str) -> dict[str, float]:
+        """Get the per-host channel wait statistics"""
+        return self._wait_stats.setdefault(host_key, {
+            "waits": 0,
+            "wait_timeouts": 0,
+            "total_wait_time": 0.0,
+            "max_wait_time": 0.0,
+            "max_queue_depth": 0,
+        })
+
+    def _record_wait(self, host_key: str, wait_time: float, timed_out: bool) -> None:
+        """Record how long a caller spent queued for a channel"""
+        wait_stats = self._host_wait_stats(host_key)
+        wait_stats["waits"] += 1
+        wait_stats["total_wait_time"] += wait_time
+        wait_stats["max_wait_time"] = max(wait_stats["max_wait_time"], wait_time)
+        if timed_out:
+            wait_stats["wait_timeouts"] += 1
+
+    def _wake_next_waiter(self, host_key: str) -> None:
+        """
+        Wake the caller at the head of the host queue.
+
+        Only the head is woken; once it has taken capacity (or given up) it wakes
+        the next caller in turn, so spare capacity is handed down the queue in order.
+        """
+        waiters = self._waiters.get(host_key)
+        if waiters and not waiters[0].done():
+            waiters[0].set_result(None)
+
+    async def _discard_connection(self, host_key: str, connection: SSHClientConnection) -> None:
+        """Remove a connection from the pool, close it and release its slot"""
+        connections = self._pools.get(host_key, [])
+        if connection not in connections:
+            return
+
+        connections.remove(connection)
+        self._active_channels.pop(connection, None)
+        self._channel_limits.pop(connection, None)
+        self._last_ok.pop(connection, None)
+        self._connection_counts[host_key] = max(0, self._connection_counts.get(host_key, 0) - 1)
+        try:
+            connection.close()
+            await connection.wait_closed()
+        except Exception as e:
+            logger.debug(f"Error closing connection to {host_key}: {e}")
+        finally:
+            # A connection slot is free again
+            self._wake_next_waiter(host_key)
+
+    def _needs_probe(self, connection: SSHClientConnection) -> bool:
+        """
+        Decide whether a pooled connection must be probed before reuse.
+
+        With keepalive enabled, asyncssh closes connections whose peer stops
+        answering, so `is_closed()` already reflects transport health. Without
+        keepalive, connections used successfully within the grace period are
+        trusted; older ones get a single probe. Connections with channels
+        already open are in active use and never probed.
+        """
+        if self.keepalive_interval > 0 or self._active_channels.get(connection):
+            return False
+        last_ok = self._last_ok.get(connection)
+        return last_ok is None or time.monotonic() - last_ok > self.liveness_grace_period
+
     async def _create_connection(self, connection_info: SSHConnectionInfo) -> SSHClientConnection:
         """Create a new SSH connection using AsyncSSH best practices"""
         # Ensure host is a string
@@ -166,7 +288,9 @@ class SSHConnectionPool:
             # AsyncSSH connect() with minimal parameters to avoid type mismatches
             connection = await asyncssh.connect(
                 connection_info.host,
-                known_hosts=None  # Disable host key checking for infrastructure monitoring
+                known_hosts=None,  # Disable host key checking for infrastructure monitoring
+                keepalive_interval=self.keepalive_interval,
+                keepalive_count_max=self.keepalive_count_max,
             )
 
             logger.debug(f"Created SSH connection to {connection_info.host}")
@@ -178,18 +302,149 @@ class SSHConnectionPool:
             logger.debug(f"SSH connection error details: {type(e).__name__}: {e}")
             raise
 
+    async def _reserve_channel(self, host_key: str) -> SSHClientConnection | None:
+        """
+        Reserve a channel slot on an existing shared connection.
+
+        Must be called with the host lock held. Returns None when no open
+        connection has a free channel slot.
+        """
+        connections = self._pools[host_key]
+
+        for connection in [c for c in connections if c.is_closed()]:
+            # Closed by keepalive failure or the remote side
+            self._record(host_key, "stale_discarded")
+            await self._discard_connection(host_key, connection)
+
+        while True:
+            candidates = [
+                c for c in connections
+                if self._active_channels.get(c, 0) < self._channel_limit(c)
+            ]
+            if not candidates:
+                return None
+
+            connection = min(candidates, key=lambda c: self._active_channels.get(c, 0))
+
+            if not self._needs_probe(connection):
+                self._record(host_key, "probes_avoided")
+            else:
+                self._record(host_key, "probes_performed")
+                try:
+                    await asyncio.wait_for(connection.run("true", check=False), timeout=5.0)
+                except Exception:
+                    # Connection is dead, close it and try the next one
+                    self._record(host_key, "probe_failures")
+                    await self._discard_connection(host_key, connection)
+                    continue
+
+            self._active_channels[connection] = self._active_channels.get(connection, 0) + 1
+            return connection
+
+    def _channel_limit(self, connection: SSHClientConnection) -> int:
+        """Concurrent channels allowed on a connection"""
+        return self._channel_limits.get(connection, self.max_channels_per_connection)
+
+    def _channel_refused(self, host_key: str, connection: SSHClientConnection) -> None:
+        """
+        Treat a refused channel as the connection being full.
+
+        The server's session limit is below max_channels_per_connection, so the
+        connection is capped at the channels it is serving besides the refused
+        one. Later callers go to another connection or wait for a free channel.
+        """
+        self._record(host_key, "channel_refusals")
+        others = self._active_channels.get(connection, 1) - 1
+        self._channel_limits[connection] = max(1, min(others, self._channel_limit(connection)))
+        logger.debug(
+            f"SSH server {host_key} refused a channel, limiting connection to "
+            f"{self._channel_limits[connection]} channels"
+        )
+
+    async def _acquire_slot(self, host_key: str) -> tuple[SSHClientConnection | None, bool]:
+        """
+        Reserve a channel on an existing connection or a slot to open a new one.
+
+        Callers that cannot be served immediately join the host's FIFO queue.
+        New arrivals never take capacity ahead of queued callers, so a busy host
+        serves commands in the order they were issued.
+
+        Returns:
+            tuple: (connection with a reserved channel, False) or (None, True) when
+            the caller has reserved a connection slot and must open the connection
+
+        Raises:
+            SSHConnectionError: If `acquire_timeout` elapses while queued
+        """
+        loop = asyncio.get_running_loop()
+        waiters = self._waiters.setdefault(host_key, deque[asyncio.Future[None]]())
+        deadline = loop.time() + self.acquire_timeout if self.acquire_timeout > 0 else None
+        waiter: asyncio.Future[None] | None = None
+        wait_started = 0.0
+        timed_out = False
+
+        try:
+            while True:
+                async with self._pool_locks[host_key]:
+                    if (not waiters and waiter is None) or (waiters and waiters[0] is waiter):
+                        connection = await self._reserve_channel(host_key)
+                        if connection is not None:
+                            return connection, False
+                        if self._connection_counts[host_key] < self.max_connections_per_host:
+                            # Reserve the connection slot before releasing the lock
+                            self._connection_counts[host_key] += 1
+                            return None, True
+
+                    if waiter is None:
+                        wait_started = time.monotonic()
+                        waiter = loop.create_future()
+                        waiters.append(waiter)
+                        wait_stats = self._host_wait_stats(host_key)
+                        wait_stats["max_queue_depth"] = max(wait_stats["max_queue_depth"], len(waiters))
+                    elif waiter.done():
+                        # Woken but the capacity is gone; keep our place at the head
+                        next_waiter: asyncio.Future[None] = loop.create_future()
+                        waiters[waiters.index(waiter)] = next_waiter
+                        waiter = next_waiter
+
+                timeout = None if deadline is None else max(0.0, deadline - loop.time())
+                try:
+                    await asyncio.wait_for(waiter, timeout=timeout)
+                except TimeoutError:
+                    timed_out = True
+                    raise SSHConnectionError(
+                        f"Timed out after {self.acquire_timeout}s waiting for an SSH channel to {host_key}",
+                        hostname=host_key,
+                        details={"queue_depth": len(waiters)},
+                    ) from None
+        finally:
+            if waiter is not None:
+                if waiter in waiters:
+                    waiters.remove(waiter)
+                self._record_wait(host_key, time.monotonic() - wait_started, timed_out)
+                # Pass any remaining capacity on to the next caller in line
+                self._wake_next_waiter(host_key)
+
     @asynccontextmanager
     async def get_connection(
         self, connection_info: SSHConnectionInfo
     ) -> AsyncGenerator[SSHClientConnection, None]:
         """
-        Get an SSH connection from the pool with automatic cleanup.
+        Reserve a session channel on a shared SSH connection to the host.
+
+        The yielded connection may be used concurrently by other callers; each
+        caller should open exactly one session channel on it (e.g. a single
+        `create_process`). Pooled connections are reused without running a
+        liveness command; see `_needs_probe` for when a probe is still issued.
 
         Args:
             connection_info: SSH connection configuration
 
         Yields:
-            SSHClientConnection: Active SSH connection
+            SSHClientConnection: Shared SSH connection with a reserved channel slot
+
+        Raises:
+            SSHConnectionError: If no channel became free within `acquire_timeout`
         """
         host_key = self._get_host_key(connection_info)
 
@@ -198,68 +453,88 @@ class SSHConnectionPool:
             self._pools[host_key] = []
             self._pool_locks[host_key] = asyncio.Lock()
             self._connection_counts[host_key] = 0
+            self._waiters.setdefault(host_key, deque[asyncio.Future[None]]())
 
-        connection = None
+        self._start_cleanup_task()
 
-        try:
-            # Try to get existing connection from pool
-            async with self._pool_locks[host_key]:
-                if self._pools[host_key]:
-                    connection = self._pools[host_key].pop()
-
-                    # Test if connection is still alive
-                    try:
-                        # Simple connectivity test
-                        await asyncio.wait_for(
-                            connection.run("echo 'test'", check=False), timeout=5.0
-                        )
-                    except Exception:
-                        # Connection is dead, close it and create new one
-                        try:
-                            connection.close()
-                            await connection.wait_closed()
-                        except Exception:
-                            pass
-                        connection = None
-                        self._connection_counts[host_key] = max(
-                            0, self._connection_counts[host_key] - 1
-                        )
-
-            # Create new connection if needed
-            if connection is None:
-                # Check connection limit
-                if self._connection_counts[host_key] >= self.max_connections_per_host:
-                    # Wait for a connection to become available
-                    while self._connection_counts[host_key] >= self.max_connections_per_host:
-                        await asyncio.sleep(0.1)
+        connection, create_connection = await self._acquire_slot(host_key)
 
+        if create_connection:
+            try:
                 connection = await self._create_connection(connection_info)
-                self._connection_counts[host_key] += 1
+            except Exception:
+                self._connection_counts[host_key] = max(0, self._connection_counts[host_key] - 1)
+                self._wake_next_waiter(host_key)
+                raise
+            self._record(host_key, "connections_opened")
+            self._pools[host_key].append(connection)
+            self._active_channels[connection] = 1
+            # The new connection has spare channels for queued callers
+            self._wake_next_waiter(host_key)
+        elif connection is None:
+            # _acquire_slot always reserves either a pooled channel or a new connection slot
+            raise SSHConnectionError(
+                f"No SSH channel was reserved for {host_key}", hostname=host_key
+            )
 
-            # Update last used time
-            self._last_used[host_key] = time.time()
+        self._record(host_key, "channels_opened")
 
+        # Update last used time
+        self._last_used[host_key] = time.time()
+
+        try:
             yield connection
+            self._last_ok[connection] = time.monotonic()
 
-        except Exception:
-            # If connection failed, clean it up
-            if connection:
-                try:
-                    connection.close()
-                    await connection.wait_closed()
-                except Exception:
-                    pass
-                self._connection_counts[host_key] = max(0, self._connection_counts[host_key] - 1)
+        except asyncssh.ChannelOpenError:
+            # Only this channel was refused; other callers keep using the connection.
+            # A connection that closed meanwhile is discarded below.
+            if not connection.is_closed():
+                self._channel_refused(host_key, connection)
+            raise
+
+        except SSH_TRANSPORT_ERRORS:
+            # The shared transport is gone; drop it so no other caller reuses it
+            async with self._pool_locks[host_key]:
+                await self._discard_connection(host_key, connection)
             raise
 
         finally:
-            # Return connection to pool if still alive
-            if connection and not connection.is_closed():
+            self._release_channel(host_key, connection)
+            if connection.is_closed() and not self._active_channels.get(connection):
                 async with self._pool_locks[host_key]:
-                    self._pools[host_key].append(connection)
-            elif connection:
-                # Connection is closed, decrease count
-                self._connection_counts[host_key] = max(0, self._connection_counts[host_key] - 1)
+                    await self._discard_connection(host_key, connection)
+
+    def _release_channel(self, host_key: str, connection: SSHClientConnection) -> None:
+        """Release a reserved channel slot on a connection and hand it to the next waiter"""
+        if connection in self._active_channels:
+            self._active_channels[connection] = max(0, self._active_channels[connection] - 1)
+        self._wake_next_waiter(host_key)
+
+    async def invalidate_host(self, connection_info: SSHConnectionInfo) -> int:
+        """
+        Close idle connections for a host after a connection failure.
+
+        Connections with open channels are left to fail or finish on their own.
+
+        Args:
+            connection_info: SSH connection configuration
+
+        Returns:
+            int: Number of connections closed
+        """
+        host_key = self._get_host_key(connection_info)
+        if host_key not in self._pools:
+            return 0
+
+        self._record(host_key, "reconnects")
+        closed = 0
+        async with self._pool_locks[host_key]:
+            for connection in list(self._pools[host_key]):
+                if not self._active_channels.get(connection):
+                    await self._discard_connection(host_key, connection)
+                    closed += 1
+        return closed
 
     async def close_all_connections(self) -> None:
         """Close all connections in the pool"""
@@ -273,6 +548,15 @@ class SSHConnectionPool:
             except asyncio.CancelledError:
                 pass
 
+        # Fail callers still queued for a channel
+        for host_key, waiters in self._waiters.items():
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_exception(
+                        SSHConnectionError("SSH connection pool is shutting down", hostname=host_key)
+                    )
+            waiters.clear()
+
         # Close all pooled connections
         for host_key, connections in self._pools.items():
             async with self._pool_locks[host_key]:
@@ -288,18 +572,37 @@ class SSHConnectionPool:
         self._pools.clear()
         self._connection_counts.clear()
         self._last_used.clear()
+        self._active_channels.clear()
+        self._channel_limits.clear()
+        self._last_ok.clear()
 
         logger.info("SSH connection pool closed")
 
     def get_pool_stats(self) -> dict[str, dict[str, Any]]:
         """Get connection pool statistics"""
         stats = {}
-        for host_key in self._pools:
+        for host_key, connections in self._pools.items():
+            channels = [self._active_channels.get(c, 0) for c in connections]
+            wait_stats = self._wait_stats.get(host_key, {})
+            waits = wait_stats.get("waits", 0)
             stats[host_key] = {
-                "pooled_connections": len(self._pools[host_key]),
+                "pooled_connections": len(connections),
                 "total_connections": self._connection_counts.get(host_key, 0),
+                "active_channels": sum(channels),
+                "channels_per_connection": channels,
                 "last_used": self._last_used.get(host_key, 0),
                 "max_connections": self.max_connections_per_host,
+                "max_channels_per_connection": self.max_channels_per_connection,
+                "keepalive_interval": self.keepalive_interval,
+                "queue_depth": len(self._waiters.get(host_key, ())),
+                "max_queue_depth": wait_stats.get("max_queue_depth", 0),
+                "waits": waits,
+                "wait_timeouts": wait_stats.get("wait_timeouts", 0),
+                "total_wait_time": wait_stats.get("total_wait_time", 0.0),
+                "avg_wait_time": wait_stats.get("total_wait_time", 0.0) / waits if waits else 0.0,
+                "max_wait_time": wait_stats.get("max_wait_time", 0.0),
+                "acquire_timeout": self.acquire_timeout,
+                **self._health_stats.get(host_key, {}),
             }
         return stats
 
@@ -323,6 +626,11 @@ class SSHClient:
         self.connection_pool = connection_pool or SSHConnectionPool(
             max_connections_per_host=settings.ssh.ssh_max_connections_per_host,
             connection_timeout=settings.ssh.ssh_connect_timeout,
+            keepalive_interval=settings.ssh.ssh_keepalive_interval,
+            keepalive_count_max=settings.ssh.ssh_keepalive_count_max,
+            liveness_grace_period=settings.ssh.ssh_liveness_grace_period,
+            max_channels_per_connection=settings.ssh.ssh_max_channels_per_connection,
+            acquire_timeout=settings.ssh.ssh_acquire_timeout,
         )
 
         # Configuration from settings
@@ -342,6 +650,48 @@ class SSHClient:
             "average_execution_time": 0.0,
         }
 
+    async def _run_on_channel(
+        self, connection: SSHClientConnection, command: str, timeout: float
+    ) -> asyncssh.SSHCompletedProcess:
+        """Run a command in its own session channel on a shared connection"""
+        process = await asyncio.wait_for(connection.create_process(command), timeout=timeout)
+        try:
+            return await process.wait(check=False, timeout=timeout)
+        finally:
+            # Always close the channel so a timed-out command does not hold a
+            # slot on the shared connection
+            process.close()
+
+    async def _run_pooled(
+        self, connection_info: SSHConnectionInfo, command: str, timeout: float
+    ) -> asyncssh.SSHCompletedProcess:
+        """
+        Run a command on a pooled connection, reconnecting once if it has gone away.
+
+        Pooled connections are not probed before use, so a connection that died
+        since its last use surfaces here as a transport error. The pool discards
+        it and the command is retried on a fresh connection without consuming
+        one of the caller's retry attempts. A refused channel is retried the same
+        way, on another connection or once a channel frees up, without closing
+        anything.
+        """
+        acquired = False
+        try:
+            async with self.connection_pool.get_connection(connection_info) as connection:
+                acquired = True
+                return await self._run_on_channel(connection, command, timeout)
+        except asyncssh.ChannelOpenError as e:
+            logger.debug(f"SSH channel to {connection_info.host} refused, retrying: {e}")
+        except SSH_TRANSPORT_ERRORS as e:
+            if not acquired:
+                # Establishing the connection failed; let the caller's retry policy apply
+                raise
+            logger.debug(f"Pooled SSH connection to {connection_info.host} lost, reconnecting: {e}")
+            await self.connection_pool.invalidate_host(connection_info)
+
+        async with self.connection_pool.get_connection(connection_info) as connection:
+            return await self._run_on_channel(connection, command, timeout)
+
     async def execute_command(
         self,
         connection_info: SSHConnectionInfo,
@@ -376,58 +726,53 @@ class SSHClient:
                 start_time = time.time()
 
                 try:
-                    async with self.connection_pool.get_connection(connection_info) as connection:
-                        # Execute command with timeout
-                        result = await asyncio.wait_for(
-                            connection.run(command, check=False), timeout=timeout
-                        )
-
-                        execution_time = time.time() - start_time
+                    result = await self._run_pooled(connection_info, command, timeout)
+                    execution_time = time.time() - start_time
 
-                        # Update statistics
-                        self._execution_stats["total_commands"] += 1
-                        self._execution_stats["total_execution_time"] += execution_time
+                    # Update statistics
+                    self._execution_stats["total_commands"] += 1
+                    self._execution_stats["total_execution_time"] += execution_time
 
-                        if result.returncode == 0:
-                            self._execution_stats["successful_commands"] += 1
-                        else:
-                            self._execution_stats["failed_commands"] += 1
+                    if result.returncode == 0:
+                        self._execution_stats["successful_commands"] += 1
+                    else:
+                        self._execution_stats["failed_commands"] += 1
 
-                        self._execution_stats["average_execution_time"] = self._execution_stats[
-                            "total_execution_time"
-                        ] / max(self._execution_stats["total_commands"], 1)
+                    self._execution_stats["average_execution_time"] = self._execution_stats[
+                        "total_execution_time"
+                    ] / max(self._execution_stats["total_commands"], 1)
 
-                        # Normalize outputs to text
-                        stdout_text = _to_text(result.stdout)
-                        stderr_text = _to_text(result.stderr)
+                    # Normalize outputs to text
+                    stdout_text = _to_text(result.stdout)
+                    stderr_text = _to_text(result.stderr)
 
-                        # Coerce return code to int
-                        rc = result.returncode if isinstance(result.returncode, int) else -1
+                    # Coerce return code to int
+                    rc = result.returncode if isinstance(result.returncode, int) else -1
 
-                        # Create result object
-                        ssh_result = SSHExecutionResult(
-                            command=command,
-                            return_code=rc,
-                            stdout=stdout_text,
-                            stderr=stderr_text,
-                            execution_time=execution_time,
-                            host=connection_info.host,
-                            success=rc == 0,
-                        )
+                    # Create result object
+                    ssh_result = SSHExecutionResult(
+                        command=command,
+                        return_code=rc,
+                        stdout=stdout_text,
+                        stderr=stderr_text,
+                        execution_time=execution_time,
+                        host=connection_info.host,
+                        success=rc == 0,
+                    )
 
-                        # Check for errors if requested
-                        if check and result.returncode != 0:
-                            error_msg = f"Command failed on {connection_info.host}: {command}"
-                            if stderr_text:
-                                error_msg += f"\nStderr: {stderr_text}"
-                            ssh_result.error_message = error_msg
-                            raise Exception(error_msg)
+                    # Check for errors if requested
+                    if check and result.returncode != 0:
+                        error_msg = f"Command failed on {connection_info.host}: {command}"
+                        if stderr_text:
+                            error_msg += f"\nStderr: {stderr_text}"
+                        ssh_result.error_message = error_msg
+                        raise Exception(error_msg)
 
-                        logger.debug(
-                            f"Command executed on {connection_info.host} in {execution_time:.2f}s: {command[:50]}..."
-                        )
+                    logger.debug(
+                        f"Command executed on {connection_info.host} in {execution_time:.2f}s: {command[:50]}..."
+                    )
 
-                        return ssh_result
+                    return ssh_result
 
                 except TimeoutError as e:
                     execution_time = time.time() - start_time
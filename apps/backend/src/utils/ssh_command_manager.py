@@ -149,6 +149,40 @@ class ContainerStatsParser(CommandParser):
             return False
 
 
+class ContainerInventoryParser(CommandParser):
+    """Parser for the combined `docker ps` + `docker stats` inventory command"""
+
+    DOCKER_NOT_AVAILABLE_MARKER = "__DOCKER_NOT_AVAILABLE__"
+    STATS_SEPARATOR = "__DOCKER_STATS__"
+
+    def __init__(self) -> None:
+        self._line_parser = ContainerStatsParser()
+
+    def parse(self, output: str) -> dict[str, Any]:
+        """Split the inventory output and index stats by container ID and name"""
+        if self.DOCKER_NOT_AVAILABLE_MARKER in output:
+            return {"docker_available": False, "containers": [], "stats": {}}
+
+        ps_output, _, stats_output = output.partition(self.STATS_SEPARATOR)
+        containers = self._line_parser.parse(ps_output)
+
+        stats: dict[str, dict[str, Any]] = {}
+        for stats_entry in self._line_parser.parse(stats_output):
+            # `docker stats` reports short IDs, `docker ps` may report either form
+            container_id = stats_entry.get("ID", "") or stats_entry.get("Container", "")
+            if container_id:
+                stats[container_id[:12]] = stats_entry
+            name = stats_entry.get("Name", "")
+            if name:
+                stats[name.lstrip("/")] = stats_entry
+
+        return {"docker_available": True, "containers": containers, "stats": stats}
+
+    def validate(self, output: str) -> bool:
+        """Validate that the inventory output contains the stats separator"""
+        return self.DOCKER_NOT_AVAILABLE_MARKER in output or self.STATS_SEPARATOR in output
+
+
 class DriveHealthParser(CommandParser):
     """Parser for drive health and SMART data"""
 
@@ -224,6 +258,25 @@ class SSHCommandManager:
             parser=self.parsers[CommandCategory.CONTAINER_MANAGEMENT].parse
         ))
 
+        # Container listing and stats for every container in a single round-trip
+        inventory_parser = ContainerInventoryParser()
+        self.register_command(CommandDefinition(
+            name="container_inventory",
+            command_template=(
+                "command -v docker >/dev/null 2>&1 || "
+                f"{{{{ echo '{ContainerInventoryParser.DOCKER_NOT_AVAILABLE_MARKER}'; exit 0; }}}}; "
+                "docker ps -a --format '{{{{json .}}}}'; "
+                f"echo '{ContainerInventoryParser.STATS_SEPARATOR}'; "
+                "docker stats --no-stream --format '{{{{json .}}}}'"
+            ),
+            category=CommandCategory.CONTAINER_MANAGEMENT,
+            description="List all Docker containers and their resource stats in one invocation",
+            timeout=30,
+            cache_ttl=0,
+            parser=inventory_parser.parse,
+            validator=inventory_parser.validate
+        ))
+
         # Drive health command
         self.register_command(CommandDefinition(
             name="list_drives",
@@ -6,42 +6,91 @@ for real-time infrastructure monitoring.
 """
 
 import asyncio
+import contextlib
+import itertools
 import json
 import logging
 import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
 from datetime import datetime, UTC
+from enum import Enum
 from typing import Any, Optional
 from uuid import uuid4
 
 from fastapi import WebSocket
-from starlette.websockets import WebSocketState
-
-from apps.backend.src.core.events import (
-    BaseEvent,
-    ContainerStatusEvent,
-    DeviceStatusChangedEvent,
-    DriveHealthEvent,
-    MetricCollectedEvent,
-    get_event_bus,
-)
+from starlette.status import WS_1013_TRY_AGAIN_LATER
+
+from apps.backend.src.core.config import get_settings
+from apps.backend.src.core.events import BaseEvent, get_event_bus
 
 from .message_protocol import (
     DataMessage,
+    Frame,
     HeartbeatMessage,
     SubscriptionMessage,
+    SubscriptionOptions,
     SubscriptionTopics,
     WebSocketMessage,
     create_error_message,
+    encode_message,
     MessageType,
+    ProtocolOptions,
+    StreamUpdate,
+    encode_payload,
+    negotiate_protocol,
+    stream_key,
 )
+from .subscription_filter import SubscriptionFilter
+from .topic_index import TopicIndex, topic_matches
 
 logger = logging.getLogger(__name__)
 
+# Seconds a normal disconnect waits for queued frames to be sent
+DISCONNECT_DRAIN_TIMEOUT = 1.0
+
+# Seconds without updates after which a stream's delta base is forgotten
+STREAM_IDLE_TIMEOUT = 900.0
+
+# Metric type and topic suffix of the WebSocket message for each event type
+EVENT_METRIC_TYPES = {
+    "metric_collected": "system_metrics",
+    "container_status": "container_snapshots",
+    "drive_health": "drive_health",
+    "device_status_changed": "device_status",
+}
+EVENT_TOPIC_SUFFIXES = {
+    "metric_collected": "metrics",
+    "device_status_changed": "status",
+    "container_status": "containers",
+    "drive_health": "drives",
+}
+
+
+class SlowConsumerPolicy(str, Enum):
+    """What a connection does when its send queue backs up"""
+
+    CONFLATE = "conflate"  # Keep only the latest pending frame per topic
+    DROP_OLDEST = "drop_oldest"  # Discard the oldest pending frame when full
+    DISCONNECT = "disconnect"  # Drop the client once it lags too far behind
 
-class WebSocketConnection:
-    """Represents a single WebSocket connection with metadata"""
 
-    def __init__(self, websocket: WebSocket, client_id: str):
+class WebSocketConnection:
+    """Represents a single WebSocket connection with metadata
+
+    Outbound frames go through a bounded queue drained by a per-connection
+    writer task, so a slow client only delays its own frames.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        client_id: str,
+        max_queue_size: int = 100,
+        policy: SlowConsumerPolicy = SlowConsumerPolicy.CONFLATE,
+        max_lag_seconds: float = 30.0,
+        on_send_failure: Callable[[WebSocket], Awaitable[None]] | None = None,
+    ):
         self.websocket = websocket
         self.client_id = client_id
         self.subscriptions: set[str] = set()
@@ -49,51 +98,250 @@ class WebSocketConnection:
         self.user_id: Optional[str] = None
         self.last_heartbeat = asyncio.get_event_loop().time()
         self.heartbeat_message: Optional[HeartbeatMessage] = None
+        # Throttled subscriptions: pattern -> filter
+        self.filters: dict[str, SubscriptionFilter] = {}
+        # Negotiated frame format, and the last seq sent per stream for delta frames
+        self.protocol = ProtocolOptions()
+        self._stream_seqs: dict[str, int] = {}
+
+        self.max_queue_size = max(1, max_queue_size)
+        self.policy = SlowConsumerPolicy(policy)
+        self.max_lag_seconds = max_lag_seconds
+        self.closed = False
+        self._on_send_failure = on_send_failure
+        # Pending frames in send order: key -> (frame, monotonic enqueue time).
+        # Keys are stream keys for conflatable frames, unique integers otherwise.
+        self._outbox: OrderedDict[Hashable, tuple[Frame | StreamUpdate, float]] = OrderedDict()
+        self._sequence = itertools.count()
+        self._sending_since: float | None = None
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._writer_task: asyncio.Task | None = None
+        self._close_task: asyncio.Task | None = None
+        self._stats = {"sent": 0, "dropped": 0, "conflated": 0, "filtered": 0, "send_failures": 0}
+
+    def start(self) -> None:
+        """Start the writer task"""
+        if self._writer_task is None:
+            self._writer_task = asyncio.create_task(self._write_loop())
+
+    def close(self, code: int | None = None) -> None:
+        """Stop the writer and discard pending frames
+
+        Args:
+            code: Close the WebSocket with this code in the background
+        """
+        self.closed = True
+        self._outbox.clear()
+        self._idle.set()
+        if self._writer_task and self._writer_task is not asyncio.current_task():
+            self._writer_task.cancel()
+        if code is not None and self._close_task is None:
+            self._close_task = asyncio.create_task(self._close_websocket(code))
+
+    def set_protocol(self, protocol: ProtocolOptions) -> None:
+        """Switch the frame format; delta clients start again from snapshots"""
+        self.protocol = protocol
+        self._stream_seqs.clear()
+
+    def encode(self, message: WebSocketMessage) -> Frame:
+        """Serialize a message for this connection's protocol"""
+        if self.protocol.is_default():
+            return encode_message(message)
+        return encode_payload(message.model_dump(), self.protocol)
+
+    def enqueue(self, frame: Frame | StreamUpdate, stream: str | None = None) -> bool:
+        """Queue a frame for the writer task
+
+        Args:
+            frame: Encoded frame, or a stream update encoded for this
+                connection's protocol when it is sent
+            stream: Stream the frame updates (see stream_key); frames of the
+                same stream replace each other under the conflate policy
+
+        Returns:
+            False if the client lags beyond max_lag_seconds under the
+            disconnect policy and should be dropped, True otherwise
+        """
+        if self.closed:
+            return True
 
-    async def send_message(self, message: WebSocketMessage) -> None:
-        """Send a message to this connection"""
-        try:
-            # Check if WebSocket is still open before sending
-            if self.websocket.client_state != WebSocketState.CONNECTED:
-                logger.debug(f"WebSocket {self.client_id} not connected, skipping message")
-                return
+        if self.policy is SlowConsumerPolicy.DISCONNECT and self.get_lag() > self.max_lag_seconds:
+            return False
+
+        if self.policy is SlowConsumerPolicy.CONFLATE and stream is not None:
+            key: Hashable = stream
+            pending = self._outbox.get(key)
+            if pending is not None:
+                # Latest value takes the older frame's place and age
+                self._outbox[key] = (frame, pending[1])
+                self._stats["conflated"] += 1
+                return True
+        else:
+            key = next(self._sequence)
+
+        if len(self._outbox) >= self.max_queue_size:
+            self._outbox.popitem(last=False)
+            self._stats["dropped"] += 1
+
+        self._outbox[key] = (frame, time.monotonic())
+        self._idle.clear()
+        self._wakeup.set()
+        return True
+
+    def get_lag(self) -> float:
+        """Seconds the oldest unsent frame has been waiting"""
+        oldest = self._sending_since
+        if oldest is None and self._outbox:
+            oldest = next(iter(self._outbox.values()))[1]
+        return time.monotonic() - oldest if oldest is not None else 0.0
+
+    async def drain(self) -> None:
+        """Wait until every queued frame has been sent"""
+        await self._idle.wait()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get send queue statistics for this connection"""
+        return {
+            **self._stats,
+            "queued": len(self._outbox),
+            "lag_seconds": round(self.get_lag(), 3),
+            "protocol": self.protocol.model_dump(),
+        }
+
+    async def _write_loop(self) -> None:
+        """Send queued frames one at a time until closed or a send fails"""
+        while not self.closed:
+            if not self._outbox:
+                self._idle.set()
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            _, (item, queued_at) = self._outbox.popitem(last=False)
+            try:
+                frame = self._resolve(item)
+            except Exception as e:
+                logger.error(f"Failed to encode frame for {self.client_id}: {e}")
+                continue
 
-            # Serialize message with error handling
+            self._sending_since = queued_at
             try:
-                message_json = message.model_dump_json()
+                await self._send_frame(frame)
             except Exception as e:
-                logger.error(f"Failed to serialize message for {self.client_id}: {e}")
-                # Send a simple error message instead
-                error_json = json.dumps(
-                    {
-                        "type": "error",
-                        "error_code": "SERIALIZATION_ERROR",
-                        "message": "Failed to serialize message",
-                    }
-                )
-                await self.websocket.send_text(error_json)
+                self._stats["send_failures"] += 1
+                logger.error(f"Error sending frame to {self.client_id}: {e}")
+                self.close()
+                if self._on_send_failure:
+                    await self._on_send_failure(self.websocket)
                 return
+            finally:
+                self._sending_since = None
+            self._stats["sent"] += 1
+
+    def _resolve(self, item: Frame | StreamUpdate) -> Frame:
+        """Pick the frame to send, at send time so deltas follow what was actually sent"""
+        if not isinstance(item, StreamUpdate):
+            return item
+        stream = item.stream
+        if stream is None:
+            return item.frame_for(self.protocol, None)
+        frame = item.frame_for(self.protocol, self._stream_seqs.get(stream))
+        if self.protocol.delta:
+            self._stream_seqs[stream] = item.seq
+        return frame
+
+    def forget_stream(self, stream: str) -> None:
+        """Drop the last seq sent for a stream, so its next frame is a snapshot"""
+        self._stream_seqs.pop(stream, None)
+
+    async def _close_websocket(self, code: int) -> None:
+        try:
+            await asyncio.wait_for(self.websocket.close(code=code), timeout=5.0)
+        except Exception as e:
+            logger.debug(f"Error closing WebSocket {self.client_id}: {e}")
+
+    async def send_message(self, message: WebSocketMessage) -> bool:
+        """Queue a message for this connection, behind frames already queued
 
-            await self.websocket.send_text(message_json)
+        Returns:
+            False if the client lags beyond max_lag_seconds under the
+            disconnect policy and should be dropped, True otherwise
+        """
+        try:
+            frame = self.encode(message)
         except Exception as e:
-            logger.error(f"Failed to send message to {self.client_id}: {e}")
-            raise
+            logger.error(f"Failed to serialize message for {self.client_id}: {e}")
+            # Queue a simple error message instead
+            frame = json.dumps(
+                {
+                    "type": "error",
+                    "error_code": "SERIALIZATION_ERROR",
+                    "message": "Failed to serialize message",
+                }
+            )
+        return self.enqueue(frame)
 
     async def send_error(
         self, error_code: str, message: str, details: dict[str, Any] | None = None
-    ) -> None:
-        """Send an error message to this connection"""
+    ) -> bool:
+        """Queue an error message for this connection, see send_message"""
         error_msg = create_error_message(error_code, message, details)
-        await self.send_message(error_msg)
+        return await self.send_message(error_msg)
+
+    async def _send_frame(self, frame: Frame) -> None:
+        """Write a serialized frame to the socket; only the writer task calls this"""
+        if isinstance(frame, bytes):
+            await self.websocket.send_bytes(frame)
+        else:
+            await self.websocket.send_text(frame)
+
+    def update_subscriptions(
+        self, action: str, topics: list[str], options: SubscriptionOptions | None = None
+    ) -> None:
+        """Update connection subscriptions
 
-    def update_subscriptions(self, action: str, topics: list[str]) -> None:
-        """Update connection subscriptions"""
+        Topics subscribed with throttling options get a fresh filter; topics
+        subscribed without options, or unsubscribed, lose theirs.
+        """
         if action == "subscribe":
             self.subscriptions.update(topics)
         elif action == "unsubscribe":
             self.subscriptions.difference_update(topics)
+            options = None
         elif action == "replace":
             self.subscriptions = set(topics)
+            self.filters.clear()
+
+        for topic in topics:
+            if options is not None and options.is_throttled():
+                self.filters[topic] = SubscriptionFilter(options)
+            else:
+                self.filters.pop(topic, None)
+
+    def allows(self, topic: str, data: dict[str, Any]) -> bool:
+        """Check an update against the filters of the subscriptions matching its topic
+
+        The update is delivered if any matching subscription is unthrottled or
+        lets it through.
+        """
+        if not self.filters:
+            return True
+
+        allowed = False
+        for subscription in self.subscriptions:
+            if not topic_matches(topic, subscription):
+                continue
+            subscription_filter = self.filters.get(subscription)
+            if subscription_filter is None:
+                return True
+            # Every matching filter sees the update so their state stays current
+            allowed = subscription_filter.allow(topic, data) or allowed
+
+        if not allowed:
+            self._stats["filtered"] += 1
+        return allowed
 
     def matches_topic(self, topic: str) -> bool:
         """Check if connection is subscribed to a topic"""
@@ -106,20 +354,7 @@ class WebSocketConnection:
             return True
 
         # Pattern matching for hierarchical topics
-        for subscription in self.subscriptions:
-            if self._topic_matches_pattern(topic, subscription):
-                return True
-
-        return False
-
-    def _topic_matches_pattern(self, topic: str, pattern: str) -> bool:
-        """Check if topic matches subscription pattern"""
-        # Support wildcard patterns
-        if pattern.endswith(".*"):
-            prefix = pattern[:-2]
-            return topic.startswith(prefix)
-
-        return topic == pattern
+        return any(topic_matches(topic, subscription) for subscription in self.subscriptions)
 
 
 class ConnectionManager:
@@ -128,17 +363,38 @@ class ConnectionManager:
     def __init__(self) -> None:
         self.active_connections: dict[WebSocket, dict[str, Any]] = {}
         self.connection_topics: dict[WebSocket, set[str]] = {}
+        # Per-client send queues and writer tasks
+        self.connections: dict[WebSocket, WebSocketConnection] = {}
+        # Latest (seq, data, monotonic update time) per stream, the base of the
+        # next delta frame; only kept while a delta client is connected
+        self._streams: OrderedDict[str, tuple[int, dict[str, Any], float]] = OrderedDict()
+        self._delta_connections: set[WebSocket] = set()
+        # Routing index over connection_topics, kept in sync by (un)subscribe
+        self.topic_index: TopicIndex[WebSocket] = TopicIndex()
         self.start_time = datetime.now(UTC)
         self.event_bus = get_event_bus()
         self._event_handlers_registered = False
+        # Broadcasts are serialized once into a frame shared by all recipients
+        websocket_settings = get_settings().websocket
+        self.binary_frames = websocket_settings.websocket_binary_frames
+        self.send_queue_size = websocket_settings.websocket_send_queue_size
+        self.slow_consumer_policy = SlowConsumerPolicy(websocket_settings.websocket_slow_consumer_policy)
+        self.max_lag_seconds = websocket_settings.websocket_max_lag_seconds
+        self._broadcast_stats = {
+            "frames_encoded": 0,
+            "frames_queued": 0,
+            "frames_filtered": 0,
+            "send_failures": 0,
+            "slow_consumer_disconnects": 0,
+        }
 
     def get_connection_count(self) -> int:
         """Get total number of active connections"""
         return len(self.active_connections)
 
     def get_connections_by_topic(self, topic: str) -> list[WebSocket]:
-        """Get all connections subscribed to a specific topic"""
-        return [conn for conn, topics in self.connection_topics.items() if topic in topics]
+        """Get all connections whose subscriptions match a specific topic"""
+        return list(self.topic_index.match(topic))
 
     def get_topics_for_connection(self, websocket: WebSocket) -> set[str]:
         """Get all topics a connection is subscribed to"""
@@ -159,6 +415,17 @@ class ConnectionManager:
             "last_ping": datetime.now(UTC)
         }
         self.connection_topics[websocket] = set()
+        connection = WebSocketConnection(
+            websocket,
+            client_id,
+            max_queue_size=self.send_queue_size,
+            policy=self.slow_consumer_policy,
+            max_lag_seconds=self.max_lag_seconds,
+            on_send_failure=self._handle_send_failure,
+        )
+        connection.start()
+        self.connections[websocket] = connection
+        self._register_event_handlers()
         
         logger.info(f"WebSocket client connected: {client_id}")
         
@@ -174,31 +441,153 @@ class ConnectionManager:
 
         return client_id
 
-    async def disconnect(self, websocket: WebSocket) -> None:
-        """Remove a WebSocket connection and clean up"""
+    async def disconnect(
+        self, websocket: WebSocket, close_code: int | None = None, drain: bool = True
+    ) -> None:
+        """Remove a WebSocket connection and clean up
+
+        Args:
+            websocket: Connection to remove
+            close_code: Also close the WebSocket with this code
+            drain: First send frames still queued, such as a final error
+                message, for up to DISCONNECT_DRAIN_TIMEOUT seconds
+        """
         if websocket in self.active_connections:
             client_info = self.active_connections[websocket]
             client_id = client_info.get("client_id", "unknown")
             
             # Clean up connection data
             del self.active_connections[websocket]
-            if websocket in self.connection_topics:
-                del self.connection_topics[websocket]
+            for topic in self.connection_topics.pop(websocket, set()):
+                self.topic_index.remove(topic, websocket)
+            connection = self.connections.pop(websocket, None)
+            self._untrack_delta(websocket)
+            if connection:
+                if drain:
+                    with contextlib.suppress(asyncio.TimeoutError):
+                        await asyncio.wait_for(connection.drain(), timeout=DISCONNECT_DRAIN_TIMEOUT)
+                connection.close(code=close_code)
             
             logger.info(f"WebSocket client disconnected: {client_id}")
 
     async def send_personal_message(self, message: WebSocketMessage, websocket: WebSocket) -> None:
-        """Send a message to a specific WebSocket connection"""
-        try:
-            await websocket.send_text(message.model_dump_json())
-        except Exception as e:
-            logger.error(f"Error sending personal message: {e}")
-            await self.disconnect(websocket)
+        """Queue a message for a specific WebSocket connection"""
+        connection = self.connections.get(websocket)
+        if connection is None:
+            logger.debug("Dropping personal message for unknown connection")
+            return
+        if not await connection.send_message(message):
+            await self._disconnect_slow_consumer(websocket)
+
+    async def _broadcast_frame(
+        self, message: WebSocketMessage, connections: list[WebSocket], topic: str | None = None
+    ) -> None:
+        """Encode a message once and queue the same frame for every connection
+
+        Plain JSON clients share one eagerly encoded frame. Clients that
+        negotiated another protocol share a StreamUpdate, which encodes each
+        variant (and snapshot or delta) once, on first use.
+        """
+        frame = encode_message(message, binary=self.binary_frames)
+        self._broadcast_stats["frames_encoded"] += 1
+        stream = stream_key(topic, message.data) if topic is not None else None
+        update = self._stream_update(message, stream)
+
+        lagging = []
+        for websocket in connections:
+            connection = self.connections.get(websocket)
+            if connection is None:
+                continue
+            if topic is not None and not connection.allows(topic, message.data):
+                self._broadcast_stats["frames_filtered"] += 1
+                continue
+            item = frame if connection.protocol.is_default() else update
+            if connection.enqueue(item, stream):
+                self._broadcast_stats["frames_queued"] += 1
+            else:
+                lagging.append(websocket)
+
+        for websocket in lagging:
+            await self._disconnect_slow_consumer(websocket)
+
+    def _stream_update(self, message: WebSocketMessage, stream: str | None) -> StreamUpdate:
+        """Number an update of a stream and remember its data as the next delta base"""
+        if stream is None or not self._delta_connections:
+            return StreamUpdate(message, stream, 0, binary=self.binary_frames)
+        now = time.monotonic()
+        self._evict_idle_streams(now)
+        seq, previous_data, _ = self._streams.pop(stream, (0, None, now))
+        self._streams[stream] = (seq + 1, message.data, now)
+        return StreamUpdate(message, stream, seq + 1, previous_data, binary=self.binary_frames)
+
+    def _evict_idle_streams(self, now: float) -> None:
+        """Forget streams not updated for STREAM_IDLE_TIMEOUT seconds
+
+        _streams is kept in update order, so idle streams are at the front.
+        Delta clients forget them too: a stream seen again restarts at seq 1.
+        """
+        while self._streams:
+            stream, (_, _, updated) = next(iter(self._streams.items()))
+            if now - updated < STREAM_IDLE_TIMEOUT:
+                break
+            del self._streams[stream]
+            for websocket in self._delta_connections:
+                connection = self.connections.get(websocket)
+                if connection is not None:
+                    connection.forget_stream(stream)
+
+    def _untrack_delta(self, websocket: WebSocket) -> None:
+        """Stop tracking a delta client, dropping all delta bases after the last one"""
+        self._delta_connections.discard(websocket)
+        if not self._delta_connections:
+            self._streams.clear()
+
+    def set_protocol(self, client_id: str, requested: ProtocolOptions | None) -> ProtocolOptions:
+        """Apply the frame format a client asked for, returning what was accepted"""
+        protocol = negotiate_protocol(requested)
+        for websocket, connection in self.connections.items():
+            if connection.client_id == client_id:
+                connection.set_protocol(protocol)
+                if protocol.delta:
+                    self._delta_connections.add(websocket)
+                else:
+                    self._untrack_delta(websocket)
+                break
+        return protocol
+
+    async def _disconnect_slow_consumer(self, websocket: WebSocket) -> None:
+        """Drop a client that fell too far behind under the disconnect policy"""
+        self._broadcast_stats["slow_consumer_disconnects"] += 1
+        connection = self.connections.get(websocket)
+        lag = connection.get_lag() if connection else 0.0
+        logger.warning(
+            f"Disconnecting slow WebSocket client "
+            f"{self.active_connections.get(websocket, {}).get('client_id', 'unknown')} "
+            f"(lag {lag:.1f}s)"
+        )
+        await self.disconnect(websocket, close_code=WS_1013_TRY_AGAIN_LATER, drain=False)
+
+    async def _handle_send_failure(self, websocket: WebSocket) -> None:
+        """Remove a connection whose writer task failed to send"""
+        self._broadcast_stats["send_failures"] += 1
+        await self.disconnect(websocket, drain=False)
+
+    async def flush(self, timeout: float = 5.0) -> None:
+        """Wait until every connection has sent its queued frames"""
+        await asyncio.wait_for(
+            asyncio.gather(*[connection.drain() for connection in list(self.connections.values())]),
+            timeout=timeout,
+        )
 
-    async def subscribe_to_topic(self, websocket: WebSocket, topic: str) -> None:
-        """Subscribe a connection to a specific topic"""
+    async def subscribe_to_topic(
+        self, websocket: WebSocket, topic: str, options: SubscriptionOptions | None = None
+    ) -> None:
+        """Subscribe a connection to a specific topic, optionally throttled"""
         if websocket in self.connection_topics:
             self.connection_topics[websocket].add(topic)
+            self.topic_index.add(topic, websocket)
+            if websocket in self.connections:
+                self.connections[websocket].update_subscriptions("subscribe", [topic], options)
             client_id = self.active_connections.get(websocket, {}).get("client_id", "unknown")
             logger.debug(f"Client {client_id} subscribed to topic: {topic}")
 
@@ -206,6 +595,9 @@ class ConnectionManager:
         """Unsubscribe a connection from a specific topic"""
         if websocket in self.connection_topics:
             self.connection_topics[websocket].discard(topic)
+            self.topic_index.remove(topic, websocket)
+            if websocket in self.connections:
+                self.connections[websocket].update_subscriptions("unsubscribe", [topic])
             client_id = self.active_connections.get(websocket, {}).get("client_id", "unknown")
             logger.debug(f"Client {client_id} unsubscribed from topic: {topic}")
 
@@ -214,19 +606,13 @@ class ConnectionManager:
         connections = self.get_connections_by_topic(topic)
         if connections:
             logger.debug(f"Broadcasting to {len(connections)} connections on topic: {topic}")
-            await asyncio.gather(
-                *[self.send_personal_message(message, conn) for conn in connections],
-                return_exceptions=True
-            )
+            await self._broadcast_frame(message, connections, topic)
 
     async def broadcast_to_all(self, message: WebSocketMessage) -> None:
         """Broadcast a message to all active connections"""
         if self.active_connections:
             logger.debug(f"Broadcasting to {len(self.active_connections)} connections")
-            await asyncio.gather(
-                *[self.send_personal_message(message, conn) for conn in self.active_connections],
-                return_exceptions=True
-            )
+            await self._broadcast_frame(message, list(self.active_connections))
 
     async def handle_monitoring_event(self, event: BaseEvent) -> None:
         """Handle incoming monitoring events and broadcast to appropriate topics"""
@@ -255,6 +641,12 @@ class ConnectionManager:
         return {
             "total_connections": len(self.active_connections),
             "topic_subscriptions": topic_counts,
+            "topic_index": self.topic_index.get_stats(),
+            "broadcast": dict(self._broadcast_stats),
+            "slow_consumer_policy": self.slow_consumer_policy.value,
+            "clients": {
+                connection.client_id: connection.get_stats() for connection in self.connections.values()
+            },
             "uptime_seconds": (datetime.now(UTC) - self.start_time).total_seconds()
         }
 
@@ -269,7 +661,7 @@ class ConnectionManager:
                 stale_connections.append(websocket)
         
         for websocket in stale_connections:
-            await self.disconnect(websocket)
+            await self.disconnect(websocket, drain=False)
 
     def _register_event_handlers(self) -> None:
         """Register event handlers with the event bus"""
@@ -309,9 +701,10 @@ class ConnectionManager:
         # Determine metric type based on event type
         metric_type = self._get_metric_type_for_event(event)
 
-        # Create data message with event information
-        return DataMessage(
-            hostname=hostname,
+        # Create data message with event information. The fields are already
+        # valid, so skip validation (and its copy of the event payload)
+        return DataMessage.model_construct(
+            hostname=str(hostname),
             metric_type=metric_type,
             type=MessageType.DATA,
             data=event.model_dump(),
@@ -320,32 +713,13 @@ class ConnectionManager:
 
     def _get_metric_type_for_event(self, event: BaseEvent) -> str:
         """Determine the metric type for an event"""
-        if isinstance(event, MetricCollectedEvent):
-            return "system_metrics"
-        elif isinstance(event, ContainerStatusEvent):
-            return "container_snapshots"
-        elif isinstance(event, DriveHealthEvent):
-            return "drive_health"
-        elif isinstance(event, DeviceStatusChangedEvent):
-            return "device_status"
-        else:
-            return "events"
+        return EVENT_METRIC_TYPES.get(event.event_type, "events")
 
     def _get_topic_for_event(self, event: BaseEvent) -> str:
         """Determine the WebSocket topic for an event"""
         # Prefer human-friendly hostname for topic formatting
         device_id = getattr(event, 'hostname', None) or 'unknown'
-        
-        if isinstance(event, MetricCollectedEvent):
-            return f"devices.{device_id}.metrics"
-        elif isinstance(event, DeviceStatusChangedEvent):
-            return f"devices.{device_id}.status"
-        elif isinstance(event, ContainerStatusEvent):
-            return f"devices.{device_id}.containers"
-        elif isinstance(event, DriveHealthEvent):
-            return f"devices.{device_id}.drives"
-        else:
-            return f"devices.{device_id}.events"
+        return f"devices.{device_id}.{EVENT_TOPIC_SUFFIXES.get(event.event_type, 'events')}"
 
     # --- Methods used by server.py ---
     async def authenticate_connection(self, client_id: str, user_id: str) -> None:
@@ -369,12 +743,15 @@ class ConnectionManager:
         # Apply subscription changes
         if msg.action == "subscribe":
             for t in msg.topics:
-                await self.subscribe_to_topic(target_ws, t)
+                await self.subscribe_to_topic(target_ws, t, msg.options)
         elif msg.action == "unsubscribe":
             for t in msg.topics:
                 await self.unsubscribe_from_topic(target_ws, t)
         elif msg.action == "replace":
-            self.connection_topics[target_ws] = set(msg.topics)
+            for t in self.connection_topics.get(target_ws, set()) - set(msg.topics):
+                await self.unsubscribe_from_topic(target_ws, t)
+            for t in msg.topics:
+                await self.subscribe_to_topic(target_ws, t, msg.options)
 
     async def handle_heartbeat(self, client_id: str) -> None:
         """Update last ping timestamp for a client."""
@@ -5,13 +5,23 @@ Defines standardized message format and types for WebSocket communication
 between the server and connected clients.
 """
 
+import zlib
 from datetime import datetime
 from enum import Enum
-from typing import Any
+from typing import Any, Literal
 from zoneinfo import ZoneInfo
 
+import orjson
 from pydantic import BaseModel, Field, field_validator, AliasChoices
 
+# Optional module typed Any so the None fallback type-checks
+try:
+    import msgpack as _msgpack
+
+    msgpack: Any = _msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
 
 class MessageType(str, Enum):
     """WebSocket message types"""
@@ -22,6 +32,8 @@ class MessageType(str, Enum):
     HEARTBEAT = "heartbeat"  # Connection keepalive
     ERROR = "error"  # Error messages
     AUTH = "auth"  # Authentication messages
+    SNAPSHOT = "snapshot"  # Full state of a stream, base for later deltas
+    DELTA = "delta"  # JSON-patch changes to a stream since its previous update
 
 
 class WebSocketMessage(BaseModel):
@@ -58,12 +70,58 @@ class EventMessage(WebSocketMessage):
     severity: str = "info"  # info, warning, error, critical
 
 
+class SnapshotMessage(DataMessage):
+    """Full data of a stream, sent to delta clients before any delta of it"""
+
+    type: MessageType = MessageType.SNAPSHOT
+    stream: str
+    seq: int
+
+
+class DeltaMessage(WebSocketMessage):
+    """Changes to a stream's data since the update numbered base_seq
+
+    ``patch`` holds RFC 6902 style operations (add, remove, replace) against
+    the ``data`` of the client's copy of the stream.
+    """
+
+    type: MessageType = MessageType.DELTA
+    stream: str
+    seq: int
+    base_seq: int
+    patch: list[dict[str, Any]] = Field(default_factory=list)
+
+
+class SubscriptionOptions(BaseModel):
+    """Server-side throttling applied to the topics of one subscription"""
+
+    # Most updates per second delivered per topic (and per container/drive)
+    max_rate: float | None = Field(default=None, gt=0)
+    # Suppress updates whose payload is identical to the last one delivered
+    changes_only: bool = False
+    # Numeric field -> smallest change worth delivering, e.g. {"cpu_usage_percent": 5}
+    min_delta: dict[str, float] = Field(default_factory=dict)
+
+    @field_validator("min_delta")
+    @classmethod
+    def _non_negative_deltas(cls, v: dict[str, float]) -> dict[str, float]:
+        if any(delta < 0 for delta in v.values()):
+            raise ValueError("min_delta thresholds must not be negative")
+        return v
+
+    def is_throttled(self) -> bool:
+        """Whether these options filter anything"""
+        return self.max_rate is not None or self.changes_only or bool(self.min_delta)
+
+
 class SubscriptionMessage(WebSocketMessage):
     """Client subscription management"""
 
     type: MessageType = MessageType.SUBSCRIPTION
     action: str  # 'subscribe', 'unsubscribe'
     topics: list[str] = Field(default_factory=list)
+    # Throttling for the subscribed topics; None delivers every update
+    options: SubscriptionOptions | None = None
 
 
 class HeartbeatMessage(WebSocketMessage):
@@ -82,12 +140,258 @@ class ErrorMessage(WebSocketMessage):
     details: dict[str, Any] | None = None
 
 
+class ProtocolOptions(BaseModel):
+    """Frame format negotiated by a client in its auth message"""
+
+    # msgpack frames are binary; it falls back to json when msgpack is not installed
+    encoding: Literal["json", "msgpack"] = "json"
+    # deflate sends zlib-compressed binary frames
+    compression: Literal["none", "deflate"] = "none"
+    # Send a snapshot per stream, then delta frames with its changes
+    delta: bool = False
+
+    def is_default(self) -> bool:
+        """Whether this is the plain JSON protocol"""
+        return self.encoding == "json" and self.compression == "none" and not self.delta
+
+
+def negotiate_protocol(requested: ProtocolOptions | None) -> ProtocolOptions:
+    """Get the protocol the server will use for a client's requested options"""
+    if requested is None:
+        return ProtocolOptions()
+    if requested.encoding == "msgpack" and msgpack is None:
+        return requested.model_copy(update={"encoding": "json"})
+    return requested
+
+
 class AuthMessage(WebSocketMessage):
     """Authentication message"""
 
     type: MessageType = MessageType.AUTH
     token: str
     action: str = "authenticate"  # 'authenticate', 'refresh'
+    # Optional frame format; the server echoes what it accepted in its auth reply
+    protocol: ProtocolOptions | None = None
+
+
+# A serialized message, ready to be sent as a text (str) or binary (bytes) frame
+Frame = str | bytes
+
+
+def encode_message(message: WebSocketMessage, binary: bool = False) -> Frame:
+    """
+    Serialize a message into a frame.
+
+    Broadcasts encode once and send the same frame to every subscriber.
+    orjson is used rather than model_dump_json(), which is several times
+    slower for the untyped event payloads in DataMessage.data.
+
+    Args:
+        message: Message to serialize
+        binary: Produce UTF-8 JSON bytes for a binary frame instead of text
+
+    Returns:
+        JSON frame
+    """
+    frame = orjson.dumps(message.model_dump(), default=str, option=orjson.OPT_NON_STR_KEYS)
+    return frame if binary else frame.decode()
+
+
+def _msgpack_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_payload(payload: dict[str, Any], protocol: ProtocolOptions, binary: bool = False) -> Frame:
+    """
+    Serialize a message payload into a frame for a negotiated protocol.
+
+    Args:
+        payload: Message as a dict (model_dump() output)
+        protocol: Encoding and compression to apply
+        binary: Send uncompressed JSON as a binary frame
+
+    Returns:
+        Text frame for plain JSON, bytes otherwise
+    """
+    frame: bytes
+    if protocol.encoding == "msgpack" and msgpack is not None:
+        frame = msgpack.packb(payload, default=_msgpack_default)
+    else:
+        frame = orjson.dumps(payload, default=str, option=orjson.OPT_NON_STR_KEYS)
+        if protocol.compression == "none" and not binary:
+            return frame.decode()
+
+    if protocol.compression == "deflate":
+        return zlib.compress(frame)
+    return frame
+
+
+def _escape_pointer(key: str) -> str:
+    return key.replace("~", "~0").replace("/", "~1")
+
+
+def _unescape_pointer(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def diff_payload(old: dict[str, Any], new: dict[str, Any], path: str = "") -> list[dict[str, Any]]:
+    """
+    Compute JSON-patch operations turning old into new.
+
+    Nested dicts are diffed key by key; any other changed value, lists
+    included, is replaced whole.
+
+    Args:
+        old: Previous payload
+        new: Current payload
+        path: JSON pointer of the dicts being compared
+
+    Returns:
+        List of add / remove / replace operations
+    """
+    patch: list[dict[str, Any]] = []
+    for key, value in new.items():
+        pointer = f"{path}/{_escape_pointer(str(key))}"
+        if key not in old:
+            patch.append({"op": "add", "path": pointer, "value": value})
+            continue
+        previous = old[key]
+        if previous == value:
+            continue
+        if isinstance(previous, dict) and isinstance(value, dict):
+            patch.extend(diff_payload(previous, value, pointer))
+        else:
+            patch.append({"op": "replace", "path": pointer, "value": value})
+    for key in old:
+        if key not in new:
+            patch.append({"op": "remove", "path": f"{path}/{_escape_pointer(str(key))}"})
+    return patch
+
+
+def apply_patch(document: dict[str, Any], patch: list[dict[str, Any]]) -> dict[str, Any]:
+    """
+    Apply operations from diff_payload to a copy of a payload.
+
+    This is what a delta client does with each DeltaMessage.
+
+    Args:
+        document: Payload the patch was computed against
+        patch: Operations to apply
+
+    Returns:
+        Patched payload
+    """
+    result: dict[str, Any] = _copy_dicts(document)
+    for operation in patch:
+        *parents, key = [_unescape_pointer(token) for token in operation["path"].split("/")[1:]]
+        target = result
+        for parent in parents:
+            target = target[parent]
+        if operation["op"] == "remove":
+            target.pop(key, None)
+        else:
+            target[key] = operation["value"]
+    return result
+
+
+def _copy_dicts(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _copy_dicts(item) for key, item in value.items()}
+    return value
+
+
+# Payload fields that, with the topic, identify one entity on a shared topic
+STREAM_KEY_FIELDS = ("container_id", "drive_name")
+
+
+def stream_key(topic: str, data: dict[str, Any]) -> str:
+    """
+    Identify the stream an update belongs to.
+
+    Topics such as devices.<host>.containers carry updates for many
+    containers; each container is its own stream, e.g.
+    ``devices.web01.containers/3f2a...``.
+    """
+    for name in STREAM_KEY_FIELDS:
+        value = data.get(name)
+        if value is not None:
+            return f"{topic}/{value}"
+    return topic
+
+
+class StreamUpdate:
+    """
+    One broadcast update of a stream, shared by every recipient.
+
+    Frames are encoded lazily, once per protocol variant and kind (full
+    message, snapshot or delta), so clients negotiating the same protocol
+    share the bytes just like plain JSON clients share one frame.
+    """
+
+    __slots__ = ("message", "stream", "seq", "previous_data", "binary", "_frames")
+
+    def __init__(
+        self,
+        message: WebSocketMessage,
+        stream: str | None,
+        seq: int,
+        previous_data: dict[str, Any] | None = None,
+        binary: bool = False,
+    ):
+        self.message = message
+        self.stream = stream
+        self.seq = seq
+        # Data of update seq - 1, None if this is the stream's first update
+        self.previous_data = previous_data
+        self.binary = binary
+        self._frames: dict[tuple[str, str, str], Frame] = {}
+
+    def frame_for(self, protocol: ProtocolOptions, last_seq: int | None = None) -> Frame:
+        """
+        Get the frame for a client.
+
+        Args:
+            protocol: Client protocol
+            last_seq: Last seq of this stream the client received, for delta clients
+
+        Returns:
+            A delta if the client holds the previous update, else a snapshot;
+            the full message for clients without delta frames
+        """
+        if not protocol.delta or self.stream is None:
+            kind = "full"
+        elif self.previous_data is not None and last_seq == self.seq - 1:
+            kind = "delta"
+        else:
+            kind = "snapshot"
+
+        variant = (protocol.encoding, protocol.compression, kind)
+        frame = self._frames.get(variant)
+        if frame is None:
+            frame = encode_payload(self._payload(kind), protocol, self.binary)
+            self._frames[variant] = frame
+        return frame
+
+    def _payload(self, kind: str) -> dict[str, Any]:
+        message = self.message
+        if kind == "delta":
+            if self.previous_data is None:
+                raise ValueError("Delta frames need the previous payload")
+            return DeltaMessage.model_construct(
+                type=MessageType.DELTA,
+                timestamp=message.timestamp,
+                data={},
+                stream=self.stream,
+                seq=self.seq,
+                base_seq=self.seq - 1,
+                patch=diff_payload(self.previous_data, message.data),
+            ).model_dump()
+        payload = message.model_dump()
+        if kind == "snapshot":
+            payload.update(type=MessageType.SNAPSHOT, stream=self.stream, seq=self.seq)
+        return payload
 
 
 def create_error_message(error_code: str, message: str, details: dict[str, Any] | None = None) -> ErrorMessage:
@@ -12,15 +12,18 @@ from datetime import datetime, UTC
 from typing import Any
 
 from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
 
 from .auth import WebSocketAuthenticator, get_websocket_authenticator
 from .connection_manager import ConnectionManager, get_connection_manager
 from .message_protocol import (
     HeartbeatMessage,
     MessageType,
+    ProtocolOptions,
     SubscriptionMessage,
     create_error_message,
     DataMessage,
+    negotiate_protocol,
 )
 
 logger = logging.getLogger(__name__)
@@ -40,7 +43,8 @@ async def websocket_endpoint(
 
     Protocol:
     1. Client connects
-    2. Client sends auth message with Bearer token
+    2. Client sends auth message with Bearer token, optionally with
+       protocol options (encoding, compression, delta frames)
     3. Server authenticates and responds
     4. Client can subscribe to topics
     5. Server streams real-time data
@@ -75,6 +79,16 @@ async def websocket_endpoint(
                 if hasattr(connection_manager, 'authenticate_connection'):
                     await connection_manager.authenticate_connection(client_id, user_id)
 
+                # Optional frame format negotiation (encoding, compression, delta frames)
+                try:
+                    requested_protocol = ProtocolOptions.model_validate(
+                        auth_message.get("protocol") or {}
+                    )
+                except ValidationError as e:
+                    logger.warning(f"Ignoring invalid protocol options from {client_id}: {e}")
+                    requested_protocol = None
+                protocol = negotiate_protocol(requested_protocol)
+
                 # Send auth success
                 await connection_manager.send_personal_message(
                     DataMessage(
@@ -85,11 +99,14 @@ async def websocket_endpoint(
                             "status": "authenticated",
                             "client_id": client_id,
                             "user_id": user_id,
+                            "protocol": protocol.model_dump(),
                         },
                         timestamp=datetime.now(UTC),
                     ),
                     websocket,
                 )
+                # The auth reply is plain JSON; later frames use the accepted protocol
+                connection_manager.set_protocol(client_id, protocol)
 
                 logger.info(f"WebSocket client {client_id} authenticated as {user_id}")
             else:
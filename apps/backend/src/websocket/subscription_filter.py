@@ -0,0 +1,77 @@
+"""
+WebSocket Subscription Filters
+
+Server-side throttling of the updates delivered for one subscription, so
+traffic to a client scales with how much actually changes rather than with
+how many devices and containers are polled.
+
+State is tracked per topic and, on topics shared by several entities such as
+``devices.<host>.containers``, per container or drive. An update is judged
+against the last update *delivered* for the same key, so slow drifts still
+get through once they add up to the configured delta.
+"""
+
+import time
+from typing import Any
+
+from .message_protocol import SubscriptionOptions, stream_key
+
+# Payload fields that differ on every event and never count as a change
+VOLATILE_FIELDS = frozenset({"event_id", "timestamp"})
+
+
+class SubscriptionFilter:
+    """Decides which updates of a throttled subscription are delivered"""
+
+    def __init__(self, options: SubscriptionOptions):
+        self.options = options
+        self._min_interval = 1.0 / options.max_rate if options.max_rate else 0.0
+        # stream key -> (monotonic delivery time, delivered payload)
+        self._last_delivered: dict[str, tuple[float, dict[str, Any]]] = {}
+        self.suppressed = 0
+
+    def allow(self, topic: str, data: dict[str, Any], now: float | None = None) -> bool:
+        """Check an update and record it as delivered if it passes
+
+        Args:
+            topic: Topic the update was published on
+            data: Message payload
+            now: Monotonic time, defaults to time.monotonic()
+
+        Returns:
+            True if the update should be sent to the client
+        """
+        now = time.monotonic() if now is None else now
+        key = stream_key(topic, data)
+        last = self._last_delivered.get(key)
+
+        if last is not None and not self._should_deliver(now, data, *last):
+            self.suppressed += 1
+            return False
+
+        self._last_delivered[key] = (now, data)
+        return True
+
+    def _should_deliver(
+        self, now: float, data: dict[str, Any], delivered_at: float, delivered: dict[str, Any]
+    ) -> bool:
+        if now - delivered_at < self._min_interval:
+            return False
+
+        options = self.options
+        delta_fields = [
+            name
+            for name in options.min_delta
+            if isinstance(data.get(name), int | float) and isinstance(delivered.get(name), int | float)
+        ]
+        if any(abs(data[name] - delivered[name]) >= options.min_delta[name] for name in delta_fields):
+            return True
+
+        if options.changes_only:
+            ignored = VOLATILE_FIELDS.union(delta_fields)
+            return any(
+                value != delivered.get(name) for name, value in data.items() if name not in ignored
+            ) or any(name not in data for name in delivered if name not in ignored)
+
+        # Only delta thresholds configured: deliver when none apply to this payload
+        return not delta_fields
@@ -0,0 +1,176 @@
+"""
+WebSocket Topic Index
+
+Hierarchical index of topic subscriptions used to route broadcasts.
+
+Topics are dot-separated paths such as ``devices.<host>.metrics``. Each
+subscription pattern is stored along the trie path of its segments, so
+finding the subscribers of a topic walks the topic's segments once instead
+of testing every pattern of every connection.
+
+Supported patterns:
+    - Exact topics: ``devices.web01.metrics``
+    - Single-segment wildcards: ``devices.*.metrics`` (any one host)
+    - Trailing wildcards: ``devices.web01.*`` (any topic below ``devices.web01``)
+    - The global topic (``SubscriptionTopics.ALL``), which receives everything
+"""
+
+from collections.abc import Hashable
+from typing import Any, Generic, TypeVar
+
+from .message_protocol import SubscriptionTopics
+
+WILDCARD = "*"
+
+S = TypeVar("S", bound=Hashable)
+
+
+def topic_matches(topic: str, pattern: str) -> bool:
+    """Check whether a topic matches a subscription pattern
+
+    Applies the same rules as TopicIndex, for checking a single pattern.
+    """
+    if pattern == SubscriptionTopics.ALL or pattern == topic:
+        return True
+
+    topic_segments = topic.split(".")
+    pattern_segments = pattern.split(".")
+    if len(pattern_segments) > 1 and pattern_segments[-1] == WILDCARD:
+        # Trailing wildcard: at least one segment below the prefix
+        prefix = pattern_segments[:-1]
+        if len(topic_segments) <= len(prefix):
+            return False
+        topic_segments = topic_segments[: len(prefix)]
+        pattern_segments = prefix
+    elif len(topic_segments) != len(pattern_segments):
+        return False
+
+    return all(
+        expected in (WILDCARD, segment)
+        for segment, expected in zip(topic_segments, pattern_segments, strict=False)
+    )
+
+
+class _TopicNode(Generic[S]):
+    """Trie node for one topic segment"""
+
+    __slots__ = ("children", "subscribers", "descendant_subscribers")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _TopicNode[S]] = {}
+        # Subscribers of the pattern ending exactly at this node
+        self.subscribers: set[S] = set()
+        # Subscribers of "<path>.*", matching every topic below this node
+        self.descendant_subscribers: set[S] = set()
+
+    def is_empty(self) -> bool:
+        return not (self.children or self.subscribers or self.descendant_subscribers)
+
+
+class TopicIndex(Generic[S]):
+    """Trie of topic subscriptions mapping topics to their subscribers
+
+    Generic over the subscriber type, any hashable value (the connection
+    manager uses the WebSocket objects). Lookups cost O(depth + matches) for exact and
+    trailing-wildcard patterns; each single-segment wildcard level adds
+    one more branch to follow.
+    """
+
+    def __init__(self) -> None:
+        self._root: _TopicNode[S] = _TopicNode()
+        self._global_subscribers: set[S] = set()
+        self._subscription_count = 0
+
+    def __len__(self) -> int:
+        """Number of (pattern, subscriber) pairs in the index"""
+        return self._subscription_count
+
+    def add(self, pattern: str, subscriber: S) -> None:
+        """Subscribe a subscriber to a topic pattern"""
+        target = self._subscriber_set(pattern)
+        if subscriber not in target:
+            target.add(subscriber)
+            self._subscription_count += 1
+
+    def remove(self, pattern: str, subscriber: S) -> None:
+        """Unsubscribe a subscriber from a topic pattern, pruning empty nodes"""
+        if pattern == SubscriptionTopics.ALL:
+            self._discard(self._global_subscribers, subscriber)
+            return
+
+        segments, trailing = self._split(pattern)
+        path = [self._root]
+        for segment in segments:
+            node = path[-1].children.get(segment)
+            if node is None:
+                return
+            path.append(node)
+
+        node = path[-1]
+        self._discard(node.descendant_subscribers if trailing else node.subscribers, subscriber)
+
+        # Drop nodes left without subscribers or children
+        for depth in range(len(segments), 0, -1):
+            if not path[depth].is_empty():
+                break
+            del path[depth - 1].children[segments[depth - 1]]
+
+    def match(self, topic: str) -> set[S]:
+        """Get every subscriber whose pattern matches a topic"""
+        matched = set(self._global_subscribers)
+        nodes = [self._root]
+        for segment in topic.split("."):
+            next_nodes: list[_TopicNode[S]] = []
+            for node in nodes:
+                matched.update(node.descendant_subscribers)
+                child = node.children.get(segment)
+                if child is not None:
+                    next_nodes.append(child)
+                wildcard = node.children.get(WILDCARD)
+                if wildcard is not None:
+                    next_nodes.append(wildcard)
+            if not next_nodes:
+                return matched
+            nodes = next_nodes
+
+        for node in nodes:
+            matched.update(node.subscribers)
+        return matched
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get index size statistics"""
+        nodes = 0
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            nodes += 1
+            stack.extend(node.children.values())
+        return {
+            "subscriptions": self._subscription_count,
+            "global_subscribers": len(self._global_subscribers),
+            "nodes": nodes,
+        }
+
+    @staticmethod
+    def _split(pattern: str) -> tuple[list[str], bool]:
+        """Split a pattern into trie segments and whether it ends in a wildcard"""
+        segments = pattern.split(".")
+        if len(segments) > 1 and segments[-1] == WILDCARD:
+            return segments[:-1], True
+        return segments, False
+
+    def _subscriber_set(self, pattern: str) -> set[S]:
+        """Get the subscriber set of a pattern, creating its trie path"""
+        if pattern == SubscriptionTopics.ALL:
+            return self._global_subscribers
+
+        segments, trailing = self._split(pattern)
+        node = self._root
+        for segment in segments:
+            node = node.children.setdefault(segment, _TopicNode())
+        return node.descendant_subscribers if trailing else node.subscribers
+
+    def _discard(self, subscribers: set[S], subscriber: S) -> None:
+        if subscriber in subscribers:
+            subscribers.remove(subscriber)
+            self._subscription_count -= 1
@@ -0,0 +1,29 @@
+"""
+Shared helpers for core tests
+"""
+
+import asyncio
+from uuid import uuid4
+
+from src.core.events import ContainerStatusEvent
+
+
+def container_event(index: int = 0, device_id=None, status: str = "running") -> ContainerStatusEvent:
+    """Create a container status event"""
+    return ContainerStatusEvent(
+        device_id=device_id or uuid4(),
+        hostname="host",
+        container_id=f"c{index}",
+        container_name=f"web{index}",
+        image="nginx",
+        status=status,
+    )
+
+
+async def wait_for(condition, timeout: float = 1.0) -> None:
+    """Poll until condition() is true"""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.005)
@@ -0,0 +1,94 @@
+"""
+Tests for database initialization and TimescaleDB rollup setup
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from src.core import database
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def init_mocks():
+    """Patch engine creation and TimescaleDB setup, resetting the globals afterwards"""
+    with (
+        patch.object(database, "create_async_database_engine", MagicMock()),
+        patch.object(database, "create_async_session_factory", MagicMock()),
+        patch.object(database, "test_database_connection", AsyncMock(return_value=True)),
+        patch.object(database, "create_hypertables", AsyncMock()) as hypertables,
+        patch.object(database, "setup_continuous_aggregates", AsyncMock()) as aggregates,
+    ):
+        yield hypertables, aggregates
+    database._async_engine = None
+    database._async_session_factory = None
+
+
+def rollup_mocks(is_hypertable: bool = True):
+    """Session whose hypertable check returns is_hypertable, and an autocommit connection"""
+    session = MagicMock()
+    hypertable_row = ("system_metrics",) if is_hypertable else None
+    session.execute = AsyncMock(
+        side_effect=[MagicMock(fetchone=MagicMock(return_value=hypertable_row))]
+        + [MagicMock(fetchone=MagicMock(return_value=None))] * 20
+    )
+    session.commit = AsyncMock()
+    session_cm = MagicMock()
+    session_cm.__aenter__ = AsyncMock(return_value=session)
+    session_cm.__aexit__ = AsyncMock(return_value=False)
+
+    conn = MagicMock()
+    conn.execution_options = AsyncMock(return_value=conn)
+    conn.execute = AsyncMock()
+    engine = MagicMock()
+    engine.connect.return_value.__aenter__ = AsyncMock(return_value=conn)
+    engine.connect.return_value.__aexit__ = AsyncMock(return_value=False)
+    return session, session_cm, conn, engine
+
+
+async def test_init_leaves_timescaledb_setup_to_migrations(init_mocks):
+    hypertables, aggregates = init_mocks
+
+    await database.init_database()
+
+    hypertables.assert_not_awaited()
+    aggregates.assert_not_awaited()
+
+
+async def test_setup_continuous_aggregates_backfills_created_views():
+    session, session_cm, conn, engine = rollup_mocks()
+    with (
+        patch.object(database, "get_async_session", MagicMock(return_value=session_cm)),
+        patch.object(database, "get_async_engine", MagicMock(return_value=engine)),
+    ):
+        results = await database.setup_continuous_aggregates()
+
+    views = [rollup["view"] for rollup in database.SYSTEM_METRICS_ROLLUPS.values()]
+    assert results["created"] == views
+    assert results["backfilled"] == views
+    created_sql = [
+        str(call.args[0])
+        for call in session.execute.await_args_list
+        if "CREATE MATERIALIZED VIEW" in str(call.args[0])
+    ]
+    assert len(created_sql) == len(views)
+    assert all("timescaledb.materialized_only = false" in sql for sql in created_sql)
+    conn.execution_options.assert_awaited_once_with(isolation_level="AUTOCOMMIT")
+    calls = [str(call.args[0]) for call in conn.execute.await_args_list]
+    assert all("refresh_continuous_aggregate" in sql and "NULL" in sql for sql in calls)
+    assert "now() - INTERVAL '1 day'" in calls[-1]
+
+
+async def test_setup_continuous_aggregates_requires_hypertable():
+    session, session_cm, conn, engine = rollup_mocks(is_hypertable=False)
+    with (
+        patch.object(database, "get_async_session", MagicMock(return_value=session_cm)),
+        patch.object(database, "get_async_engine", MagicMock(return_value=engine)),
+    ):
+        results = await database.setup_continuous_aggregates()
+
+    assert results["created"] == []
+    assert results["errors"] == ["system_metrics is not a hypertable"]
+    session.execute.assert_awaited_once()
+    engine.connect.assert_not_called()
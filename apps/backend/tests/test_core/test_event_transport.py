@@ -0,0 +1,239 @@
+"""
+Unit tests for bridging EventBus events between processes
+"""
+
+import time
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import orjson
+import pytest
+from src.core.event_transport import EventTransport, RedisStreamTransport, create_event_transport
+from src.core.events import DataCollectedEvent, EventBus, is_bridged
+
+from .conftest import container_event, wait_for
+
+
+class LoopbackTransport(EventTransport):
+    """Transport handing published payloads straight to peer buses"""
+
+    name = "loopback"
+
+    def __init__(self):
+        self.peers: list[LoopbackTransport] = []
+        self.deliver = None
+        self.published: list[bytes] = []
+
+    async def start(self, deliver):
+        self.deliver = deliver
+
+    def publish(self, _event_type, payload):
+        self.published.append(payload)
+        for peer in self.peers:
+            peer.deliver(payload)
+
+
+class TestBridgedEventBus:
+    """Test event buses connected through a transport"""
+
+    @pytest.mark.asyncio
+    async def test_events_reach_other_bus_without_echo(self):
+        """Test that a remote bus gets a copy while local handlers get the original"""
+        transport_a, transport_b = LoopbackTransport(), LoopbackTransport()
+        transport_a.peers.append(transport_b)
+        transport_b.peers.append(transport_a)
+        bus_a, bus_b = EventBus(transport=transport_a), EventBus(transport=transport_b)
+        local, remote = [], []
+
+        async def on_local(event):
+            local.append(event)
+
+        async def on_remote(event):
+            remote.append(event)
+
+        bus_a.subscribe("container_status", on_local)
+        bus_b.subscribe("container_status", on_remote)
+        await bus_a.start()
+        await bus_b.start()
+        try:
+            event = container_event()
+            bus_a.emit_nowait(event)
+            await wait_for(lambda: local and remote)
+        finally:
+            await bus_a.stop()
+            await bus_b.stop()
+
+        assert local[0] is event
+        assert not is_bridged(local[0])
+        assert remote[0] is not event
+        assert remote[0].event_id == event.event_id
+        assert remote[0].device_id == event.device_id
+        assert is_bridged(remote[0])
+        # The receiving bus does not publish the bridged event again
+        assert transport_b.published == []
+        assert bus_b.get_stats()["events_bridged_in"] == 1
+
+    def test_local_event_types_are_not_bridged(self):
+        """Test that collected payloads stay in the emitting process"""
+        transport = LoopbackTransport()
+        bus = EventBus(transport=transport)
+
+        bus.emit_nowait(DataCollectedEvent(device_id=uuid4(), data_type="containers", data={"x": 1}))
+        bus.emit_nowait(container_event())
+
+        assert len(transport.published) == 1
+        assert orjson.loads(transport.published[0])["event_type"] == "container_status"
+        assert bus.get_stats()["queue_size"] == 2
+
+    def test_undecodable_payloads_are_counted(self):
+        """Test that unknown or malformed bridged events are dropped"""
+        transport = LoopbackTransport()
+        bus = EventBus(transport=transport)
+
+        assert bus._receive_bridged(b"not json") is False
+        assert bus._receive_bridged(orjson.dumps({"event_type": "unknown"})) is False
+        assert bus._receive_bridged(orjson.dumps(["container_status"])) is False
+        assert bus.get_stats()["events_bridged_failed"] == 3
+        assert bus.get_stats()["queue_size"] == 0
+
+    def test_memory_transport_does_not_serialize(self):
+        """Test that the default bus stays process-local"""
+        bus = EventBus()
+
+        bus.emit_nowait(container_event())
+
+        assert bus.get_stats()["transport"] == {"transport": "memory"}
+
+    def test_unknown_transport_is_rejected(self):
+        """Test transport selection from settings"""
+        with pytest.raises(ValueError, match="Unknown event bus transport"):
+            create_event_transport("kafka", "redis://localhost")
+
+
+class TestRedisStreamTransport:
+    """Test the Redis Streams transport against a mocked client"""
+
+    @pytest.fixture
+    def client(self):
+        """Mocked Redis client"""
+        client = MagicMock()
+        client.pipeline.return_value.execute = AsyncMock(return_value=[])
+        client.xack = AsyncMock(return_value=1)
+        client.xinfo_groups = AsyncMock(return_value=[
+            {"name": b"bus:other", "consumers": 1, "pending": 3, "lag": 7},
+        ])
+        return client
+
+    @pytest.mark.asyncio
+    async def test_publish_appends_to_capped_stream(self, client):
+        """Test that buffered events are sent in one pipeline"""
+        transport = RedisStreamTransport("redis://unused", client=client)
+        transport.publish("container_status", b"{}")
+        transport.publish("drive_health", b"{}")
+
+        await transport._flush_outbox()
+
+        pipeline = client.pipeline.return_value
+        assert pipeline.xadd.call_count == 2
+        stream, fields = pipeline.xadd.call_args.args
+        assert stream == "infrastructor:events"
+        assert fields["origin"] == transport.origin
+        assert fields["type"] == "drive_health"
+        assert pipeline.xadd.call_args.kwargs == {"maxlen": 10000, "approximate": True}
+        assert transport.get_stats()["published"] == 2
+
+    @pytest.mark.asyncio
+    async def test_entries_from_other_processes_are_delivered_and_acked(self, client):
+        """Test delivery, own-event skipping, latency and acknowledgement"""
+        transport = RedisStreamTransport("redis://unused", consumer_group="websocket", client=client)
+        delivered = []
+        transport._deliver = lambda payload: delivered.append(payload) or True
+        sent_at = repr(time.time() - 0.05).encode()
+
+        await transport._handle_entries([
+            (b"1-0", {b"origin": b"other", b"sent_at": sent_at, b"payload": b"remote"}),
+            (b"2-0", {b"origin": transport.origin.encode(), b"sent_at": sent_at, b"payload": b"own"}),
+        ])
+
+        assert delivered == [b"remote"]
+        client.xack.assert_awaited_once_with("infrastructor:events", transport.consumer_group, b"1-0", b"2-0")
+        stats = transport.get_stats()
+        assert stats["skipped_own"] == 1
+        latency = stats["delivery_latency_ms"][transport.consumer_group]
+        assert latency["count"] == 1
+        assert latency["max"] >= 50
+
+    @pytest.mark.asyncio
+    async def test_fanout_reads_by_last_seen_id_without_a_group(self, client):
+        """Test that fan-out readers keep no per-process state in Redis"""
+        client.xrevrange = AsyncMock(return_value=[(b"5-0", {})])
+        client.xread = AsyncMock(return_value=[])
+        transport = RedisStreamTransport("redis://unused", client=client)
+        transport._deliver = lambda _payload: True
+
+        await transport._read_fanout()
+        await transport._handle_entries([(b"6-0", {b"origin": b"other", b"payload": b"{}"})])
+        await transport._read_fanout()
+
+        assert transport.consumer_group is None
+        first, second = client.xread.await_args_list
+        assert first.args == ({"infrastructor:events": b"5-0"},)
+        assert second.args == ({"infrastructor:events": b"6-0"},)
+        client.xrevrange.assert_awaited_once()
+        client.xack.assert_not_awaited()
+        assert transport.get_stats()["delivery_latency_ms"]["fanout"]["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_malformed_entries_are_rejected_without_stalling_the_reader(self, client):
+        """Test that a bad entry is counted and the read position still moves past it"""
+        transport = RedisStreamTransport("redis://unused", client=client)
+        delivered = []
+        transport._deliver = lambda payload: delivered.append(payload) or True
+
+        await transport._handle_entries([
+            (b"1-0", {b"origin": b"other", b"payload": b"first"}),
+            (b"2-0", {b"origin": b"other"}),
+            (b"3-0", {b"origin": b"other", b"sent_at": b"soon", b"payload": b"{}"}),
+            (b"4-0", {b"origin": b"other", b"payload": b"last"}),
+        ])
+
+        assert delivered == [b"first", b"last"]
+        assert transport._last_id == b"4-0"
+        stats = transport.get_stats()
+        assert stats["delivered"] == 2
+        assert stats["rejected"] == 2
+
+    @pytest.mark.asyncio
+    async def test_consumer_group_lag_is_reported(self, client):
+        """Test the per consumer group snapshot from XINFO GROUPS"""
+        transport = RedisStreamTransport("redis://unused", consumer_group="websocket", client=client)
+
+        await transport._refresh_group_stats()
+
+        assert transport.consumer_group == "websocket"
+        assert transport.get_stats()["consumer_groups"] == {
+            "bus:other": {"consumers": 1, "pending": 3, "lag": 7}
+        }
+        assert transport.get_stats()["fanout_lag"] == {}
+
+    @pytest.mark.asyncio
+    async def test_fanout_lag_is_reported(self, client):
+        """Test that a fan-out reader reports how far it is behind the stream"""
+        client.xinfo_stream = AsyncMock(return_value={"last-generated-id": b"1700000005000-2"})
+        transport = RedisStreamTransport("redis://unused", client=client)
+        transport._last_id = b"1700000003500-0"
+
+        await transport._refresh_group_stats()
+
+        assert transport.get_stats()["fanout_lag"] == {
+            "last_read_id": "1700000003500-0",
+            "last_generated_id": "1700000005000-2",
+            "caught_up": False,
+            "lag_ms": 1500,
+        }
+
+        transport._last_id = b"1700000005000-2"
+        await transport._refresh_group_stats()
+
+        assert transport.get_stats()["fanout_lag"]["caught_up"] is True
+        assert transport.get_stats()["fanout_lag"]["lag_ms"] == 0
@@ -0,0 +1,238 @@
+"""
+Unit tests for EventBus batched dispatch and conflation
+"""
+
+import asyncio
+from uuid import uuid4
+
+import pytest
+from src.core.events import DeviceStatusChangedEvent, EventBus
+
+from .conftest import container_event, wait_for
+
+
+class TestBatchedDispatch:
+    """Test draining the queue in batches"""
+
+    @pytest.mark.asyncio
+    async def test_batch_handler_receives_queued_events_in_one_call(self):
+        """Test that events queued before a wakeup reach a batch handler together, in order"""
+        bus = EventBus(batch_size=50)
+        batches = []
+
+        async def on_batch(events):
+            batches.append([event.container_id for event in events])
+
+        bus.subscribe_batch("container_status", on_batch)
+        for index in range(100):
+            bus.emit_nowait(container_event(index))
+
+        await bus.start()
+        try:
+            await wait_for(lambda: sum(len(batch) for batch in batches) == 100)
+        finally:
+            await bus.stop()
+
+        assert [len(batch) for batch in batches] == [50, 50]
+        assert batches[0][:3] == ["c0", "c1", "c2"]
+        assert bus.get_stats()["batches_processed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_single_event_handlers_still_get_each_event(self):
+        """Test that handlers without batch support are called once per event"""
+        bus = EventBus()
+        received = []
+
+        async def on_event(event):
+            received.append(event.container_id)
+
+        bus.subscribe("container_status", on_event)
+        for index in range(5):
+            bus.emit_nowait(container_event(index))
+
+        await bus.start()
+        try:
+            await wait_for(lambda: len(received) == 5)
+        finally:
+            await bus.stop()
+
+        assert received == ["c0", "c1", "c2", "c3", "c4"]
+        assert bus.get_stats()["events_processed"] == 5
+
+    @pytest.mark.asyncio
+    async def test_handler_concurrency_is_bounded(self):
+        """Test that no more than max_concurrent_handlers handler tasks run at once"""
+        bus = EventBus(batch_size=1, max_concurrent_handlers=2)
+        running = 0
+        peak = 0
+        done = 0
+
+        async def slow(event):
+            nonlocal running, peak, done
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            done += 1
+
+        for _ in range(3):
+            bus.subscribe("container_status", slow)
+        for index in range(4):
+            bus.emit_nowait(container_event(index))
+
+        await bus.start()
+        try:
+            await wait_for(lambda: done == 12)
+        finally:
+            await bus.stop()
+
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_queue_wait_is_measured_per_event_type(self):
+        """Test queue-wait latency statistics"""
+        bus = EventBus()
+        bus.emit_nowait(container_event())
+        bus.emit_nowait(DeviceStatusChangedEvent(
+            device_id=uuid4(), hostname="host", old_status="online", new_status="offline"
+        ))
+
+        await bus.start()
+        try:
+            await wait_for(lambda: len(bus.get_stats()["queue_wait_ms"]) == 2)
+        finally:
+            await bus.stop()
+
+        wait = bus.get_stats()["queue_wait_ms"]
+        assert wait["container_status"]["count"] == 1
+        assert wait["device_status_changed"]["max"] >= 0
+
+    @pytest.mark.asyncio
+    async def test_stop_dispatches_remaining_events(self):
+        """Test that events still queued on shutdown are delivered"""
+        bus = EventBus()
+        received = []
+
+        async def on_batch(events):
+            received.extend(events)
+
+        bus.subscribe_batch("container_status", on_batch)
+        await bus.start()
+        bus._processor_task.cancel()
+        for index in range(3):
+            bus.emit_nowait(container_event(index))
+
+        await bus.stop()
+
+        assert len(received) == 3
+
+    @pytest.mark.asyncio
+    async def test_stop_finishes_batch_waiting_for_handler_slot(self):
+        """Test that a batch taken from the queue is not lost when stopping"""
+        bus = EventBus(max_concurrent_handlers=1)
+        release = asyncio.Event()
+        received = []
+
+        async def blocking(event):
+            await release.wait()
+
+        async def on_status(event):
+            received.append(event)
+
+        bus.subscribe("container_status", blocking)
+        bus.subscribe("device_status_changed", on_status)
+        await bus.start()
+        bus.emit_nowait(container_event())
+        await wait_for(lambda: bus.get_stats()["active_handler_tasks"] == 1)
+        # Taken from the queue, then blocked waiting for the only handler slot
+        bus.emit_nowait(DeviceStatusChangedEvent(
+            device_id=uuid4(), hostname="host", old_status="online", new_status="offline"
+        ))
+        await wait_for(lambda: bus._event_queue.empty())
+
+        stopping = asyncio.create_task(bus.stop())
+        await asyncio.sleep(0.01)
+        release.set()
+        await asyncio.wait_for(stopping, timeout=2)
+
+        assert len(received) == 1
+        assert bus.get_stats()["events_processed"] == 2
+        assert bus.get_stats()["events_dropped"] == 0
+
+
+class TestConflation:
+    """Test latest-value conflation of pending events"""
+
+    @pytest.mark.asyncio
+    async def test_newer_event_replaces_pending_one(self):
+        """Test that only the latest event per device and container is delivered"""
+        bus = EventBus(conflate_event_types=["container_status"])
+        device_id = uuid4()
+        received = []
+
+        async def on_batch(events):
+            received.extend(events)
+
+        bus.subscribe_batch("container_status", on_batch)
+        for status in ("running", "restarting", "exited"):
+            bus.emit_nowait(container_event(0, device_id, status))
+        bus.emit_nowait(container_event(1, device_id))
+
+        await bus.start()
+        try:
+            await wait_for(lambda: len(received) == 2)
+        finally:
+            await bus.stop()
+
+        assert [(event.container_id, event.status) for event in received] == [
+            ("c0", "exited"), ("c1", "running")
+        ]
+        stats = bus.get_stats()
+        assert stats["events_conflated"] == 2
+        assert stats["events_dropped"] == 0
+
+    def test_conflation_is_counted_apart_from_drops(self):
+        """Test that a full queue still accepts replacements of pending events"""
+        bus = EventBus(max_queue_size=1, conflate_event_types=["container_status"])
+        device_id = uuid4()
+
+        assert bus.emit_nowait(container_event(0, device_id)) is True
+        assert bus.emit_nowait(container_event(1, device_id)) is False
+        assert bus.emit_nowait(container_event(0, device_id, "exited")) is True
+
+        stats = bus.get_stats()
+        assert stats["events_dropped"] == 1
+        assert stats["events_conflated"] == 1
+
+    def test_other_event_types_are_not_conflated(self):
+        """Test that event types outside conflate_event_types queue every event"""
+        bus = EventBus(conflate_event_types=["metric_collected"])
+        device_id = uuid4()
+
+        bus.emit_nowait(container_event(0, device_id))
+        bus.emit_nowait(container_event(0, device_id))
+
+        assert bus.get_stats()["queue_size"] == 2
+
+    @pytest.mark.asyncio
+    async def test_event_after_dispatch_is_queued_again(self):
+        """Test that an event taken for dispatch is not replaced by later ones"""
+        bus = EventBus(conflate_event_types=["container_status"])
+        device_id = uuid4()
+        received = []
+
+        async def on_event(event):
+            received.append(event.status)
+
+        bus.subscribe("container_status", on_event)
+        await bus.start()
+        try:
+            bus.emit_nowait(container_event(0, device_id, "running"))
+            await wait_for(lambda: len(received) == 1)
+            bus.emit_nowait(container_event(0, device_id, "exited"))
+            await wait_for(lambda: len(received) == 2)
+        finally:
+            await bus.stop()
+
+        assert received == ["running", "exited"]
+        assert bus.get_stats()["pending_conflatable"] == 0
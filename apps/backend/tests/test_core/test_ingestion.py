@@ -0,0 +1,284 @@
+"""
+Unit tests for the IngestionBuffer write-behind buffer
+"""
+
+import asyncio
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import DateTime, Float, Integer
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from src.core.ingestion import MAX_BIND_PARAMETERS, IngestionBuffer, model_to_row
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Metric(Base):
+    """Minimal time-series model standing in for SystemMetric"""
+
+    __tablename__ = "test_metrics"
+
+    time: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    device_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    cpu_usage_percent: Mapped[float | None] = mapped_column(Float)
+    additional_metrics: Mapped[dict] = mapped_column(JSONB, default={})
+
+
+def make_session_factory() -> tuple[MagicMock, AsyncMock]:
+    """Create a fake async session factory and the session it yields"""
+    session = AsyncMock()
+    # begin_nested() is a plain call returning an async context manager
+    session.begin_nested = MagicMock()
+    session.begin_nested.return_value.__aexit__.return_value = False
+    session_factory = MagicMock()
+    session_factory.return_value.__aenter__.return_value = session
+    session_factory.return_value.__aexit__.return_value = None
+    return session_factory, session
+
+
+def make_metric() -> Metric:
+    """Create a metric row"""
+    return Metric(time=datetime.now(UTC), device_id=1, cpu_usage_percent=12.5)
+
+
+class TestIngestionBuffer:
+    """Test batching, flush triggers, backpressure and failure accounting"""
+
+    def test_model_to_row_omits_unset_defaults(self):
+        """Test that unset columns with defaults are left to the database"""
+        row = model_to_row(make_metric())
+
+        assert row["cpu_usage_percent"] == 12.5
+        assert "additional_metrics" not in row
+
+    @pytest.mark.asyncio
+    async def test_rows_are_written_in_one_statement_per_table(self):
+        """Test that buffered rows are grouped into a single multi-row insert"""
+        session_factory, session = make_session_factory()
+        buffer = IngestionBuffer(session_factory=session_factory, batch_size=100)
+
+        await buffer.add_models([make_metric() for _ in range(5)])
+        assert buffer.get_stats()["pending_rows"] == 5
+
+        written = await buffer.flush()
+        await buffer.stop()
+
+        assert written == 5
+        session.execute.assert_awaited_once()
+        session.commit.assert_awaited_once()
+        stats = buffer.get_stats()
+        assert stats["pending_rows"] == 0
+        assert stats["rows_written"] == 5
+        assert stats["rows_written_by_table"] == {"test_metrics": 5}
+
+    @pytest.mark.asyncio
+    async def test_large_batches_are_chunked_by_bind_parameters(self):
+        """Test that a statement never exceeds the PostgreSQL bind parameter limit"""
+        session_factory, session = make_session_factory()
+        buffer = IngestionBuffer(session_factory=session_factory, batch_size=100000, max_pending_rows=100000)
+        rows = [{"a": i, "b": i} for i in range(MAX_BIND_PARAMETERS // 2 + 1)]
+
+        await buffer.add(Metric.__table__, rows)
+        await buffer.stop()
+
+        assert session.execute.await_count == 2
+        assert buffer.get_stats()["statements"] == 2
+
+    @pytest.mark.asyncio
+    async def test_flush_triggered_by_batch_size(self):
+        """Test that reaching batch_size flushes without waiting for the interval"""
+        session_factory, session = make_session_factory()
+        buffer = IngestionBuffer(session_factory=session_factory, batch_size=3, flush_interval=60)
+
+        await buffer.add_models([make_metric() for _ in range(3)])
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+        assert buffer.get_stats()["rows_written"] == 3
+        await buffer.stop()
+
+    @pytest.mark.asyncio
+    async def test_flush_triggered_by_interval(self):
+        """Test that a partial batch is written after flush_interval"""
+        session_factory, session = make_session_factory()
+        buffer = IngestionBuffer(session_factory=session_factory, batch_size=100, flush_interval=0.02)
+
+        await buffer.add_models([make_metric()])
+        await asyncio.sleep(0.1)
+
+        assert buffer.get_stats()["rows_written"] == 1
+        await buffer.stop()
+
+    @pytest.mark.asyncio
+    async def test_full_buffer_applies_backpressure(self):
+        """Test that producers wait while the database is behind"""
+        release = asyncio.Event()
+        session_factory, session = make_session_factory()
+
+        async def slow_execute(*args, **kwargs):
+            await release.wait()
+
+        session.execute = AsyncMock(side_effect=slow_execute)
+        buffer = IngestionBuffer(
+            session_factory=session_factory, batch_size=2, flush_interval=60, max_pending_rows=2
+        )
+
+        await buffer.add_models([make_metric(), make_metric()])
+        blocked = asyncio.create_task(buffer.add_models([make_metric()]))
+        await asyncio.sleep(0.02)
+
+        # Both rows are in flight, so the third producer has to wait
+        assert not blocked.done()
+        assert buffer.get_stats()["in_flight_rows"] == 2
+
+        release.set()
+        await asyncio.wait_for(blocked, timeout=1)
+        await buffer.stop()
+
+        stats = buffer.get_stats()
+        assert stats["backpressure_waits"] == 1
+        assert stats["backpressure_wait_seconds"] > 0
+        assert stats["rows_written"] == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_write_is_counted_and_releases_space(self):
+        """Test that a persistent database error drops the batch after its retries"""
+        session_factory, session = make_session_factory()
+        session.execute = AsyncMock(side_effect=RuntimeError("connection refused"))
+        buffer = IngestionBuffer(session_factory=session_factory, batch_size=100, retry_backoff=0)
+
+        await buffer.add_models([make_metric(), make_metric()])
+        assert await buffer.flush() == 0
+        await buffer.stop()
+
+        stats = buffer.get_stats()
+        assert stats["rows_failed"] == 2
+        assert stats["flush_failures"] == 3
+        assert stats["write_retries"] == 2
+        assert stats["pending_rows"] == 0
+        assert stats["in_flight_rows"] == 0
+
+    @pytest.mark.asyncio
+    async def test_stop_flushes_remaining_rows(self):
+        """Test that stopping the buffer writes out what is still pending"""
+        session_factory, session = make_session_factory()
+        buffer = IngestionBuffer(session_factory=session_factory, batch_size=100, flush_interval=60)
+
+        await buffer.add_models([make_metric()])
+        await buffer.stop()
+
+        assert buffer.get_stats()["rows_written"] == 1
+        assert not buffer.is_running()
+        with pytest.raises(RuntimeError):
+            await buffer.add_models([make_metric()])
+
+    @pytest.mark.asyncio
+    async def test_constraint_violation_only_drops_offending_rows(self):
+        """Test that a bad row is isolated instead of rolling back the whole table"""
+        session_factory, session = make_session_factory()
+        written = []
+
+        async def execute(statement):
+            rows = statement.compile().params
+            if any(key.startswith("device_id") and value == 2 for key, value in rows.items()):
+                raise IntegrityError("INSERT", rows, Exception("foreign key violation"))
+            written.append(statement)
+
+        session.execute = AsyncMock(side_effect=execute)
+        buffer = IngestionBuffer(session_factory=session_factory, batch_size=100)
+        metrics = [make_metric() for _ in range(4)]
+        metrics[2].device_id = 2
+
+        await buffer.add_models(metrics)
+        assert await buffer.flush() == 3
+        await buffer.stop()
+
+        stats = buffer.get_stats()
+        assert stats["rows_written"] == 3
+        assert stats["rows_failed"] == 1
+        assert stats["rows_rejected"] == 1
+        assert stats["flush_failures"] == 0
+        session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_stop_waits_for_flush_in_progress(self):
+        """Test that stopping during a flush does not lose the rows being written"""
+        session_factory, session = make_session_factory()
+        write_started = asyncio.Event()
+        release_write = asyncio.Event()
+
+        async def slow_execute(*args, **kwargs):
+            write_started.set()
+            await release_write.wait()
+
+        session.execute = AsyncMock(side_effect=slow_execute)
+        buffer = IngestionBuffer(session_factory=session_factory, batch_size=2, flush_interval=60)
+
+        await buffer.add_models([make_metric(), make_metric()])
+        await asyncio.wait_for(write_started.wait(), timeout=1)
+        stopping = asyncio.create_task(buffer.stop())
+        await asyncio.sleep(0.01)
+        assert not stopping.done()
+
+        release_write.set()
+        await asyncio.wait_for(stopping, timeout=1)
+
+        stats = buffer.get_stats()
+        assert stats["rows_written"] == 2
+        assert stats["rows_failed"] == 0
+        assert stats["pending_rows"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_flush_requeues_rows(self):
+        """Test that rows taken by a cancelled flush go back into the buffer"""
+        session_factory, session = make_session_factory()
+        write_started = asyncio.Event()
+
+        async def hanging_execute(*args, **kwargs):
+            write_started.set()
+            await asyncio.Event().wait()
+
+        session.execute = AsyncMock(side_effect=hanging_execute)
+        buffer = IngestionBuffer(session_factory=session_factory, batch_size=100, flush_interval=60)
+
+        await buffer.add_models([make_metric(), make_metric()])
+        flushing = asyncio.create_task(buffer.flush())
+        await asyncio.wait_for(write_started.wait(), timeout=1)
+        flushing.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await flushing
+
+        stats = buffer.get_stats()
+        assert stats["pending_rows"] == 2
+        assert stats["in_flight_rows"] == 0
+        assert stats["rows_failed"] == 0
+
+        session.execute = AsyncMock()
+        await buffer.stop()
+        assert buffer.get_stats()["rows_written"] == 2
+
+    @pytest.mark.asyncio
+    async def test_transient_failure_requeues_rows_for_retry(self):
+        """Test that rows survive a failed write and are written on the next flush"""
+        session_factory, session = make_session_factory()
+        session.execute = AsyncMock(side_effect=[ConnectionError("server closed the connection"), None])
+        buffer = IngestionBuffer(session_factory=session_factory, batch_size=100, flush_interval=60)
+
+        await buffer.add_models([make_metric(), make_metric()])
+        assert await buffer.flush() == 0
+
+        stats = buffer.get_stats()
+        assert stats["pending_rows"] == 2
+        assert stats["rows_failed"] == 0
+        assert stats["write_retries"] == 1
+        assert buffer._retry_delay() == 1.0
+
+        assert await buffer.flush() == 2
+        assert buffer._retry_delay() == 0.0
+        await buffer.stop()
+        assert buffer.get_stats()["rows_written"] == 2
@@ -0,0 +1,197 @@
+"""
+Unit tests for event-driven cache write-through and invalidation
+"""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from src.core.events import (
+    ContainerStatusEvent,
+    DataCollectedEvent,
+    DeviceStatusChangedEvent,
+    EventBus,
+    MetricCollectedEvent,
+)
+from src.services.cache_invalidation import CacheEventSubscriber
+
+
+@pytest.fixture
+def cache_manager():
+    """Mock cache manager"""
+    manager = MagicMock()
+    manager.set = AsyncMock(return_value=True)
+    manager.delete_if_older = AsyncMock(return_value=True)
+    manager.clear_device_cache = AsyncMock(return_value=4)
+    return manager
+
+
+@pytest.fixture
+def subscriber(cache_manager):
+    """Subscriber attached to a private event bus"""
+    return CacheEventSubscriber(cache_manager, event_bus=EventBus())
+
+
+def container_event(device_id):
+    return ContainerStatusEvent(
+        device_id=device_id,
+        hostname="host",
+        container_id="abc",
+        container_name="web",
+        image="nginx",
+        status="running",
+    )
+
+
+class TestCacheEventSubscriber:
+    """Test how events are applied to the cache"""
+
+    @pytest.mark.asyncio
+    async def test_uncached_collection_is_written_through(self, subscriber, cache_manager):
+        """Test that collected data the publisher did not cache is stored with its TTL"""
+        device_id = uuid4()
+        event = DataCollectedEvent(
+            device_id=device_id, data_type="containers", data={"containers": []}, cache_ttl=600
+        )
+
+        await subscriber.handle_event(event)
+
+        cache_manager.set.assert_awaited_once_with("containers", device_id, {"containers": []}, ttl=600)
+        assert subscriber.get_stats()["write_throughs"] == 1
+
+    @pytest.mark.asyncio
+    async def test_already_cached_collection_is_skipped(self, subscriber, cache_manager):
+        """Test that data cached by the publisher is not written twice"""
+        event = DataCollectedEvent(device_id=uuid4(), data_type="containers", data={}, cached=True)
+
+        await subscriber.handle_event(event)
+
+        cache_manager.set.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_container_event_invalidates_dependent_entries(self, subscriber, cache_manager):
+        """Test that a container change invalidates entries cached before it"""
+        device_id = uuid4()
+        event = container_event(device_id)
+
+        await subscriber.handle_event(event)
+
+        invalidated = [call.args for call in cache_manager.delete_if_older.await_args_list]
+        assert ("containers", device_id, event.timestamp) in invalidated
+        assert ("service_dependencies", device_id, event.timestamp) in invalidated
+
+    @pytest.mark.asyncio
+    async def test_batch_invalidations_are_coalesced(self, subscriber, cache_manager):
+        """Test that many container events of a device cost one check per data type"""
+        device_id = uuid4()
+        events = [container_event(device_id) for _ in range(100)]
+
+        await subscriber.handle_events(events)
+
+        invalidated = [call.args for call in cache_manager.delete_if_older.await_args_list]
+        assert len(invalidated) == 3
+        assert ("containers", device_id, events[-1].timestamp) in invalidated
+        assert subscriber.get_stats()["events_handled"] == 100
+
+    @pytest.mark.asyncio
+    async def test_device_status_change_clears_device(self, subscriber, cache_manager):
+        """Test that a device status change drops every entry of the device"""
+        device_id = uuid4()
+        event = DeviceStatusChangedEvent(
+            device_id=device_id, hostname="host", old_status="online", new_status="offline"
+        )
+
+        await subscriber.handle_event(event)
+
+        cache_manager.clear_device_cache.assert_awaited_once_with(device_id)
+        assert subscriber.get_stats()["invalidations"] == 4
+
+    @pytest.mark.asyncio
+    async def test_bridged_events_are_skipped(self, subscriber, cache_manager):
+        """Test that events from other processes, already applied there, are ignored"""
+        event = container_event(uuid4())
+        event.metadata["bridged"] = True
+
+        await subscriber.handle_event(event)
+
+        cache_manager.delete_if_older.assert_not_awaited()
+        assert subscriber.get_stats()["bridged_skipped"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cache_errors_are_counted_not_raised(self, subscriber, cache_manager):
+        """Test that a failing cache does not break event handling"""
+        cache_manager.delete_if_older.side_effect = RuntimeError("redis down")
+
+        await subscriber.handle_event(container_event(uuid4()))
+
+        assert subscriber.get_stats()["failures"] == 1
+
+    @pytest.mark.asyncio
+    async def test_events_reach_subscriber_through_bus(self, subscriber, cache_manager):
+        """Test subscribing and unsubscribing on a running event bus"""
+        bus = subscriber.event_bus
+        await bus.start()
+        try:
+            subscriber.start()
+            assert subscriber.is_running()
+            bus.emit_nowait(MetricCollectedEvent(
+                device_id=uuid4(), hostname="host", cpu_usage_percent=1.0,
+                memory_usage_percent=1.0, disk_usage_percent=1.0, load_average_1m=0.1,
+                load_average_5m=0.1, load_average_15m=0.1, uptime_seconds=10,
+            ))
+            for _ in range(50):
+                if cache_manager.delete_if_older.await_count:
+                    break
+                await asyncio.sleep(0.01)
+
+            assert cache_manager.delete_if_older.await_args.args[0] == "system_metrics"
+
+            subscriber.stop()
+            assert "metric_collected" not in bus.get_stats()["event_types"]
+        finally:
+            await bus.stop()
+
+
+class TestDeleteIfOlder:
+    """Test age-guarded invalidation in CacheManager"""
+
+    @pytest.fixture
+    def manager(self):
+        """Cache manager with a mocked Redis client"""
+        from src.utils.cache_manager import CacheManager
+
+        manager = CacheManager(l1_max_size=0)
+        manager.redis_client = MagicMock()
+        manager.delete = AsyncMock(return_value=True)
+        return manager
+
+    def _stored(self, manager, cached_at):
+        return manager.codec.encode({"v": 1, "_cache_metadata": {"cached_at": cached_at.isoformat()}})
+
+    @pytest.mark.asyncio
+    async def test_older_entry_is_deleted(self, manager):
+        """Test that an entry cached before the event is deleted"""
+        now = datetime.now(UTC)
+        manager.redis_client.get = AsyncMock(return_value=self._stored(manager, now - timedelta(seconds=5)))
+
+        assert await manager.delete_if_older("containers", uuid4(), now) is True
+        manager.delete.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_newer_entry_is_kept(self, manager):
+        """Test that an entry written after the event survives"""
+        now = datetime.now(UTC)
+        manager.redis_client.get = AsyncMock(return_value=self._stored(manager, now + timedelta(seconds=5)))
+
+        assert await manager.delete_if_older("containers", uuid4(), now) is False
+        manager.delete.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_missing_entry_is_not_deleted(self, manager):
+        """Test that nothing is deleted when there is no entry"""
+        manager.redis_client.get = AsyncMock(return_value=None)
+
+        assert await manager.delete_if_older("containers", uuid4(), datetime.now(UTC)) is False
+        manager.delete.assert_not_awaited()
@@ -0,0 +1,165 @@
+"""
+Unit tests for downsampled historical metrics in MetricsService
+"""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+from src.schemas.common import PaginationParams, TimeSeriesInterval
+from src.services.metrics_service import MetricsService, SystemMetric
+
+
+def make_row(device_id, bucket: datetime) -> MagicMock:
+    """Create a result row for one aggregated bucket"""
+    values = {
+        "time_bucket": bucket,
+        "device_id": device_id,
+        "sample_count": 12,
+        "period_start": bucket,
+        "period_end": bucket + timedelta(minutes=55),
+        "total_network_sent": 0,
+        "total_network_recv": 0,
+        "max_process_count": 100,
+    }
+    for column in (
+        "avg_cpu_usage", "max_cpu_usage", "min_cpu_usage", "avg_memory_usage", "max_memory_usage",
+        "min_memory_usage", "avg_memory_total", "avg_memory_available", "avg_load_1m", "max_load_1m",
+        "avg_load_5m", "avg_load_15m", "avg_disk_usage", "max_disk_usage", "avg_disk_total",
+        "avg_disk_available", "avg_network_sent", "avg_network_recv", "avg_process_count", "avg_uptime",
+    ):
+        values[column] = 10.0
+    row = MagicMock()
+    row._mapping = values
+    return row
+
+
+@pytest.fixture
+def metrics_service():
+    """MetricsService with a mocked database session"""
+    with patch("src.services.metrics_service.get_ssh_client"):
+        service = MetricsService(db_session=AsyncMock())
+    # begin_nested() is a plain call returning an async context manager
+    service.db.begin_nested = MagicMock()
+    service.db.begin_nested.return_value.__aexit__.return_value = False
+    service.get_device_by_id = AsyncMock(return_value=MagicMock())
+    return service
+
+
+class TestResolutionSelection:
+    """Test choosing a rollup for the requested points per chart"""
+
+    def test_no_resolution_returns_raw(self, metrics_service):
+        """Test that queries without resolution or points keep raw rows"""
+        assert metrics_service._select_resolution(None, None, timedelta(days=30)) is None
+
+    def test_auto_picks_coarsest_rollup_with_enough_points(self, metrics_service):
+        """Test that auto chooses the coarsest bucket that still yields the target points"""
+        select = metrics_service._select_resolution
+
+        assert select("auto", 500, timedelta(days=30)) == TimeSeriesInterval.HOUR
+        assert select("auto", 20, timedelta(days=30)) == TimeSeriesInterval.DAY
+        assert select(None, 200, timedelta(hours=24)) == TimeSeriesInterval.FIVE_MINUTES
+        # Even one-minute buckets cannot give 500 points over an hour
+        assert select("auto", 500, timedelta(hours=1)) is None
+
+    def test_explicit_resolution_is_validated(self, metrics_service):
+        """Test that explicit resolutions are used as-is and invalid ones rejected"""
+        assert metrics_service._select_resolution("15m", None, timedelta(days=1)) == TimeSeriesInterval.FIFTEEN_MINUTES
+
+        with pytest.raises(Exception, match="Invalid resolution"):
+            metrics_service._select_resolution("2m", None, timedelta(days=1))
+
+    def test_intervals_without_rollup_use_finer_divisor(self, metrics_service):
+        """Test that 15m, 6h and 1w are re-bucketed from the nearest finer rollup"""
+        assert metrics_service._rollup_for(TimeSeriesInterval.FIFTEEN_MINUTES)["view"] == "system_metrics_5m"
+        assert metrics_service._rollup_for(TimeSeriesInterval.SIX_HOURS)["view"] == "system_metrics_1h"
+        assert metrics_service._rollup_for(TimeSeriesInterval.WEEK)["view"] == "system_metrics_1d"
+        assert metrics_service._rollup_for(TimeSeriesInterval.HOUR)["view"] == "system_metrics_1h"
+
+
+class TestDownsampledHistory:
+    """Test reading historical metrics from continuous aggregates"""
+
+    @pytest.mark.asyncio
+    async def test_history_reads_from_rollup(self, metrics_service):
+        """Test that a 30-day chart is served from the hourly rollup"""
+        device_id = uuid4()
+        bucket = datetime(2026, 1, 1, tzinfo=UTC)
+        result = MagicMock()
+        result.fetchall.return_value = [make_row(device_id, bucket)]
+        metrics_service.db.execute = AsyncMock(return_value=result)
+
+        response = await metrics_service.get_device_metrics(
+            device_id, time_range="30d", resolution="auto", points=500
+        )
+
+        query = str(metrics_service.db.execute.await_args.args[0])
+        assert "FROM system_metrics_1h" in query
+        assert "nullif(sum(sample_count) FILTER (WHERE avg_cpu_usage IS NOT NULL), 0) AS avg_cpu_usage" in query
+        assert response.resolution == TimeSeriesInterval.HOUR
+        assert response.source == "system_metrics_1h"
+        assert response.total_count == 1
+        assert response.metrics[0].sample_count == 12
+
+    @pytest.mark.asyncio
+    async def test_missing_rollup_falls_back_to_raw_bucketing(self, metrics_service):
+        """Test that raw metrics are bucketed when the aggregates do not exist"""
+        device_id = uuid4()
+        result = MagicMock()
+        result.fetchall.return_value = [make_row(device_id, datetime(2026, 1, 1, tzinfo=UTC))]
+        metrics_service.db.execute = AsyncMock(side_effect=[Exception("relation does not exist"), result])
+
+        response = await metrics_service.get_device_metrics(device_id, time_range="7d", resolution="1h")
+
+        # Only the savepoint is rolled back, not the caller's transaction
+        metrics_service.db.begin_nested.assert_called_once()
+        metrics_service.db.rollback.assert_not_awaited()
+        query = str(metrics_service.db.execute.await_args.args[0])
+        assert "FROM system_metrics\n" in query
+        assert response.source == "system_metrics"
+
+
+class TestRawHistory:
+    """Test raw (not downsampled) historical metrics"""
+
+    @pytest.mark.asyncio
+    async def test_unpaginated_history_returns_whole_range_without_counting(self, metrics_service):
+        """Test that callers without pagination still get every row, and no count runs"""
+        rows = [MagicMock() for _ in range(120)]
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = rows
+        metrics_service.db.execute = AsyncMock(return_value=result)
+
+        items, page_fields = await metrics_service._fetch_history(
+            select(SystemMetric), None, [SystemMetric.time, SystemMetric.device_id]
+        )
+
+        metrics_service.db.execute.assert_awaited_once()
+        query = str(metrics_service.db.execute.await_args.args[0])
+        assert "LIMIT" not in query
+        assert "count(" not in query
+        assert items == rows
+        assert page_fields["total_count"] == 120
+        assert page_fields["has_next"] is False
+
+    @pytest.mark.asyncio
+    async def test_paginated_history_estimates_total_by_default(self, metrics_service):
+        """Test that paging a hypertable estimates the total unless an exact one is requested"""
+        with (
+            patch("src.services.metrics_service.fetch_keyset_page", AsyncMock()) as fetch_page,
+            patch("src.services.metrics_service.count_rows", AsyncMock(return_value=1000)) as count,
+        ):
+            fetch_page.return_value = MagicMock(items=[], has_next=True, next_cursor="abc")
+            response = await metrics_service.get_device_metrics(
+                uuid4(), pagination=PaginationParams(page_size=10)
+            )
+            assert count.await_args.args[2].include_total is False
+            assert response.total_is_estimate is True
+
+            await metrics_service.get_device_metrics(
+                uuid4(), pagination=PaginationParams(page_size=10, include_total=True)
+            )
+            assert count.await_args.args[2].include_total is True
@@ -0,0 +1,144 @@
+"""
+Unit tests for the PollingScheduler deadline queue and worker pool
+"""
+
+import asyncio
+from uuid import uuid4
+
+import pytest
+from src.services.polling_scheduler import PollingScheduler
+
+
+class TestPollingScheduler:
+    """Test job ordering, concurrency limits and lag tracking"""
+
+    @pytest.mark.asyncio
+    async def test_worker_pool_bounds_concurrency(self):
+        """Test that no more than max_workers jobs run at once"""
+        running = 0
+        peak = 0
+        done = asyncio.Event()
+        completed = 0
+
+        async def run_job(job):
+            nonlocal running, peak, completed
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            completed += 1
+            if completed == 6:
+                done.set()
+
+        scheduler = PollingScheduler(run_job, max_workers=2, jitter_ratio=0)
+        for _ in range(6):
+            scheduler.schedule(uuid4(), "containers", interval=60)
+        scheduler.start()
+
+        await asyncio.wait_for(done.wait(), timeout=1)
+        await scheduler.stop()
+
+        assert peak == 2
+        assert scheduler.get_stats()["jobs_completed"] == 6
+
+    @pytest.mark.asyncio
+    async def test_jobs_run_in_deadline_order(self):
+        """Test that the earliest due job runs first regardless of insertion order"""
+        order = []
+        done = asyncio.Event()
+
+        async def run_job(job):
+            order.append(job.data_type)
+            if len(order) == 3:
+                done.set()
+
+        scheduler = PollingScheduler(run_job, max_workers=1, jitter_ratio=0)
+        device_id = uuid4()
+        scheduler.schedule(device_id, "drive_health", interval=60, first_run_delay=0.03)
+        scheduler.schedule(device_id, "containers", interval=60, first_run_delay=0.0)
+        scheduler.schedule(device_id, "system_metrics", interval=60, first_run_delay=0.015)
+        scheduler.start()
+
+        await asyncio.wait_for(done.wait(), timeout=1)
+        await scheduler.stop()
+
+        assert order == ["containers", "system_metrics", "drive_health"]
+
+    @pytest.mark.asyncio
+    async def test_missed_deadlines_are_skipped_and_counted(self):
+        """Test that a job far behind its grid runs once now instead of replaying every run"""
+        runs = 0
+
+        async def run_job(job):
+            nonlocal runs
+            runs += 1
+
+        scheduler = PollingScheduler(run_job, max_workers=1, jitter_ratio=0)
+        job = scheduler.schedule(uuid4(), "containers", interval=10)
+        # Pretend the last run was due 35 seconds ago
+        job.deadline -= 35
+        scheduler._queue.clear()
+
+        scheduler._reschedule(job, None)
+
+        assert scheduler.get_stats()["missed_deadlines"] == 3
+        assert job.due_at <= scheduler._now()
+        assert scheduler._now() - job.due_at < 10
+
+    @pytest.mark.asyncio
+    async def test_delay_override_restarts_grid(self):
+        """Test that a backoff delay reschedules the job off its regular grid"""
+        async def run_job(job):
+            return None
+
+        scheduler = PollingScheduler(run_job, max_workers=1, jitter_ratio=0)
+        job = scheduler.schedule(uuid4(), "containers", interval=10)
+        scheduler._queue.clear()
+
+        scheduler._reschedule(job, 120)
+
+        assert job.due_at == job.deadline
+        assert job.due_at - scheduler._now() == pytest.approx(120, abs=1)
+
+    @pytest.mark.asyncio
+    async def test_unscheduled_device_is_not_run(self):
+        """Test that removing a device drops its queued jobs"""
+        ran = []
+
+        async def run_job(job):
+            ran.append(job.device_id)
+
+        scheduler = PollingScheduler(run_job, max_workers=1, jitter_ratio=0)
+        removed, kept = uuid4(), uuid4()
+        scheduler.schedule(removed, "containers", interval=60)
+        scheduler.schedule(kept, "containers", interval=60)
+        assert scheduler.unschedule_device(removed) == 1
+
+        scheduler.start()
+        await asyncio.sleep(0.02)
+        await scheduler.stop()
+
+        assert ran == [kept]
+
+    @pytest.mark.asyncio
+    async def test_lag_is_recorded_per_data_type(self):
+        """Test that scheduling lag is reported for each data type"""
+        done = asyncio.Event()
+
+        async def run_job(job):
+            done.set()
+
+        scheduler = PollingScheduler(run_job, max_workers=1, jitter_ratio=0)
+        job = scheduler.schedule(uuid4(), "system_metrics", interval=60)
+        job.due_at -= 5  # Already five seconds overdue
+
+        assert scheduler.get_stats()["overdue_jobs"] == 1
+        assert scheduler.get_stats()["current_lag_seconds"] >= 5
+
+        scheduler.start()
+        await asyncio.wait_for(done.wait(), timeout=1)
+        await scheduler.stop()
+
+        lag = scheduler.get_stats()["lag"]["system_metrics"]
+        assert lag["runs"] == 1
+        assert lag["max_lag_seconds"] >= 5
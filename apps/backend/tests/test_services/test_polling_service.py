@@ -0,0 +1,203 @@
+"""
+Unit tests for PollingService container collection
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from src.core.ingestion import IngestionBuffer
+from src.services.polling_service import PollingService
+from src.utils.ssh_command_manager import SSHCommandManager
+
+
+@pytest.fixture
+def device():
+    """Mock device with SSH connection details"""
+    device = MagicMock()
+    device.id = uuid4()
+    device.hostname = "test-host"
+    device.ssh_port = 22
+    device.ssh_username = "root"
+    return device
+
+
+@pytest.fixture
+def polling_service():
+    """Create a PollingService with mocked SSH, event bus and database"""
+    with patch("src.services.polling_service.get_ssh_client") as mock_ssh_client, \
+         patch("src.services.polling_service.get_ssh_command_manager") as mock_command_manager, \
+         patch("src.services.polling_service.get_event_bus") as mock_event_bus:
+        mock_ssh_client.return_value = MagicMock()
+        mock_command_manager.return_value = MagicMock()
+        mock_event_bus.return_value = MagicMock()
+        service = PollingService()
+
+    session = AsyncMock()
+    session.add = MagicMock()
+    session_factory = MagicMock()
+    session_factory.return_value.__aenter__.return_value = session
+    session_factory.return_value.__aexit__.return_value = None
+    service.session_factory = session_factory
+    service.ingestion_buffer = IngestionBuffer(session_factory=session_factory)
+    return service
+
+
+class TestContainerInventoryParser:
+    """Test parsing of the combined docker ps + docker stats output"""
+
+    def test_parse_joins_ps_and_stats_sections(self):
+        """Test that stats are indexed by short ID and by container name"""
+        manager = SSHCommandManager(MagicMock())
+        parser = manager.get_command("container_inventory").parser
+
+        output = (
+            '{"ID":"abc123456789","Names":"web","State":"running"}\n'
+            '{"ID":"def123456789","Names":"db","State":"exited"}\n'
+            "__DOCKER_STATS__\n"
+            '{"ID":"abc123456789","Name":"web","CPUPerc":"1.50%","MemUsage":"10MiB / 1GiB"}\n'
+        )
+        result = parser(output)
+
+        assert result["docker_available"] is True
+        assert len(result["containers"]) == 2
+        assert result["stats"]["abc123456789"]["CPUPerc"] == "1.50%"
+        assert result["stats"]["web"]["CPUPerc"] == "1.50%"
+        assert "def123456789" not in result["stats"]
+
+    def test_parse_docker_not_available(self):
+        """Test that the docker-missing marker is reported"""
+        manager = SSHCommandManager(MagicMock())
+        parser = manager.get_command("container_inventory").parser
+
+        result = parser("__DOCKER_NOT_AVAILABLE__\n")
+
+        assert result == {"docker_available": False, "containers": [], "stats": {}}
+
+
+class TestBatchedContainerCollection:
+    """Test batched container collection in PollingService"""
+
+    @pytest.mark.asyncio
+    async def test_batched_collection_uses_single_round_trip(self, polling_service, device):
+        """Test that all containers are collected with one SSH command"""
+        polling_service.container_batch_stats = True
+        polling_service.ssh_command_manager.execute_command = AsyncMock(return_value={
+            "docker_available": True,
+            "containers": [
+                {"ID": "abc123456789", "Names": "web", "Image": "nginx", "State": "running"},
+                {"ID": "def123456789", "Names": "db", "Image": "postgres", "State": "exited"},
+            ],
+            "stats": {
+                "abc123456789": {"CPUPerc": "12.5%", "MemUsage": "512B / 1024B"},
+            },
+        })
+        polling_service.ssh_command_manager.execute_raw_command = AsyncMock()
+
+        result = await polling_service._collect_container_data_unified(device)
+
+        polling_service.ssh_command_manager.execute_command.assert_awaited_once()
+        polling_service.ssh_command_manager.execute_raw_command.assert_not_awaited()
+        assert result["status"] == "success"
+        assert result["collection_mode"] == "batched"
+        assert result["ssh_round_trips"] == 1
+        assert result["container_count"] == 2
+
+        containers = {c["container_name"]: c for c in result["containers"]}
+        assert containers["web"]["cpu_usage_percent"] == 12.5
+        assert containers["web"]["memory_usage_bytes"] == 512
+        assert containers["web"]["memory_limit_bytes"] == 1024
+        assert containers["db"]["cpu_usage_percent"] == 0.0
+
+        latency = polling_service.collection_latency[device.id]["containers"]
+        assert latency["ssh_round_trips"] == 1
+        assert latency["latency_seconds"] >= 0
+
+    @pytest.mark.asyncio
+    async def test_batched_collection_docker_not_available(self, polling_service, device):
+        """Test that a host without docker is reported without storing snapshots"""
+        polling_service.container_batch_stats = True
+        polling_service.ssh_command_manager.execute_command = AsyncMock(return_value={
+            "docker_available": False, "containers": [], "stats": {},
+        })
+
+        result = await polling_service._collect_container_data_unified(device)
+
+        assert result["status"] == "docker_not_available"
+        assert result["containers"] == []
+        polling_service.session_factory.assert_not_called()
+        assert polling_service.ingestion_buffer.get_stats()["rows_buffered"] == 0
+
+    @pytest.mark.asyncio
+    async def test_per_container_collection_counts_round_trips(self, polling_service, device):
+        """Test that the legacy mode issues one stats command per container"""
+        polling_service.container_batch_stats = False
+        polling_service.ssh_client.execute_command = AsyncMock(
+            return_value=MagicMock(stdout="Docker version 27.0.0")
+        )
+        polling_service.ssh_command_manager.execute_command = AsyncMock(return_value=[
+            {"ID": "abc123456789", "Names": "web", "State": "running"},
+            {"ID": "def123456789", "Names": "db", "State": "running"},
+        ])
+        polling_service.ssh_command_manager.execute_raw_command = AsyncMock(
+            return_value=MagicMock(stdout='{"CPUPerc": "1.0%", "MemUsage": "1KB / 2KB"}')
+        )
+
+        result = await polling_service._collect_container_data_unified(device)
+
+        assert result["collection_mode"] == "per_container"
+        assert result["ssh_round_trips"] == 4
+        assert polling_service.ssh_command_manager.execute_raw_command.await_count == 2
+        assert result["container_count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_polling_status_reports_latency(self, polling_service, device):
+        """Test that per-device latency is exposed in the polling status"""
+        polling_service._record_collection_latency(device, "containers", 0.25, 1)
+
+        status = await polling_service.get_polling_status()
+
+        assert status["collection_latency"][str(device.id)]["containers"]["latency_seconds"] == 0.25
+
+
+class TestScheduledPolling:
+    """Test PollingService integration with the polling scheduler"""
+
+    @pytest.mark.asyncio
+    async def test_manage_polling_jobs_schedules_each_data_type(self, polling_service, device):
+        """Test that each device gets one job per data type and is removed cleanly"""
+        await polling_service._manage_polling_jobs([device])
+
+        jobs = polling_service.scheduler._jobs[device.id]
+        assert set(jobs) == {"containers", "system_metrics", "drive_health"}
+
+        await polling_service._manage_polling_jobs([])
+
+        assert polling_service.scheduler.scheduled_devices() == []
+        assert all(job.cancelled for job in jobs.values())
+
+    @pytest.mark.asyncio
+    async def test_ssh_failures_back_off_then_mark_offline(self, polling_service, device):
+        """Test that repeated SSH failures back off and finally mark the device offline"""
+        from src.services import polling_service as polling_module
+
+        polling_service.unified_data_service = MagicMock()
+        polling_service.unified_data_service.collect_and_store_data = AsyncMock(
+            side_effect=polling_module.SSHConnectionError("unreachable")
+        )
+        polling_service._update_device_status = AsyncMock()
+        await polling_service._manage_polling_jobs([device])
+        job = polling_service.scheduler._jobs[device.id]["containers"]
+
+        assert await polling_service._run_polling_job(job) == 30
+        assert await polling_service._run_polling_job(job) == 60
+        assert await polling_service._run_polling_job(job) == job.interval * 2
+        polling_service._update_device_status.assert_awaited_once_with(device, "offline")
+
+    @pytest.mark.asyncio
+    async def test_polling_status_reports_scheduler(self, polling_service):
+        """Test that scheduler lag and worker stats are exposed in the polling status"""
+        status = await polling_service.get_polling_status()
+
+        assert status["scheduler"]["workers"] == polling_service.max_concurrent_devices
+        assert status["scheduler"]["lag"] == {}
@@ -2,6 +2,8 @@
 Unit tests for UnifiedDataCollectionService
 """
 
+import asyncio
+
 import pytest
 from datetime import datetime, timezone, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -10,8 +12,10 @@ from uuid import uuid4
 from src.services.unified_data_collection import (
     UnifiedDataCollectionService,
     get_unified_data_collection_service,
+    shutdown_unified_data_collection_services,
 )
 from src.core.exceptions import DataCollectionError
+from src.utils.single_flight import SingleFlight
 
 
 @pytest.fixture
@@ -273,6 +277,351 @@ class TestGetFreshData:
                 await service.get_fresh_data("containers", device_id)
 
 
+class TestSingleFlightCollection:
+    """Test that concurrent collections of the same data are coalesced"""
+
+    @pytest.fixture
+    def coalescing_service(self, mock_db_session_factory, mock_ssh_client):
+        """Service with a private single-flight registry and audit storage stubbed out"""
+        service = UnifiedDataCollectionService(
+            db_session_factory=mock_db_session_factory,
+            ssh_client=mock_ssh_client,
+            single_flight=SingleFlight(),
+        )
+        service._store_audit_record = AsyncMock()
+        return service
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_collection(self, coalescing_service):
+        """Test that the poller, REST and MCP callers trigger a single collection"""
+        device_id = uuid4()
+        calls = 0
+
+        async def collect():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"cpu": 12.5}
+
+        results = await asyncio.gather(*[
+            coalescing_service.collect_and_store_data(
+                data_type="system_metrics",
+                device_id=device_id,
+                collection_method=collect,
+                force_refresh=True,
+                correlation_id=f"caller_{index}",
+            )
+            for index in range(3)
+        ])
+
+        assert calls == 1
+        assert all(result["cpu"] == 12.5 for result in results)
+        # Each caller gets its own top-level dict
+        assert results[0] is not results[1]
+        coalescing_service._store_audit_record.assert_awaited_once()
+
+        stats = coalescing_service.get_single_flight_stats()
+        assert stats["executions"] == 1
+        assert stats["coalesced"] == 2
+        assert stats["by_label"]["system_metrics"]["coalesced"] == 2
+
+    @pytest.mark.asyncio
+    async def test_different_parameters_are_not_coalesced(self, coalescing_service):
+        """Test that collections with different kwargs run separately"""
+        device_id = uuid4()
+        calls = []
+
+        def collector(name):
+            async def collect():
+                calls.append(name)
+                await asyncio.sleep(0.01)
+                return {"container_name": name}
+            return collect
+
+        results = await asyncio.gather(*[
+            coalescing_service.collect_and_store_data(
+                data_type="container_info",
+                device_id=device_id,
+                collection_method=collector(name),
+                force_refresh=True,
+                container_name=name,
+            )
+            for name in ("web", "db")
+        ])
+
+        assert sorted(calls) == ["db", "web"]
+        assert [r["container_name"] for r in results] == ["web", "db"]
+
+    @pytest.mark.asyncio
+    async def test_collections_without_device_are_not_coalesced(self, coalescing_service):
+        """Test that calls without a device ID always run their own collection"""
+        calls = 0
+
+        async def collect():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"drives": []}
+
+        await asyncio.gather(*[
+            coalescing_service.collect_and_store_data(
+                data_type="drive_health", device_id=None, collection_method=collect
+            )
+            for _ in range(2)
+        ])
+
+        assert calls == 2
+
+    @pytest.mark.asyncio
+    async def test_failure_is_shared_by_waiting_callers(self, coalescing_service):
+        """Test that every coalesced caller sees the collection error"""
+        device_id = uuid4()
+
+        async def collect():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("SSH failed")
+
+        results = await asyncio.gather(*[
+            coalescing_service.collect_and_store_data(
+                data_type="containers", device_id=device_id, collection_method=collect, force_refresh=True
+            )
+            for _ in range(2)
+        ], return_exceptions=True)
+
+        assert all("Failed to collect and store containers" in str(result) for result in results)
+        assert all(isinstance(result.__cause__, RuntimeError) for result in results)
+        assert coalescing_service.get_single_flight_stats()["by_label"]["containers"]["failures"] == 1
+        assert coalescing_service.single_flight.in_flight() == 0
+
+    @pytest.mark.asyncio
+    async def test_get_fresh_data_coalesces_collections(self, coalescing_service):
+        """Test that concurrent live requests share one collection"""
+        device_id = uuid4()
+
+        async def collect(data_type, device_id, **kwargs):
+            await asyncio.sleep(0.01)
+            return {"cpu": {"total": 5.0}}
+
+        with patch.object(coalescing_service, "_collect_fresh_data", side_effect=collect) as mock_collect:
+            results = await asyncio.gather(*[
+                coalescing_service.get_fresh_data("system_metrics", device_id, force_refresh=True)
+                for _ in range(3)
+            ])
+
+        assert mock_collect.call_count == 1
+        assert all(result == {"cpu": {"total": 5.0}} for result in results)
+
+
+class TestGetFreshDataBulk:
+    """Test fleet-wide collection with batched cache access"""
+
+    @pytest.fixture
+    def bulk_service(self, mock_db_session_factory, mock_ssh_client):
+        """Service with a mocked cache manager and a private single-flight registry"""
+        cache_manager = MagicMock()
+        cache_manager.get_many = AsyncMock()
+        cache_manager.set_many = AsyncMock(return_value=0)
+        return UnifiedDataCollectionService(
+            db_session_factory=mock_db_session_factory,
+            ssh_client=mock_ssh_client,
+            cache_manager=cache_manager,
+            single_flight=SingleFlight(),
+            bulk_concurrency=2,
+        )
+
+    @pytest.mark.asyncio
+    async def test_collects_only_misses_with_bounded_concurrency(self, bulk_service):
+        """Test that fresh cache entries are reused and misses collected at most 2 at a time"""
+        cached_id = uuid4()
+        stale_id = uuid4()
+        miss_ids = [uuid4() for _ in range(4)]
+        now = datetime.now(timezone.utc)
+        bulk_service.cache_manager.get_many.return_value = {
+            cached_id: {"cpu": 1.0, "_cache_metadata": {"cached_at": now.isoformat()}},
+            stale_id: {"cpu": 2.0, "_cache_metadata": {"cached_at": (now - timedelta(hours=2)).isoformat()}},
+        }
+        running = 0
+        peak = 0
+
+        async def collect(data_type, device_id, **kwargs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {"cpu": 3.0}
+
+        with patch.object(bulk_service, "_collect_fresh_data", side_effect=collect) as mock_collect:
+            results = await bulk_service.get_fresh_data_bulk(
+                "system_metrics", [cached_id, stale_id, *miss_ids]
+            )
+
+        assert results[cached_id] == {"cpu": 1.0}
+        assert results[stale_id] == {"cpu": 3.0}
+        assert mock_collect.await_count == 5
+        assert peak == 2
+        bulk_service.cache_manager.get_many.assert_awaited_once()
+        cached_items = bulk_service.cache_manager.set_many.await_args.args[1]
+        assert set(cached_items) == {stale_id, *miss_ids}
+
+    @pytest.mark.asyncio
+    async def test_failed_devices_are_omitted(self, bulk_service):
+        """Test that one failing device does not fail the whole batch"""
+        ok_id, failing_id = uuid4(), uuid4()
+        bulk_service.cache_manager.get_many.return_value = {}
+
+        async def collect(data_type, device_id, **kwargs):
+            if device_id == failing_id:
+                raise RuntimeError("unreachable")
+            return {"cpu": 1.0}
+
+        with patch.object(bulk_service, "_collect_fresh_data", side_effect=collect):
+            results = await bulk_service.get_fresh_data_bulk("system_metrics", [ok_id, failing_id])
+
+        assert list(results) == [ok_id]
+
+
+class TestStaleWhileRevalidate:
+    """Test serving stale cache entries while refreshing in the background"""
+
+    @pytest.fixture
+    def swr_service(self, mock_db_session_factory, mock_ssh_client):
+        """Service with a mocked cache manager and audit storage stubbed out"""
+        cache_manager = MagicMock()
+        cache_manager.get = AsyncMock()
+        cache_manager.set = AsyncMock(return_value=True)
+        service = UnifiedDataCollectionService(
+            db_session_factory=mock_db_session_factory,
+            ssh_client=mock_ssh_client,
+            cache_manager=cache_manager,
+            single_flight=SingleFlight(),
+        )
+        service._store_audit_record = AsyncMock()
+        service.set_freshness_threshold("system_metrics", 60)
+        service.set_max_stale("system_metrics", 120)
+        return service
+
+    def _cached(self, age_seconds):
+        collected_at = datetime.now(timezone.utc) - timedelta(seconds=age_seconds)
+        return {"cpu": 1.0, "collection_metadata": {"collected_at": collected_at.isoformat()}}
+
+    def test_max_stale_defaults_to_freshness_threshold(self, service):
+        """Test that the stale window defaults to the freshness threshold"""
+        assert service.get_max_stale("containers") == service.get_freshness_threshold("containers")
+        with pytest.raises(ValueError):
+            service.set_max_stale("containers", -1)
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_is_served_and_refreshed_once(self, swr_service):
+        """Test that concurrent stale reads return immediately and share one refresh"""
+        device_id = uuid4()
+        swr_service.cache_manager.get.return_value = self._cached(90)
+        release = asyncio.Event()
+        calls = 0
+
+        async def collect():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return {"cpu": 2.0}
+
+        results = await asyncio.gather(*(
+            swr_service.collect_and_store_data("system_metrics", device_id, collect)
+            for _ in range(3)
+        ))
+
+        assert all(result["cpu"] == 1.0 for result in results)
+        assert all(result["collection_metadata"]["stale"] for result in results)
+        stats = swr_service.get_stale_serving_stats()
+        assert stats["stale_served"] == 3
+        assert stats["started"] == 1
+        assert stats["deduplicated"] == 2
+
+        release.set()
+        await asyncio.sleep(0.01)
+        assert calls == 1
+        assert swr_service.get_stale_serving_stats()["in_progress"] == 0
+        # Cached for the freshness threshold plus the stale window
+        assert swr_service.cache_manager.set.await_args.kwargs["ttl"] == 180
+
+    @pytest.mark.asyncio
+    async def test_entry_past_stale_window_blocks_on_collection(self, swr_service):
+        """Test that data older than threshold + max_stale is collected inline"""
+        swr_service.cache_manager.get.return_value = self._cached(300)
+
+        result = await swr_service.collect_and_store_data(
+            "system_metrics", uuid4(), AsyncMock(return_value={"cpu": 2.0})
+        )
+
+        assert result["cpu"] == 2.0
+        assert "stale" not in result.get("collection_metadata", {})
+        assert swr_service.get_stale_serving_stats()["stale_served"] == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_is_counted(self, swr_service):
+        """Test that a failing background refresh does not reach the caller"""
+        swr_service.cache_manager.get.return_value = self._cached(90)
+
+        result = await swr_service.collect_and_store_data(
+            "system_metrics", uuid4(), AsyncMock(side_effect=RuntimeError("unreachable"))
+        )
+        await asyncio.sleep(0.01)
+
+        assert result["collection_metadata"]["stale"] is True
+        assert swr_service.get_stale_serving_stats()["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_shutdown_cancels_background_refreshes(self, swr_service):
+        """Test that application shutdown stops refreshes still in flight"""
+        swr_service.cache_manager.get.return_value = self._cached(90)
+        started = asyncio.Event()
+
+        async def collect():
+            started.set()
+            await asyncio.Event().wait()
+
+        await swr_service.collect_and_store_data("system_metrics", uuid4(), collect)
+        await asyncio.wait_for(started.wait(), timeout=1)
+        task = next(iter(swr_service._background_refreshes.values()))
+
+        await shutdown_unified_data_collection_services()
+
+        assert task.cancelled()
+        assert swr_service.get_stale_serving_stats()["in_progress"] == 0
+        swr_service.cache_manager.set.assert_not_awaited()
+
+
+class TestDataCollectionEvents:
+    """Test that completed collections are published on the event bus"""
+
+    @pytest.mark.asyncio
+    async def test_collection_emits_data_collected_event(self, mock_db_session_factory, mock_ssh_client):
+        """Test that the event carries the data, cache TTL and whether it was cached"""
+        cache_manager = MagicMock()
+        cache_manager.set = AsyncMock(return_value=True)
+        service = UnifiedDataCollectionService(
+            db_session_factory=mock_db_session_factory,
+            ssh_client=mock_ssh_client,
+            cache_manager=cache_manager,
+            single_flight=SingleFlight(),
+        )
+        service._store_audit_record = AsyncMock()
+        service.event_bus = MagicMock()
+        service.event_bus.is_running.return_value = True
+        device_id = uuid4()
+
+        await service.collect_and_store_data(
+            "containers", device_id, AsyncMock(return_value={"containers": []}), force_refresh=True
+        )
+
+        event = service.event_bus.emit_nowait.call_args.args[0]
+        assert event.event_type == "data_collected"
+        assert event.device_id == device_id
+        assert event.data["containers"] == []
+        assert event.cached is True
+        assert event.cache_ttl == service._cache_ttl("containers")
+
+
 class TestHealthCheck:
     """Test health check functionality"""
 
@@ -303,6 +652,24 @@ class TestHealthCheck:
         assert result["components"]["database"]["status"] == "unhealthy"
         assert "Database connection failed" in result["components"]["database"]["message"]
 
+    @pytest.mark.asyncio
+    async def test_health_check_reports_unreachable_glances_endpoints(self, service):
+        """Test that the Glances component status follows the pooled client stats"""
+        endpoints = {
+            "http://host-a:61208": {"reachable": True},
+            "http://host-b:61208": {"reachable": False},
+            "http://host-c:61208": {"reachable": None},
+        }
+        with patch(
+            "src.services.unified_data_collection.get_glances_client_stats",
+            return_value=endpoints,
+        ):
+            result = await service.health_check()
+
+        glances = result["components"]["glances_clients"]
+        assert glances["status"] == "degraded"
+        assert glances["unreachable"] == ["http://host-b:61208"]
+
     @pytest.mark.asyncio
     async def test_health_check_no_ssh_client(self, mock_db_session_factory):
         """Test health check when SSH client is not available"""
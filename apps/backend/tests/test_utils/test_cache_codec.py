@@ -0,0 +1,95 @@
+"""
+Unit tests for cache value codecs
+"""
+
+from datetime import UTC, datetime
+import json
+from uuid import uuid4
+
+import pytest
+from src.utils.cache_codec import CODEC_FORMAT_VERSION, CacheCodec
+
+
+@pytest.fixture
+def payload():
+    """Cached payload with nested values, dates and UUIDs"""
+    return {
+        "containers": [{"name": f"container-{i}", "cpu": i * 1.5, "status": "running"} for i in range(200)],
+        "timestamp": datetime(2025, 1, 1, tzinfo=UTC),
+        "device_id": uuid4(),
+    }
+
+
+class TestCacheCodec:
+    """Test encoding, decoding and codec statistics"""
+
+    def test_orjson_round_trip_with_header(self, payload):
+        """Test that encoded values carry a header and decode to JSON-compatible data"""
+        codec = CacheCodec()
+
+        encoded = codec.encode(payload)
+
+        assert encoded[0] == CODEC_FORMAT_VERSION
+        decoded = codec.decode(encoded)
+        assert decoded["containers"] == payload["containers"]
+        assert decoded["device_id"] == str(payload["device_id"])
+        assert decoded["timestamp"] == "2025-01-01T00:00:00+00:00"
+
+    def test_legacy_json_values_readable(self):
+        """Test that plain JSON written before the codec existed still decodes"""
+        codec = CacheCodec()
+        legacy = json.dumps({"value": 1})
+
+        assert codec.decode(legacy) == {"value": 1}
+        assert codec.decode(legacy.encode()) == {"value": 1}
+        assert codec.get_stats()["legacy_decoded"] == 2
+
+    def test_unknown_codec_ids_rejected(self):
+        """Test that values from an unknown codec raise ValueError"""
+        codec = CacheCodec()
+
+        with pytest.raises(ValueError):
+            codec.decode(bytes((CODEC_FORMAT_VERSION, 9, 0)) + b"{}")
+        with pytest.raises(ValueError):
+            codec.decode(bytes((CODEC_FORMAT_VERSION, 1, 9)) + b"{}")
+
+    def test_invalid_configuration_rejected(self):
+        """Test that unknown serializer or compression names are rejected"""
+        with pytest.raises(ValueError, match="serializer"):
+            CacheCodec(serializer="pickle")
+        with pytest.raises(ValueError, match="compression"):
+            CacheCodec(compression="gzip")
+
+    def test_stats_track_sizes_and_timings(self, payload):
+        """Test that encode/decode counts, sizes and timings are reported"""
+        codec = CacheCodec()
+
+        codec.decode(codec.encode(payload))
+        stats = codec.get_stats()
+
+        assert stats["encoded"] == 1
+        assert stats["decoded"] == 1
+        assert stats["serialized_bytes"] == stats["stored_bytes"] > 0
+        assert stats["bytes_saved"] == 0
+        assert stats["avg_encode_ms"] > 0
+
+    @pytest.mark.parametrize("compression, module", [("zstd", "zstandard"), ("lz4", "lz4.frame")])
+    def test_compression_above_threshold(self, payload, compression, module):
+        """Test that large values are compressed and small ones are not"""
+        pytest.importorskip(module)
+        codec = CacheCodec(compression=compression, compression_threshold=1024)
+
+        large = codec.encode(payload)
+        small = codec.encode({"value": 1})
+
+        assert large[2] != 0
+        assert small[2] == 0
+        assert codec.decode(large)["containers"] == payload["containers"]
+        assert codec.get_stats()["bytes_saved"] > 0
+
+    def test_msgpack_round_trip(self, payload):
+        """Test msgpack serialization and reading it with an orjson-configured codec"""
+        pytest.importorskip("msgpack")
+        encoded = CacheCodec(serializer="msgpack").encode(payload)
+
+        assert CacheCodec().decode(encoded)["containers"] == payload["containers"]
@@ -0,0 +1,362 @@
+"""
+Tests for the in-process L1 cache, LRU eviction modes and index sets in CacheManager
+"""
+
+import json
+import time
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from src.utils.cache_manager import CacheManager, LocalCache
+
+
+@pytest.fixture
+def cache_manager():
+    """CacheManager with a mocked Redis client and pipeline"""
+    manager = CacheManager(key_prefix="test_cache:", l1_max_size=2, l1_ttl=30.0)
+    redis_client = AsyncMock()
+    pipe = AsyncMock()
+    pipe.execute.return_value = [True, 1, 1]
+    redis_client.pipeline = MagicMock()
+    redis_client.pipeline.return_value.__aenter__.return_value = pipe
+    redis_client.zcard.return_value = 0
+    manager.redis_client = redis_client
+    manager.pipe = pipe
+    return manager
+
+
+async def async_iter(items: list):
+    """Async iterator over items, standing in for scan_iter"""
+    for item in items:
+        yield item
+
+
+def make_stored_value(ttl: int = 60) -> str:
+    """Serialized cache entry as written by CacheManager.set"""
+    return json.dumps({
+        "value": 1,
+        "_cache_metadata": {"cached_at": "2099-01-01T00:00:00+00:00", "ttl": ttl},
+    })
+
+
+class TestLocalCache:
+    """Test the bounded local LRU"""
+
+    def test_evicts_least_recently_used(self):
+        """Test that the oldest untouched entry is dropped when full"""
+        cache = LocalCache(max_size=2, max_ttl=10)
+        cache.set("a", 1, 10)
+        cache.set("b", 2, 10)
+        cache.get("a")
+        cache.set("c", 3, 10)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_expiry_honours_ttl(self):
+        """Test that entries expire at the smaller of their TTL and max_ttl"""
+        cache = LocalCache(max_size=10, max_ttl=10)
+        cache.set("short", 1, 0.01)
+        cache.set("expired", 2, -5)
+        time.sleep(0.02)
+
+        assert cache.get("short") is None
+        assert cache.get("expired") is None
+        assert len(cache) == 0
+
+    def test_delete_matching_uses_redis_glob(self):
+        """Test pattern invalidation with Redis-style globs"""
+        cache = LocalCache(max_size=10, max_ttl=10)
+        cache.set("p::containers:dev1", 1, 10)
+        cache.set("p::system_metrics:dev1", 2, 10)
+        cache.set("p::containers:dev2", 3, 10)
+
+        assert cache.delete_matching("p::*:dev1") == 2
+        assert cache.get("p::containers:dev2") == 3
+
+
+class TestTwoTierCache:
+    """Test L1/L2 reads, writes and invalidation"""
+
+    @pytest.mark.asyncio
+    async def test_repeat_reads_served_from_l1(self, cache_manager):
+        """Test that a second read does not touch Redis"""
+        device_id = uuid4()
+        cache_manager.redis_client.get.return_value = make_stored_value()
+
+        first = await cache_manager.get("system_metrics", device_id)
+        second = await cache_manager.get("system_metrics", device_id)
+
+        assert first == second
+        assert cache_manager.redis_client.get.await_count == 1
+        metrics = await cache_manager.get_metrics()
+        assert metrics.l1_hits == 1
+        assert metrics.l2_hits == 1
+        assert metrics.l1_hit_ratio == 0.5
+        assert metrics.l2_hit_ratio == 1.0
+
+    @pytest.mark.asyncio
+    async def test_expired_redis_ttl_not_cached_locally(self, cache_manager):
+        """Test that data already past its Redis TTL is not kept in L1"""
+        cache_manager.redis_client.get.return_value = json.dumps({
+            "value": 1,
+            "_cache_metadata": {"cached_at": "2000-01-01T00:00:00+00:00", "ttl": 60},
+        })
+
+        await cache_manager.get("system_metrics", uuid4())
+
+        assert len(cache_manager.l1) == 0
+
+    @pytest.mark.asyncio
+    async def test_set_populates_l1_and_publishes_invalidation(self, cache_manager):
+        """Test that writes are readable locally and invalidate other processes"""
+        device_id = uuid4()
+
+        assert await cache_manager.set("containers", device_id, {"value": 1}) is True
+        result = await cache_manager.get("containers", device_id)
+
+        assert result["value"] == 1
+        cache_manager.redis_client.get.assert_not_called()
+        channel, payload = cache_manager.pipe.publish.await_args.args
+        assert channel == "test_cache:invalidations"
+        assert json.loads(payload)["keys"] == [cache_manager._build_cache_key("containers", device_id)]
+
+    @pytest.mark.asyncio
+    async def test_delete_drops_l1_entry(self, cache_manager):
+        """Test that deletes are not masked by the local copy"""
+        device_id = uuid4()
+        await cache_manager.set("containers", device_id, {"value": 1})
+        cache_manager.redis_client.get.return_value = None
+
+        await cache_manager.delete("containers", device_id)
+
+        assert await cache_manager.get("containers", device_id) is None
+
+    @pytest.mark.asyncio
+    async def test_clear_device_cache_drops_matching_l1_entries(self, cache_manager):
+        """Test that device invalidation covers every data type locally"""
+        device_id, other_id = uuid4(), uuid4()
+        await cache_manager.set("containers", device_id, {"value": 1})
+        await cache_manager.set("containers", other_id, {"value": 2})
+        cache_manager.redis_client.smembers.return_value = set()
+        cache_manager.redis_client.scan_iter = MagicMock(return_value=async_iter([]))
+
+        await cache_manager.clear_device_cache(device_id)
+
+        assert cache_manager.l1.get(cache_manager._build_cache_key("containers", device_id)) is None
+        assert cache_manager.l1.get(cache_manager._build_cache_key("containers", other_id)) is not None
+        cache_manager.redis_client.publish.assert_awaited_once()
+
+    def test_remote_invalidation_applied_and_own_ignored(self, cache_manager):
+        """Test handling of invalidation messages from this and other processes"""
+        cache_manager.l1.set("test_cache::containers:a", 1, 10)
+        cache_manager.l1.set("test_cache::containers:b", 2, 10)
+
+        cache_manager._apply_invalidation(json.dumps(
+            {"origin": cache_manager._instance_id, "keys": ["test_cache::containers:a"]}
+        ))
+        assert cache_manager.l1.get("test_cache::containers:a") == 1
+
+        cache_manager._apply_invalidation(json.dumps(
+            {"origin": "other", "keys": ["test_cache::containers:a"], "pattern": "*:b"}
+        ))
+        assert len(cache_manager.l1) == 0
+
+    @pytest.mark.asyncio
+    async def test_l1_disabled(self, cache_manager):
+        """Test that l1_max_size=0 always reads through to Redis"""
+        manager = CacheManager(key_prefix="test_cache:", l1_max_size=0)
+        manager.redis_client = cache_manager.redis_client
+        manager.redis_client.get.return_value = make_stored_value()
+        device_id = uuid4()
+
+        await manager.get("system_metrics", device_id)
+        await manager.get("system_metrics", device_id)
+
+        assert manager.redis_client.get.await_count == 2
+
+
+class TestEvictionModes:
+    """Test LRU bookkeeping in each eviction mode"""
+
+    def make_manager(self, cache_manager, mode: str) -> CacheManager:
+        manager = CacheManager(key_prefix="test_cache:", l1_max_size=0, eviction_mode=mode)
+        manager.redis_client = cache_manager.redis_client
+        manager.pipe = cache_manager.pipe
+        return manager
+
+    def test_unknown_mode_rejected(self):
+        """Test that eviction modes are validated"""
+        with pytest.raises(ValueError, match="Unknown cache eviction mode"):
+            CacheManager(eviction_mode="lfu")
+
+    @pytest.mark.asyncio
+    async def test_batched_mode_defers_lru_writes(self, cache_manager):
+        """Test that batched mode sends one ZADD per flush instead of per operation"""
+        manager = self.make_manager(cache_manager, "batched")
+        manager.redis_client.get.return_value = make_stored_value()
+        device_id = uuid4()
+
+        await manager.set("containers", device_id, {"value": 1})
+        for _ in range(5):
+            await manager.get("containers", device_id)
+
+        manager.redis_client.zcard.assert_not_called()
+        manager.redis_client.zadd.assert_not_called()
+        manager.pipe.zadd.assert_not_called()
+        manager.redis_client.setex.assert_not_called()
+
+        await manager._flush_maintenance()
+
+        manager.redis_client.zadd.assert_awaited_once()
+        touches = manager.redis_client.zadd.await_args.args[1]
+        assert list(touches) == [manager._build_cache_key("containers", device_id)]
+        manager.redis_client.zcard.assert_awaited_once()
+        manager.redis_client.setex.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_redis_mode_keeps_no_lru_state(self, cache_manager):
+        """Test that redis mode leaves eviction entirely to Redis"""
+        manager = self.make_manager(cache_manager, "redis")
+        manager.redis_client.get.return_value = make_stored_value()
+        device_id = uuid4()
+
+        await manager.set("containers", device_id, {"value": 1})
+        await manager.get("containers", device_id)
+        await manager.delete("containers", device_id)
+        await manager._flush_maintenance()
+
+        manager.redis_client.zcard.assert_not_called()
+        manager.redis_client.zadd.assert_not_called()
+        manager.pipe.zadd.assert_not_called()
+        manager.pipe.zrem.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_redis_mode_warns_without_eviction_policy(self, cache_manager):
+        """Test that a non-evicting Redis configuration is reported"""
+        manager = self.make_manager(cache_manager, "redis")
+        manager.logger = MagicMock()
+        manager.redis_client.config_get.return_value = {
+            "maxmemory": "0", "maxmemory-policy": "noeviction"
+        }
+
+        await manager._check_eviction_policy()
+
+        manager.logger.warning.assert_called_once()
+
+
+class TestIndexedInvalidation:
+    """Test bulk invalidation through per-device and per-type index sets"""
+
+    @pytest.mark.asyncio
+    async def test_set_records_key_in_both_indexes(self, cache_manager):
+        """Test that set adds the key to the device and data type index sets"""
+        device_id = uuid4()
+
+        await cache_manager.set("containers", device_id, {"value": 1}, ttl=120)
+
+        cache_key = cache_manager._build_cache_key("containers", device_id)
+        sadd_calls = [call.args for call in cache_manager.pipe.sadd.await_args_list]
+        assert (f"test_cache:index:device:{device_id}", cache_key) in sadd_calls
+        assert ("test_cache:index:type:containers", cache_key) in sadd_calls
+        cache_manager.pipe.expire.assert_any_await(f"test_cache:index:device:{device_id}", 120, gt=True)
+
+    @pytest.mark.asyncio
+    async def test_clear_device_cache_uses_index(self, cache_manager):
+        """Test that device invalidation deletes indexed keys without scanning"""
+        device_id = uuid4()
+        keys = {
+            cache_manager._build_cache_key("containers", device_id),
+            cache_manager._build_cache_key("system_metrics", device_id, "1h"),
+        }
+        cache_manager.redis_client.smembers.return_value = keys
+        cache_manager.redis_client.scan_iter = MagicMock(return_value=async_iter([]))
+        cache_manager.pipe.execute.return_value = [2, 2, 1, 1]
+
+        deleted = await cache_manager.clear_device_cache(device_id)
+
+        assert deleted == 2
+        cache_manager.redis_client.keys.assert_not_called()
+        cache_manager.redis_client.scan_iter.assert_not_called()
+        assert set(cache_manager.pipe.delete.await_args.args) == keys
+        srem_indexes = {call.args[0] for call in cache_manager.pipe.srem.await_args_list}
+        assert srem_indexes == {
+            f"test_cache:index:device:{device_id}",
+            "test_cache:index:type:containers",
+            "test_cache:index:type:system_metrics",
+        }
+        cache_manager.redis_client.delete.assert_awaited_once_with(f"test_cache:index:device:{device_id}")
+
+    @pytest.mark.asyncio
+    async def test_unindexed_keys_found_by_scan(self, cache_manager):
+        """Test that legacy keys without an index are found with SCAN, not KEYS"""
+        legacy_key = cache_manager._build_cache_key("containers", uuid4())
+        cache_manager.redis_client.smembers.return_value = set()
+        cache_manager.redis_client.scan_iter = MagicMock(return_value=async_iter([legacy_key]))
+        cache_manager.pipe.execute.return_value = [1, 1, 1, 1]
+
+        deleted = await cache_manager.clear_data_type_cache("containers")
+
+        assert deleted == 1
+        cache_manager.redis_client.keys.assert_not_called()
+        assert cache_manager.redis_client.scan_iter.call_args.kwargs["match"] == "test_cache::containers:*"
+
+
+class TestEncodedValues:
+    """Test that cached values go through the codec"""
+
+    @pytest.mark.asyncio
+    async def test_set_stores_encoded_bytes_and_reports_codec_metrics(self, cache_manager):
+        """Test that values are stored with a codec header and codec stats reach CacheMetrics"""
+        cache_manager.redis_client.get.return_value = None
+        await cache_manager.set("containers", uuid4(), {"value": 1})
+
+        stored = cache_manager.pipe.setex.await_args.args[2]
+        assert isinstance(stored, bytes)
+        assert stored[0] == 1
+        metrics = await cache_manager.get_metrics()
+        assert metrics.average_encode_time_ms > 0
+        assert metrics.bytes_saved == 0
+
+
+class TestBatchOperations:
+    """Test get_many/set_many"""
+
+    @pytest.mark.asyncio
+    async def test_get_many_uses_one_mget_for_l1_misses(self, cache_manager):
+        """Test that only L1 misses are fetched, in a single MGET"""
+        local_id, hit_id, miss_id = uuid4(), uuid4(), uuid4()
+        cache_manager.l1.set(cache_manager._build_cache_key("containers", local_id), {"value": 0}, 10)
+        cache_manager.redis_client.mget.return_value = [make_stored_value(), None]
+        cache_manager.redis_client.get.return_value = None
+
+        results = await cache_manager.get_many("containers", [local_id, hit_id, miss_id])
+
+        assert set(results) == {local_id, hit_id}
+        cache_manager.redis_client.mget.assert_awaited_once_with([
+            cache_manager._build_cache_key("containers", hit_id),
+            cache_manager._build_cache_key("containers", miss_id),
+        ])
+        cache_manager.redis_client.get.assert_not_called()
+        cache_manager.redis_client.zadd.assert_awaited_once()
+        metrics = await cache_manager.get_metrics()
+        assert (metrics.l1_hits, metrics.l2_hits, metrics.misses) == (1, 1, 1)
+
+    @pytest.mark.asyncio
+    async def test_set_many_uses_one_pipeline(self, cache_manager):
+        """Test that many entries are written, indexed and published in one pipeline"""
+        items = {uuid4(): {"value": i} for i in range(2)}
+
+        stored = await cache_manager.set_many("containers", items, ttl=60)
+
+        assert stored == 2
+        cache_manager.redis_client.pipeline.assert_called_once()
+        assert cache_manager.pipe.setex.await_count == 2
+        cache_manager.pipe.zadd.assert_awaited_once()
+        cache_manager.pipe.publish.assert_awaited_once()
+        cache_manager.pipe.execute.assert_awaited_once()
+        for device_id, data in items.items():
+            cached = cache_manager.l1.get(cache_manager._build_cache_key("containers", device_id))
+            assert cached["value"] == data["value"]
@@ -0,0 +1,144 @@
+"""
+Tests for the pooled Glances client registry and single-request collection
+"""
+
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+from src.services.glances_service import GlancesService
+from src.utils import glances_client
+from src.utils.glances_client import get_glances_client
+
+ALL_RESPONSE = {
+    "cpu": {"total": 12.5, "user": 8.0, "system": 4.5, "idle": 87.5},
+    "mem": {"total": 1024, "available": 512, "percent": 50.0, "used": 512, "free": 512},
+    "load": {"min1": 0.5, "min5": 0.4, "min15": 0.3, "cpucore": 4},
+    "uptime": "3 days, 4:05:06",
+    "processcount": {"total": 120},
+    "network": [{"interface_name": "eth0", "rx": 10, "tx": 20}],
+    "processlist": [{"pid": 1, "name": "init", "cpu_percent": 0.1, "memory_percent": 0.2}],
+    "fs": [{"device_name": "/dev/sda1", "mnt_point": "/", "size": 100, "used": 40, "free": 60, "percent": 40.0}],
+    "diskio": [],
+    "gpu": [],
+    "sensors": [],
+}
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    """Start and finish every test with an empty client registry"""
+    glances_client._glances_clients.clear()
+    yield
+    glances_client._glances_clients.clear()
+
+
+def make_service(handler) -> tuple[GlancesService, list[str]]:
+    """Create a GlancesService whose HTTP client is served by handler"""
+    requested: list[str] = []
+
+    def record(request: httpx.Request) -> httpx.Response:
+        requested.append(request.url.path)
+        return handler(request)
+
+    device = MagicMock()
+    device.hostname = "test-host"
+    device.glances_endpoint = "http://test-host:61208"
+    service = GlancesService(device)
+    # A fresh client per test, so state learned by the pooled one does not leak
+    service.client = type(service.client)(service.client.base_url)
+    service.client.client = httpx.AsyncClient(
+        base_url=service.client.base_url, transport=httpx.MockTransport(record)
+    )
+    return service, requested
+
+
+class TestGlancesClientRegistry:
+    """Test that clients are shared per endpoint"""
+
+    @pytest.mark.asyncio
+    async def test_client_is_reused_per_endpoint(self):
+        """Test that the same endpoint always gets the same keep-alive client"""
+        first = get_glances_client("http://host-a:61208/")
+        again = get_glances_client("http://host-a:61208")
+        other = get_glances_client("http://host-b:61208")
+
+        assert first is again
+        assert other is not first
+        assert set(glances_client.get_glances_client_stats()) == {
+            "http://host-a:61208", "http://host-b:61208"
+        }
+
+    @pytest.mark.asyncio
+    async def test_closed_client_is_replaced(self):
+        """Test that a closed client is not handed out again"""
+        client = get_glances_client("http://host-a:61208")
+        await client.close()
+
+        assert get_glances_client("http://host-a:61208") is not client
+
+
+class TestSingleRequestCollection:
+    """Test collection through the aggregate /api/4/all endpoint"""
+
+    @pytest.mark.asyncio
+    async def test_all_system_data_uses_one_request(self):
+        """Test that every plugin is parsed from a single /api/4/all response"""
+        service, requested = make_service(lambda _: httpx.Response(200, json=ALL_RESPONSE))
+        service.use_all_endpoint = True
+
+        result = await service.get_all_system_data()
+
+        assert requested == ["/api/4/all"]
+        assert result["system_metrics"].cpu.total == 12.5
+        assert result["system_metrics"].process_count == 120
+        assert result["network_stats"][0].interface_name == "eth0"
+        assert result["process_list"][0].name == "init"
+        assert result["filesystem_usage"][0].percent == 40.0
+        assert service.client.get_stats()["reachable"] is True
+
+    @pytest.mark.asyncio
+    async def test_missing_all_endpoint_falls_back_to_plugins(self):
+        """Test that servers without /api/4/all are queried per plugin"""
+        def handler(request: httpx.Request) -> httpx.Response:
+            plugin = request.url.path.rsplit("/", 1)[-1]
+            if plugin == "all":
+                return httpx.Response(404, json={"detail": "Not Found"})
+            return httpx.Response(200, json=ALL_RESPONSE[plugin])
+
+        service, requested = make_service(handler)
+        service.use_all_endpoint = True
+
+        result = await service.get_all_system_data()
+
+        assert requested[0] == "/api/4/all"
+        assert len(requested) == 1 + 11
+        assert "/api/4/status" not in requested
+        assert result["system_metrics"].memory.percent == 50.0
+        stats = service.client.get_stats()
+        assert stats["reachable"] is True
+        assert stats["supports_all"] is False
+        assert stats["failures"] == 0
+
+        # The unsupported endpoint is remembered by the pooled client
+        requested.clear()
+        await service.get_all_system_data()
+        assert "/api/4/all" not in requested
+        assert len(requested) == 11
+
+    @pytest.mark.asyncio
+    async def test_unreachable_server_is_learned_from_request(self):
+        """Test that connection failures surface without a pre-flight probe"""
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("Connection refused", request=request)
+
+        service, requested = make_service(handler)
+        service.use_all_endpoint = True
+
+        with pytest.raises(Exception, match="Failed to collect system data"):
+            await service.get_all_system_data()
+
+        assert requested == ["/api/4/all"]
+        stats = service.client.get_stats()
+        assert stats["reachable"] is False
+        assert stats["consecutive_failures"] == 1
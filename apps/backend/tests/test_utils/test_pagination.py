@@ -0,0 +1,198 @@
+"""
+Unit tests for keyset (cursor) pagination helpers
+"""
+
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import Column, DateTime, String, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import DeclarativeBase
+from src.schemas.common import PaginationParams
+from src.utils.pagination import count_rows, decode_cursor, encode_cursor, fetch_keyset_page
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Snapshot(Base):
+    """Minimal time-series table keyed by (time, device_id, name)"""
+
+    __tablename__ = "pagination_snapshots"
+
+    time = Column(DateTime(timezone=True), primary_key=True)
+    device_id = Column(String, primary_key=True)
+    name = Column(String, primary_key=True)
+
+
+KEYS = [Snapshot.time, Snapshot.device_id, Snapshot.name]
+
+
+def make_db(rows: list) -> AsyncMock:
+    """Create a session whose execute() returns rows via scalars().all()"""
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = rows
+    db = AsyncMock()
+    db.execute = AsyncMock(return_value=result)
+    return savepoints(db)
+
+
+def savepoints(db: AsyncMock) -> AsyncMock:
+    """Make begin_nested() a plain call returning an async context manager, as on AsyncSession"""
+    db.begin_nested = MagicMock()
+    db.begin_nested.return_value.__aexit__.return_value = False
+    return db
+
+
+def compiled(db: AsyncMock) -> str:
+    """Render the statement passed to db.execute"""
+    statement = db.execute.await_args.args[0]
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class TestCursorEncoding:
+    """Test cursor encoding and decoding"""
+
+    def test_round_trip_preserves_types(self):
+        """Test that datetimes, UUIDs and plain values survive a round trip"""
+        values = [datetime(2025, 1, 2, 3, 4, 5, tzinfo=UTC), uuid4(), "nginx"]
+
+        assert decode_cursor(encode_cursor(values), 3) == values
+
+    def test_invalid_cursor_rejected(self):
+        """Test that malformed cursors raise a validation error"""
+        with pytest.raises(Exception, match="Invalid pagination cursor"):
+            decode_cursor("not-a-cursor", 3)
+
+    def test_wrong_key_count_rejected(self):
+        """Test that a cursor for a different key is rejected"""
+        with pytest.raises(Exception, match="Invalid pagination cursor"):
+            decode_cursor(encode_cursor([1, 2]), 3)
+
+
+class TestFetchKeysetPage:
+    """Test fetching pages in key order"""
+
+    @pytest.mark.asyncio
+    async def test_first_page_detects_next(self):
+        """Test that an extra row sets has_next and a cursor for the last returned row"""
+        now = datetime.now(UTC)
+        rows = [Snapshot(time=now, device_id="d", name=str(i)) for i in range(3)]
+        db = make_db(rows)
+
+        page = await fetch_keyset_page(db, select(Snapshot), PaginationParams(page_size=2), KEYS)
+
+        assert page.items == rows[:2]
+        assert page.has_next is True
+        assert decode_cursor(page.next_cursor, 3) == [now, "d", "1"]
+        sql = compiled(db)
+        assert "ORDER BY pagination_snapshots.time DESC" in sql
+        assert "OFFSET" not in sql
+
+    @pytest.mark.asyncio
+    async def test_cursor_filters_by_key_instead_of_offset(self):
+        """Test that a cursor continues after its key with no OFFSET"""
+        cursor = encode_cursor([datetime.now(UTC), "d", "1"])
+        db = make_db([])
+
+        page = await fetch_keyset_page(
+            db, select(Snapshot), PaginationParams(page=9, page_size=2, cursor=cursor), KEYS
+        )
+
+        assert page.items == []
+        assert page.has_next is False
+        assert page.next_cursor is None
+        sql = compiled(db)
+        assert "(pagination_snapshots.time, pagination_snapshots.device_id, pagination_snapshots.name) <" in sql
+        assert "OFFSET" not in sql
+
+    @pytest.mark.asyncio
+    async def test_page_number_still_supported(self):
+        """Test that page numbers without a cursor fall back to OFFSET"""
+        db = make_db([])
+
+        await fetch_keyset_page(db, select(Snapshot), PaginationParams(page=3, page_size=2), KEYS)
+
+        assert "OFFSET" in compiled(db)
+
+
+class TestCountRows:
+    """Test exact and estimated totals"""
+
+    @pytest.mark.asyncio
+    async def test_exact_count(self):
+        """Test that include_total counts the filtered query"""
+        result = MagicMock()
+        result.scalar.return_value = 42
+        db = AsyncMock()
+        db.execute = AsyncMock(return_value=result)
+
+        total = await count_rows(db, select(Snapshot).where(Snapshot.device_id == "d"), PaginationParams())
+
+        assert total == 42
+        assert "count(*)" in compiled(db)
+
+    @pytest.mark.asyncio
+    async def test_estimate_uses_query_plan(self):
+        """Test that filtered estimates read the planner's row estimate"""
+        result = MagicMock()
+        result.scalar.return_value = [{"Plan": {"Plan Rows": 1234}}]
+        db = savepoints(AsyncMock())
+        db.execute = AsyncMock(return_value=result)
+
+        query = select(Snapshot).where(Snapshot.time >= datetime(2025, 1, 1, tzinfo=UTC))
+        total = await count_rows(db, query, PaginationParams(include_total=False))
+
+        assert total == 1234
+        assert str(db.execute.await_args.args[0]).startswith("EXPLAIN (FORMAT JSON)")
+
+    @pytest.mark.asyncio
+    async def test_estimate_of_unfiltered_table(self):
+        """Test that unfiltered estimates use approximate_row_count"""
+        result = MagicMock()
+        result.scalar.return_value = 5000
+        db = savepoints(AsyncMock())
+        db.execute = AsyncMock(return_value=result)
+
+        total = await count_rows(db, select(Snapshot), PaginationParams(include_total=False))
+
+        assert total == 5000
+        assert db.execute.await_args.args[1] == {"table_name": "pagination_snapshots"}
+
+    @pytest.mark.asyncio
+    async def test_estimate_of_unfiltered_subquery_uses_query_plan(self):
+        """Test that approximate_row_count is only used for a plain table"""
+        result = MagicMock()
+        result.scalar.return_value = '[{"Plan": {"Plan Rows": 321}}]'
+        db = savepoints(AsyncMock())
+        db.execute = AsyncMock(return_value=result)
+
+        latest = select(Snapshot).where(Snapshot.device_id == "d").subquery()
+        total = await count_rows(db, select(latest), PaginationParams(include_total=False))
+
+        assert total == 321
+        assert str(db.execute.await_args.args[0]).startswith("EXPLAIN (FORMAT JSON)")
+
+    @pytest.mark.asyncio
+    async def test_failed_estimate_keeps_the_callers_transaction(self):
+        """Test that the exact-count fallback does not roll back a fetched page"""
+        page_result = MagicMock()
+        page_result.scalars.return_value.all.return_value = ["row"]
+        count_result = MagicMock()
+        count_result.scalar.return_value = 7
+        db = savepoints(AsyncMock())
+        db.execute = AsyncMock(side_effect=[
+            page_result, Exception("function approximate_row_count does not exist"), count_result,
+        ])
+
+        page = await fetch_keyset_page(db, select(Snapshot), PaginationParams(), KEYS)
+        total = await count_rows(db, select(Snapshot), PaginationParams(include_total=False))
+
+        assert page.items == ["row"]
+        assert total == 7
+        assert "count(*)" in compiled(db)
+        db.begin_nested.assert_called_once()
+        db.rollback.assert_not_awaited()
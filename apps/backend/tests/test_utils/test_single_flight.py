@@ -0,0 +1,54 @@
+"""
+Tests for SingleFlight request coalescing
+"""
+
+import asyncio
+
+import pytest
+from src.utils.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test coalescing of concurrent calls with the same key"""
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_are_not_cached(self):
+        """Test that a finished execution is not reused by later calls"""
+        single_flight = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await single_flight.do("key", work) == 1
+        assert await single_flight.do("key", work) == 2
+        assert single_flight.get_stats()["coalesced"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_shared_execution(self):
+        """Test that other waiters still get the result when the first caller is cancelled"""
+        single_flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return "done"
+
+        first = asyncio.create_task(single_flight.do("key", work))
+        second = asyncio.create_task(single_flight.do("key", work))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        release.set()
+
+        assert await second == "done"
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+        stats = single_flight.get_stats()
+        assert stats["executions"] == 1
+        assert stats["coalesced"] == 1
+        assert stats["coalesced_ratio"] == 0.5
+        assert stats["in_flight"] == 0
@@ -0,0 +1,329 @@
+"""
+Tests for SSHConnectionPool channel multiplexing, connection health tracking,
+fair channel queueing and SSHClient reconnects
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import asyncssh
+import pytest
+from src.utils.ssh_client import SSHClient, SSHConnectionError, SSHConnectionInfo, SSHConnectionPool
+
+
+def make_connection(closed: bool = False) -> MagicMock:
+    """Create a fake asyncssh connection"""
+    connection = MagicMock()
+    connection.is_closed.return_value = closed
+    connection.run = AsyncMock(return_value=MagicMock(returncode=0, stdout="ok", stderr=""))
+    connection.wait_closed = AsyncMock()
+    process = MagicMock()
+    process.wait = AsyncMock(return_value=MagicMock(returncode=0, stdout="ok", stderr=""))
+    connection.create_process = AsyncMock(return_value=process)
+    return connection
+
+
+@pytest.fixture
+def connection_info():
+    """SSH connection info for a test host"""
+    return SSHConnectionInfo(host="test-host")
+
+
+class TestChannelMultiplexing:
+    """Test that concurrent callers share one connection per host"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_channels_share_one_connection(self, connection_info):
+        """Test that concurrent checkouts reuse the same transport up to the cap"""
+        pool = SSHConnectionPool(max_channels_per_connection=3)
+        first = make_connection()
+        second = make_connection()
+        pool._create_connection = AsyncMock(side_effect=[first, second])
+
+        async with pool.get_connection(connection_info) as a, \
+                pool.get_connection(connection_info) as b, \
+                pool.get_connection(connection_info) as c:
+            assert a is b is c is first
+            assert pool.get_pool_stats()["test-host"]["active_channels"] == 3
+
+            # A fourth concurrent caller exceeds the channel cap
+            async with pool.get_connection(connection_info) as d:
+                assert d is second
+
+        stats = pool.get_pool_stats()["test-host"]
+        assert stats["connections_opened"] == 2
+        assert stats["channels_opened"] == 4
+        assert stats["active_channels"] == 0
+        assert stats["pooled_connections"] == 2
+
+    @pytest.mark.asyncio
+    async def test_transport_error_discards_shared_connection(self, connection_info):
+        """Test that a lost transport is removed from the pool"""
+        pool = SSHConnectionPool()
+        connection = make_connection()
+        pool._create_connection = AsyncMock(return_value=connection)
+
+        with pytest.raises(asyncssh.ConnectionLost):
+            async with pool.get_connection(connection_info):
+                raise asyncssh.ConnectionLost("Connection lost")
+
+        stats = pool.get_pool_stats()["test-host"]
+        assert stats["pooled_connections"] == 0
+        assert stats["total_connections"] == 0
+        connection.close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_refused_channel_keeps_shared_connection(self, connection_info):
+        """Test that a refused channel caps the connection instead of discarding it"""
+        pool = SSHConnectionPool(max_channels_per_connection=3)
+        first = make_connection()
+        second = make_connection()
+        pool._create_connection = AsyncMock(side_effect=[first, second])
+
+        async with pool.get_connection(connection_info) as busy:
+            with pytest.raises(asyncssh.ChannelOpenError):
+                async with pool.get_connection(connection_info) as refused:
+                    assert refused is busy is first
+                    raise asyncssh.ChannelOpenError(asyncssh.OPEN_ADMINISTRATIVELY_PROHIBITED, "open failed")
+
+            # The connection still serves its other channel but takes no more
+            async with pool.get_connection(connection_info) as other:
+                assert other is second
+
+        stats = pool.get_pool_stats()["test-host"]
+        assert stats["pooled_connections"] == 2
+        assert stats["channel_refusals"] == 1
+        first.close.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_command_timeout_keeps_shared_connection(self, connection_info):
+        """Test that a command failure does not tear down the shared transport"""
+        pool = SSHConnectionPool()
+        connection = make_connection()
+        pool._create_connection = AsyncMock(return_value=connection)
+
+        with pytest.raises(TimeoutError):
+            async with pool.get_connection(connection_info):
+                raise TimeoutError()
+
+        assert pool.get_pool_stats()["test-host"]["pooled_connections"] == 1
+        connection.close.assert_not_called()
+
+
+class TestConnectionLiveness:
+    """Test that pooled connections are reused without liveness commands"""
+
+    @pytest.mark.asyncio
+    async def test_pooled_connection_reused_without_probe(self, connection_info):
+        """Test that keepalive-managed connections are never probed"""
+        pool = SSHConnectionPool(keepalive_interval=30)
+        connection = make_connection()
+        pool._create_connection = AsyncMock(return_value=connection)
+
+        async with pool.get_connection(connection_info):
+            pass
+        async with pool.get_connection(connection_info) as reused:
+            assert reused is connection
+
+        connection.run.assert_not_awaited()
+        stats = pool.get_pool_stats()["test-host"]
+        assert stats["probes_avoided"] == 1
+        assert stats["probes_performed"] == 0
+
+    @pytest.mark.asyncio
+    async def test_closed_pooled_connection_is_discarded(self, connection_info):
+        """Test that connections closed by keepalive are replaced"""
+        pool = SSHConnectionPool(keepalive_interval=30)
+        stale = make_connection()
+        fresh = make_connection()
+        pool._create_connection = AsyncMock(side_effect=[stale, fresh])
+
+        async with pool.get_connection(connection_info):
+            pass
+        stale.is_closed.return_value = True
+
+        async with pool.get_connection(connection_info) as connection:
+            assert connection is fresh
+
+        stats = pool.get_pool_stats()["test-host"]
+        assert stats["stale_discarded"] == 1
+        assert stats["total_connections"] == 1
+
+    @pytest.mark.asyncio
+    async def test_recently_used_connection_skips_probe_without_keepalive(self, connection_info):
+        """Test that the last_ok grace period avoids probes when keepalive is off"""
+        pool = SSHConnectionPool(keepalive_interval=0, liveness_grace_period=60)
+        connection = make_connection()
+        pool._create_connection = AsyncMock(return_value=connection)
+
+        async with pool.get_connection(connection_info):
+            pass
+        async with pool.get_connection(connection_info):
+            pass
+
+        connection.run.assert_not_awaited()
+
+        # Once the grace period has passed, a single probe is issued
+        pool._last_ok[connection] -= 120
+        async with pool.get_connection(connection_info):
+            pass
+
+        connection.run.assert_awaited_once()
+        assert pool.get_pool_stats()["test-host"]["probes_performed"] == 1
+
+
+class TestFairChannelQueue:
+    """Test FIFO hand-off of channels when a host is at capacity"""
+
+    @pytest.mark.asyncio
+    async def test_waiters_are_served_in_arrival_order(self, connection_info):
+        """Test that queued callers acquire released channels in FIFO order"""
+        pool = SSHConnectionPool(max_connections_per_host=1, max_channels_per_connection=1)
+        pool._create_connection = AsyncMock(return_value=make_connection())
+        order = []
+
+        async def worker(name: str) -> None:
+            async with pool.get_connection(connection_info):
+                order.append(name)
+                await asyncio.sleep(0)
+
+        async with pool.get_connection(connection_info):
+            tasks = []
+            for name in ("first", "second", "third"):
+                tasks.append(asyncio.create_task(worker(name)))
+                await asyncio.sleep(0)
+            assert pool.get_pool_stats()["test-host"]["queue_depth"] == 3
+
+        await asyncio.gather(*tasks)
+
+        assert order == ["first", "second", "third"]
+        stats = pool.get_pool_stats()["test-host"]
+        assert stats["queue_depth"] == 0
+        assert stats["max_queue_depth"] == 3
+        assert stats["waits"] == 3
+        assert stats["wait_timeouts"] == 0
+        assert stats["max_wait_time"] >= stats["avg_wait_time"] >= 0
+
+    @pytest.mark.asyncio
+    async def test_new_arrivals_do_not_jump_the_queue(self, connection_info):
+        """Test that a freed channel goes to the queued caller, not a newcomer"""
+        pool = SSHConnectionPool(max_connections_per_host=1, max_channels_per_connection=1)
+        pool._create_connection = AsyncMock(return_value=make_connection())
+        order = []
+
+        async def worker(name: str) -> None:
+            async with pool.get_connection(connection_info):
+                order.append(name)
+
+        async with pool.get_connection(connection_info):
+            queued = asyncio.create_task(worker("queued"))
+            await asyncio.sleep(0)
+
+        # Channel released: the queued caller is woken but has not run yet
+        newcomer = asyncio.create_task(worker("newcomer"))
+        await asyncio.gather(queued, newcomer)
+
+        assert order == ["queued", "newcomer"]
+
+    @pytest.mark.asyncio
+    async def test_acquire_timeout_raises_and_is_counted(self, connection_info):
+        """Test that a queued caller gives up after acquire_timeout"""
+        pool = SSHConnectionPool(
+            max_connections_per_host=1, max_channels_per_connection=1, acquire_timeout=0.05
+        )
+        pool._create_connection = AsyncMock(return_value=make_connection())
+
+        async with pool.get_connection(connection_info):
+            with pytest.raises(SSHConnectionError):
+                async with pool.get_connection(connection_info):
+                    pass
+
+        stats = pool.get_pool_stats()["test-host"]
+        assert stats["wait_timeouts"] == 1
+        assert stats["queue_depth"] == 0
+
+        # The pool is still usable after a timeout
+        async with pool.get_connection(connection_info):
+            pass
+
+    @pytest.mark.asyncio
+    async def test_failed_connect_wakes_next_waiter(self, connection_info):
+        """Test that a queued caller proceeds when a connection attempt fails"""
+        pool = SSHConnectionPool(max_connections_per_host=1, max_channels_per_connection=1)
+        connect_started = asyncio.Event()
+        fail_connect = asyncio.Event()
+        connection = make_connection()
+
+        async def create_connection(_info):
+            if not connect_started.is_set():
+                connect_started.set()
+                await fail_connect.wait()
+                raise OSError("Connection refused")
+            return connection
+
+        pool._create_connection = create_connection
+
+        async def acquire():
+            async with pool.get_connection(connection_info) as conn:
+                return conn
+
+        failing = asyncio.create_task(acquire())
+        await connect_started.wait()
+        waiting = asyncio.create_task(acquire())
+        await asyncio.sleep(0)
+        assert pool.get_pool_stats()["test-host"]["queue_depth"] == 1
+
+        fail_connect.set()
+        with pytest.raises(OSError):
+            await failing
+        assert await asyncio.wait_for(waiting, timeout=1) is connection
+
+
+class TestLazyReconnect:
+    """Test reconnect-on-failure in SSHClient.execute_command"""
+
+    @pytest.mark.asyncio
+    async def test_execute_command_reconnects_on_lost_connection(self, connection_info):
+        """Test that a dead pooled connection is replaced without a retry attempt"""
+        pool = SSHConnectionPool(keepalive_interval=30)
+        dead = make_connection()
+        dead.create_process = AsyncMock(side_effect=asyncssh.ConnectionLost("Connection lost"))
+        fresh = make_connection()
+        pool._create_connection = AsyncMock(side_effect=[dead, fresh])
+
+        with patch("src.utils.ssh_client.get_settings") as mock_settings:
+            mock_settings.return_value = MagicMock()
+            mock_settings.return_value.api.max_concurrent_ssh_connections = 5
+            client = SSHClient(connection_pool=pool)
+
+        result = await client.execute_command(connection_info, "uptime", retries=0)
+
+        assert result.success
+        assert result.stdout == "ok"
+        assert pool.get_pool_stats()["test-host"]["reconnects"] == 1
+
+    @pytest.mark.asyncio
+    async def test_execute_command_retries_refused_channel(self, connection_info):
+        """Test that a refused channel is retried without reconnecting"""
+        pool = SSHConnectionPool(keepalive_interval=30)
+        connection = make_connection()
+        process = connection.create_process.return_value
+        connection.create_process = AsyncMock(side_effect=[
+            asyncssh.ChannelOpenError(asyncssh.OPEN_ADMINISTRATIVELY_PROHIBITED, "open failed"),
+            process,
+        ])
+        pool._create_connection = AsyncMock(return_value=connection)
+
+        with patch("src.utils.ssh_client.get_settings") as mock_settings:
+            mock_settings.return_value = MagicMock()
+            mock_settings.return_value.api.max_concurrent_ssh_connections = 5
+            client = SSHClient(connection_pool=pool)
+
+        result = await client.execute_command(connection_info, "uptime", retries=0)
+
+        assert result.success
+        stats = pool.get_pool_stats()["test-host"]
+        assert stats["connections_opened"] == 1
+        assert stats["reconnects"] == 0
+        assert stats["channel_refusals"] == 1
+        connection.close.assert_not_called()
@@ -0,0 +1,408 @@
+"""
+Unit tests for WebSocket ConnectionManager broadcasting
+"""
+
+import asyncio
+from datetime import UTC, datetime
+import json
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+from src.core.events import ContainerStatusEvent, MetricCollectedEvent
+from src.websocket import connection_manager as connection_manager_module
+from src.websocket.connection_manager import ConnectionManager, SlowConsumerPolicy
+from src.websocket.message_protocol import ProtocolOptions, SubscriptionMessage, encode_message
+from src.websocket.server import websocket_endpoint
+
+TOPIC = "devices.host.metrics"
+
+
+class FakeWebSocket:
+    """In-memory WebSocket recording the frames it is sent"""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.accept = AsyncMock()
+        self.frames: list = []
+
+    async def send_text(self, data):
+        if self.fail:
+            raise RuntimeError("connection reset")
+        self.frames.append(data)
+
+    async def send_bytes(self, data):
+        if self.fail:
+            raise RuntimeError("connection reset")
+        self.frames.append(data)
+
+    async def close(self, code=1000):
+        self.closed_with = code
+
+
+def metric_event() -> MetricCollectedEvent:
+    return MetricCollectedEvent(
+        device_id=uuid4(),
+        hostname="host",
+        cpu_usage_percent=12.5,
+        memory_usage_percent=48.1,
+        disk_usage_percent=71.0,
+        load_average_1m=0.5,
+        load_average_5m=0.4,
+        load_average_15m=0.3,
+        uptime_seconds=86400,
+    )
+
+
+@pytest.fixture
+def manager():
+    """Connection manager without event bus registration"""
+    manager = ConnectionManager()
+    manager._event_handlers_registered = True
+    return manager
+
+
+async def connect(manager, websocket, topic=TOPIC):
+    await manager.connect(websocket)
+    await manager.subscribe_to_topic(websocket, topic)
+    await manager.flush()
+    websocket.frames.clear()
+
+
+class TestBroadcastEncoding:
+    """Test that broadcasts are serialized once and shared"""
+
+    @pytest.mark.asyncio
+    async def test_broadcast_encodes_once_for_all_subscribers(self, manager):
+        """Test that every subscriber receives the same frame from one encode"""
+        sockets = [FakeWebSocket() for _ in range(5)]
+        for websocket in sockets:
+            await connect(manager, websocket)
+        other = FakeWebSocket()
+        await connect(manager, other, topic="devices.other.metrics")
+
+        with patch.object(
+            connection_manager_module, "encode_message", wraps=encode_message
+        ) as mock_encode:
+            await manager.handle_monitoring_event(metric_event())
+        await manager.flush()
+
+        assert mock_encode.call_count == 1
+        frames = [websocket.frames[0] for websocket in sockets]
+        assert all(frame is frames[0] for frame in frames)
+        assert other.frames == []
+
+        payload = json.loads(frames[0])
+        assert payload["type"] == "data"
+        assert payload["metric_type"] == "system_metrics"
+        assert payload["data"]["cpu_usage_percent"] == 12.5
+        assert manager.get_connection_stats()["broadcast"]["frames_queued"] == 5
+
+    @pytest.mark.asyncio
+    async def test_binary_frames_are_sent_as_bytes(self, manager):
+        """Test the binary frame option"""
+        manager.binary_frames = True
+        websocket = FakeWebSocket()
+        await connect(manager, websocket)
+
+        await manager.handle_monitoring_event(metric_event())
+        await manager.flush()
+
+        assert isinstance(websocket.frames[0], bytes)
+        assert json.loads(websocket.frames[0])["hostname"] == "host"
+
+    @pytest.mark.asyncio
+    async def test_failed_send_disconnects_only_that_client(self, manager):
+        """Test that one broken connection does not affect the others"""
+        healthy, broken = FakeWebSocket(), FakeWebSocket()
+        await connect(manager, healthy)
+        await connect(manager, broken)
+        broken.fail = True
+
+        await manager.handle_monitoring_event(metric_event())
+        await manager.flush()
+
+        assert len(healthy.frames) == 1
+        assert broken not in manager.active_connections
+        assert manager.get_connection_stats()["broadcast"]["send_failures"] == 1
+
+
+class TestTopicRouting:
+    """Test routing broadcasts through the topic index"""
+
+    @pytest.mark.asyncio
+    async def test_wildcard_subscribers_receive_events(self, manager):
+        """Test that wildcard and global subscriptions receive matching events"""
+        host_tree, all_hosts, other = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+        await connect(manager, host_tree, topic="devices.host.*")
+        await connect(manager, all_hosts, topic="devices.*.metrics")
+        await connect(manager, other, topic="devices.*.drives")
+
+        await manager.handle_monitoring_event(metric_event())
+        await manager.flush()
+
+        assert len(host_tree.frames) == 1
+        assert len(all_hosts.frames) == 1
+        assert other.frames == []
+
+    @pytest.mark.asyncio
+    async def test_disconnect_and_replace_update_the_index(self, manager):
+        """Test that the index follows subscription replacement and disconnects"""
+        websocket = FakeWebSocket()
+        await connect(manager, websocket)
+        client_id = manager.active_connections[websocket]["client_id"]
+
+        await manager.handle_subscription(
+            client_id, SubscriptionMessage(action="replace", topics=["devices.host.drives"])
+        )
+        assert manager.get_connections_by_topic(TOPIC) == []
+        assert manager.get_connections_by_topic("devices.host.drives") == [websocket]
+
+        await manager.disconnect(websocket)
+        assert len(manager.topic_index) == 0
+
+
+class StalledWebSocket(FakeWebSocket):
+    """WebSocket whose sends block until released"""
+
+    def __init__(self):
+        super().__init__()
+        self.release = asyncio.Event()
+
+    async def send_text(self, data):
+        await self.release.wait()
+        await super().send_text(data)
+
+
+class TestSlowConsumers:
+    """Test per-client send queues and slow-consumer policies"""
+
+    async def _stall(self, manager):
+        stalled = StalledWebSocket()
+        stalled.release.set()
+        await connect(manager, stalled)
+        stalled.release.clear()
+        return stalled
+
+    @pytest.mark.asyncio
+    async def test_slow_client_does_not_delay_others(self, manager):
+        """Test that a stalled client keeps only the latest frame per topic"""
+        fast = FakeWebSocket()
+        await connect(manager, fast)
+        stalled = await self._stall(manager)
+
+        for _ in range(5):
+            await manager.handle_monitoring_event(metric_event())
+            await asyncio.sleep(0)
+
+        assert len(fast.frames) == 5
+        client = manager.get_connection_stats()["clients"][manager.connections[stalled].client_id]
+        assert client["queued"] == 1
+        assert client["conflated"] == 3
+        assert client["lag_seconds"] >= 0
+
+        stalled.release.set()
+        await manager.flush()
+        assert json.loads(stalled.frames[-1]) == json.loads(fast.frames[-1])
+        assert len(stalled.frames) == 2
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_bounds_the_queue(self, manager):
+        """Test that a full queue discards its oldest frames"""
+        manager.slow_consumer_policy = SlowConsumerPolicy.DROP_OLDEST
+        manager.send_queue_size = 2
+        stalled = await self._stall(manager)
+
+        for _ in range(5):
+            await manager.handle_monitoring_event(metric_event())
+
+        stats = manager.connections[stalled].get_stats()
+        assert stats["queued"] == 2
+        assert stats["dropped"] == 3
+
+    @pytest.mark.asyncio
+    async def test_lagging_client_is_disconnected(self, manager):
+        """Test that the disconnect policy drops a client lagging past the limit"""
+        manager.slow_consumer_policy = SlowConsumerPolicy.DISCONNECT
+        manager.max_lag_seconds = 0.01
+        stalled = await self._stall(manager)
+
+        await manager.handle_monitoring_event(metric_event())
+        await asyncio.sleep(0.02)
+        await manager.handle_monitoring_event(metric_event())
+        await asyncio.sleep(0.01)
+
+        assert stalled not in manager.active_connections
+        assert stalled.closed_with == 1013
+        assert manager.get_connection_stats()["broadcast"]["slow_consumer_disconnects"] == 1
+
+    @pytest.mark.asyncio
+    async def test_error_is_queued_behind_pending_frames(self, manager):
+        """Test that send_error goes through the send queue instead of the socket"""
+        stalled = await self._stall(manager)
+        await manager.handle_monitoring_event(metric_event())
+        await asyncio.sleep(0)
+
+        connection = manager.connections[stalled]
+        assert await connection.send_error("INVALID_MESSAGE", "bad request") is True
+        assert stalled.frames == []
+
+        stalled.release.set()
+        await manager.flush()
+        assert [json.loads(frame)["type"] for frame in stalled.frames] == ["data", "error"]
+
+
+class TestThrottledSubscriptions:
+    """Test server-side throttling of subscriptions"""
+
+    @pytest.mark.asyncio
+    async def test_changes_only_subscription_skips_repeated_events(self, manager):
+        """Test that a changes-only client gets one frame for unchanged polls"""
+        throttled, plain = FakeWebSocket(), FakeWebSocket()
+        await connect(manager, plain, topic="devices.*.metrics")
+        await manager.connect(throttled)
+        await manager.handle_subscription(
+            manager.active_connections[throttled]["client_id"],
+            SubscriptionMessage(
+                action="subscribe",
+                topics=["devices.*.metrics"],
+                options={"changes_only": True},
+            ),
+        )
+        await manager.flush()
+        throttled.frames.clear()
+
+        event = metric_event()
+        for _ in range(3):
+            await manager.handle_monitoring_event(event.model_copy(update={"timestamp": datetime.now(UTC)}))
+            await asyncio.sleep(0)
+        await manager.flush()
+
+        assert len(plain.frames) == 3
+        assert len(throttled.frames) == 1
+        assert manager.get_connection_stats()["broadcast"]["frames_filtered"] == 2
+
+
+def container_event(container_id: str, status: str = "running") -> ContainerStatusEvent:
+    return ContainerStatusEvent(
+        device_id=uuid4(),
+        hostname="host",
+        container_id=container_id,
+        container_name=f"web-{container_id}",
+        image="nginx:1.27",
+        status=status,
+    )
+
+
+class TestDeltaFrames:
+    """Test snapshot and delta frames for negotiated clients"""
+
+    async def _delta_client(self, manager):
+        websocket = FakeWebSocket()
+        await connect(manager, websocket, topic="devices.host.containers")
+        client_id = manager.active_connections[websocket]["client_id"]
+        manager.set_protocol(client_id, ProtocolOptions(delta=True))
+        return websocket
+
+    @pytest.mark.asyncio
+    async def test_snapshot_then_deltas_per_container(self, manager):
+        """Test that each container stream starts with a snapshot and continues with deltas"""
+        websocket = await self._delta_client(manager)
+        plain = FakeWebSocket()
+        await connect(manager, plain, topic="devices.host.containers")
+
+        for event in (container_event("a"), container_event("b"), container_event("a", "exited")):
+            await manager.handle_monitoring_event(event)
+            await asyncio.sleep(0)
+        await manager.flush()
+
+        frames = [json.loads(frame) for frame in websocket.frames]
+        assert [frame["type"] for frame in frames] == ["snapshot", "snapshot", "delta"]
+        assert frames[2]["stream"] == "devices.host.containers/a"
+        assert {"op": "replace", "path": "/status", "value": "exited"} in frames[2]["patch"]
+        assert [json.loads(frame)["type"] for frame in plain.frames] == ["data", "data", "data"]
+
+    @pytest.mark.asyncio
+    async def test_skipped_update_resends_snapshot(self, manager):
+        """Test that a conflated update makes the next frame a snapshot"""
+        websocket = await self._delta_client(manager)
+
+        await manager.handle_monitoring_event(container_event("a"))
+        await manager.flush()
+        # Two updates while the writer is busy: the first is conflated away
+        await manager.handle_monitoring_event(container_event("a", "restarting"))
+        await manager.handle_monitoring_event(container_event("a", "exited"))
+        await manager.flush()
+
+        frames = [json.loads(frame) for frame in websocket.frames]
+        assert [frame["type"] for frame in frames] == ["snapshot", "snapshot"]
+        assert frames[1]["data"]["status"] == "exited"
+
+    @pytest.mark.asyncio
+    async def test_streams_tracked_only_with_delta_clients(self, manager):
+        """Test that delta bases are kept only while a delta client is connected"""
+        plain = FakeWebSocket()
+        await connect(manager, plain, topic="devices.host.containers")
+        await manager.handle_monitoring_event(container_event("a"))
+        assert not manager._streams
+
+        websocket = await self._delta_client(manager)
+        await manager.handle_monitoring_event(container_event("a"))
+        assert list(manager._streams) == ["devices.host.containers/a"]
+
+        await manager.disconnect(websocket)
+        assert not manager._streams
+
+    @pytest.mark.asyncio
+    async def test_idle_stream_evicted(self, manager):
+        """Test that an idle stream is forgotten and restarts with a snapshot"""
+        websocket = await self._delta_client(manager)
+        await manager.handle_monitoring_event(container_event("a"))
+        await manager.flush()
+        seq, data, updated = manager._streams["devices.host.containers/a"]
+        idle_since = updated - connection_manager_module.STREAM_IDLE_TIMEOUT
+        manager._streams["devices.host.containers/a"] = (seq, data, idle_since)
+
+        await manager.handle_monitoring_event(container_event("b"))
+        await manager.flush()
+        assert list(manager._streams) == ["devices.host.containers/b"]
+
+        await manager.handle_monitoring_event(container_event("a", "exited"))
+        await manager.flush()
+
+        frames = [json.loads(frame) for frame in websocket.frames]
+        assert [frame["type"] for frame in frames] == ["snapshot", "snapshot", "snapshot"]
+        assert frames[2]["seq"] == 1
+
+
+class TestDisconnect:
+    """Test that final messages reach the client before the connection closes"""
+
+    @pytest.mark.asyncio
+    async def test_auth_failure_error_is_delivered(self, manager):
+        """Test that the welcome and AUTH_FAILED frames are sent before disconnecting"""
+        websocket = FakeWebSocket()
+        websocket.receive_text = AsyncMock(return_value=json.dumps({"type": "auth", "token": "bad"}))
+        authenticator = AsyncMock()
+        authenticator.authenticate_token.return_value = None
+
+        await websocket_endpoint(websocket, connection_manager=manager, authenticator=authenticator)
+
+        frames = [json.loads(frame) for frame in websocket.frames]
+        assert frames[-1]["type"] == "error"
+        assert frames[-1]["error_code"] == "AUTH_FAILED"
+        assert len(frames) == 2
+        assert manager.get_connection_count() == 0
+
+    @pytest.mark.asyncio
+    async def test_disconnect_sends_queued_frames(self, manager):
+        """Test that a normal disconnect drains the send queue first"""
+        websocket = FakeWebSocket()
+        await connect(manager, websocket)
+
+        await manager.handle_monitoring_event(metric_event())
+        await manager.disconnect(websocket, close_code=1000)
+        await asyncio.sleep(0.01)
+
+        assert len(websocket.frames) == 1
+        assert websocket.closed_with == 1000
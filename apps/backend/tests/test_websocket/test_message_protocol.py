@@ -0,0 +1,120 @@
+"""
+Unit tests for WebSocket delta frames and negotiated encodings
+"""
+
+from datetime import UTC, datetime
+import json
+import zlib
+
+import pytest
+from src.websocket import message_protocol
+from src.websocket.message_protocol import (
+    DataMessage,
+    ProtocolOptions,
+    StreamUpdate,
+    apply_patch,
+    diff_payload,
+    encode_payload,
+    negotiate_protocol,
+    stream_key,
+)
+
+
+def container(status: str = "running", cpu: float = 1.0) -> dict:
+    return {
+        "container_id": "abc",
+        "container_name": "web",
+        "image": "nginx:1.27",
+        "status": status,
+        "cpu_usage_percent": cpu,
+        "labels": {"tier": "frontend", "owner": "ops"},
+    }
+
+
+def message(data: dict) -> DataMessage:
+    return DataMessage(
+        hostname="host", metric_type="container_snapshots", data=data, timestamp=datetime.now(UTC)
+    )
+
+
+class TestJsonPatch:
+    """Test payload diffing and patching"""
+
+    def test_patch_round_trips(self):
+        """Test that applying the diff of two payloads reproduces the newer one"""
+        old = container()
+        new = {**container(status="exited", cpu=0.0), "exit_code": 137}
+        new["labels"] = {"tier": "frontend", "owner/team": "sre"}
+        del new["image"]
+
+        patch = diff_payload(old, new)
+
+        assert apply_patch(old, patch) == new
+        assert old == container()
+        assert {"op": "remove", "path": "/image"} in patch
+        assert {"op": "add", "path": "/labels/owner~1team", "value": "sre"} in patch
+
+    def test_unchanged_fields_are_not_sent(self):
+        """Test that the patch only touches changed fields"""
+        patch = diff_payload(container(), container(cpu=2.5))
+
+        assert patch == [{"op": "replace", "path": "/cpu_usage_percent", "value": 2.5}]
+
+
+class TestStreamUpdate:
+    """Test choosing and sharing frames per client protocol"""
+
+    def test_delta_needs_the_previous_update(self):
+        """Test that clients missing the previous update get a snapshot"""
+        delta_protocol = ProtocolOptions(delta=True)
+        update = StreamUpdate(message(container(cpu=2.0)), "s", seq=2, previous_data=container())
+
+        delta = json.loads(update.frame_for(delta_protocol, last_seq=1))
+        snapshot = json.loads(update.frame_for(delta_protocol, last_seq=None))
+
+        assert delta["type"] == "delta"
+        assert (delta["base_seq"], delta["seq"]) == (1, 2)
+        assert delta["patch"] == [{"op": "replace", "path": "/cpu_usage_percent", "value": 2.0}]
+        assert snapshot["type"] == "snapshot"
+        assert snapshot["data"] == container(cpu=2.0)
+
+    def test_frames_are_encoded_once_per_variant(self):
+        """Test that clients on the same protocol share one frame"""
+        protocol = ProtocolOptions(compression="deflate")
+        update = StreamUpdate(message(container()), "s", seq=1)
+
+        frame = update.frame_for(protocol)
+
+        assert update.frame_for(protocol) is frame
+        assert json.loads(zlib.decompress(frame))["data"]["image"] == "nginx:1.27"
+
+    def test_stream_key_separates_containers(self):
+        """Test that each container on a shared topic is its own stream"""
+        assert stream_key("devices.host.containers", container()) == "devices.host.containers/abc"
+        assert stream_key("devices.host.metrics", {"cpu_usage_percent": 1}) == "devices.host.metrics"
+
+
+class TestProtocolNegotiation:
+    """Test negotiating frame formats"""
+
+    def test_plain_json_is_text(self):
+        """Test that the default protocol produces text frames"""
+        assert isinstance(encode_payload({"a": 1}, ProtocolOptions()), str)
+        assert ProtocolOptions().is_default()
+
+    def test_msgpack_falls_back_without_library(self, monkeypatch):
+        """Test that msgpack is downgraded to json when it is not installed"""
+        monkeypatch.setattr(message_protocol, "msgpack", None)
+
+        accepted = negotiate_protocol(ProtocolOptions(encoding="msgpack", delta=True))
+
+        assert accepted.encoding == "json"
+        assert accepted.delta is True
+
+    def test_msgpack_frames_decode(self):
+        """Test msgpack frames when the library is installed"""
+        msgpack = pytest.importorskip("msgpack")
+
+        frame = encode_payload({"data": container()}, ProtocolOptions(encoding="msgpack"))
+
+        assert msgpack.unpackb(frame)["data"] == container()
@@ -0,0 +1,85 @@
+"""
+Unit tests for server-side WebSocket subscription throttling
+"""
+
+from pydantic import ValidationError
+import pytest
+from src.websocket.message_protocol import SubscriptionMessage, SubscriptionOptions
+from src.websocket.subscription_filter import SubscriptionFilter
+
+TOPIC = "devices.host.containers"
+
+
+def container(container_id: str = "c1", status: str = "running", event_id: str = "e1") -> dict:
+    return {"event_id": event_id, "device_id": "d1", "container_id": container_id, "status": status}
+
+
+def metrics(cpu: float, event_id: str = "e1") -> dict:
+    return {"event_id": event_id, "device_id": "d1", "cpu_usage_percent": cpu, "uptime_seconds": 10}
+
+
+class TestSubscriptionFilter:
+    """Test which updates a throttled subscription delivers"""
+
+    def test_changes_only_suppresses_identical_payloads(self):
+        """Test that repeats are dropped while real changes and new containers pass"""
+        subscription_filter = SubscriptionFilter(SubscriptionOptions(changes_only=True))
+
+        assert subscription_filter.allow(TOPIC, container(event_id="e1"), now=0)
+        assert not subscription_filter.allow(TOPIC, container(event_id="e2"), now=30)
+        assert subscription_filter.allow(TOPIC, container("c2"), now=30)
+        assert subscription_filter.allow(TOPIC, container(status="exited"), now=60)
+        assert subscription_filter.suppressed == 1
+
+    def test_max_rate_limits_updates_per_container(self):
+        """Test that updates closer than 1/max_rate apart are dropped"""
+        subscription_filter = SubscriptionFilter(SubscriptionOptions(max_rate=0.5))
+
+        assert subscription_filter.allow(TOPIC, container(status="a"), now=0)
+        assert subscription_filter.allow(TOPIC, container("c2", status="a"), now=0.1)
+        assert not subscription_filter.allow(TOPIC, container(status="b"), now=1)
+        assert subscription_filter.allow(TOPIC, container(status="c"), now=2)
+
+    def test_min_delta_measures_from_last_delivered_value(self):
+        """Test that small moves are dropped but add up against the delivered value"""
+        subscription_filter = SubscriptionFilter(
+            SubscriptionOptions(min_delta={"cpu_usage_percent": 5})
+        )
+        topic = "devices.host.metrics"
+
+        assert subscription_filter.allow(topic, metrics(10.0), now=0)
+        assert not subscription_filter.allow(topic, metrics(13.0), now=1)
+        assert subscription_filter.allow(topic, metrics(15.5), now=2)
+        assert not subscription_filter.allow(topic, metrics(12.0), now=3)
+
+    def test_min_delta_without_matching_fields_delivers(self):
+        """Test that delta thresholds for absent fields do not block other payloads"""
+        subscription_filter = SubscriptionFilter(
+            SubscriptionOptions(min_delta={"cpu_usage_percent": 5})
+        )
+
+        assert subscription_filter.allow(TOPIC, container(), now=0)
+        assert subscription_filter.allow(TOPIC, container(), now=1)
+
+
+class TestSubscriptionOptions:
+    """Test subscription option parsing"""
+
+    def test_options_parse_from_subscription_message(self):
+        """Test that clients can send options with a subscription"""
+        message = SubscriptionMessage(
+            type="subscription",
+            action="subscribe",
+            topics=["devices.*.containers"],
+            options={"changes_only": True, "max_rate": 1},
+        )
+
+        assert message.options.changes_only is True
+        assert message.options.is_throttled()
+        assert not SubscriptionOptions().is_throttled()
+
+    @pytest.mark.parametrize("options", [{"max_rate": 0}, {"min_delta": {"cpu_usage_percent": -1}}])
+    def test_invalid_options_are_rejected(self, options):
+        """Test validation of rates and thresholds"""
+        with pytest.raises(ValidationError):
+            SubscriptionOptions(**options)
@@ -0,0 +1,71 @@
+"""
+Unit tests for the WebSocket topic subscription index
+"""
+
+import pytest
+from src.websocket.topic_index import TopicIndex, topic_matches
+
+
+@pytest.fixture
+def index():
+    """Index with one subscriber per pattern kind"""
+    index = TopicIndex()
+    index.add("devices.web01.metrics", "exact")
+    index.add("devices.*.metrics", "any_host")
+    index.add("devices.web01.*", "host_tree")
+    index.add("global", "everything")
+    return index
+
+
+class TestTopicIndex:
+    """Test routing topics to subscribers"""
+
+    def test_exact_and_wildcard_patterns_match(self, index):
+        """Test that every matching pattern kind is returned"""
+        assert index.match("devices.web01.metrics") == {"exact", "any_host", "host_tree", "everything"}
+
+    def test_single_segment_wildcard_matches_one_level(self, index):
+        """Test that devices.*.metrics matches any host but no other kind"""
+        assert index.match("devices.db02.metrics") == {"any_host", "everything"}
+        assert index.match("devices.db02.containers") == {"everything"}
+
+    def test_trailing_wildcard_matches_below_prefix_only(self, index):
+        """Test that devices.web01.* does not match sibling hosts or the prefix itself"""
+        assert "host_tree" in index.match("devices.web01.containers")
+        assert "host_tree" not in index.match("devices.web011.containers")
+        assert "host_tree" not in index.match("devices.web01")
+
+    def test_remove_prunes_empty_nodes(self):
+        """Test that removing the last subscriber leaves no trie nodes behind"""
+        index = TopicIndex()
+        index.add("devices.web01.metrics", "a")
+        index.add("devices.web01.metrics", "a")
+        assert len(index) == 1
+
+        index.remove("devices.web01.metrics", "a")
+        index.remove("devices.unknown.metrics", "a")
+
+        assert len(index) == 0
+        assert index.get_stats()["nodes"] == 1
+        assert index.match("devices.web01.metrics") == set()
+
+    @pytest.mark.parametrize(
+        "topic, pattern, expected",
+        [
+            ("devices.web01.metrics", "devices.web01.metrics", True),
+            ("devices.web01.metrics", "devices.*.metrics", True),
+            ("devices.web01.metrics", "devices.web01.*", True),
+            ("devices.web011.metrics", "devices.web01.*", False),
+            ("devices.web01.metrics", "devices.*", True),
+            ("devices.web01", "devices.web01.*", False),
+            ("devices.web01.metrics", "global", True),
+            ("devices.web01.metrics", "devices.*.drives", False),
+        ],
+    )
+    def test_topic_matches_agrees_with_index(self, topic, pattern, expected):
+        """Test that the single-pattern check follows the index rules"""
+        index = TopicIndex()
+        index.add(pattern, "subscriber")
+
+        assert topic_matches(topic, pattern) is expected
+        assert (index.match(topic) == {"subscriber"}) is expected